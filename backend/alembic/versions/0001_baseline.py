@@ -0,0 +1,210 @@
+"""기준 스키마
+
+마이그레이션 도입 전의 스키마(users, documents, analyses, exports, feedback)를
+그대로 고정해 둔다. 모델이 바뀌어도 이 리비전은 바뀌지 않으며, 이후 변경은
+다음 리비전에서 적용한다.
+
+지금까지는 애플리케이션 시작 시 create_all로 테이블을 만들었으므로, 이미
+운영 중인 DB에서는 빠진 테이블만 생성하고 기존 테이블은 그대로 둔다.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum(모델 enum)은 멤버 이름을 저장한다
+DOCUMENT_STATUS = sa.Enum(
+    "UPLOADED", "PROCESSING", "COMPLETED", "FAILED", "DELETED",
+    name="documentstatus"
+)
+EXPORT_TYPE = sa.Enum(
+    "MARKDOWN", "PDF", "TXT", "JSON", "DOCX", "GDRIVE", "NOTION", "CHATGPT",
+    name="exporttype"
+)
+EXPORT_STATUS = sa.Enum("PENDING", "PROCESSING", "COMPLETED", "FAILED", name="exportstatus")
+FEEDBACK_TYPE = sa.Enum(
+    "QUALITY", "SPEED", "ACCURACY", "UI", "FEATURE", "BUG", "GENERAL",
+    name="feedbacktype"
+)
+
+
+def _create_users():
+    op.create_table(
+        "users",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_premium", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("full_name", sa.String(255), nullable=True),
+        sa.Column("avatar_url", sa.String(500), nullable=True),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.Column("language", sa.String(10), nullable=True),
+        sa.Column("timezone", sa.String(50), nullable=True),
+        sa.Column("google_id", sa.String(255), nullable=True, unique=True),
+        sa.Column("github_id", sa.String(255), nullable=True, unique=True),
+        sa.Column("subscription_type", sa.String(50), nullable=True),
+        sa.Column("subscription_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("monthly_uploads", sa.Integer(), nullable=True),
+        sa.Column("total_uploads", sa.Integer(), nullable=True),
+        sa.Column("last_upload_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("last_login_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+
+def _create_documents():
+    op.create_table(
+        "documents",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("original_filename", sa.String(255), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("mime_type", sa.String(100), nullable=False),
+        sa.Column("file_hash", sa.String(64), nullable=True),
+        sa.Column("status", DOCUMENT_STATUS, nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("word_count", sa.Integer(), nullable=True),
+        sa.Column("language", sa.String(10), nullable=True),
+        sa.Column("processing_started_at", sa.DateTime(), nullable=True),
+        sa.Column("processing_completed_at", sa.DateTime(), nullable=True),
+        sa.Column("processing_time", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    for column in ("id", "user_id", "status", "created_at"):
+        op.create_index(f"ix_documents_{column}", "documents", [column])
+
+
+def _create_analyses():
+    op.create_table(
+        "analyses",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "document_id", UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("raw_text", sa.Text(), nullable=True),
+        sa.Column("cleaned_text", sa.Text(), nullable=True),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("keywords", sa.JSON(), nullable=True),
+        sa.Column("qa_pairs", sa.JSON(), nullable=True),
+        sa.Column("important_sentences", sa.JSON(), nullable=True),
+        sa.Column("metadata", sa.JSON(), nullable=True),
+        sa.Column("ai_model", sa.String(50), nullable=True),
+        sa.Column("language", sa.String(10), nullable=True),
+        sa.Column("processing_time", sa.Integer(), nullable=True),
+        sa.Column("confidence_score", sa.Float(), nullable=True),
+        sa.Column("readability_score", sa.Float(), nullable=True),
+        sa.Column("total_pages", sa.Integer(), nullable=True),
+        sa.Column("total_words", sa.Integer(), nullable=True),
+        sa.Column("total_sentences", sa.Integer(), nullable=True),
+        sa.Column("total_paragraphs", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    for column in ("id", "document_id", "created_at"):
+        op.create_index(f"ix_analyses_{column}", "analyses", [column])
+
+
+def _create_exports():
+    op.create_table(
+        "exports",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "analysis_id", UUID(as_uuid=True),
+            sa.ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("export_type", EXPORT_TYPE, nullable=False),
+        sa.Column("status", EXPORT_STATUS, nullable=False),
+        sa.Column("filename", sa.String(255), nullable=True),
+        sa.Column("file_path", sa.String(500), nullable=True),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("external_url", sa.String(500), nullable=True),
+        sa.Column("external_id", sa.String(255), nullable=True),
+        sa.Column("include_metadata", sa.Boolean(), nullable=True),
+        sa.Column("template_name", sa.String(100), nullable=True),
+        sa.Column("processing_started_at", sa.DateTime(), nullable=True),
+        sa.Column("processing_completed_at", sa.DateTime(), nullable=True),
+        sa.Column("processing_time", sa.Integer(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    for column in ("id", "analysis_id", "export_type", "status", "created_at"):
+        op.create_index(f"ix_exports_{column}", "exports", [column])
+
+
+def _create_feedback():
+    op.create_table(
+        "feedback",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+        ),
+        sa.Column(
+            "analysis_id", UUID(as_uuid=True),
+            sa.ForeignKey("analyses.id", ondelete="SET NULL"), nullable=True
+        ),
+        sa.Column("rating", sa.Integer(), nullable=True),
+        sa.Column("comment", sa.Text(), nullable=True),
+        sa.Column("feedback_type", FEEDBACK_TYPE, nullable=False),
+        sa.Column("user_agent", sa.String(500), nullable=True),
+        sa.Column("ip_address", sa.String(45), nullable=True),
+        sa.Column("page_url", sa.String(500), nullable=True),
+        sa.Column("is_resolved", sa.Boolean(), nullable=True),
+        sa.Column("admin_response", sa.Text(), nullable=True),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.Column("resolved_by", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    for column in ("id", "user_id", "analysis_id", "feedback_type", "created_at"):
+        op.create_index(f"ix_feedback_{column}", "feedback", [column])
+
+
+# 생성 순서 (참조되는 테이블 먼저)
+TABLES = [
+    ("users", _create_users),
+    ("documents", _create_documents),
+    ("analyses", _create_analyses),
+    ("exports", _create_exports),
+    ("feedback", _create_feedback),
+]
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, create in TABLES:
+        if table not in existing:
+            create()
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table, _ in reversed(TABLES):
+        op.drop_table(table)
+    for enum in (FEEDBACK_TYPE, EXPORT_STATUS, EXPORT_TYPE, DOCUMENT_STATUS):
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,314 @@
+"""문서 처리/저장소 스키마
+
+기준 스키마 이후 추가된 테이블, 컬럼, 인덱스를 만든다.
+
+- documents: 저장소 키, 단계별 소요 시간, 부가 산출물, 워커 lease 컬럼과
+  목록 키셋 페이지네이션 인덱스
+- analyses: 원문/정제 텍스트 해시(text_blobs 참조) 컬럼과 키셋 인덱스
+- 새 테이블: text_blobs, stored_blobs, document_chunks,
+  document_search_indexes, processing_jobs, upload_sessions, user_stats,
+  document_archives, archived_documents
+
+애플리케이션 시작 시 create_all이 새 테이블을 먼저 만들었을 수 있으므로 이미
+있는 테이블, 컬럼, 인덱스는 건너뛴다. 기존 raw_text/cleaned_text 값은
+0003_analysis_text_blobs에서 text_blobs로 옮긴다.
+
+Revision ID: 0001b_processing_storage_schema
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0001b_processing_storage_schema"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+JOB_STATUS = sa.Enum("QUEUED", "DISPATCHED", "COMPLETED", "FAILED", name="jobstatus")
+UPLOAD_SESSION_STATUS = sa.Enum(
+    "ACTIVE", "ASSEMBLING", "COMPLETED", "ABORTED", "EXPIRED",
+    name="uploadsessionstatus"
+)
+
+
+def _document_columns():
+    return [
+        sa.Column("storage_key", sa.String(500), nullable=True),
+        sa.Column("stage_timings", sa.JSON(), nullable=True),
+        sa.Column("artifacts", sa.JSON(), nullable=True),
+        sa.Column("lease_owner", sa.String(255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("processing_attempts", sa.Integer(), nullable=False, server_default="0"),
+    ]
+
+
+def _analysis_columns():
+    return [
+        sa.Column("raw_text_hash", sa.String(64), sa.ForeignKey("text_blobs.content_hash"), nullable=True),
+        sa.Column("cleaned_text_hash", sa.String(64), sa.ForeignKey("text_blobs.content_hash"), nullable=True),
+    ]
+
+
+# (인덱스 이름, 테이블, 컬럼)
+INDEXES = [
+    ("ix_documents_storage_key", "documents", ["storage_key"]),
+    ("ix_documents_lease_expires_at", "documents", ["lease_expires_at"]),
+    ("ix_documents_user_created_id", "documents", ["user_id", "created_at", "id"]),
+    ("ix_documents_user_updated_id", "documents", ["user_id", "updated_at", "id"]),
+    ("ix_documents_user_filename_id", "documents", ["user_id", "original_filename", "id"]),
+    ("ix_documents_user_file_size_id", "documents", ["user_id", "file_size", "id"]),
+    ("ix_analyses_raw_text_hash", "analyses", ["raw_text_hash"]),
+    ("ix_analyses_cleaned_text_hash", "analyses", ["cleaned_text_hash"]),
+    ("ix_analyses_created_id", "analyses", ["created_at", "id"]),
+    ("ix_analyses_confidence_id", "analyses", ["confidence_score", "id"]),
+    ("ix_analyses_processing_time_id", "analyses", ["processing_time", "id"]),
+]
+
+
+def _create_text_blobs():
+    op.create_table(
+        "text_blobs",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("codec", sa.String(10), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("original_size", sa.BigInteger(), nullable=False),
+        sa.Column("compressed_size", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_referenced_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index("ix_text_blobs_last_referenced_at", "text_blobs", ["last_referenced_at"])
+
+
+def _create_stored_blobs():
+    op.create_table(
+        "stored_blobs",
+        sa.Column("file_hash", sa.String(64), primary_key=True),
+        sa.Column("storage_key", sa.String(500), nullable=False, unique=True),
+        sa.Column("file_size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+
+
+def _create_document_chunks():
+    op.create_table(
+        "document_chunks",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "document_id", UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column(
+            "parent_id", UUID(as_uuid=True),
+            sa.ForeignKey("document_chunks.id", ondelete="CASCADE"), nullable=True
+        ),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("start_offset", sa.Integer(), nullable=False),
+        sa.Column("end_offset", sa.Integer(), nullable=False),
+        sa.Column("page_start", sa.Integer(), nullable=True),
+        sa.Column("page_end", sa.Integer(), nullable=True),
+        sa.Column("token_count", sa.Integer(), nullable=True),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("summary_model", sa.String(50), nullable=True),
+        sa.Column("language", sa.String(10), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    for column in ("id", "document_id", "parent_id", "content_hash"):
+        op.create_index(f"ix_document_chunks_{column}", "document_chunks", [column])
+    op.create_index(
+        "ix_document_chunks_document_level_position", "document_chunks",
+        ["document_id", "level", "position"]
+    )
+
+
+def _create_document_search_indexes():
+    op.create_table(
+        "document_search_indexes",
+        sa.Column(
+            "document_id", UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("text_hash", sa.String(64), nullable=False),
+        sa.Column("passage_count", sa.Integer(), nullable=False),
+        sa.Column("term_count", sa.Integer(), nullable=False),
+        sa.Column("avg_passage_length", sa.Float(), nullable=True),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+
+
+def _create_processing_jobs():
+    op.create_table(
+        "processing_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "document_id", UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("priority_class", sa.String(20), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=False),
+        sa.Column("virtual_finish", sa.Float(), nullable=False),
+        sa.Column("status", JOB_STATUS, nullable=False),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("task_id", sa.String(255), nullable=True),
+        sa.Column("enqueued_at", sa.DateTime(), nullable=False),
+        sa.Column("dispatched_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("queue_wait", sa.Float(), nullable=True)
+    )
+    for column in ("id", "document_id", "status", "enqueued_at"):
+        op.create_index(f"ix_processing_jobs_{column}", "processing_jobs", [column])
+    op.create_index(
+        "ix_processing_jobs_status_class_finish", "processing_jobs",
+        ["status", "priority_class", "virtual_finish"]
+    )
+    op.create_index("ix_processing_jobs_user_status", "processing_jobs", ["user_id", "status"])
+
+
+def _create_upload_sessions():
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("original_filename", sa.String(255), nullable=False),
+        sa.Column("mime_type", sa.String(100), nullable=False),
+        sa.Column("total_size", sa.BigInteger(), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("total_chunks", sa.Integer(), nullable=False),
+        sa.Column("file_hash", sa.String(64), nullable=True),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("status", UPLOAD_SESSION_STATUS, nullable=False),
+        sa.Column(
+            "document_id", UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="SET NULL"), nullable=True
+        ),
+        sa.Column("error_message", sa.String(500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True)
+    )
+    for column in ("id", "user_id", "status", "expires_at"):
+        op.create_index(f"ix_upload_sessions_{column}", "upload_sessions", [column])
+
+
+def _create_user_stats():
+    counters = [
+        "total_documents", "uploaded_documents", "processing_documents",
+        "completed_documents", "failed_documents", "document_processing_time_count",
+        "total_analyses", "analysis_processing_time_count", "confidence_score_count",
+    ]
+    op.create_table(
+        "user_stats",
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+        ),
+        *[sa.Column(name, sa.Integer(), nullable=False) for name in counters],
+        sa.Column("total_file_size", sa.BigInteger(), nullable=False),
+        sa.Column("document_processing_time_sum", sa.BigInteger(), nullable=False),
+        sa.Column("analysis_processing_time_sum", sa.BigInteger(), nullable=False),
+        sa.Column("confidence_score_sum", sa.Float(), nullable=False),
+        sa.Column("language_counts", sa.JSON(), nullable=False),
+        sa.Column("model_counts", sa.JSON(), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+
+
+def _create_document_archives():
+    op.create_table(
+        "document_archives",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("label", sa.String(50), nullable=False),
+        sa.Column("storage_prefix", sa.String(500), nullable=False),
+        sa.Column("row_counts", sa.JSON(), nullable=False),
+        sa.Column("total_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index("ix_document_archives_label", "document_archives", ["label"])
+
+
+def _create_archived_documents():
+    op.create_table(
+        "archived_documents",
+        sa.Column("document_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id", UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column(
+            "archive_id", UUID(as_uuid=True),
+            sa.ForeignKey("document_archives.id"), nullable=False
+        ),
+        sa.Column("original_filename", sa.String(255), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("document_created_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=True),
+        sa.Column("rehydrate_requested_at", sa.DateTime(), nullable=True),
+        sa.Column("rehydrated_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index("ix_archived_documents_user_id", "archived_documents", ["user_id"])
+    op.create_index("ix_archived_documents_archive_id", "archived_documents", ["archive_id"])
+
+
+# 생성 순서 (참조되는 테이블 먼저)
+TABLES = [
+    ("text_blobs", _create_text_blobs),
+    ("stored_blobs", _create_stored_blobs),
+    ("document_chunks", _create_document_chunks),
+    ("document_search_indexes", _create_document_search_indexes),
+    ("processing_jobs", _create_processing_jobs),
+    ("upload_sessions", _create_upload_sessions),
+    ("user_stats", _create_user_stats),
+    ("document_archives", _create_document_archives),
+    ("archived_documents", _create_archived_documents),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    
+    existing = set(inspector.get_table_names())
+    for table, create in TABLES:
+        if table not in existing:
+            create()
+    
+    for table, columns in (("documents", _document_columns()), ("analyses", _analysis_columns())):
+        present = {column["name"] for column in inspector.get_columns(table)}
+        for column in columns:
+            if column.name not in present:
+                op.add_column(table, column)
+    
+    for name, table, columns in INDEXES:
+        present = {index["name"] for index in inspector.get_indexes(table)}
+        if name not in present:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    bind = op.get_bind()
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table, columns in (("analyses", _analysis_columns()), ("documents", _document_columns())):
+        for column in reversed(columns):
+            op.drop_column(table, column.name)
+    for table, _ in reversed(TABLES):
+        op.drop_table(table)
+    for enum in (UPLOAD_SESSION_STATUS, JOB_STATUS):
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,174 @@
+"""documents/analyses 월 단위 범위 파티션
+
+created_at 기준 월 파티션({테이블}_pYYYYMM)과 범위 밖 행을 받는 기본
+파티션({테이블}_default)으로 나눈다. 파티션 테이블의 기본 키에는 분할 키가
+포함되어야 하므로 기본 키는 (id, created_at)이 된다.
+
+이 두 테이블을 id만으로 참조하는 외래 키는 PostgreSQL에서 유지할 수 없어
+삭제하고, 같은 ON DELETE 동작을 AFTER DELETE 트리거로 대신한다.
+PostgreSQL이 아니면 아무것도 하지 않는다.
+
+Revision ID: 0002_partition_documents_analyses
+Revises: 0001b_processing_storage_schema
+Create Date: 2026-10-19
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_partition_documents_analyses"
+down_revision = "0001b_processing_storage_schema"
+branch_labels = None
+depends_on = None
+
+PARTITIONED_TABLES = ("documents", "analyses")
+PREMAKE_MONTHS = 3
+
+# 파티션 테이블을 참조하던 외래 키 (테이블, 컬럼, 참조 테이블, ON DELETE 동작)
+REFERENCES = [
+    ("analyses", "document_id", "documents", "CASCADE"),
+    ("document_chunks", "document_id", "documents", "CASCADE"),
+    ("document_search_indexes", "document_id", "documents", "CASCADE"),
+    ("processing_jobs", "document_id", "documents", "CASCADE"),
+    ("upload_sessions", "document_id", "documents", "SET NULL"),
+    ("exports", "analysis_id", "analyses", "CASCADE"),
+    ("feedback", "analysis_id", "analyses", "SET NULL"),
+]
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(bind, table: str, first_month: datetime):
+    """첫 달부터 이번 달 + PREMAKE_MONTHS까지의 월 파티션과 기본 파티션 생성"""
+    now = datetime.utcnow()
+    last_month = _add_months(datetime(now.year, now.month, 1), PREMAKE_MONTHS)
+    month = first_month
+    while month <= last_month:
+        following = _add_months(month, 1)
+        bind.execute(sa.text(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{following:%Y-%m-%d}')"
+        ))
+        month = following
+    bind.execute(sa.text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+
+
+def _rebuild(bind, table: str, partitioned: bool):
+    """
+    테이블을 같은 컬럼의 새 테이블로 옮김 (partitioned=True면 월 파티션 테이블)
+    
+    인덱스와 다른 테이블로의 외래 키는 그대로 다시 만든다.
+    """
+    inspector = sa.inspect(bind)
+    indexes = [index for index in inspector.get_indexes(table)]
+    foreign_keys = [
+        fk for fk in inspector.get_foreign_keys(table)
+        if fk["referred_table"] not in PARTITIONED_TABLES
+    ]
+    pk_name = inspector.get_pk_constraint(table)["name"]
+    old = f"{table}_old"
+    
+    op.rename_table(table, old)
+    bind.execute(sa.text(f"ALTER TABLE {old} RENAME CONSTRAINT {pk_name} TO {old}_pkey"))
+    for index in indexes:
+        op.drop_index(index["name"], table_name=old)
+    
+    if partitioned:
+        bind.execute(sa.text(
+            f"UPDATE {old} SET created_at = now() AT TIME ZONE 'utc' WHERE created_at IS NULL"
+        ))
+        bind.execute(sa.text(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+        ))
+        bind.execute(sa.text(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL"))
+        op.create_primary_key(f"{table}_pkey", table, ["id", "created_at"])
+        
+        first = bind.execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar() or datetime.utcnow()
+        _create_partitions(bind, table, datetime(first.year, first.month, 1))
+    else:
+        bind.execute(sa.text(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)"))
+        op.create_primary_key(f"{table}_pkey", table, ["id"])
+    
+    bind.execute(sa.text(f"INSERT INTO {table} SELECT * FROM {old}"))
+    
+    for index in indexes:
+        columns = list(index["column_names"])
+        # 파티션 테이블의 고유 인덱스에는 분할 키가 포함되어야 함
+        if partitioned and index["unique"] and "created_at" not in columns:
+            columns.append("created_at")
+        op.create_index(index["name"], table, columns, unique=index["unique"])
+    for fk in foreign_keys:
+        op.create_foreign_key(
+            fk["name"], table, fk["referred_table"],
+            fk["constrained_columns"], fk["referred_columns"],
+            ondelete=fk.get("options", {}).get("ondelete")
+        )
+    
+    bind.execute(sa.text(f"DROP TABLE {old} CASCADE"))
+
+
+def _create_cascade_triggers(bind):
+    """파티션 테이블 행 삭제 시 참조하던 행 삭제/NULL 처리"""
+    for referred in PARTITIONED_TABLES:
+        statements = []
+        for table, column, target, action in REFERENCES:
+            if target != referred:
+                continue
+            if action == "CASCADE":
+                statements.append(f"DELETE FROM {table} WHERE {column} = OLD.id;")
+            else:
+                statements.append(f"UPDATE {table} SET {column} = NULL WHERE {column} = OLD.id;")
+        
+        body = "\n    ".join(statements)
+        bind.execute(sa.text(
+            f"CREATE OR REPLACE FUNCTION {referred}_cascade_delete() RETURNS trigger AS $$\n"
+            f"BEGIN\n    {body}\n    RETURN OLD;\nEND;\n$$ LANGUAGE plpgsql"
+        ))
+        bind.execute(sa.text(
+            f"CREATE TRIGGER {referred}_cascade_delete AFTER DELETE ON {referred} "
+            f"FOR EACH ROW EXECUTE FUNCTION {referred}_cascade_delete()"
+        ))
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    
+    inspector = sa.inspect(bind)
+    for table, column, referred, _ in REFERENCES:
+        for fk in inspector.get_foreign_keys(table):
+            if fk["referred_table"] == referred and fk["constrained_columns"] == [column]:
+                op.drop_constraint(fk["name"], table, type_="foreignkey")
+    
+    for table in PARTITIONED_TABLES:
+        _rebuild(bind, table, partitioned=True)
+    _create_cascade_triggers(bind)
+
+
+def downgrade():
+    """
+    일반 테이블로 되돌림
+    
+    보관된 문서는 되돌리지 않으므로, 보관된 문서를 참조하던 행이 있을 수
+    있어 외래 키는 NOT VALID로 다시 만든다.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    
+    for table in PARTITIONED_TABLES:
+        bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {table}_cascade_delete ON {table}"))
+        bind.execute(sa.text(f"DROP FUNCTION IF EXISTS {table}_cascade_delete()"))
+        _rebuild(bind, table, partitioned=False)
+    
+    for table, column, referred, action in REFERENCES:
+        bind.execute(sa.text(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey FOREIGN KEY ({column}) "
+            f"REFERENCES {referred} (id) ON DELETE {action} NOT VALID"
+        ))
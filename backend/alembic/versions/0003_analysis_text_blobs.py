@@ -0,0 +1,125 @@
+"""분석 원문/정제 텍스트를 text_blobs로 이동
+
+analyses.raw_text/cleaned_text를 zstd로 압축해 text_blobs에 내용 해시로
+저장하고, raw_text_hash/cleaned_text_hash를 채운 뒤 두 컬럼을 삭제한다.
+같은 텍스트는 한 번만 저장한다. 분석 행이 많을 수 있으므로 BATCH_SIZE씩
+나누어 읽는다.
+
+Revision ID: 0003_analysis_text_blobs
+Revises: 0002_partition_documents_analyses
+Create Date: 2026-10-19
+"""
+
+import hashlib
+from datetime import datetime
+
+import zstandard
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.config import settings
+
+revision = "0003_analysis_text_blobs"
+down_revision = "0002_partition_documents_analyses"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+analyses = sa.table(
+    "analyses",
+    sa.column("id", UUID(as_uuid=True)),
+    sa.column("raw_text", sa.Text()),
+    sa.column("cleaned_text", sa.Text()),
+    sa.column("raw_text_hash", sa.String(64)),
+    sa.column("cleaned_text_hash", sa.String(64)),
+)
+text_blobs = sa.table(
+    "text_blobs",
+    sa.column("content_hash", sa.String(64)),
+    sa.column("codec", sa.String(10)),
+    sa.column("data", sa.LargeBinary()),
+    sa.column("original_size", sa.BigInteger()),
+    sa.column("compressed_size", sa.BigInteger()),
+    sa.column("created_at", sa.DateTime()),
+    sa.column("last_referenced_at", sa.DateTime()),
+)
+
+
+def _store(bind, text, stored: set):
+    """텍스트를 text_blobs에 저장하고 해시 반환 (이미 있으면 저장하지 않음)"""
+    if text is None:
+        return None
+    
+    encoded = text.encode("utf-8")
+    content_hash = hashlib.sha256(encoded).hexdigest()
+    if content_hash in stored:
+        return content_hash
+    
+    exists = bind.execute(
+        sa.select(text_blobs.c.content_hash).where(text_blobs.c.content_hash == content_hash)
+    ).first()
+    if exists is None:
+        data = zstandard.compress(encoded, settings.TEXT_BLOB_ZSTD_LEVEL)
+        now = datetime.utcnow()
+        bind.execute(text_blobs.insert().values(
+            content_hash=content_hash, codec="zstd", data=data,
+            original_size=len(encoded), compressed_size=len(data),
+            created_at=now, last_referenced_at=now
+        ))
+    stored.add(content_hash)
+    return content_hash
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("analyses")}
+    if "raw_text" not in columns:
+        return
+    
+    stored = set()
+    last_id = None
+    while True:
+        query = sa.select(analyses.c.id, analyses.c.raw_text, analyses.c.cleaned_text).where(
+            analyses.c.raw_text_hash.is_(None),
+            analyses.c.cleaned_text_hash.is_(None),
+            sa.or_(analyses.c.raw_text.isnot(None), analyses.c.cleaned_text.isnot(None))
+        ).order_by(analyses.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(analyses.c.id > last_id)
+        
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        
+        for analysis_id, raw_text, cleaned_text in rows:
+            bind.execute(analyses.update().where(analyses.c.id == analysis_id).values(
+                raw_text_hash=_store(bind, raw_text, stored),
+                cleaned_text_hash=_store(bind, cleaned_text, stored)
+            ))
+        last_id = rows[-1][0]
+    
+    op.drop_column("analyses", "raw_text")
+    op.drop_column("analyses", "cleaned_text")
+
+
+def downgrade():
+    """텍스트 컬럼을 되살리고 text_blobs에서 채움 (text_blobs와 해시는 그대로 둠)"""
+    bind = op.get_bind()
+    op.add_column("analyses", sa.Column("raw_text", sa.Text(), nullable=True))
+    op.add_column("analyses", sa.Column("cleaned_text", sa.Text(), nullable=True))
+    
+    for text_column, hash_column in (("raw_text", "raw_text_hash"), ("cleaned_text", "cleaned_text_hash")):
+        hashes = bind.execute(
+            sa.select(analyses.c[hash_column]).where(analyses.c[hash_column].isnot(None)).distinct()
+        ).scalars().all()
+        for content_hash in hashes:
+            data = bind.execute(
+                sa.select(text_blobs.c.data).where(text_blobs.c.content_hash == content_hash)
+            ).scalar()
+            if data is None:
+                continue
+            bind.execute(analyses.update().where(analyses.c[hash_column] == content_hash).values(
+                {text_column: zstandard.decompress(data).decode("utf-8")}
+            ))
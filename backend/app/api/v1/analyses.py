@@ -2,38 +2,96 @@
 분석 결과 API 엔드포인트
 """
 
+import time
 import uuid
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, case, func, select
+from sqlalchemy.orm import joinedload, load_only
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_active_user
 from app.models.user import User
 from app.models.document import Document, DocumentStatus
-from app.models.analysis import Analysis
+from app.models.analysis import Analysis, PARTITION_CLOCK_SKEW
 from app.schemas.analysis import (
     AnalysisResponse,
     AnalysisList,
+    AnalysisListItem,
     AnalysisStats,
     AnalysisRequest,
     AnalysisOptions,
     TextAnalysisRequest,
     TextAnalysisResponse,
-    AnalysisSummary
+    AnalysisSummary,
+    DocumentChunkResponse,
+    PageRangeSummaryRequest,
+    PageRangeSummaryResponse,
+    AskRequest,
+    AskResponse
 )
 from app.services.text_cleaner import TextCleaner
 from app.services.ai_analyzer import AIAnalyzer
+from app.services.chunk_store import ChunkStore
+from app.services.retrieval import RetrievalService
+from app.services.single_flight import single_flight
+from app.services.text_store import text_store
+from app.services.read_cache import read_cache
+from app.services.user_stats import user_stats_service
+from app.utils.pagination import apply_keyset, next_cursor, InvalidCursorError
 
 router = APIRouter()
 
 # 서비스 인스턴스
 text_cleaner = TextCleaner()
 ai_analyzer = AIAnalyzer()
+chunk_store = ChunkStore()
+retrieval_service = RetrievalService(ai_analyzer)
 
+# 목록에서 선택할 수 있는 필드 (원문/정제 텍스트는 목록에서 로드하지 않음)
+LIST_FIELDS = [
+    field for field in AnalysisListItem.model_fields
+    if field in Analysis.__mapper__.column_attrs
+]
+# fields 지정과 관계없이 항상 포함하는 필드
+REQUIRED_LIST_FIELDS = ["id"]
+# 상세 조회에서 함께 불러오는 원문/정제 텍스트
+TEXT_BLOB_OPTIONS = (joinedload(Analysis.raw_text_blob), joinedload(Analysis.cleaned_text_blob))
+# 목록 정렬 컬럼 (sort_by 값 -> 컬럼)
+ANALYSIS_SORT_COLUMNS = {
+    "created_at": Analysis.created_at,
+    "confidence_score": Analysis.confidence_score,
+    "processing_time": Analysis.processing_time
+}
 
-@router.get("/", response_model=AnalysisList)
+
+def parse_list_fields(fields: Optional[str]) -> List[str]:
+    """fields 파라미터 (쉼표 구분) 검증, 지정하지 않으면 목록 필드 전체"""
+    if not fields:
+        return LIST_FIELDS
+    
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"선택할 수 없는 필드입니다: {', '.join(unknown)} (가능한 필드: {', '.join(LIST_FIELDS)})"
+        )
+    return REQUIRED_LIST_FIELDS + [field for field in LIST_FIELDS if field in requested and field not in REQUIRED_LIST_FIELDS]
+
+
+def json_array_length(column):
+    """JSON 배열 길이 (NULL이거나 배열이 아니면 0)"""
+    return case(
+        (func.json_typeof(column) == "array", func.json_array_length(column)),
+        else_=0
+    )
+
+
+@router.get("/", response_model=AnalysisList, response_model_exclude_unset=True)
 async def get_analyses(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
@@ -42,42 +100,71 @@ async def get_analyses(
     min_confidence: Optional[float] = Query(None, ge=0, le=1),
     sort_by: str = Query("created_at", regex="^(created_at|confidence_score|processing_time)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    date_from: Optional[datetime] = Query(None, description="이 시각 이후 생성된 분석만 (해당 월 파티션만 조회)"),
+    date_to: Optional[datetime] = Query(None, description="이 시각 이전 생성된 분석만"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정하면 page 대신 사용)"),
+    include_total: Optional[bool] = Query(None, description="전체 개수 포함 여부 (기본: 커서 조회 시 생략)"),
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: id,summary,created_at)"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     사용자의 분석 결과 목록 조회
+    
+    선택한 컬럼만 로드하며 원문/정제 텍스트는 목록에서 읽지 않는다.
+    next_cursor를 cursor로 넘기면 OFFSET 없이 다음 페이지를 조회한다.
     """
+    selected = parse_list_fields(fields)
+    sort_column = ANALYSIS_SORT_COLUMNS[sort_by]
+    
     # 사용자의 문서에 대한 분석만 조회
-    query = db.query(Analysis).join(Document).filter(Document.user_id == current_user.id)
+    conditions = [Document.user_id == current_user.id]
     
     # 필터 적용
     if language:
-        query = query.filter(Analysis.language == language)
+        conditions.append(Analysis.language == language)
     if ai_model:
-        query = query.filter(Analysis.ai_model == ai_model)
+        conditions.append(Analysis.ai_model == ai_model)
     if min_confidence is not None:
-        query = query.filter(Analysis.confidence_score >= min_confidence)
+        conditions.append(Analysis.confidence_score >= min_confidence)
+    # 생성 시각 범위 (분석보다 늦게 만든 문서는 없으므로 문서 파티션도 함께 제외)
+    if date_from:
+        conditions.append(Analysis.created_at >= date_from)
+    if date_to:
+        conditions.append(Analysis.created_at < date_to)
+        conditions.append(Document.created_at < date_to + PARTITION_CLOCK_SKEW)
+    # 커서 생성에 필요한 정렬 컬럼도 함께 로드
+    loaded = set(selected) | {sort_column.key}
+    query = select(Analysis).join(Document).where(*conditions).options(
+        load_only(*[getattr(Analysis, field) for field in loaded], raiseload=True)
+    )
+    
+    # 정렬 (id로 동순위 구분) 및 커서 조건
+    try:
+        query = apply_keyset(query, sort_column, Analysis.id, sort_by, sort_order, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not cursor:
+        query = query.offset((page - 1) * limit)
     
-    # 정렬
-    order_func = desc if sort_order == "desc" else asc
-    if sort_by == "created_at":
-        query = query.order_by(order_func(Analysis.created_at))
-    elif sort_by == "confidence_score":
-        query = query.order_by(order_func(Analysis.confidence_score))
-    elif sort_by == "processing_time":
-        query = query.order_by(order_func(Analysis.processing_time))
+    # 다음 페이지 여부를 알기 위해 하나 더 조회
+    analyses = list((await db.scalars(query.limit(limit + 1))).all())
+    cursor_next = next_cursor(analyses, limit, sort_column, sort_by, sort_order)
     
-    # 페이지네이션
-    total = query.count()
-    analyses = query.offset((page - 1) * limit).limit(limit).all()
+    if include_total is None:
+        include_total = cursor is None
+    total = await db.scalar(select(func.count(Analysis.id)).join(Document).where(*conditions)) if include_total else None
     
     return {
-        "items": analyses,
+        "items": [{field: getattr(analysis, field) for field in selected} for analysis in analyses],
         "total": total,
-        "page": page,
+        "page": None if cursor else page,
         "limit": limit,
-        "pages": (total + limit - 1) // limit
+        "pages": (total + limit - 1) // limit if total is not None else None,
+        "next_cursor": cursor_next
     }
 
 
@@ -85,65 +172,86 @@ async def get_analyses(
 async def get_analysis(
     analysis_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     특정 분석 결과 조회
     """
-    analysis = db.query(Analysis).join(Document).filter(
-        Analysis.id == analysis_id,
-        Document.user_id == current_user.id
-    ).first()
-    
-    if not analysis:
+    async def load():
+        row = (await db.execute(
+            select(Analysis, Document.user_id).join(Document).options(*TEXT_BLOB_OPTIONS)
+            .where(Analysis.id == analysis_id)
+        )).first()
+        if not row:
+            return None
+        return read_cache.owned(row.user_id, AnalysisResponse.model_validate(row.Analysis).model_dump(mode="json"))
+    
+    cached = await read_cache.get_or_load(
+        read_cache.analysis_key(analysis_id), load, settings.CACHE_TTL_ANALYSIS_RESULT
+    )
+    
+    if not read_cache.is_owner(cached, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="분석 결과를 찾을 수 없습니다"
         )
     
-    return analysis
+    return cached["data"]
 
 
 @router.get("/document/{document_id}", response_model=AnalysisResponse)
 async def get_analysis_by_document(
     document_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     문서의 최신 분석 결과 조회
     """
-    # 문서 소유권 확인
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
-    
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다"
+    async def load():
+        document = await db.scalar(select(Document).where(Document.id == document_id))
+        if not document:
+            return None
+        
+        # 최신 분석 결과 조회 (아직 없으면 캐시하지 않음)
+        analysis = await db.scalar(
+            select(Analysis).options(*TEXT_BLOB_OPTIONS)
+            .where(Analysis.of_document(document)).order_by(desc(Analysis.created_at)).limit(1)
         )
-    
-    # 최신 분석 결과 조회
-    analysis = db.query(Analysis).filter(
-        Analysis.document_id == document_id
-    ).order_by(desc(Analysis.created_at)).first()
-    
-    if not analysis:
+        if not analysis:
+            return None
+        return read_cache.owned(document.user_id, AnalysisResponse.model_validate(analysis).model_dump(mode="json"))
+    
+    cached = await read_cache.get_or_load(
+        read_cache.document_analysis_key(document_id), load, settings.CACHE_TTL_ANALYSIS_RESULT
+    )
+    
+    if cached is None:
+        # 문서 소유권 확인
+        document_exists = await db.scalar(select(Document.id).where(
+            Document.id == document_id,
+            Document.user_id == current_user.id
+        ))
+        if document_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="분석 결과가 없습니다. 문서 처리가 완료되지 않았을 수 있습니다"
+            )
+    
+    if not read_cache.is_owner(cached, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="분석 결과가 없습니다. 문서 처리가 완료되지 않았을 수 있습니다"
+            detail="문서를 찾을 수 없습니다"
         )
     
-    return analysis
+    return cached["data"]
 
 
 @router.post("/analyze-text", response_model=TextAnalysisResponse)
 async def analyze_text_directly(
     request: TextAnalysisRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     텍스트 직접 분석 (파일 업로드 없이)
@@ -157,12 +265,31 @@ async def analyze_text_directly(
             }
         )
         
-        # AI 분석
-        analysis_result = await ai_analyzer.analyze_document(
+        # AI 분석 (선택한 구성 요소만, 동시에 들어온 동일 요청은 한 번만 계산)
+        options = request.options or AnalysisOptions()
+        components = options.selected_components()
+        flight_key = single_flight.make_key(
             clean_result["cleaned_text"],
             language=request.language,
-            is_premium=current_user.is_premium
+            model=ai_analyzer.premium_model if current_user.is_premium else ai_analyzer.default_model,
+            components=components,
+            max_keywords=options.max_keywords,
+            max_qa_pairs=options.max_qa_pairs,
+            max_sentences=options.max_sentences
         )
+        analysis_result = await single_flight.run(
+            flight_key,
+            lambda: ai_analyzer.analyze_document(
+                clean_result["cleaned_text"],
+                language=request.language,
+                is_premium=current_user.is_premium,
+                components=components,
+                max_keywords=options.max_keywords,
+                max_qa_pairs=options.max_qa_pairs,
+                max_sentences=options.max_sentences
+            )
+        )
+        ai_analyzer.fill_missing_components(analysis_result)
         
         return {
             "summary": analysis_result["summary"],
@@ -187,16 +314,16 @@ async def reanalyze_document(
     options: Optional[AnalysisOptions] = None,
     background_tasks: BackgroundTasks = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     문서 재분석 (새로운 옵션으로)
     """
     # 문서 소유권 확인
-    document = db.query(Document).filter(
+    document = await db.scalar(select(Document).where(
         Document.id == document_id,
         Document.user_id == current_user.id
-    ).first()
+    ))
     
     if not document:
         raise HTTPException(
@@ -210,10 +337,11 @@ async def reanalyze_document(
             detail="완료된 문서만 재분석할 수 있습니다"
         )
     
-    # 기존 분석 결과가 있는지 확인
-    existing_analysis = db.query(Analysis).filter(
-        Analysis.document_id == document_id
-    ).first()
+    # 기존 분석 결과가 있는지 확인 (최신 분석 기준, 재분석에는 정제 텍스트만 필요)
+    existing_analysis = await db.scalar(
+        select(Analysis).options(joinedload(Analysis.cleaned_text_blob))
+        .where(Analysis.of_document(document)).order_by(desc(Analysis.created_at)).limit(1)
+    )
     
     if not existing_analysis:
         raise HTTPException(
@@ -221,20 +349,45 @@ async def reanalyze_document(
             detail="기존 분석 결과가 없습니다"
         )
     
+    options = options or AnalysisOptions()
+    components = options.selected_components()
+    if not components:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="재분석할 구성 요소를 하나 이상 선택해주세요"
+        )
+    
     try:
-        # 새로운 분석 수행
+        # 저장된 청크 요약이 있으면 최종 reduce 단계만 다시 수행
+        chunk_summaries = None
+        if "summary" in components:
+            leaves = await db.run_sync(chunk_store.get_leaves, document.id)
+            if len(leaves) > 1:
+                chunk_summaries = await chunk_store.ensure_leaf_summaries(
+                    leaves, existing_analysis.cleaned_text, ai_analyzer, existing_analysis.language
+                )
+        
+        # 선택한 구성 요소만 새로 분석
         analysis_result = await ai_analyzer.analyze_document(
             existing_analysis.cleaned_text,
             language=existing_analysis.language,
-            model=options.use_premium_model if options and options.use_premium_model and current_user.is_premium else None,
-            is_premium=current_user.is_premium
+            model=ai_analyzer.premium_model if options.use_premium_model and current_user.is_premium else None,
+            is_premium=current_user.is_premium,
+            chunk_summaries=chunk_summaries,
+            components=components,
+            max_keywords=options.max_keywords,
+            max_qa_pairs=options.max_qa_pairs,
+            max_sentences=options.max_sentences
         )
         
+        # 선택하지 않은 구성 요소는 이전 분석 결과에서 그대로 복사
+        ai_analyzer.fill_missing_components(analysis_result, previous=existing_analysis)
+        
         # 새로운 분석 결과 생성
         new_analysis = Analysis(
             document_id=document.id,
-            raw_text=existing_analysis.raw_text,
-            cleaned_text=existing_analysis.cleaned_text,
+            raw_text_hash=existing_analysis.raw_text_hash,
+            cleaned_text_hash=existing_analysis.cleaned_text_hash,
             summary=analysis_result["summary"],
             keywords=analysis_result["keywords"],
             qa_pairs=analysis_result["qa_pairs"],
@@ -250,12 +403,13 @@ async def reanalyze_document(
         )
         
         db.add(new_analysis)
-        db.commit()
-        db.refresh(new_analysis)
+        await db.commit()
+        await db.refresh(new_analysis)
         
         return {
             "message": "문서 재분석이 완료되었습니다",
-            "analysis_id": new_analysis.id
+            "analysis_id": new_analysis.id,
+            "components": analysis_result["components"]
         }
         
     except Exception as e:
@@ -265,52 +419,121 @@ async def reanalyze_document(
         )
 
 
-@router.get("/{analysis_id}/summary", response_model=AnalysisSummary)
-async def get_analysis_summary(
-    analysis_id: uuid.UUID,
+@router.get("/document/{document_id}/chunks", response_model=List[DocumentChunkResponse])
+async def get_document_chunks(
+    document_id: uuid.UUID,
+    level: Optional[int] = Query(None, ge=0),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    분석 결과 요약 정보 조회
+    문서의 청크/요약 트리 조회
     """
-    analysis = db.query(Analysis).join(Document).filter(
-        Analysis.id == analysis_id,
+    document = await db.scalar(select(Document).where(
+        Document.id == document_id,
         Document.user_id == current_user.id
-    ).first()
+    ))
     
-    if not analysis:
+    if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="분석 결과를 찾을 수 없습니다"
+            detail="문서를 찾을 수 없습니다"
+        )
+    
+    chunks = await db.run_sync(chunk_store.get_chunks, document.id)
+    if level is not None:
+        chunks = [chunk for chunk in chunks if chunk.level == level]
+    
+    return chunks
+
+
+@router.post("/document/{document_id}/page-summary", response_model=PageRangeSummaryResponse)
+async def summarize_page_range(
+    document_id: uuid.UUID,
+    request: PageRangeSummaryRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    페이지 범위 요약 (저장된 청크 요약으로 단일 LLM 호출)
+    """
+    document = await db.scalar(select(Document).where(
+        Document.id == document_id,
+        Document.user_id == current_user.id
+    ))
+    
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다"
+        )
+    
+    if request.page_start > (document.page_count or request.page_start):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"문서의 페이지 수({document.page_count})를 벗어난 범위입니다"
+        )
+    
+    leaves = await db.run_sync(chunk_store.get_leaves, document.id, request.page_start, request.page_end)
+    if not leaves:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 페이지 범위의 청크가 없습니다. 문서를 재처리해주세요"
+        )
+    
+    analysis = await db.scalar(
+        select(Analysis).where(Analysis.of_document(document)).order_by(desc(Analysis.created_at)).limit(1)
+    )
+    language = analysis.language if analysis else (document.language or "ko")
+    model = (
+        ai_analyzer.premium_model
+        if request.use_premium_model and current_user.is_premium
+        else ai_analyzer.default_model
+    )
+    
+    # 요약이 빠진 청크가 있을 때만 정제 텍스트를 불러옴
+    text = ""
+    if analysis and not all(leaf.has_summary for leaf in leaves):
+        text = await db.run_sync(text_store.get, analysis.cleaned_text_hash) or ""
+    
+    start_time = time.perf_counter()
+    try:
+        summaries = await chunk_store.ensure_leaf_summaries(
+            leaves, text, ai_analyzer, language, model
+        )
+        summary = await ai_analyzer.summarize_chunk_summaries(summaries, language, model)
+        await db.commit()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"페이지 범위 요약 중 오류가 발생했습니다: {str(e)}"
         )
     
     return {
-        "id": analysis.id,
-        "document_id": analysis.document_id,
-        "summary": analysis.summary,
-        "keyword_count": len(analysis.keywords) if analysis.keywords else 0,
-        "qa_count": len(analysis.qa_pairs) if analysis.qa_pairs else 0,
-        "sentence_count": len(analysis.important_sentences) if analysis.important_sentences else 0,
-        "confidence_score": analysis.confidence_score,
-        "processing_time": analysis.processing_time,
-        "created_at": analysis.created_at
+        "document_id": document.id,
+        "page_start": request.page_start,
+        "page_end": request.page_end,
+        "summary": summary,
+        "chunk_count": len(leaves),
+        "ai_model": model,
+        "processing_time": time.perf_counter() - start_time
     }
 
 
-@router.get("/{analysis_id}/markdown")
-async def get_analysis_markdown(
+@router.post("/{analysis_id}/ask", response_model=AskResponse)
+async def ask_document(
     analysis_id: uuid.UUID,
+    request: AskRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    분석 결과를 마크다운 형식으로 반환
+    문서 자유 질의응답 (BM25 검색 상위 청크만 프롬프트에 포함)
     """
-    analysis = db.query(Analysis).join(Document).filter(
+    analysis = await db.scalar(select(Analysis).join(Document).options(joinedload(Analysis.cleaned_text_blob)).where(
         Analysis.id == analysis_id,
         Document.user_id == current_user.id
-    ).first()
+    ))
     
     if not analysis:
         raise HTTPException(
@@ -318,27 +541,151 @@ async def get_analysis_markdown(
             detail="분석 결과를 찾을 수 없습니다"
         )
     
-    markdown_content = analysis.to_markdown()
+    if not analysis.cleaned_text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="질의할 문서 텍스트가 없습니다"
+        )
+    
+    start_time = time.perf_counter()
+    
+    # 검색 인덱스 (최초 1회 생성 후 캐시/DB에서 재사용)
+    index = await db.run_sync(retrieval_service.get_index, analysis.document_id, analysis.cleaned_text)
+    hits = index.search(request.question, request.top_k)
+    
+    passages = [
+        analysis.cleaned_text[index.passages[i]["start"]:index.passages[i]["end"]].strip()
+        for i, _ in hits
+    ]
+    citations = [
+        {
+            "number": number,
+            "chunk_index": i,
+            "start_offset": index.passages[i]["start"],
+            "end_offset": index.passages[i]["end"],
+            "page_start": index.passages[i]["page_start"],
+            "page_end": index.passages[i]["page_end"],
+            "score": round(score, 4),
+            "excerpt": passage[:200]
+        }
+        for number, ((i, score), passage) in enumerate(zip(hits, passages), 1)
+    ]
+    
+    if not passages:
+        return {
+            "analysis_id": analysis.id,
+            "question": request.question,
+            "answer": "문서에서 관련 내용을 찾을 수 없습니다" if analysis.language == "ko" else "Not found in the document",
+            "citations": [],
+            "ai_model": None,
+            "context_tokens": 0,
+            "processing_time": time.perf_counter() - start_time
+        }
+    
+    model = ai_analyzer.premium_model if current_user.is_premium else ai_analyzer.default_model
+    
+    try:
+        answer, answer_model = await ai_analyzer.answer_question(
+            request.question, passages, language=analysis.language or "ko", model=model
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"질의응답 중 오류가 발생했습니다: {str(e)}"
+        )
     
     return {
-        "content": markdown_content,
-        "filename": f"analysis_{analysis.id}.md"
+        "analysis_id": analysis.id,
+        "question": request.question,
+        "answer": answer,
+        "citations": citations,
+        "ai_model": answer_model,
+        "context_tokens": sum(ai_analyzer.count_tokens(passage) for passage in passages),
+        "processing_time": time.perf_counter() - start_time
     }
 
 
+@router.get("/{analysis_id}/summary", response_model=AnalysisSummary)
+async def get_analysis_summary(
+    analysis_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    분석 결과 요약 정보 조회 (항목 수는 DB에서 계산해 JSON 배열을 읽어오지 않음)
+    """
+    summary = (await db.execute(
+        select(
+            Analysis.id,
+            Analysis.document_id,
+            Analysis.summary,
+            json_array_length(Analysis.keywords).label("keyword_count"),
+            json_array_length(Analysis.qa_pairs).label("qa_count"),
+            json_array_length(Analysis.important_sentences).label("sentence_count"),
+            Analysis.confidence_score,
+            Analysis.processing_time,
+            Analysis.created_at
+        ).join(Document).where(
+            Analysis.id == analysis_id,
+            Document.user_id == current_user.id
+        )
+    )).one_or_none()
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="분석 결과를 찾을 수 없습니다"
+        )
+    
+    return dict(summary._mapping)
+
+
+@router.get("/{analysis_id}/markdown")
+async def get_analysis_markdown(
+    analysis_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    분석 결과를 마크다운 형식으로 반환
+    """
+    async def load():
+        row = (await db.execute(
+            select(Analysis, Document.user_id).join(Document).where(Analysis.id == analysis_id)
+        )).first()
+        if not row:
+            return None
+        return read_cache.owned(row.user_id, {
+            "content": row.Analysis.to_markdown(),
+            "filename": f"analysis_{row.Analysis.id}.md"
+        })
+    
+    cached = await read_cache.get_or_load(
+        read_cache.analysis_markdown_key(analysis_id), load, settings.CACHE_TTL_ANALYSIS_RESULT
+    )
+    
+    if not read_cache.is_owner(cached, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="분석 결과를 찾을 수 없습니다"
+        )
+    
+    return cached["data"]
+
+
 @router.delete("/{analysis_id}")
 async def delete_analysis(
     analysis_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     분석 결과 삭제
     """
-    analysis = db.query(Analysis).join(Document).filter(
+    analysis = await db.scalar(select(Analysis).join(Document).where(
         Analysis.id == analysis_id,
         Document.user_id == current_user.id
-    ).first()
+    ))
     
     if not analysis:
         raise HTTPException(
@@ -346,8 +693,8 @@ async def delete_analysis(
             detail="분석 결과를 찾을 수 없습니다"
         )
     
-    db.delete(analysis)
-    db.commit()
+    await db.delete(analysis)
+    await db.commit()
     
     return {"message": "분석 결과가 성공적으로 삭제되었습니다"}
 
@@ -355,54 +702,18 @@ async def delete_analysis(
 @router.get("/stats/overview", response_model=AnalysisStats)
 async def get_analysis_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    사용자의 분석 통계 조회
+    사용자의 분석 통계 조회 (증분 갱신되는 사용자 통계 행 조회)
     """
-    from sqlalchemy import func
-    
-    # 사용자의 분석 결과만 조회
-    base_query = db.query(Analysis).join(Document).filter(Document.user_id == current_user.id)
-    
-    # 기본 통계
-    total_analyses = base_query.count()
-    
-    # 평균 처리 시간
-    avg_processing_time = base_query.filter(
-        Analysis.processing_time.isnot(None)
-    ).with_entities(func.avg(Analysis.processing_time)).scalar()
-    
-    # 평균 신뢰도 점수
-    avg_confidence_score = base_query.filter(
-        Analysis.confidence_score.isnot(None)
-    ).with_entities(func.avg(Analysis.confidence_score)).scalar()
-    
-    # 언어별 분포
-    language_stats = db.query(
-        Analysis.language,
-        func.count(Analysis.id)
-    ).join(Document).filter(
-        Document.user_id == current_user.id
-    ).group_by(Analysis.language).all()
-    
-    language_distribution = {lang: count for lang, count in language_stats}
-    
-    # 모델별 사용량
-    model_stats = db.query(
-        Analysis.ai_model,
-        func.count(Analysis.id)
-    ).join(Document).filter(
-        Document.user_id == current_user.id
-    ).group_by(Analysis.ai_model).all()
-    
-    model_usage = {model: count for model, count in model_stats if model}
+    stats = await db.run_sync(user_stats_service.get, current_user.id)
     
     return {
-        "total_analyses": total_analyses,
-        "average_processing_time": float(avg_processing_time) if avg_processing_time else None,
-        "average_confidence_score": float(avg_confidence_score) if avg_confidence_score else None,
-        "language_distribution": language_distribution,
-        "model_usage": model_usage
+        "total_analyses": stats.total_analyses,
+        "average_processing_time": stats.average_analysis_processing_time,
+        "average_confidence_score": stats.average_confidence_score,
+        "language_distribution": stats.language_counts,
+        "model_usage": stats.model_counts
     }
 
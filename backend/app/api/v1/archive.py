@@ -0,0 +1,88 @@
+"""
+보관된 문서 API 엔드포인트
+
+보존 기간(PARTITION_RETENTION_MONTHS)이 지난 문서는 DB에서 저장소의
+Parquet 보관본으로 옮겨지고 색인만 남는다. 필요한 문서는 복원을 요청하면
+워커가 보관본에서 읽어 DB로 되돌린다.
+"""
+
+import uuid
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select
+
+from app.core.database import get_db
+from app.core.security import get_current_active_user
+from app.models.user import User
+from app.models.archive import ArchivedDocument
+from app.schemas.document import ArchivedDocumentList, ArchivedDocumentResponse
+from app.worker import rehydrate_document_task
+
+router = APIRouter()
+
+
+@router.get("/documents", response_model=ArchivedDocumentList)
+async def get_archived_documents(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    사용자의 보관된 문서 목록 조회 (최근 생성 순)
+    """
+    condition = ArchivedDocument.user_id == current_user.id
+    
+    total = await db.scalar(select(func.count(ArchivedDocument.document_id)).where(condition))
+    items = (await db.scalars(
+        select(ArchivedDocument).where(condition)
+        .order_by(desc(ArchivedDocument.document_created_at), ArchivedDocument.document_id)
+        .offset((page - 1) * limit).limit(limit)
+    )).all()
+    
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "pages": (total + limit - 1) // limit
+    }
+
+
+@router.post(
+    "/documents/{document_id}/rehydrate",
+    response_model=ArchivedDocumentResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def rehydrate_document(
+    document_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    보관된 문서 복원 요청
+    
+    복원은 워커에서 진행되며, 완료되면 rehydrated_at이 채워지고 문서와
+    분석 결과를 기존 API로 다시 조회할 수 있다.
+    """
+    record = await db.scalar(select(ArchivedDocument).where(
+        ArchivedDocument.document_id == document_id,
+        ArchivedDocument.user_id == current_user.id
+    ))
+    
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="보관된 문서를 찾을 수 없습니다"
+        )
+    
+    if record.is_rehydrated:
+        return record
+    
+    record.rehydrate_requested_at = datetime.utcnow()
+    await db.commit()
+    
+    rehydrate_document_task.delay(str(document_id))
+    
+    return record
@@ -3,18 +3,19 @@
 """
 
 from datetime import timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import (
     create_access_token, 
-    verify_password, 
-    get_password_hash,
     verify_password_reset_token,
-    generate_password_reset_token
+    generate_password_reset_token,
+    get_current_active_user
 )
 from app.models.user import User
 from app.schemas.user import (
@@ -26,17 +27,57 @@ from app.schemas.user import (
     PasswordResetConfirm,
     TokenRefresh
 )
+from app.services.password_hasher import password_hasher, PasswordHasherBusyError
 
 router = APIRouter()
 
 
+def password_hasher_busy_exception(error: PasswordHasherBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+async def hash_password(password: str) -> str:
+    """비밀번호 해싱 (전용 실행기, 포화 시 503)"""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception(e)
+
+
+async def authenticate(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    이메일/비밀번호로 사용자 확인 (전용 실행기, 포화 시 503)
+    
+    해시의 bcrypt cost가 BCRYPT_ROUNDS와 다르면 새 cost로 다시 해싱해 두며,
+    호출자의 커밋과 함께 저장된다.
+    """
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user:
+        return None
+    
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception(e)
+    
+    if not valid:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+    return user
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     새 사용자 등록
     """
     # 이메일 중복 확인
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -44,7 +85,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # 사용자명 중복 확인
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -52,7 +93,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # 새 사용자 생성
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -63,20 +104,20 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     사용자 로그인
     """
     # 사용자 확인
-    user = db.query(User).filter(User.email == user_credentials.email).first()
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    user = await authenticate(db, user_credentials.email, user_credentials.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다",
@@ -100,7 +141,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     # 로그인 시간 업데이트
     from datetime import datetime
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -111,13 +152,13 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/login/oauth", response_model=Token)
-async def oauth_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def oauth_login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     OAuth2 호환 로그인 (Swagger UI용)
     """
     # 사용자 확인
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await authenticate(db, form_data.username, form_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다",
@@ -141,7 +182,7 @@ async def oauth_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Sess
     # 로그인 시간 업데이트
     from datetime import datetime
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -152,11 +193,11 @@ async def oauth_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Sess
 
 
 @router.post("/password-reset")
-async def request_password_reset(reset_data: PasswordReset, db: Session = Depends(get_db)):
+async def request_password_reset(reset_data: PasswordReset, db: AsyncSession = Depends(get_db)):
     """
     비밀번호 재설정 요청
     """
-    user = db.query(User).filter(User.email == reset_data.email).first()
+    user = await db.scalar(select(User).where(User.email == reset_data.email))
     if not user:
         # 보안상 사용자 존재 여부를 알려주지 않음
         return {"message": "비밀번호 재설정 링크가 이메일로 전송되었습니다"}
@@ -171,7 +212,7 @@ async def request_password_reset(reset_data: PasswordReset, db: Session = Depend
 
 
 @router.post("/password-reset/confirm")
-async def confirm_password_reset(reset_data: PasswordResetConfirm, db: Session = Depends(get_db)):
+async def confirm_password_reset(reset_data: PasswordResetConfirm, db: AsyncSession = Depends(get_db)):
     """
     비밀번호 재설정 확인
     """
@@ -182,7 +223,7 @@ async def confirm_password_reset(reset_data: PasswordResetConfirm, db: Session =
             detail="유효하지 않거나 만료된 토큰입니다"
         )
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -190,14 +231,14 @@ async def confirm_password_reset(reset_data: PasswordResetConfirm, db: Session =
         )
     
     # 새 비밀번호 설정
-    user.hashed_password = get_password_hash(reset_data.new_password)
-    db.commit()
+    user.hashed_password = await hash_password(reset_data.new_password)
+    await db.commit()
     
     return {"message": "비밀번호가 성공적으로 변경되었습니다"}
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(refresh_data: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(refresh_data: TokenRefresh, db: AsyncSession = Depends(get_db)):
     """
     토큰 갱신
     """
@@ -210,7 +251,7 @@ async def refresh_token(refresh_data: TokenRefresh, db: Session = Depends(get_db
             detail="유효하지 않은 리프레시 토큰입니다"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -3,17 +3,27 @@
 """
 
 import os
+import json
 import uuid
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, BackgroundTasks
+import shutil
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from fastapi import (
+    APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query,
+    Request, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, get_user_from_token
 from app.models.user import User
 from app.models.document import Document, DocumentStatus
+from app.models.archive import ArchivedDocument
 from app.schemas.document import (
     DocumentResponse, 
     DocumentList, 
@@ -21,174 +31,443 @@ from app.schemas.document import (
     DocumentFilter,
     DocumentSearch,
     FileUploadResponse,
-    ProcessingStatus
+    ProcessingStatus,
+    DirectUploadRequest,
+    DirectUploadResponse,
+    DirectUploadComplete,
+    DownloadUrlResponse
 )
+from app.schemas.analysis import AnalysisOptions
 from app.services.pdf_processor import PDFProcessor
-from app.services.text_cleaner import TextCleaner
-from app.services.ai_analyzer import AIAnalyzer
+from app.services.checkpoint_store import CheckpointStore
+from app.services.job_scheduler import job_scheduler
+from app.services.admission import admission_controller
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.progress_bus import progress_bus, TERMINAL_EVENTS
+from app.services.upload_writer import upload_writer, StoredFile, FileTooLargeError
+from app.services.storage import storage, ACTION_REGISTER
+from app.services.dedup import dedup_service
+from app.services.user_stats import user_stats_service
+from app.services.read_cache import read_cache
+from app.utils.pagination import apply_keyset, next_cursor, InvalidCursorError
 
 router = APIRouter()
 
 # 서비스 인스턴스
 pdf_processor = PDFProcessor()
-text_cleaner = TextCleaner()
-ai_analyzer = AIAnalyzer()
+checkpoint_store = CheckpointStore()
 
+# multipart 경계/폼 필드용 여유분 (Content-Length 사전 확인 시 허용)
+MULTIPART_OVERHEAD = 64 * 1024
 
-@router.post("/upload", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload_document(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    PDF 문서 업로드
-    """
-    # 파일 타입 확인
-    if file.content_type not in settings.ALLOWED_FILE_TYPES:
+# 업로드 접수 응답 메시지
+UPLOAD_ACCEPTED_MESSAGE = "파일이 성공적으로 업로드되었습니다. 분석이 시작됩니다."
+
+# 목록 정렬 컬럼 (sort_by 값 -> 컬럼)
+DOCUMENT_SORT_COLUMNS = {
+    "created_at": Document.created_at,
+    "updated_at": Document.updated_at,
+    "filename": Document.original_filename,
+    "file_size": Document.file_size
+}
+
+
+def file_too_large_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"파일 크기는 {settings.MAX_FILE_SIZE // (1024*1024)}MB를 초과할 수 없습니다"
+    )
+
+
+def parse_analysis_options(options: Union[str, Dict[str, Any], None]) -> Optional[AnalysisOptions]:
+    """분석 옵션(JSON 문자열 또는 dict) 확인"""
+    if not options:
+        return None
+    
+    try:
+        if isinstance(options, str):
+            analysis_options = AnalysisOptions.parse_raw(options)
+        else:
+            analysis_options = AnalysisOptions(**options)
+    except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="PDF 파일만 업로드 가능합니다"
+            detail=f"잘못된 분석 옵션입니다: {str(e)}"
+        )
+    if not analysis_options.selected_components():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="분석할 구성 요소를 하나 이상 선택해주세요"
+        )
+    return analysis_options
+
+
+async def check_upload_allowed(db: AsyncSession, current_user: User, content_type: Optional[str]):
+    """업로드 가능 여부 확인 (승인 제어, 파일 타입, 월 업로드 제한)"""
+    # 큐 상태 기반 승인 제어 (포화 시 Retry-After와 함께 거절)
+    decision = await db.run_sync(admission_controller.check, current_user)
+    if not decision.admitted:
+        raise HTTPException(
+            status_code=decision.status_code,
+            detail=decision.reason,
+            headers={"Retry-After": str(decision.retry_after)}
         )
     
-    # 파일 크기 확인
-    file_content = await file.read()
-    if len(file_content) > settings.MAX_FILE_SIZE:
+    # 파일 타입 확인
+    if content_type not in settings.ALLOWED_FILE_TYPES:
         raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"파일 크기는 {settings.MAX_FILE_SIZE // (1024*1024)}MB를 초과할 수 없습니다"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="PDF 파일만 업로드 가능합니다"
         )
     
-    # 업로드 제한 확인
+    # 업로드 제한 확인 (캐시된 인증 사용자의 업로드 수는 오래됐을 수 있으므로 다시 읽음)
+    await db.refresh(current_user, ["is_active", "is_premium", "subscription_expires_at", "monthly_uploads"])
     if not current_user.can_upload_file():
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="월 업로드 제한에 도달했습니다. 프리미엄으로 업그레이드하세요"
         )
+
+
+def new_upload_path(original_filename: str) -> Tuple[str, str]:
+    """저장할 파일 이름과 경로"""
+    file_extension = os.path.splitext(original_filename)[1]
+    filename = f"{uuid.uuid4()}{file_extension}"
+    return filename, os.path.join(settings.UPLOAD_DIR, filename)
+
+
+async def register_uploaded_file(
+    db: AsyncSession,
+    current_user: User,
+    stored: StoredFile,
+    filename: str,
+    original_filename: str,
+    content_type: str,
+    analysis_options: Optional[AnalysisOptions] = None
+) -> Dict[str, Any]:
+    """
+    저장된 업로드 파일을 검증하고 문서로 등록한 뒤 처리 작업 등록
     
-    # 파일 저장
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    file_id = str(uuid.uuid4())
-    file_extension = os.path.splitext(file.filename)[1]
-    filename = f"{file_id}{file_extension}"
-    file_path = os.path.join(settings.UPLOAD_DIR, filename)
-    
-    with open(file_path, "wb") as f:
-        f.write(file_content)
-    
-    # 파일 정보 추출
+    Returns:
+        FileUploadResponse 형식의 응답
+    """
+    # PDF 유효성 확인 (파싱은 이벤트 루프 밖에서)
     try:
-        file_info = pdf_processor.get_file_info(file_path)
-        is_valid, error_msg = pdf_processor.validate_pdf(file_path)
-        
-        if not is_valid:
-            os.remove(file_path)  # 잘못된 파일 삭제
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"유효하지 않은 PDF 파일입니다: {error_msg}"
-            )
+        is_valid, error_msg = await run_in_threadpool(pdf_processor.validate_pdf, stored.path)
+        page_count = await run_in_threadpool(pdf_processor.get_page_count, stored.path) if is_valid else 0
     except Exception as e:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        await upload_writer.remove(stored.path)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"파일 처리 중 오류가 발생했습니다: {str(e)}"
         )
     
+    if not is_valid:
+        await upload_writer.remove(stored.path)  # 잘못된 파일 삭제
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"유효하지 않은 PDF 파일입니다: {error_msg}"
+        )
+    
+    # 저장소로 이동 (같은 내용의 파일이 이미 있으면 그 파일을 참조)
+    storage_key = await db.run_sync(dedup_service.acquire_existing, stored.file_hash)
+    if storage_key:
+        await upload_writer.remove(stored.path)
+    else:
+        storage_key = storage.document_key(current_user.id, filename)
+        try:
+            await run_in_threadpool(storage.put_file, stored.path, storage_key, content_type)
+        except Exception as e:
+            await upload_writer.remove(stored.path)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"파일 저장에 실패했습니다: {str(e)}"
+            )
+        storage_key = await _register_blob(db, stored.file_hash, stored.size, storage_key)
+    
     # 데이터베이스에 문서 정보 저장
     document = Document(
         user_id=current_user.id,
         filename=filename,
-        original_filename=file.filename,
-        file_size=len(file_content),
-        file_path=file_path,
-        mime_type=file.content_type,
-        file_hash=file_info["file_hash"],
+        original_filename=original_filename,
+        file_size=stored.size,
+        file_path=storage.location(storage_key),
+        storage_key=storage_key,
+        mime_type=content_type,
+        file_hash=stored.file_hash,
+        page_count=page_count,
         status=DocumentStatus.UPLOADED
     )
     
+    return await _submit_and_dispatch(db, current_user, document, analysis_options)
+
+
+async def _register_blob(db: AsyncSession, file_hash: Optional[str], file_size: int, storage_key: str) -> str:
+    """새로 저장한 파일을 참조 카운트에 등록 (동시에 같은 파일이 먼저 등록됐으면 그 파일 사용)"""
+    blob_key = await db.run_sync(dedup_service.register, file_hash, file_size, storage_key)
+    if blob_key != storage_key:
+        await run_in_threadpool(storage.delete, storage_key)
+    return blob_key
+
+
+async def _submit_and_dispatch(
+    db: AsyncSession,
+    current_user: User,
+    document: Document,
+    analysis_options: Optional[AnalysisOptions]
+) -> Dict[str, Any]:
+    """문서와 처리 작업을 등록(커밋)한 뒤 워커로 전달하고 예상 처리 시간 계산"""
+    result, job = await db.run_sync(_submit_document, current_user, document, analysis_options)
+    if job is None:
+        return result
+    
+    await dispatch_jobs()
+    result["estimated_time"] = await db.run_sync(_estimate_time, current_user, document, job)
+    return result
+
+
+async def dispatch_jobs():
+    """
+    대기 작업을 워커로 전달
+    
+    전달은 advisory lock을 잡은 채 Celery 브로커를 호출하므로 이벤트 루프
+    밖의 스레드에서 전용 동기 세션으로 실행한다. 실패해도 작업은 이미
+    커밋되어 있어 주기적인 전달 작업(documents.dispatch)이 이어서 전달한다.
+    """
+    await run_in_threadpool(job_scheduler.dispatch_pending)
+
+
+def _submit_document(
+    db: Session,
+    current_user: User,
+    document: Document,
+    analysis_options: Optional[AnalysisOptions]
+) -> Tuple[Dict[str, Any], Optional[ProcessingJob]]:
+    """
+    문서 저장, 업로드 수 증가, 처리 작업 등록 (같은 파일의 분석이 있으면 재사용)
+    
+    스케줄러/중복 제거 서비스가 동기 Session을 사용하므로 AsyncSession.run_sync로 호출한다.
+    
+    Returns:
+        (응답, 등록한 처리 작업). 분석을 재사용했으면 작업은 None
+    """
     db.add(document)
     db.commit()
     db.refresh(document)
     
-    # 사용자 업로드 카운트 증가
-    current_user.increment_upload_count()
+    # 사용자 업로드 카운트 증가 (DB에서 증가, Core UPDATE라 캐시는 직접 무효화)
+    db.execute(User.increment_upload_count(current_user.id))
+    db.commit()
+    read_cache.invalidate_nowait(read_cache.principal_key(current_user.id))
+    
+    # 같은 파일의 완료된 분석이 있으면 복제 (추출/LLM 호출 없이 바로 완료)
+    reusable = dedup_service.find_reusable(db, document.file_hash, current_user, analysis_options)
+    if reusable is not None:
+        source, analysis = reusable
+        own_result = source.user_id == current_user.id
+        dedup_service.clone(db, source, analysis, document)
+        db.commit()
+        db.refresh(document)
+        if own_result:
+            return {
+                "message": "동일한 파일의 분석 결과를 재사용했습니다.",
+                "task_id": document.id,
+                "document": document,
+                "estimated_time": 0
+            }, None
+        
+        # 다른 사용자의 결과를 재사용한 경우 그 파일이 이미 올라와 있었다는 사실이
+        # 드러나지 않도록 일반 업로드와 같은 응답을 돌려준다
+        return {
+            "message": UPLOAD_ACCEPTED_MESSAGE,
+            "task_id": document.id,
+            "document": document,
+            "estimated_time": int(round(admission_controller.estimate_processing_time(
+                document.page_count, document.file_size
+            )))
+        }, None
+    
+    # 스케줄러에 처리 작업 등록 (커밋 후 우선순위/공정 순서에 따라 워커로 전달)
+    job = job_scheduler.submit(db, document, current_user, analysis_options)
     db.commit()
-    
-    # 백그라운드에서 문서 처리 시작
-    task_id = uuid.uuid4()
-    background_tasks.add_task(process_document_background, document.id, db)
     
     return {
-        "message": "파일이 성공적으로 업로드되었습니다. 분석이 시작됩니다.",
-        "task_id": task_id,
+        "message": UPLOAD_ACCEPTED_MESSAGE,
+        "task_id": job.id,
         "document": document,
-        "estimated_time": 60  # 예상 처리 시간 (초)
-    }
+        "estimated_time": None
+    }, job
 
 
-async def process_document_background(document_id: uuid.UUID, db: Session):
+def _estimate_time(db: Session, current_user: User, document: Document, job: ProcessingJob) -> int:
+    """예상 처리 시간 (초) = 큐 대기 + 문서 처리 시간 예측"""
+    db.refresh(job)  # 다른 세션에서 전달했는지 확인
+    queue_wait = 0.0
+    if job.status == JobStatus.QUEUED:
+        queue_wait = admission_controller.estimate_queue_wait(db, current_user, virtual_finish=job.virtual_finish)
+    estimated_time = queue_wait + admission_controller.estimate_processing_time(
+        document.page_count, document.file_size
+    )
+    return int(round(estimated_time))
+
+
+@router.post("/upload", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_document(
+    request: Request,
+    file: UploadFile = File(...),
+    options: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    백그라운드에서 문서 처리
+    PDF 문서 업로드
+    
+    options: 분석 옵션(AnalysisOptions) JSON 문자열. 계산할 구성 요소를 선택할 수 있음
+    큰 파일이나 불안정한 네트워크에서는 /uploads 의 이어 올리기 업로드를 사용
     """
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        return
+    analysis_options = parse_analysis_options(options)
+    await check_upload_allowed(db, current_user, file.content_type)
+    
+    # 파일 크기 확인 (선언된 요청 크기만 먼저 확인, 실제 크기는 저장하면서 확인)
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        raise file_too_large_exception()
     
+    # 파일 저장 (청크 단위 스트리밍, 저장하면서 SHA-256 계산)
+    filename, file_path = new_upload_path(file.filename)
     try:
-        # 처리 시작
-        document.start_processing()
-        db.commit()
-        
-        # PDF 텍스트 추출
-        pdf_result = pdf_processor.extract_text(document.file_path)
-        
-        # 텍스트 정제
-        clean_result = text_cleaner.clean_text(pdf_result["text"])
-        
-        # AI 분석
-        user = db.query(User).filter(User.id == document.user_id).first()
-        analysis_result = await ai_analyzer.analyze_document(
-            clean_result["cleaned_text"],
-            language=clean_result["language"],
-            is_premium=user.is_premium if user else False
+        stored = await upload_writer.save(file, file_path)
+    except FileTooLargeError:
+        raise file_too_large_exception()
+    
+    return await register_uploaded_file(
+        db, current_user, stored, filename, file.filename, file.content_type, analysis_options
+    )
+
+
+@router.post("/upload-url", response_model=DirectUploadResponse)
+async def create_direct_upload(
+    upload: DirectUploadRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    서명 URL 직접 업로드 시작
+    
+    클라이언트는 받은 URL로 파일을 저장소에 직접 올린 뒤 upload_token으로
+    /upload-complete 를 호출한다. 파일 본문은 API 서버를 거치지 않는다.
+    """
+    parse_analysis_options(upload.options)
+    await check_upload_allowed(db, current_user, upload.content_type)
+    if upload.file_size > settings.MAX_FILE_SIZE:
+        raise file_too_large_exception()
+    
+    filename, _ = new_upload_path(upload.filename)
+    storage_key = storage.document_key(current_user.id, filename)
+    presigned = await run_in_threadpool(
+        storage.presigned_upload, storage_key, upload.content_type, upload.sha256
+    )
+    upload_token = storage.create_token(
+        storage_key,
+        ACTION_REGISTER,
+        expires=storage.presign_expires * 2,
+        user_id=str(current_user.id),
+        filename=filename,
+        original_filename=upload.filename,
+        content_type=upload.content_type,
+        file_hash=upload.sha256,
+        options=upload.options
+    )
+    
+    return {
+        "upload_url": presigned["url"],
+        "method": presigned["method"],
+        "headers": presigned["headers"],
+        "expires_in": presigned["expires_in"],
+        "upload_token": upload_token
+    }
+
+
+@router.post("/upload-complete", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
+async def complete_direct_upload(
+    upload: DirectUploadComplete,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    직접 업로드한 파일을 문서로 등록하고 처리 시작
+    
+    PDF 유효성과 페이지 수는 API 서버가 파일을 읽지 않도록 워커가 처리하면서 확인한다.
+    """
+    payload = storage.verify_token(upload.upload_token, ACTION_REGISTER)
+    if payload is None or payload.get("user_id") != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="만료되었거나 잘못된 업로드 토큰입니다"
         )
-        
-        # 분석 결과 저장
-        from app.models.analysis import Analysis
-        analysis = Analysis(
-            document_id=document.id,
-            raw_text=pdf_result["text"],
-            cleaned_text=clean_result["cleaned_text"],
-            summary=analysis_result["summary"],
-            keywords=analysis_result["keywords"],
-            qa_pairs=analysis_result["qa_pairs"],
-            important_sentences=analysis_result["important_sentences"],
-            ai_model=analysis_result["ai_model"],
-            language=analysis_result["language"],
-            processing_time=analysis_result["processing_time"],
-            confidence_score=analysis_result["confidence_score"],
-            total_pages=pdf_result.get("page_count"),
-            total_words=clean_result["statistics"]["word_count"],
-            total_sentences=clean_result["statistics"]["sentence_count"],
-            total_paragraphs=clean_result["statistics"]["paragraph_count"]
+    
+    storage_key = payload["key"]
+    if await db.scalar(select(Document.id).where(Document.storage_key == storage_key)):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 등록된 파일입니다"
         )
-        
-        db.add(analysis)
-        
-        # 문서 정보 업데이트
-        document.page_count = pdf_result.get("page_count")
-        document.word_count = clean_result["statistics"]["word_count"]
-        document.language = clean_result["language"]
-        document.complete_processing()
-        
-        db.commit()
-        
-    except Exception as e:
-        # 처리 실패
-        document.fail_processing(str(e))
-        db.commit()
+    
+    analysis_options = parse_analysis_options(payload.get("options"))
+    await check_upload_allowed(db, current_user, payload["content_type"])
+    
+    file_size = await run_in_threadpool(storage.size, storage_key)
+    if file_size is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="파일이 아직 업로드되지 않았습니다"
+        )
+    if file_size > settings.MAX_FILE_SIZE:
+        await run_in_threadpool(storage.delete, storage_key)
+        raise file_too_large_exception()
+    
+    # 같은 내용의 파일이 이미 있으면 방금 올린 파일 대신 그 파일을 참조
+    file_hash = payload.get("file_hash")
+    existing_key = await db.run_sync(dedup_service.acquire_existing, file_hash)
+    if existing_key:
+        await run_in_threadpool(storage.delete, storage_key)
+        storage_key = existing_key
+    else:
+        storage_key = await _register_blob(db, file_hash, file_size, storage_key)
+    
+    document = Document(
+        user_id=current_user.id,
+        filename=payload["filename"],
+        original_filename=payload["original_filename"],
+        file_size=file_size,
+        file_path=storage.location(storage_key),
+        storage_key=storage_key,
+        mime_type=payload["content_type"],
+        file_hash=file_hash,  # 저장소가 업로드 시 검증한 해시 (없으면 워커가 계산)
+        status=DocumentStatus.UPLOADED
+    )
+    
+    return await _submit_and_dispatch(db, current_user, document, analysis_options)
+
+
+@router.get("/{document_id}/download", response_model=DownloadUrlResponse)
+async def get_download_url(
+    document_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """원본 파일 다운로드 서명 URL (파일은 저장소에서 직접 내려받음)"""
+    document = await _get_owned_document(db, document_id, current_user)
+    if not document or not document.storage_key:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다"
+        )
+    
+    url = await run_in_threadpool(
+        storage.presigned_download, document.storage_key, document.original_filename
+    )
+    return {"url": url, "expires_in": storage.presign_expires}
 
 
 @router.get("/", response_model=DocumentList)
@@ -199,41 +478,59 @@ async def get_documents(
     language: Optional[str] = None,
     sort_by: str = Query("created_at", regex="^(created_at|updated_at|filename|file_size)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    date_from: Optional[datetime] = Query(None, description="이 시각 이후 생성된 문서만 (해당 월 파티션만 조회)"),
+    date_to: Optional[datetime] = Query(None, description="이 시각 이전 생성된 문서만"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정하면 page 대신 사용)"),
+    include_total: Optional[bool] = Query(None, description="전체 개수 포함 여부 (기본: 커서 조회 시 생략)"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     사용자의 문서 목록 조회
+    
+    next_cursor를 cursor로 넘기면 (정렬 컬럼, id) 인덱스로 다음 페이지를 바로
+    조회한다. page는 OFFSET 방식으로 계속 지원한다. 보존 기간이 지나 보관된
+    문서는 /archive/documents에서 조회한다.
     """
-    query = db.query(Document).filter(Document.user_id == current_user.id)
+    conditions = [Document.user_id == current_user.id]
     
-    # 필터 적용
+    # 필터 적용 (생성 시각 범위는 파티션 제외에 사용됨)
     if status:
-        query = query.filter(Document.status == status)
+        conditions.append(Document.status == status)
     if language:
-        query = query.filter(Document.language == language)
-    
-    # 정렬
-    order_func = desc if sort_order == "desc" else asc
-    if sort_by == "created_at":
-        query = query.order_by(order_func(Document.created_at))
-    elif sort_by == "updated_at":
-        query = query.order_by(order_func(Document.updated_at))
-    elif sort_by == "filename":
-        query = query.order_by(order_func(Document.original_filename))
-    elif sort_by == "file_size":
-        query = query.order_by(order_func(Document.file_size))
-    
-    # 페이지네이션
-    total = query.count()
-    documents = query.offset((page - 1) * limit).limit(limit).all()
+        conditions.append(Document.language == language)
+    if date_from:
+        conditions.append(Document.created_at >= date_from)
+    if date_to:
+        conditions.append(Document.created_at < date_to)
+    
+    # 정렬 (id로 동순위 구분) 및 커서 조건
+    sort_column = DOCUMENT_SORT_COLUMNS[sort_by]
+    try:
+        query = apply_keyset(select(Document).where(*conditions), sort_column, Document.id, sort_by, sort_order, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not cursor:
+        query = query.offset((page - 1) * limit)
+    
+    # 다음 페이지 여부를 알기 위해 하나 더 조회
+    documents = list((await db.scalars(query.limit(limit + 1))).all())
+    cursor_next = next_cursor(documents, limit, sort_column, sort_by, sort_order)
+    
+    if include_total is None:
+        include_total = cursor is None
+    total = await db.scalar(select(func.count(Document.id)).where(*conditions)) if include_total else None
     
     return {
         "items": documents,
         "total": total,
-        "page": page,
+        "page": None if cursor else page,
         "limit": limit,
-        "pages": (total + limit - 1) // limit
+        "pages": (total + limit - 1) // limit if total is not None else None,
+        "next_cursor": cursor_next
     }
 
 
@@ -241,38 +538,40 @@ async def get_documents(
 async def get_document(
     document_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     특정 문서 조회
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    async def load():
+        document = await db.scalar(select(Document).where(Document.id == document_id))
+        if not document:
+            return None
+        return read_cache.owned(document.user_id, DocumentResponse.model_validate(document).model_dump(mode="json"))
+    
+    cached = await read_cache.get_or_load(
+        read_cache.document_key(document_id), load, settings.CACHE_TTL_USER_DATA
+    )
     
-    if not document:
+    if not read_cache.is_owner(cached, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="문서를 찾을 수 없습니다"
         )
     
-    return document
+    return cached["data"]
 
 
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     문서 삭제
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    document = await _get_owned_document(db, document_id, current_user)
     
     if not document:
         raise HTTPException(
@@ -280,13 +579,27 @@ async def delete_document(
             detail="문서를 찾을 수 없습니다"
         )
     
-    # 파일 삭제
-    if os.path.exists(document.file_path):
+    # 파일 삭제 (다른 문서가 같은 파일을 참조하면 유지, 저장소 키가 없는 이전 문서는 로컬 경로)
+    if document.storage_key:
+        if await db.run_sync(dedup_service.release, document):
+            await run_in_threadpool(storage.delete, document.storage_key)
+    elif os.path.exists(document.file_path):
         os.remove(document.file_path)
     
-    # 데이터베이스에서 삭제 (CASCADE로 관련 데이터도 삭제됨)
-    db.delete(document)
-    db.commit()
+    # 처리 체크포인트와 부가 산출물 삭제
+    checkpoint_store.clear(document.id)
+    shutil.rmtree(os.path.join(settings.PIPELINE_ARTIFACT_DIR, str(document.id)), ignore_errors=True)
+    
+    # 트리거로 함께 삭제되는 분석 결과는 ORM 이벤트에 잡히지 않으므로 캐시 키를 미리 수집
+    from app.models.analysis import Analysis
+    analysis_ids = (await db.scalars(select(Analysis.id).where(Analysis.of_document(document)))).all()
+    
+    # 데이터베이스에서 삭제 (CASCADE로 관련 데이터도 삭제됨, 복원된 문서면 보관 색인도 삭제)
+    await db.execute(delete(ArchivedDocument).where(ArchivedDocument.document_id == document.id))
+    await db.delete(document)
+    await db.commit()
+    
+    await read_cache.invalidate(*[key for analysis_id in analysis_ids for key in read_cache.analysis_keys(analysis_id)])
     
     return {"message": "문서가 성공적으로 삭제되었습니다"}
 
@@ -295,15 +608,12 @@ async def delete_document(
 async def get_processing_status(
     document_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     문서 처리 상태 조회
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    document = await _get_owned_document(db, document_id, current_user)
     
     if not document:
         raise HTTPException(
@@ -311,47 +621,212 @@ async def get_processing_status(
             detail="문서를 찾을 수 없습니다"
         )
     
-    # 진행률 계산
-    progress = 0
-    current_step = "대기 중"
-    
-    if document.status == DocumentStatus.UPLOADED:
-        progress = 10
-        current_step = "업로드 완료"
-    elif document.status == DocumentStatus.PROCESSING:
-        progress = 50
-        current_step = "AI 분석 중"
-    elif document.status == DocumentStatus.COMPLETED:
-        progress = 100
-        current_step = "분석 완료"
-    elif document.status == DocumentStatus.FAILED:
-        progress = 0
-        current_step = "처리 실패"
+    # 진행률 계산 (처리 중이면 워커가 발행한 마지막 진행 이벤트 사용)
+    progress, current_step = _status_progress(document)
+    if document.status == DocumentStatus.PROCESSING:
+        last_event = await progress_bus.last_event(document.id)
+        if last_event and last_event.get("progress") is not None and last_event["event"] not in TERMINAL_EVENTS:
+            progress = last_event["progress"]
+            current_step = last_event.get("message") or current_step
+    
+    # 남은 시간 추정 (대기 중이면 큐 대기 시간 포함)
+    estimated_remaining = None
+    if document.status in (DocumentStatus.UPLOADED, DocumentStatus.PROCESSING):
+        estimated_remaining = admission_controller.estimate_processing_time(
+            document.page_count, document.file_size
+        )
+        if document.status == DocumentStatus.PROCESSING and document.processing_started_at:
+            elapsed = (datetime.utcnow() - document.processing_started_at).total_seconds()
+            estimated_remaining = max(0.0, estimated_remaining - elapsed)
+        else:
+            job = await db.scalar(select(ProcessingJob).where(
+                ProcessingJob.document_id == document.id,
+                ProcessingJob.status == JobStatus.QUEUED
+            ))
+            if job is not None:
+                estimated_remaining += await db.run_sync(
+                    admission_controller.estimate_queue_wait, current_user, virtual_finish=job.virtual_finish
+                )
+        estimated_remaining = int(round(estimated_remaining))
     
     return {
         "task_id": document.id,  # document_id를 task_id로 사용
         "status": document.status,
         "progress": progress,
         "current_step": current_step,
-        "estimated_remaining": None,
+        "estimated_remaining": estimated_remaining,
         "error_message": document.error_message
     }
 
 
+def _status_progress(document: Document):
+    """문서 상태 기준 진행률과 단계 설명"""
+    if document.status == DocumentStatus.UPLOADED:
+        return 10, "업로드 완료"
+    if document.status == DocumentStatus.PROCESSING:
+        return 50, "AI 분석 중"
+    if document.status == DocumentStatus.COMPLETED:
+        return 100, "분석 완료"
+    if document.status == DocumentStatus.FAILED:
+        return 0, "처리 실패"
+    return 0, "대기 중"
+
+
+async def _progress_snapshot(document: Document) -> Dict[str, Any]:
+    """
+    연결 직후 보낼 현재 진행 상태
+    
+    문서가 이미 끝났으면 상태에서 만든 종료 이벤트를, 처리 중이면 마지막
+    진행 이벤트를 돌려준다.
+    """
+    last_event = await progress_bus.last_event(document.id)
+    if document.status not in (DocumentStatus.COMPLETED, DocumentStatus.FAILED) and last_event:
+        return last_event
+    
+    progress, current_step = _status_progress(document)
+    event = {
+        DocumentStatus.COMPLETED: "completed",
+        DocumentStatus.FAILED: "failed"
+    }.get(document.status, "snapshot")
+    return {
+        "document_id": str(document.id),
+        "event": event,
+        "progress": progress,
+        "message": current_step,
+        "data": {"status": document.status, "error": document.error_message},
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _progress_events(document: Document) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    스냅샷 후 진행 이벤트 스트림 (None은 연결 유지 신호)
+    
+    종료 이벤트를 보내면 끝난다. 구독 직전에 처리가 끝나 종료 이벤트를
+    놓친 경우에 대비해 연결 유지 신호마다 마지막 이벤트를 다시 확인한다.
+    """
+    snapshot = await _progress_snapshot(document)
+    yield snapshot
+    if snapshot["event"] in TERMINAL_EVENTS:
+        return
+    
+    async for event in progress_bus.subscribe(document.id):
+        if event is None:
+            last_event = await progress_bus.last_event(document.id)
+            if last_event and last_event["event"] in TERMINAL_EVENTS:
+                yield last_event
+                return
+            yield None
+            continue
+        
+        yield event
+        if event["event"] in TERMINAL_EVENTS:
+            return
+
+
+async def _get_owned_document(db: AsyncSession, document_id: uuid.UUID, user: User) -> Optional[Document]:
+    return await db.scalar(select(Document).where(
+        Document.id == document_id,
+        Document.user_id == user.id
+    ))
+
+
+@router.get("/{document_id}/events")
+async def stream_processing_events(
+    document_id: uuid.UUID,
+    request: Request,
+    token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    문서 처리 진행 이벤트 (Server-Sent Events)
+    
+    EventSource는 헤더를 보낼 수 없으므로 token 쿼리 파라미터로도 인증할 수 있다.
+    """
+    authorization = request.headers.get("Authorization", "")
+    if not token and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    current_user = await get_user_from_token(token, db) if token else None
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    document = await _get_owned_document(db, document_id, current_user)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다"
+        )
+    
+    # 스트림이 열려 있는 동안 DB 연결을 잡고 있지 않도록 세션을 먼저 닫음
+    await db.close()
+    
+    async def event_stream():
+        async for event in _progress_events(document):
+            if await request.is_disconnected():
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(event, ensure_ascii=False, default=str)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{document_id}/ws")
+async def processing_events_websocket(
+    websocket: WebSocket,
+    document_id: uuid.UUID,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """문서 처리 진행 이벤트 (WebSocket, token 쿼리 파라미터로 인증)"""
+    current_user = await get_user_from_token(token, db)
+    if current_user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    document = await _get_owned_document(db, document_id, current_user)
+    await db.close()
+    if not document:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    try:
+        async for event in _progress_events(document):
+            if event is None:
+                await websocket.send_json({"event": "heartbeat"})
+                continue
+            await websocket.send_text(json.dumps(event, ensure_ascii=False, default=str))
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.post("/{document_id}/reprocess")
 async def reprocess_document(
     document_id: uuid.UUID,
-    background_tasks: BackgroundTasks,
+    from_scratch: bool = Query(False),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     문서 재처리
+    
+    실패한 문서는 마지막으로 성공한 단계의 체크포인트부터 이어서 처리한다.
+    완료된 문서는 체크포인트가 삭제되어 있으므로 처음부터 다시 처리하며,
+    from_scratch=true이면 실패한 문서도 모든 단계를 처음부터 실행한다.
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    document = await _get_owned_document(db, document_id, current_user)
     
     if not document:
         raise HTTPException(
@@ -365,9 +840,16 @@ async def reprocess_document(
             detail="이미 처리 중인 문서입니다"
         )
     
-    # 기존 분석 결과 삭제
+    # 기존 분석 결과 삭제 (일괄 삭제라 통계에서 먼저 제외)
     from app.models.analysis import Analysis
-    db.query(Analysis).filter(Analysis.document_id == document.id).delete()
+    await db.run_sync(user_stats_service.discard_analyses, Analysis.of_document(document))
+    deleted_analysis_ids = (await db.scalars(
+        delete(Analysis).where(Analysis.of_document(document)).returning(Analysis.id)
+    )).all()
+    
+    # 재사용할 체크포인트 정리
+    if from_scratch or document.status == DocumentStatus.COMPLETED:
+        checkpoint_store.clear(document.id)
     
     # 문서 상태 초기화
     document.status = DocumentStatus.UPLOADED
@@ -375,11 +857,17 @@ async def reprocess_document(
     document.processing_started_at = None
     document.processing_completed_at = None
     document.processing_time = None
+    document.processing_attempts = 0
+    document.release_lease()
     
-    db.commit()
+    await db.run_sync(job_scheduler.submit, document, current_user)
+    await db.commit()
+    
+    # 일괄 삭제한 분석 결과 캐시 무효화 (문서 키는 커밋 시 자동 무효화)
+    await read_cache.invalidate(*[key for analysis_id in deleted_analysis_ids for key in read_cache.analysis_keys(analysis_id)])
     
-    # 백그라운드에서 재처리 시작
-    background_tasks.add_task(process_document_background, document.id, db)
+    # 스케줄러 순서에 따라 재처리 시작
+    await dispatch_jobs()
     
     return {"message": "문서 재처리가 시작되었습니다"}
 
@@ -387,45 +875,19 @@ async def reprocess_document(
 @router.get("/stats/overview", response_model=DocumentStats)
 async def get_document_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    사용자의 문서 통계 조회
+    사용자의 문서 통계 조회 (증분 갱신되는 사용자 통계 행 조회)
     """
-    from sqlalchemy import func
-    
-    # 기본 통계
-    total_documents = db.query(Document).filter(Document.user_id == current_user.id).count()
-    completed_documents = db.query(Document).filter(
-        Document.user_id == current_user.id,
-        Document.status == DocumentStatus.COMPLETED
-    ).count()
-    failed_documents = db.query(Document).filter(
-        Document.user_id == current_user.id,
-        Document.status == DocumentStatus.FAILED
-    ).count()
-    processing_documents = db.query(Document).filter(
-        Document.user_id == current_user.id,
-        Document.status == DocumentStatus.PROCESSING
-    ).count()
-    
-    # 총 파일 크기
-    total_file_size = db.query(func.sum(Document.file_size)).filter(
-        Document.user_id == current_user.id
-    ).scalar() or 0
-    
-    # 평균 처리 시간
-    avg_processing_time = db.query(func.avg(Document.processing_time)).filter(
-        Document.user_id == current_user.id,
-        Document.processing_time.isnot(None)
-    ).scalar()
+    stats = await db.run_sync(user_stats_service.get, current_user.id)
     
     return {
-        "total_documents": total_documents,
-        "completed_documents": completed_documents,
-        "failed_documents": failed_documents,
-        "processing_documents": processing_documents,
-        "total_file_size": total_file_size,
-        "average_processing_time": float(avg_processing_time) if avg_processing_time else None
+        "total_documents": stats.total_documents,
+        "completed_documents": stats.completed_documents,
+        "failed_documents": stats.failed_documents,
+        "processing_documents": stats.processing_documents,
+        "total_file_size": stats.total_file_size,
+        "average_processing_time": stats.average_document_processing_time
     }
 
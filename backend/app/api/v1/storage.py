@@ -0,0 +1,80 @@
+"""
+로컬 저장소 서명 URL 엔드포인트
+
+S3 호환 저장소를 쓰면 클라이언트가 저장소와 직접 주고받으므로 사용되지
+않는다. 로컬 저장소에서 같은 클라이언트 흐름(서명 URL로 PUT/GET)을
+유지하기 위한 엔드포인트다.
+"""
+
+import os
+import uuid
+from fastapi import APIRouter, HTTPException, status, Request, Query
+from fastapi.responses import FileResponse
+
+from app.services.storage import storage, LocalStorage, ACTION_UPLOAD, ACTION_DOWNLOAD
+from app.services.upload_writer import upload_writer, FileTooLargeError
+
+router = APIRouter()
+
+
+def _verify(token: str, action: str) -> dict:
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="로컬 저장소를 사용하지 않습니다"
+        )
+    
+    payload = storage.verify_token(token, action)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="만료되었거나 잘못된 서명 URL입니다"
+        )
+    return payload
+
+
+@router.put("/objects")
+async def put_object(
+    request: Request,
+    token: str = Query(...)
+):
+    """서명 URL로 파일 업로드 (본문은 파일 바이트 그대로)"""
+    payload = _verify(token, ACTION_UPLOAD)
+    path = storage.path(payload["key"])
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    
+    try:
+        stored = await upload_writer.save_stream(request.stream(), temp_path)
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    
+    if payload.get("file_hash") and stored.file_hash != payload["file_hash"]:
+        await upload_writer.remove(temp_path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="업로드한 파일의 해시가 일치하지 않습니다"
+        )
+    
+    os.replace(temp_path, path)
+    return {"size": stored.size, "sha256": stored.file_hash}
+
+
+@router.get("/objects")
+async def get_object(token: str = Query(...)):
+    """서명 URL로 파일 다운로드"""
+    payload = _verify(token, ACTION_DOWNLOAD)
+    path = storage.path(payload["key"])
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="파일을 찾을 수 없습니다"
+        )
+    
+    return FileResponse(
+        path,
+        filename=payload.get("filename") or os.path.basename(path),
+        media_type="application/pdf" if path.endswith(".pdf") else None
+    )
@@ -0,0 +1,242 @@
+"""
+이어 올리기(resumable) 업로드 API 엔드포인트
+
+1. POST   /uploads                      세션 생성 (전체 크기, 해시, 조각 크기)
+2. PUT    /uploads/{id}/chunks/{index}  조각 업로드 (본문은 조각 바이트, 병렬/순서 무관)
+3. GET    /uploads/{id}                 받은/받지 못한 조각 조회 (끊긴 뒤 이어 올리기)
+4. POST   /uploads/{id}/complete        병합, 해시 검증 후 문서 등록 및 처리 시작
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import get_current_active_user
+from app.models.user import User
+from app.models.upload_session import UploadSession, UploadSessionStatus
+from app.schemas.document import UploadSessionCreate, UploadSessionResponse, FileUploadResponse
+from app.services.chunked_upload import chunked_upload_service, ChunkError
+from app.api.v1.documents import (
+    parse_analysis_options,
+    check_upload_allowed,
+    new_upload_path,
+    register_uploaded_file,
+    file_too_large_exception
+)
+
+router = APIRouter()
+
+
+def _session_response(session: UploadSession) -> dict:
+    received = chunked_upload_service.received_chunks(session)
+    return {
+        "id": session.id,
+        "status": session.status.value,
+        "original_filename": session.original_filename,
+        "total_size": session.total_size,
+        "chunk_size": session.chunk_size,
+        "total_chunks": session.total_chunks,
+        "received_chunks": received,
+        "missing_chunks": chunked_upload_service.missing_chunks(session, received),
+        "received_bytes": sum(session.chunk_length(index) for index in received),
+        "expires_at": session.expires_at,
+        "document_id": session.document_id,
+        "error_message": session.error_message
+    }
+
+
+async def _get_session(db: AsyncSession, session_id: uuid.UUID, user: User) -> UploadSession:
+    session = await db.scalar(select(UploadSession).where(
+        UploadSession.id == session_id,
+        UploadSession.user_id == user.id
+    ))
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="업로드 세션을 찾을 수 없습니다"
+        )
+    return session
+
+
+def _ensure_active(session: UploadSession):
+    if session.status == UploadSessionStatus.ACTIVE and session.is_expired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="업로드 세션이 만료되었습니다. 새로 업로드해주세요"
+        )
+    if session.status != UploadSessionStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"조각을 받을 수 없는 세션 상태입니다: {session.status.value}"
+        )
+
+
+@router.post("/", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    upload: UploadSessionCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    이어 올리기 업로드 세션 생성
+    
+    승인 제어/업로드 제한은 세션을 만들 때 먼저 확인해 전송 후 거절되는 일을 줄인다.
+    """
+    parse_analysis_options(upload.options)
+    await check_upload_allowed(db, current_user, upload.content_type)
+    if upload.total_size > settings.MAX_FILE_SIZE:
+        raise file_too_large_exception()
+    
+    try:
+        session = await db.run_sync(chunked_upload_service.create_session, current_user, upload)
+    except ChunkError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    await db.commit()
+    await db.refresh(session)
+    
+    return _session_response(session)
+
+
+@router.get("/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    session_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """업로드 세션 상태 조회 (이어 올릴 조각 확인)"""
+    session = await _get_session(db, session_id, current_user)
+    return _session_response(session)
+
+
+@router.put("/{session_id}/chunks/{index}")
+async def upload_chunk(
+    session_id: uuid.UUID,
+    index: int,
+    request: Request,
+    x_chunk_sha256: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    조각 업로드
+    
+    요청 본문은 조각의 바이트 그대로 보낸다 (application/octet-stream).
+    X-Chunk-SHA256 헤더를 보내면 조각 해시를 검증한다. 같은 조각을 다시
+    보내면 덮어쓰므로 실패한 조각은 그대로 재전송하면 된다.
+    """
+    session = await _get_session(db, session_id, current_user)
+    _ensure_active(session)
+    
+    try:
+        stored = await chunked_upload_service.save_chunk(
+            session, index, request.stream(), checksum=x_chunk_sha256
+        )
+    except ChunkError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {
+        "index": index,
+        "size": stored.size,
+        "sha256": stored.file_hash
+    }
+
+
+@router.post("/{session_id}/complete", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload_session(
+    session_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """모든 조각 병합 및 해시 검증 후 문서 등록 (일반 업로드와 같은 처리 흐름)"""
+    session = await _get_session(db, session_id, current_user)
+    _ensure_active(session)
+    analysis_options = parse_analysis_options(session.options)
+    await check_upload_allowed(db, current_user, session.mime_type)
+    
+    # 동시에 들어온 완료 요청 중 하나만 병합
+    claimed = (await db.execute(
+        update(UploadSession).where(
+            UploadSession.id == session.id,
+            UploadSession.status == UploadSessionStatus.ACTIVE
+        ).values(status=UploadSessionStatus.ASSEMBLING).execution_options(synchronize_session=False)
+    )).rowcount
+    await db.commit()
+    if claimed != 1:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 완료 처리 중인 업로드 세션입니다"
+        )
+    await db.refresh(session)
+    
+    filename, file_path = new_upload_path(session.original_filename)
+    try:
+        stored = await chunked_upload_service.assemble(session, file_path)
+    except ChunkError as e:
+        # 조각이 모자라면 이어 올릴 수 있도록 세션 유지, 해시가 다르면 세션 폐기
+        missing = chunked_upload_service.missing_chunks(session)
+        session.status = UploadSessionStatus.ACTIVE if missing else UploadSessionStatus.ABORTED
+        session.error_message = str(e)
+        await db.commit()
+        if not missing:
+            chunked_upload_service.discard(session.id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT if missing else status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        session.status = UploadSessionStatus.ACTIVE
+        await db.commit()
+        raise
+    
+    try:
+        response = await register_uploaded_file(
+            db, current_user, stored, filename, session.original_filename, session.mime_type, analysis_options
+        )
+    except HTTPException as e:
+        await db.rollback()
+        session.status = UploadSessionStatus.ABORTED
+        session.error_message = str(e.detail)
+        await db.commit()
+        chunked_upload_service.discard(session_id)
+        raise
+    
+    session.status = UploadSessionStatus.COMPLETED
+    session.document_id = response["document"].id
+    session.completed_at = datetime.utcnow()
+    await db.commit()
+    chunked_upload_service.discard(session.id)
+    
+    return response
+
+
+@router.delete("/{session_id}")
+async def abort_upload_session(
+    session_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """업로드 세션 취소 (받은 조각 삭제)"""
+    session = await _get_session(db, session_id, current_user)
+    if session.status == UploadSessionStatus.ASSEMBLING:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="완료 처리 중인 업로드 세션은 취소할 수 없습니다"
+        )
+    
+    if session.status == UploadSessionStatus.ACTIVE:
+        session.status = UploadSessionStatus.ABORTED
+        await db.commit()
+    chunked_upload_service.discard(session.id)
+    
+    return {"message": "업로드 세션이 취소되었습니다"}
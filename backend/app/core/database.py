@@ -1,14 +1,37 @@
 """
 데이터베이스 연결 및 세션 관리
+
+API 서버는 비동기 엔진(asyncpg)과 AsyncSession을 사용해 쿼리가 이벤트
+루프를 막지 않도록 한다. Celery 워커와 동기 서비스 코드는 동기 엔진과
+SessionLocal을 그대로 사용한다.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from app.core.config import settings
+from app.core.metrics import instrument_pool
+
+# 비동기 드라이버
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite"
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """동기 DATABASE_URL을 비동기 드라이버 URL로 변환"""
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    if database_url.drivername in ASYNC_DRIVERS.values() or backend not in ASYNC_DRIVERS:
+        return url
+    return database_url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
 
 # SQLAlchemy 엔진 생성
 if settings.DATABASE_URL.startswith("sqlite"):
@@ -19,25 +42,67 @@ if settings.DATABASE_URL.startswith("sqlite"):
         poolclass=StaticPool,
         echo=settings.DATABASE_ECHO
     )
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        poolclass=StaticPool,
+        echo=settings.DATABASE_ECHO
+    )
 else:
     # PostgreSQL용 설정
     engine = create_engine(
         settings.DATABASE_URL,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        echo=settings.DATABASE_ECHO
+    )
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
         pool_pre_ping=True,
-        pool_recycle=300,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
         echo=settings.DATABASE_ECHO
     )
 
+# 연결 풀 사용량 지표
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 세션 팩토리 (커밋 후 속성 접근이 지연 로딩을 일으키지 않도록 expire 하지 않음)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base 클래스 생성
 Base = declarative_base()
 
 
-def get_db() -> Generator:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    데이터베이스 세션 의존성
+    데이터베이스 세션 의존성 (비동기)
+    
+    동기 Session을 받는 서비스는 db.run_sync로 호출한다.
+    
+    Yields:
+        비동기 데이터베이스 세션
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_sync_db() -> Generator:
+    """
+    동기 데이터베이스 세션 (워커, 스크립트용)
     
     Yields:
         데이터베이스 세션
@@ -57,4 +122,3 @@ def create_tables():
 def drop_tables():
     """모든 테이블 삭제 (테스트용)"""
     Base.metadata.drop_all(bind=engine)
-
@@ -0,0 +1,303 @@
+"""
+Prometheus 지표
+
+API 서버(/metrics)와 Celery 워커(WORKER_METRICS_PORT)가 노출한다.
+
+gunicorn처럼 여러 프로세스로 실행할 때는 PROMETHEUS_MULTIPROC_DIR을
+prometheus_client를 임포트하기 전에 설정해야 한다 (gunicorn.conf.py). 각
+프로세스가 값을 이 디렉토리의 파일에 쓰고, 수집 시 MultiProcessCollector가
+모든 프로세스의 값을 합친다. 게이지는 프로세스별 값의 합계(livesum)로 합친다.
+
+큐 대기 수처럼 DB에서 읽는 값은 프로세스별로 누적할 수 없으므로 수집할 때
+조회한다 (QueueDepthCollector).
+"""
+
+import os
+import logging
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# 라우트에 매칭되지 않은 요청 (404 등)의 route 레이블
+UNMATCHED_ROUTE = "unmatched"
+
+# 지연 시간 버킷 (초)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+
+
+# ----------------------------------------------------------------------
+# HTTP
+# ----------------------------------------------------------------------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "handoc_http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (라우트 템플릿별)",
+    ["method", "route", "status"],
+    buckets=HTTP_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "handoc_http_requests_in_progress",
+    "처리 중인 HTTP 요청 수",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+
+# ----------------------------------------------------------------------
+# 문서 처리 파이프라인
+# ----------------------------------------------------------------------
+
+PIPELINE_STAGE_DURATION = Histogram(
+    "handoc_pipeline_stage_duration_seconds",
+    "문서 처리 단계 소요 시간 (status: completed, cached, failed)",
+    ["stage", "status"],
+    buckets=STAGE_BUCKETS
+)
+AI_COMPONENT_DURATION = Histogram(
+    "handoc_ai_component_duration_seconds",
+    "AI 분석 구성 요소(요약, 키워드, QA, 중요 문장) 소요 시간",
+    ["component", "status"],
+    buckets=STAGE_BUCKETS
+)
+
+# ----------------------------------------------------------------------
+# LLM
+# ----------------------------------------------------------------------
+
+LLM_REQUEST_DURATION = Histogram(
+    "handoc_llm_request_duration_seconds",
+    "LLM 호출 지연 시간",
+    ["model", "route", "status"],
+    buckets=LLM_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "handoc_llm_tokens",
+    "LLM 토큰 사용량 (direction: in, out)",
+    ["model", "route", "direction"]
+)
+
+# ----------------------------------------------------------------------
+# 캐시
+# ----------------------------------------------------------------------
+
+CACHE_REQUESTS = Counter(
+    "handoc_cache_requests",
+    "캐시 조회 결과 (result: l1_hit, l2_hit, coalesced, miss, error). "
+    "적중률은 miss가 아닌 조회 / 전체 조회",
+    ["cache", "namespace", "result"]
+)
+
+# ----------------------------------------------------------------------
+# DB 연결 풀
+# ----------------------------------------------------------------------
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "handoc_db_pool_checked_out_connections",
+    "사용 중인 DB 연결 수",
+    ["engine"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CAPACITY = Gauge(
+    "handoc_db_pool_capacity_connections",
+    "DB 연결 풀 최대 연결 수 (pool_size + max_overflow)",
+    ["engine"],
+    multiprocess_mode="livesum"
+)
+
+
+def route_template(scope) -> str:
+    """요청에 매칭된 라우트 경로 템플릿 (예: /api/v1/documents/{document_id})"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def observe_http_request(method: str, route: str, status_code: int, seconds: float):
+    HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(seconds)
+
+
+def observe_stage(stage: str, status: str, seconds: float):
+    PIPELINE_STAGE_DURATION.labels(stage, status).observe(seconds)
+
+
+def observe_ai_component(component: str, status: str, seconds: float):
+    AI_COMPONENT_DURATION.labels(component, status).observe(seconds)
+
+
+def observe_llm_call(
+    model: str,
+    route: str,
+    seconds: float,
+    error: bool = False,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0
+):
+    LLM_REQUEST_DURATION.labels(model, route, "error" if error else "ok").observe(seconds)
+    if prompt_tokens:
+        LLM_TOKENS.labels(model, route, "in").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(model, route, "out").inc(completion_tokens)
+
+
+def count_cache_request(cache: str, namespace: str, result: str):
+    CACHE_REQUESTS.labels(cache, namespace, result).inc()
+
+
+def instrument_pool(engine, name: str):
+    """
+    엔진의 연결 풀 사용량 기록 (checkout/checkin 이벤트)
+    
+    비동기 엔진은 sync_engine을 넘긴다. StaticPool처럼 크기가 없는 풀은
+    용량을 기록하지 않는다.
+    """
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    if callable(size):
+        DB_POOL_CAPACITY.labels(name).set(size() + max(0, getattr(pool, "_max_overflow", 0)))
+    
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["metrics_checked_out"] = True
+        checked_out.inc()
+    
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        # 무효화된 연결도 반납되므로 checkout으로 센 연결만 감소
+        if connection_record.info.pop("metrics_checked_out", False):
+            checked_out.dec()
+
+
+class QueueDepthCollector:
+    """
+    처리 대기열 길이 (수집 시 조회)
+    
+    - handoc_processing_jobs{status, priority_class}: 스케줄러 대기/전달된 작업 수
+    - handoc_processing_queue_wait_seconds{priority_class, quantile}: 집계 기간
+      (SCHEDULER_STATS_WINDOW_HOURS) 동안 전달된 작업의 대기 시간 p50/p95/최대(1)
+    - handoc_processing_oldest_queued_seconds{priority_class}: 가장 오래 대기 중인 작업의 대기 시간
+    - handoc_celery_queue_length{queue}: 브로커(Redis) 큐에 쌓인 메시지 수
+    """
+    
+    # queue_stats 항목 -> quantile 레이블
+    WAIT_QUANTILES = (("wait_p50", "0.5"), ("wait_p95", "0.95"), ("wait_max", "1"))
+    
+    def collect(self):
+        jobs = GaugeMetricFamily(
+            "handoc_processing_jobs",
+            "상태/우선순위 클래스별 처리 작업 수 (대기 중 + 워커에 전달됨)",
+            labels=["status", "priority_class"]
+        )
+        waits = GaugeMetricFamily(
+            "handoc_processing_queue_wait_seconds",
+            "우선순위 클래스별 처리 작업 대기 시간 분위수 (집계 기간 내 전달된 작업)",
+            labels=["priority_class", "quantile"]
+        )
+        oldest = GaugeMetricFamily(
+            "handoc_processing_oldest_queued_seconds",
+            "우선순위 클래스별 가장 오래 대기 중인 작업의 대기 시간",
+            labels=["priority_class"]
+        )
+        try:
+            for priority_class, stats in self._scheduler_stats()["classes"].items():
+                jobs.add_metric(["queued", priority_class], stats["queued"])
+                jobs.add_metric(["dispatched", priority_class], stats["running"])
+                for key, quantile in self.WAIT_QUANTILES:
+                    if stats[key] is not None:
+                        waits.add_metric([priority_class, quantile], stats[key])
+                if stats["oldest_queued_age"] is not None:
+                    oldest.add_metric([priority_class], stats["oldest_queued_age"])
+        except Exception as e:
+            logger.warning(f"처리 작업 통계 조회 실패: {str(e)}")
+        yield jobs
+        yield waits
+        yield oldest
+        
+        broker = GaugeMetricFamily(
+            "handoc_celery_queue_length",
+            "Celery 브로커 큐 길이",
+            labels=["queue"]
+        )
+        try:
+            for queue, length in self._broker_lengths():
+                broker.add_metric([queue], length)
+        except Exception as e:
+            logger.warning(f"브로커 큐 길이 조회 실패: {str(e)}")
+        yield broker
+    
+    @staticmethod
+    def _scheduler_stats():
+        from app.core.database import SessionLocal
+        from app.services.job_scheduler import job_scheduler
+        
+        db = SessionLocal()
+        try:
+            return job_scheduler.queue_stats(db)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _broker_lengths():
+        if not settings.CELERY_BROKER_URL.startswith("redis"):
+            return []
+        import redis
+        
+        client = redis.Redis.from_url(settings.CELERY_BROKER_URL, socket_timeout=2)
+        try:
+            return [
+                (queue, client.llen(queue))
+                for queue in ("celery", settings.LARGE_DOCUMENT_RANGE_QUEUE)
+            ]
+        finally:
+            client.close()
+
+
+queue_depth_collector = QueueDepthCollector()
+
+
+def _registry(include_queue_depth: bool) -> CollectorRegistry:
+    """수집용 레지스트리 (멀티프로세스 모드면 모든 프로세스의 값을 합침)"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        if include_queue_depth:
+            registry.register(queue_depth_collector)
+        return registry
+    return REGISTRY
+
+
+if not MULTIPROC_DIR:
+    # 단일 프로세스 모드에서는 기본 레지스트리에 바로 등록
+    REGISTRY.register(queue_depth_collector)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type"""
+    return generate_latest(_registry(include_queue_depth=True)), CONTENT_TYPE_LATEST
+
+
+def start_worker_server(port: Optional[int]):
+    """Celery 워커의 지표 HTTP 서버 시작 (멀티프로세스 모드에서는 큐 길이를 API 서버에서만 수집)"""
+    if not port:
+        return
+    start_http_server(port, registry=_registry(include_queue_depth=False))
+    logger.info(f"📈 워커 지표 서버 시작: :{port}/metrics")
@@ -2,24 +2,37 @@
 보안 및 인증 관련 유틸리티
 """
 
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select, DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
+from app.services.read_cache import read_cache
 
-# 비밀번호 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해싱 컨텍스트 (cost가 BCRYPT_ROUNDS와 다른 해시는 needs_update로 판정)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 # JWT 토큰 스키마
 security = HTTPBearer()
 
+# 인증 사용자 캐시에 저장하지 않는 컬럼
+PRINCIPAL_EXCLUDED_COLUMNS = {"hashed_password"}
+
 
 def create_access_token(
     subject: Union[str, Any], 
@@ -77,7 +90,7 @@ def verify_token(token: str) -> Optional[str]:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    비밀번호 검증
+    비밀번호 검증 (이벤트 루프에서는 password_hasher.verify_and_update 사용)
     
     Args:
         plain_password: 평문 비밀번호
@@ -91,7 +104,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """
-    비밀번호 해싱
+    비밀번호 해싱 (이벤트 루프에서는 password_hasher.hash 사용)
     
     Args:
         password: 평문 비밀번호
@@ -102,9 +115,72 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def get_current_user(
+def _principal_snapshot(user: User) -> Dict[str, Any]:
+    """캐시할 사용자 컬럼 값 (JSON 직렬화 가능한 형태)"""
+    snapshot = {}
+    for column in User.__table__.columns:
+        if column.key in PRINCIPAL_EXCLUDED_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        if isinstance(value, (datetime, uuid.UUID)):
+            value = value.isoformat() if isinstance(value, datetime) else str(value)
+        snapshot[column.key] = value
+    return snapshot
+
+
+def _principal_from_snapshot(snapshot: Dict[str, Any]) -> User:
+    """캐시한 컬럼 값으로 사용자 객체 복원 (세션에 붙이기 전의 detached 상태)"""
+    values = dict(snapshot)
+    values["id"] = uuid.UUID(values["id"])
+    for column in User.__table__.columns:
+        if isinstance(column.type, DateTime) and values.get(column.key) is not None:
+            values[column.key] = datetime.fromisoformat(values[column.key])
+    
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+async def resolve_principal(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    사용자 ID로 인증 사용자 조회 (캐시 우선)
+    
+    캐시에 있으면 DB 조회 없이 사용자 객체를 만들어 세션에 붙인다. 사용자가
+    변경되어 커밋되면 캐시가 무효화된다 (hashed_password는 캐시하지 않아
+    복원한 객체에서는 읽을 수 없음).
+    
+    복원한 객체는 다른 요청의 변경을 아직 반영하지 않았을 수 있으므로 읽기
+    전용으로 다룬다. 현재 값에 의존하는 변경은 DB에서 직접 갱신하고
+    (User.increment_upload_count), 값을 확인하는 쓰기 경로는 db.refresh로
+    다시 읽는다.
+    
+    Args:
+        db: 데이터베이스 세션
+        user_id: 토큰에서 추출한 사용자 ID
+    
+    Returns:
+        사용자 객체 또는 None
+    """
+    try:
+        user_id = uuid.UUID(user_id)
+    except ValueError:
+        return None
+    
+    async def load():
+        user = await db.scalar(select(User).where(User.id == user_id))
+        return _principal_snapshot(user) if user is not None else None
+    
+    snapshot = await read_cache.get_or_load(read_cache.principal_key(user_id), load, settings.PRINCIPAL_CACHE_TTL)
+    if snapshot is None:
+        return None
+    
+    # 쿼리 없이 세션에 연결 (방금 DB에서 로드했으면 세션에 있는 객체가 반환됨)
+    return await db.merge(_principal_from_snapshot(snapshot), load=False)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     현재 인증된 사용자 조회
@@ -133,14 +209,35 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await resolve_principal(db, user_id)
     if user is None:
         raise credentials_exception
     
     return user
 
 
-def get_current_active_user(
+async def get_user_from_token(token: str, db: AsyncSession) -> Optional[User]:
+    """
+    토큰으로 활성 사용자 조회 (Authorization 헤더를 쓸 수 없는 WebSocket/SSE용)
+    
+    Args:
+        token: JWT 토큰
+        db: 데이터베이스 세션
+    
+    Returns:
+        활성 사용자 객체 또는 None
+    """
+    user_id = verify_token(token)
+    if user_id is None:
+        return None
+    
+    user = await resolve_principal(db, user_id)
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
     """
@@ -163,7 +260,7 @@ def get_current_active_user(
     return current_user
 
 
-def get_current_premium_user(
+async def get_current_premium_user(
     current_user: User = Depends(get_current_active_user)
 ) -> User:
     """
@@ -5,15 +5,19 @@ HanDoc AI Backend - FastAPI 메인 애플리케이션
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 import time
 import logging
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import create_tables
-from app.api.v1 import auth, documents, analyses
+from app.core.database import create_tables, async_engine
+from app.core.metrics import HTTP_REQUESTS_IN_PROGRESS, observe_http_request, render_latest, route_template
+from app.api.v1 import auth, documents, analyses, uploads, archive, storage as storage_api
+from app.services.storage import storage, S3Storage
+from app.services.read_cache import read_cache
+from app.services.password_hasher import password_hasher
 
 # 로깅 설정
 logging.basicConfig(
@@ -41,9 +45,18 @@ async def lifespan(app: FastAPI):
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     logger.info(f"📁 업로드 디렉토리 생성: {settings.UPLOAD_DIR}")
     
+    # 객체 저장소 버킷 확인
+    if isinstance(storage, S3Storage):
+        try:
+            storage.ensure_bucket()
+            logger.info(f"🪣 저장소 버킷 확인: {storage.bucket}")
+        except Exception as e:
+            logger.error(f"❌ 저장소 버킷 확인 실패: {e}")
+    
     yield
     
     # 종료 시 실행
+    await async_engine.dispose()
     logger.info("🛑 HanDoc AI Backend 종료")
 
 
@@ -75,12 +88,20 @@ if settings.ENVIRONMENT == "production":
     )
 
 
-# 요청 처리 시간 미들웨어
+# 요청 처리 시간 미들웨어 (헤더 + 라우트 템플릿별 지표)
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(request.method)
+    in_progress.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        in_progress.dec()
+        process_time = time.time() - start_time
+        observe_http_request(request.method, route_template(request.scope), status_code, process_time)
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
@@ -105,12 +126,14 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         content={
             "detail": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=getattr(exc, "headers", None)  # Retry-After, WWW-Authenticate 등
     )
 
 
-# 정적 파일 서빙 (업로드된 파일)
-app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR), name="static")
+# 정적 파일 서빙 (업로드된 파일, 로컬 저장소에서만)
+if settings.STORAGE_BACKEND == "local":
+    app.mount("/static", StaticFiles(directory=settings.UPLOAD_DIR), name="static")
 
 
 # API 라우터 등록
@@ -126,12 +149,30 @@ app.include_router(
     tags=["문서 관리"]
 )
 
+app.include_router(
+    uploads.router,
+    prefix=f"{settings.API_V1_STR}/uploads",
+    tags=["이어 올리기 업로드"]
+)
+
+app.include_router(
+    storage_api.router,
+    prefix=f"{settings.API_V1_STR}/storage",
+    tags=["저장소"]
+)
+
 app.include_router(
     analyses.router,
     prefix=f"{settings.API_V1_STR}/analyses",
     tags=["분석 결과"]
 )
 
+app.include_router(
+    archive.router,
+    prefix=f"{settings.API_V1_STR}/archive",
+    tags=["보관 문서"]
+)
+
 
 # 루트 엔드포인트
 @app.get("/")
@@ -159,6 +200,28 @@ async def health_check():
     }
 
 
+@app.get("/health/cache")
+async def cache_health_check():
+    """조회 캐시 적중률 (이 프로세스 기준)"""
+    return {
+        "backend": read_cache.backend,
+        "namespaces": read_cache.stats()
+    }
+
+
+@app.get("/health/password-hasher")
+async def password_hasher_health_check():
+    """비밀번호 해싱 실행기 대기열 상태 (이 프로세스 기준)"""
+    return password_hasher.stats()
+
+
+# Prometheus 지표 (큐 길이를 DB에서 조회하므로 스레드 풀에서 실행되도록 동기 함수)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
+
+
 # API 정보 엔드포인트
 @app.get(f"{settings.API_V1_STR}/info")
 async def api_info():
@@ -201,6 +264,39 @@ if settings.DEBUG:
             "upload_dir": settings.UPLOAD_DIR,
             "cors_origins": settings.BACKEND_CORS_ORIGINS
         }
+    
+    @app.get("/debug/model-routing")
+    async def debug_model_routing():
+        """모델 라우팅 지표 (개발용)"""
+        from app.services.model_router import model_router
+        
+        return {
+            "enabled": model_router.enabled,
+            "fast_model": model_router.fast_model,
+            "premium_model": model_router.premium_model,
+            "premium_routes": sorted(model_router.premium_routes),
+            "metrics": model_router.get_metrics()
+        }
+    
+    @app.get("/debug/scheduler")
+    async def debug_scheduler(hours: int = 24):
+        """처리 작업 스케줄러 클래스별 대기 시간 (개발용)"""
+        from starlette.concurrency import run_in_threadpool
+        from app.core.database import SessionLocal
+        from app.services.job_scheduler import job_scheduler
+        from app.services.admission import eta_model
+        
+        def load_stats():
+            db = SessionLocal()
+            try:
+                return job_scheduler.queue_stats(db, hours=hours)
+            finally:
+                db.close()
+        
+        # 동기 세션 조회가 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+        stats = await run_in_threadpool(load_stats)
+        stats["eta_model"] = eta_model.to_dict()
+        return stats
 
 
 if __name__ == "__main__":
@@ -5,6 +5,14 @@
 from app.models.user import User
 from app.models.document import Document
 from app.models.analysis import Analysis
+from app.models.document_chunk import DocumentChunk
+from app.models.search_index import DocumentSearchIndex
+from app.models.processing_job import ProcessingJob
+from app.models.upload_session import UploadSession
+from app.models.stored_blob import StoredBlob
+from app.models.text_blob import TextBlob
+from app.models.user_stats import UserStats
+from app.models.archive import DocumentArchive, ArchivedDocument
 from app.models.export import Export
 from app.models.feedback import Feedback
 
@@ -12,6 +20,15 @@ __all__ = [
     "User",
     "Document", 
     "Analysis",
+    "DocumentChunk",
+    "DocumentSearchIndex",
+    "ProcessingJob",
+    "UploadSession",
+    "StoredBlob",
+    "TextBlob",
+    "UserStats",
+    "DocumentArchive",
+    "ArchivedDocument",
     "Export",
     "Feedback"
 ]
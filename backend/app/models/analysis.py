@@ -3,19 +3,32 @@
 """
 
 import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, Float
+from datetime import datetime, timedelta
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, Float, Index, and_
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from app.core.database import Base
 
+# 문서와 분석을 만든 서버 간 시계 차이 허용 범위 (파티션 제외 조건의 여유분)
+PARTITION_CLOCK_SKEW = timedelta(days=1)
+
 
 class Analysis(Base):
-    """분석 결과 모델"""
+    """분석 결과 모델
+    
+    PostgreSQL에서는 created_at 월 단위 파티션 테이블이다
+    (alembic 0002_partition_documents_analyses).
+    """
     
     __tablename__ = "analyses"
+    __table_args__ = (
+        # 목록 키셋 페이지네이션 (정렬 컬럼, id)
+        Index("ix_analyses_created_id", "created_at", "id"),
+        Index("ix_analyses_confidence_id", "confidence_score", "id"),
+        Index("ix_analyses_processing_time_id", "processing_time", "id"),
+    )
     
     # 기본 필드
     id = Column(
@@ -31,9 +44,9 @@ class Analysis(Base):
         index=True
     )
     
-    # 텍스트 데이터
-    raw_text = Column(Text, nullable=True)
-    cleaned_text = Column(Text, nullable=True)
+    # 텍스트 데이터 (원문/정제 텍스트는 text_blobs에 압축 저장하고 해시로 참조)
+    raw_text_hash = Column(String(64), ForeignKey("text_blobs.content_hash"), nullable=True, index=True)
+    cleaned_text_hash = Column(String(64), ForeignKey("text_blobs.content_hash"), nullable=True, index=True)
     summary = Column(Text, nullable=True)
     
     # JSON 데이터
@@ -65,10 +78,36 @@ class Analysis(Base):
     document = relationship("Document", back_populates="analyses")
     exports = relationship("Export", back_populates="analysis", cascade="all, delete-orphan")
     feedback = relationship("Feedback", back_populates="analysis", cascade="all, delete-orphan")
+    # 텍스트는 필요한 조회에서만 joinedload로 불러온다 (암묵적 지연 로딩 금지)
+    raw_text_blob = relationship("TextBlob", foreign_keys=[raw_text_hash], lazy="raise")
+    cleaned_text_blob = relationship("TextBlob", foreign_keys=[cleaned_text_hash], lazy="raise")
     
     def __repr__(self):
         return f"<Analysis(id={self.id}, document_id={self.document_id}, ai_model={self.ai_model})>"
     
+    @classmethod
+    def of_document(cls, document):
+        """
+        문서의 분석 조회 조건
+        
+        분석은 문서보다 먼저 만들어지지 않으므로 created_at 하한을 함께 걸어
+        문서 생성 월 이전의 파티션은 조회하지 않는다.
+        """
+        return and_(
+            cls.document_id == document.id,
+            cls.created_at >= document.created_at - PARTITION_CLOCK_SKEW
+        )
+    
+    @property
+    def raw_text(self) -> Optional[str]:
+        """원문 텍스트 (raw_text_blob을 불러온 경우에만 사용 가능)"""
+        return self.raw_text_blob.text if self.raw_text_blob is not None else None
+    
+    @property
+    def cleaned_text(self) -> Optional[str]:
+        """정제 텍스트 (cleaned_text_blob을 불러온 경우에만 사용 가능)"""
+        return self.cleaned_text_blob.text if self.cleaned_text_blob is not None else None
+    
     @property
     def keyword_list(self) -> List[str]:
         """키워드 목록 반환"""
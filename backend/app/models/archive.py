@@ -0,0 +1,84 @@
+"""
+보관(아카이브) 파티션 모델
+"""
+
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class DocumentArchive(Base):
+    """문서 보관본 모델
+    
+    보존 기간이 지난 월 파티션의 문서와 분석, 청크, 텍스트를 테이블별
+    Parquet 파일로 저장소(archives/{id}/{테이블}.parquet)에 옮긴 기록이다.
+    문서의 원본 PDF는 archives/{id}/files/{문서 ID}.pdf로 옮긴다.
+    """
+    
+    __tablename__ = "document_archives"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    label = Column(String(50), nullable=False, index=True)  # 보관한 파티션 (예: 202401, default)
+    storage_prefix = Column(String(500), nullable=False)
+    row_counts = Column(JSON, nullable=False, default=dict)  # {테이블: 행 수}
+    total_bytes = Column(BigInteger, nullable=False, default=0)  # Parquet 파일 크기 합계
+    
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<DocumentArchive(id={self.id}, label={self.label}, rows={self.row_counts})>"
+    
+    def object_key(self, table: str) -> str:
+        """테이블별 Parquet 저장소 키"""
+        return f"{self.storage_prefix}/{table}.parquet"
+    
+    def file_key(self, document_id) -> str:
+        """문서 원본 파일 저장소 키"""
+        return f"{self.storage_prefix}/files/{document_id}.pdf"
+
+
+class ArchivedDocument(Base):
+    """보관된 문서 색인 모델
+    
+    보관된 문서는 DB에 이 행만 남는다. 사용자는 목록을 보고 필요한 문서를
+    복원(rehydrate)할 수 있으며, 복원된 문서는 일정 기간 뒤 다시 보관된다.
+    """
+    
+    __tablename__ = "archived_documents"
+    
+    document_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    archive_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("document_archives.id"),
+        nullable=False,
+        index=True
+    )
+    
+    # 목록 표시용 문서 정보
+    original_filename = Column(String(255), nullable=False)
+    file_size = Column(Integer, nullable=False)
+    page_count = Column(Integer, nullable=True)
+    document_created_at = Column(DateTime, nullable=False)
+    
+    # 보관/복원 상태
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    rehydrate_requested_at = Column(DateTime, nullable=True)
+    rehydrated_at = Column(DateTime, nullable=True)  # 복원되어 DB에 있는 동안만 값이 있음
+    
+    def __repr__(self):
+        return f"<ArchivedDocument(document_id={self.document_id}, archive_id={self.archive_id})>"
+    
+    @property
+    def is_rehydrated(self) -> bool:
+        """현재 DB에 복원되어 있는지 여부"""
+        return self.rehydrated_at is not None
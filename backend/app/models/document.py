@@ -4,7 +4,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Enum, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -22,9 +22,22 @@ class DocumentStatus(str, enum.Enum):
 
 
 class Document(Base):
-    """문서 모델"""
+    """문서 모델
+    
+    PostgreSQL에서는 created_at 월 단위 파티션 테이블이며 (alembic
+    0002_partition_documents_analyses), 다른 테이블의 document_id 외래 키는
+    DB에서 삭제 트리거로 대신한다. 보존 기간이 지난 문서는 저장소로
+    보관된다 (app.services.partition_archive).
+    """
     
     __tablename__ = "documents"
+    __table_args__ = (
+        # 목록 키셋 페이지네이션 (사용자, 정렬 컬럼, id)
+        Index("ix_documents_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_documents_user_updated_id", "user_id", "updated_at", "id"),
+        Index("ix_documents_user_filename_id", "user_id", "original_filename", "id"),
+        Index("ix_documents_user_file_size_id", "user_id", "file_size", "id"),
+    )
     
     # 기본 필드
     id = Column(
@@ -45,6 +58,7 @@ class Document(Base):
     original_filename = Column(String(255), nullable=False)
     file_size = Column(Integer, nullable=False)
     file_path = Column(String(500), nullable=False)
+    storage_key = Column(String(500), nullable=True, index=True)  # 저장소 객체 키 (없으면 file_path의 로컬 파일)
     mime_type = Column(String(100), nullable=False)
     file_hash = Column(String(64), nullable=True)  # SHA-256 해시
     
@@ -66,6 +80,13 @@ class Document(Base):
     processing_started_at = Column(DateTime, nullable=True)
     processing_completed_at = Column(DateTime, nullable=True)
     processing_time = Column(Integer, nullable=True)  # 초 단위
+    stage_timings = Column(JSON, nullable=True)  # {단계: {"status", "seconds", "finished_at"}}
+    artifacts = Column(JSON, nullable=True)  # 이미지/표/썸네일 정보
+    
+    # 작업 소유권 (워커 lease/heartbeat)
+    lease_owner = Column(String(255), nullable=True)  # "호스트:PID" 형식의 워커 ID
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    processing_attempts = Column(Integer, nullable=False, default=0)
     
     # 타임스탬프
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -74,6 +95,13 @@ class Document(Base):
     # 관계
     user = relationship("User", back_populates="documents")
     analyses = relationship("Analysis", back_populates="document", cascade="all, delete-orphan")
+    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
+    search_index = relationship(
+        "DocumentSearchIndex",
+        back_populates="document",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
     
     def __repr__(self):
         return f"<Document(id={self.id}, filename={self.filename}, status={self.status})>"
@@ -115,6 +143,16 @@ class Document(Base):
             delta = self.processing_completed_at - self.processing_started_at
             self.processing_time = int(delta.total_seconds())
     
+    @property
+    def is_lease_expired(self) -> bool:
+        """처리 중인 워커의 lease가 만료되었는지 확인"""
+        return self.lease_expires_at is None or self.lease_expires_at < datetime.utcnow()
+    
+    def release_lease(self):
+        """워커 lease 해제"""
+        self.lease_owner = None
+        self.lease_expires_at = None
+    
     def fail_processing(self, error_message: str):
         """처리 실패"""
         self.status = DocumentStatus.FAILED
@@ -0,0 +1,94 @@
+"""
+문서 청크 모델 (계층적 요약 트리)
+"""
+
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class DocumentChunk(Base):
+    """문서 청크 모델
+    
+    level 0은 정제 텍스트의 원본 청크(map 단계), 그 위 레벨은
+    하위 청크 요약을 합친 reduce 노드이며 최상위 노드가 최종 요약이다.
+    """
+    
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_document_level_position", "document_id", "level", "position"),
+    )
+    
+    # 기본 필드
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        index=True
+    )
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    parent_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("document_chunks.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True
+    )
+    
+    # 트리 위치
+    level = Column(Integer, nullable=False, default=0)  # 0 = 원본 청크
+    position = Column(Integer, nullable=False, default=0)  # 레벨 내 순서
+    
+    # 원문 범위 (cleaned_text 기준 문자 오프셋)
+    start_offset = Column(Integer, nullable=False)
+    end_offset = Column(Integer, nullable=False)
+    page_start = Column(Integer, nullable=True)
+    page_end = Column(Integer, nullable=True)
+    
+    # 내용 정보
+    token_count = Column(Integer, nullable=True)
+    content_hash = Column(String(64), nullable=False, index=True)  # SHA-256 해시
+    summary = Column(Text, nullable=True)
+    summary_model = Column(String(50), nullable=True)
+    language = Column(String(10), nullable=True)
+    
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 관계
+    document = relationship("Document", back_populates="chunks")
+    parent = relationship("DocumentChunk", remote_side=[id], back_populates="children")
+    children = relationship(
+        "DocumentChunk",
+        back_populates="parent",
+        cascade="all, delete-orphan",
+        order_by="DocumentChunk.position"
+    )
+    
+    def __repr__(self):
+        return f"<DocumentChunk(id={self.id}, document_id={self.document_id}, level={self.level}, position={self.position})>"
+    
+    @property
+    def is_leaf(self) -> bool:
+        """원본 청크(leaf)인지 확인"""
+        return self.level == 0
+    
+    @property
+    def has_summary(self) -> bool:
+        """재사용 가능한 요약이 있는지 확인"""
+        return bool(self.summary and self.summary.strip())
+    
+    def overlaps_pages(self, page_start: int, page_end: int) -> bool:
+        """주어진 페이지 범위와 겹치는지 확인"""
+        if self.page_start is None or self.page_end is None:
+            return False
+        return self.page_start <= page_end and self.page_end >= page_start
@@ -0,0 +1,102 @@
+"""
+문서 처리 작업 모델 (스케줄러 큐)
+"""
+
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Float, ForeignKey, Enum, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    """처리 작업 상태"""
+    QUEUED = "queued"          # 스케줄러 대기
+    DISPATCHED = "dispatched"  # 워커 큐로 전달됨
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ProcessingJob(Base):
+    """문서 처리 작업 모델
+    
+    업로드/재처리 요청은 먼저 이 테이블에 쌓이고, 스케줄러가 우선순위
+    클래스와 사용자별 가중 공정 큐(WFQ) 순서에 따라 워커 큐로 보낸다.
+    """
+    
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        Index("ix_processing_jobs_status_class_finish", "status", "priority_class", "virtual_finish"),
+        Index("ix_processing_jobs_user_status", "user_id", "status"),
+    )
+    
+    # 기본 필드
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        index=True
+    )
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    
+    # 스케줄링 정보
+    priority_class = Column(String(20), nullable=False, default="free")  # free, premium, enterprise
+    weight = Column(Float, nullable=False, default=1.0)
+    virtual_finish = Column(Float, nullable=False, default=0.0)  # WFQ 가상 종료 시각
+    status = Column(
+        Enum(JobStatus),
+        default=JobStatus.QUEUED,
+        nullable=False,
+        index=True
+    )
+    options = Column(JSON, nullable=True)  # AnalysisOptions
+    task_id = Column(String(255), nullable=True)  # Celery 작업 ID
+    
+    # 시간 정보
+    enqueued_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    dispatched_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    queue_wait = Column(Float, nullable=True)  # 초 단위 (enqueued → dispatched)
+    
+    # 관계
+    document = relationship("Document")
+    
+    def __repr__(self):
+        return f"<ProcessingJob(id={self.id}, document_id={self.document_id}, class={self.priority_class}, status={self.status})>"
+    
+    @property
+    def is_active(self) -> bool:
+        """워커에서 처리 중(또는 전달됨)인지 확인"""
+        return self.status == JobStatus.DISPATCHED
+    
+    def mark_dispatched(self, task_id: str):
+        """워커 큐로 전달"""
+        self.status = JobStatus.DISPATCHED
+        self.task_id = task_id
+        self.dispatched_at = datetime.utcnow()
+        self.queue_wait = (self.dispatched_at - self.enqueued_at).total_seconds()
+    
+    def mark_requeued(self):
+        """워커 큐 전달 취소 (메시지가 발행되지 않았거나 유실된 작업)"""
+        self.status = JobStatus.QUEUED
+        self.task_id = None
+        self.dispatched_at = None
+        self.queue_wait = None
+    
+    def mark_finished(self, succeeded: bool):
+        """처리 종료"""
+        self.status = JobStatus.COMPLETED if succeeded else JobStatus.FAILED
+        self.finished_at = datetime.utcnow()
@@ -0,0 +1,45 @@
+"""
+문서 검색 인덱스 모델 (BM25 역색인)
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Float, ForeignKey, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class DocumentSearchIndex(Base):
+    """문서별 BM25 검색 인덱스 모델 (압축 저장)"""
+    
+    __tablename__ = "document_search_indexes"
+    
+    # 기본 필드 (문서당 하나)
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    # 인덱스 정보
+    text_hash = Column(String(64), nullable=False)  # 인덱싱한 cleaned_text의 SHA-256 해시
+    passage_count = Column(Integer, nullable=False, default=0)
+    term_count = Column(Integer, nullable=False, default=0)
+    avg_passage_length = Column(Float, nullable=True)
+    data = Column(LargeBinary, nullable=False)  # zlib 압축 JSON
+    
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 관계
+    document = relationship("Document", back_populates="search_index")
+    
+    def __repr__(self):
+        return f"<DocumentSearchIndex(document_id={self.document_id}, passages={self.passage_count})>"
+    
+    @property
+    def size_bytes(self) -> int:
+        """압축된 인덱스 크기"""
+        return len(self.data) if self.data else 0
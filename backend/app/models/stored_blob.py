@@ -0,0 +1,30 @@
+"""
+저장소 파일(내용 해시 기준) 참조 카운트 모델
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime
+
+from app.core.database import Base
+
+
+class StoredBlob(Base):
+    """저장소 파일 모델
+    
+    같은 내용(SHA-256)의 파일은 저장소에 한 번만 두고, 이를 가리키는
+    문서 수를 ref_count로 관리한다. 마지막 문서가 삭제될 때 파일도 삭제된다.
+    """
+    
+    __tablename__ = "stored_blobs"
+    
+    file_hash = Column(String(64), primary_key=True)  # SHA-256 해시
+    storage_key = Column(String(500), nullable=False, unique=True)
+    file_size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=1)
+    
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<StoredBlob(file_hash={self.file_hash}, refs={self.ref_count})>"
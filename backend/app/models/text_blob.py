@@ -0,0 +1,65 @@
+"""
+압축 텍스트 저장소 모델 (내용 해시 기준)
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+import zstandard
+from sqlalchemy import Column, String, BigInteger, DateTime, LargeBinary
+
+from app.core.database import Base
+
+CODEC_ZSTD = "zstd"
+
+
+class TextBlob(Base):
+    """압축 텍스트 모델
+    
+    분석의 원문/정제 텍스트는 분석 행에 직접 두지 않고 여기에 zstd로 압축해
+    한 번만 저장한다. 분석 행은 SHA-256 해시로 참조하므로 재분석이나 중복
+    파일 재사용으로 만든 분석 버전은 같은 텍스트를 공유한다. 참조하는 분석이
+    없는 텍스트는 정리 작업(text_blobs.sweep)이 삭제한다.
+    """
+    
+    __tablename__ = "text_blobs"
+    
+    content_hash = Column(String(64), primary_key=True)  # 압축 전 텍스트(UTF-8)의 SHA-256 해시
+    codec = Column(String(10), nullable=False, default=CODEC_ZSTD)
+    data = Column(LargeBinary, nullable=False)
+    original_size = Column(BigInteger, nullable=False)  # 압축 전 바이트 수
+    compressed_size = Column(BigInteger, nullable=False)
+    
+    # 타임스탬프
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_referenced_at = Column(DateTime, default=datetime.utcnow, index=True)  # 마지막으로 저장 요청된 시각
+    
+    def __repr__(self):
+        return f"<TextBlob(content_hash={self.content_hash}, size={self.original_size}->{self.compressed_size})>"
+    
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """텍스트 해시 (검색 인덱스의 text_hash와 같은 방식)"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def compress(text: str, level: int = 3) -> bytes:
+        """텍스트 압축"""
+        return zstandard.compress(text.encode("utf-8"), level)
+    
+    @property
+    def text(self) -> Optional[str]:
+        """압축 해제한 텍스트 (인스턴스마다 한 번만 해제)"""
+        cached = self.__dict__.get("_text")
+        if cached is None and self.data is not None:
+            if self.codec != CODEC_ZSTD:
+                raise ValueError(f"지원하지 않는 텍스트 압축 방식입니다: {self.codec}")
+            cached = zstandard.decompress(self.data).decode("utf-8")
+            self.__dict__["_text"] = cached
+        return cached
+    
+    @property
+    def compression_ratio(self) -> float:
+        """압축률 (압축 후 / 압축 전)"""
+        return self.compressed_size / self.original_size if self.original_size else 1.0
@@ -0,0 +1,88 @@
+"""
+이어 올리기(resumable) 업로드 세션 모델
+"""
+
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class UploadSessionStatus(str, enum.Enum):
+    """업로드 세션 상태"""
+    ACTIVE = "active"          # 조각 수신 중
+    ASSEMBLING = "assembling"  # 조각 병합/검증 중
+    COMPLETED = "completed"
+    ABORTED = "aborted"
+    EXPIRED = "expired"
+
+
+class UploadSession(Base):
+    """업로드 세션 모델
+    
+    큰 파일을 고정 크기 조각으로 나누어 올린다. 조각은 서로 독립적으로
+    (병렬로, 순서와 무관하게) 저장되며, 연결이 끊기면 받지 못한 조각만
+    다시 올리면 된다. 모든 조각이 도착하면 서버에서 병합하고 해시를 검증한 뒤
+    일반 업로드와 같은 처리 흐름에 넘긴다.
+    """
+    
+    __tablename__ = "upload_sessions"
+    
+    # 기본 필드
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        index=True
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    
+    # 파일 정보
+    original_filename = Column(String(255), nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    total_chunks = Column(Integer, nullable=False)
+    file_hash = Column(String(64), nullable=True)  # 클라이언트가 알려준 SHA-256 (병합 후 검증)
+    options = Column(JSON, nullable=True)  # AnalysisOptions
+    
+    # 상태
+    status = Column(
+        Enum(UploadSessionStatus),
+        default=UploadSessionStatus.ACTIVE,
+        nullable=False,
+        index=True
+    )
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    error_message = Column(String(500), nullable=True)
+    
+    # 시간 정보
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    completed_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<UploadSession(id={self.id}, filename={self.original_filename}, status={self.status})>"
+    
+    @property
+    def is_expired(self) -> bool:
+        """세션 만료 여부"""
+        return self.expires_at < datetime.utcnow()
+    
+    def chunk_length(self, index: int) -> int:
+        """조각의 바이트 수 (마지막 조각만 짧을 수 있음)"""
+        if index == self.total_chunks - 1:
+            return self.total_size - self.chunk_size * (self.total_chunks - 1)
+        return self.chunk_size
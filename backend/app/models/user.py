@@ -4,7 +4,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, func, update
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -87,11 +87,19 @@ class User(Base):
         # 일반 사용자는 월 50개 제한
         return self.monthly_uploads < 50
     
-    def increment_upload_count(self):
-        """업로드 카운트 증가"""
-        self.monthly_uploads += 1
-        self.total_uploads += 1
-        self.last_upload_at = datetime.utcnow()
+    @classmethod
+    def increment_upload_count(cls, user_id):
+        """
+        업로드 카운트 증가 쿼리
+        
+        인증 사용자 객체는 캐시에서 복원한 값일 수 있어, 읽은 값에 1을 더해
+        쓰면 동시 업로드의 증가분이 사라진다. DB의 현재 값에서 증가시킨다.
+        """
+        return update(cls).where(cls.id == user_id).values(
+            monthly_uploads=func.coalesce(cls.monthly_uploads, 0) + 1,
+            total_uploads=func.coalesce(cls.total_uploads, 0) + 1,
+            last_upload_at=datetime.utcnow()
+        ).execution_options(synchronize_session=False)
     
     def reset_monthly_uploads(self):
         """월별 업로드 카운트 리셋"""
@@ -0,0 +1,77 @@
+"""
+사용자별 문서/분석 통계 모델
+"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Column, Integer, BigInteger, Float, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class UserStats(Base):
+    """사용자 통계 모델
+    
+    문서/분석이 추가, 변경, 삭제될 때 같은 트랜잭션에서 증분으로 갱신된다
+    (app.services.user_stats). 통계 API는 이 행 하나만 조회하며, 원본
+    테이블에서 다시 계산하는 배치 작업(stats.rebuild_user_stats)으로 언제든
+    재구성할 수 있다.
+    """
+    
+    __tablename__ = "user_stats"
+    
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    # 문서 상태별 개수
+    total_documents = Column(Integer, nullable=False, default=0)
+    uploaded_documents = Column(Integer, nullable=False, default=0)
+    processing_documents = Column(Integer, nullable=False, default=0)
+    completed_documents = Column(Integer, nullable=False, default=0)
+    failed_documents = Column(Integer, nullable=False, default=0)
+    total_file_size = Column(BigInteger, nullable=False, default=0)
+    
+    # 문서 처리 시간 (평균 = 합계 / 값이 있는 문서 수)
+    document_processing_time_sum = Column(BigInteger, nullable=False, default=0)
+    document_processing_time_count = Column(Integer, nullable=False, default=0)
+    
+    # 분석 결과
+    total_analyses = Column(Integer, nullable=False, default=0)
+    analysis_processing_time_sum = Column(BigInteger, nullable=False, default=0)
+    analysis_processing_time_count = Column(Integer, nullable=False, default=0)
+    confidence_score_sum = Column(Float, nullable=False, default=0.0)
+    confidence_score_count = Column(Integer, nullable=False, default=0)
+    language_counts = Column(JSON, nullable=False, default=dict)  # {언어: 분석 수}
+    model_counts = Column(JSON, nullable=False, default=dict)  # {AI 모델: 분석 수}
+    
+    # 타임스탬프
+    rebuilt_at = Column(DateTime, nullable=True)  # 마지막 배치 재계산 시각
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, documents={self.total_documents}, analyses={self.total_analyses})>"
+    
+    @property
+    def average_document_processing_time(self) -> Optional[float]:
+        """문서 평균 처리 시간 (초)"""
+        if not self.document_processing_time_count:
+            return None
+        return self.document_processing_time_sum / self.document_processing_time_count
+    
+    @property
+    def average_analysis_processing_time(self) -> Optional[float]:
+        """분석 평균 처리 시간 (초)"""
+        if not self.analysis_processing_time_count:
+            return None
+        return self.analysis_processing_time_sum / self.analysis_processing_time_count
+    
+    @property
+    def average_confidence_score(self) -> Optional[float]:
+        """분석 평균 신뢰도 점수"""
+        if not self.confidence_score_count:
+            return None
+        return self.confidence_score_sum / self.confidence_score_count
@@ -91,13 +91,38 @@ class AnalysisResponse(AnalysisBase):
         from_attributes = True
 
 
+class AnalysisListItem(AnalysisBase):
+    """
+    분석 목록 항목 스키마
+    
+    원문/정제 텍스트는 포함하지 않는다 (단건 조회로 확인). fields 파라미터로
+    선택한 필드만 응답에 포함된다.
+    """
+    id: uuid.UUID
+    document_id: Optional[uuid.UUID] = None
+    summary: Optional[str] = None
+    keywords: Optional[List[KeywordItem]] = None
+    qa_pairs: Optional[List[QAPair]] = None
+    important_sentences: Optional[List[ImportantSentence]] = None
+    processing_time: Optional[int] = None
+    confidence_score: Optional[float] = None
+    readability_score: Optional[float] = None
+    total_pages: Optional[int] = None
+    total_words: Optional[int] = None
+    total_sentences: Optional[int] = None
+    total_paragraphs: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class AnalysisList(BaseModel):
     """분석 목록 스키마"""
-    items: List[AnalysisResponse]
-    total: int
-    page: int
+    items: List[AnalysisListItem]
+    total: Optional[int] = None
+    page: Optional[int] = None
     limit: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class AnalysisStats(BaseModel):
@@ -159,6 +184,16 @@ class AnalysisOptions(BaseModel):
     spell_check: bool = False
     use_premium_model: bool = False
     
+    def selected_components(self) -> List[str]:
+        """계산할 분석 구성 요소 목록 (Analysis 컬럼명)"""
+        flags = [
+            ("summary", self.generate_summary),
+            ("qa_pairs", self.generate_qa),
+            ("keywords", self.generate_keywords),
+            ("important_sentences", self.extract_sentences),
+        ]
+        return [component for component, enabled in flags if enabled]
+    
     @validator('max_keywords')
     def validate_max_keywords(cls, v):
         if not 1 <= v <= 50:
@@ -219,3 +254,96 @@ class TextAnalysisResponse(BaseModel):
     processing_time: int
     confidence_score: float
 
+
+
+class DocumentChunkResponse(BaseModel):
+    """문서 청크(요약 트리 노드) 응답 스키마"""
+    id: uuid.UUID
+    document_id: uuid.UUID
+    parent_id: Optional[uuid.UUID] = None
+    level: int
+    position: int
+    start_offset: int
+    end_offset: int
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+    token_count: Optional[int] = None
+    content_hash: str
+    summary: Optional[str] = None
+    summary_model: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class PageRangeSummaryRequest(BaseModel):
+    """페이지 범위 요약 요청 스키마"""
+    page_start: int
+    page_end: int
+    use_premium_model: bool = False
+    
+    @validator('page_start')
+    def validate_page_start(cls, v):
+        if v < 1:
+            raise ValueError('시작 페이지는 1 이상이어야 합니다')
+        return v
+    
+    @validator('page_end')
+    def validate_page_end(cls, v, values):
+        if 'page_start' in values and v < values['page_start']:
+            raise ValueError('끝 페이지는 시작 페이지보다 작을 수 없습니다')
+        return v
+
+
+class PageRangeSummaryResponse(BaseModel):
+    """페이지 범위 요약 응답 스키마"""
+    document_id: uuid.UUID
+    page_start: int
+    page_end: int
+    summary: str
+    chunk_count: int
+    ai_model: Optional[str] = None
+    processing_time: float
+
+
+class AskRequest(BaseModel):
+    """문서 질의응답 요청 스키마"""
+    question: str
+    top_k: int = 5
+    
+    @validator('question')
+    def validate_question(cls, v):
+        if not v.strip():
+            raise ValueError('질문을 입력해주세요')
+        if len(v) > 1000:
+            raise ValueError('질문은 최대 1,000자까지 가능합니다')
+        return v.strip()
+    
+    @validator('top_k')
+    def validate_top_k(cls, v):
+        if not 1 <= v <= 10:
+            raise ValueError('검색 청크 수는 1-10 사이여야 합니다')
+        return v
+
+
+class Citation(BaseModel):
+    """답변 근거 인용 스키마"""
+    number: int  # 답변 내 [n] 인용 번호
+    chunk_index: int
+    start_offset: int
+    end_offset: int
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+    score: float
+    excerpt: str
+
+
+class AskResponse(BaseModel):
+    """문서 질의응답 응답 스키마"""
+    analysis_id: uuid.UUID
+    question: str
+    answer: str
+    citations: List[Citation]
+    ai_model: Optional[str] = None
+    context_tokens: int
+    processing_time: float
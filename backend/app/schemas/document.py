@@ -33,6 +33,7 @@ class DocumentResponse(DocumentBase):
     filename: str
     file_size: int
     file_path: str
+    storage_key: Optional[str] = None
     mime_type: str
     file_hash: Optional[str] = None
     status: DocumentStatus
@@ -42,6 +43,8 @@ class DocumentResponse(DocumentBase):
     processing_started_at: Optional[datetime] = None
     processing_completed_at: Optional[datetime] = None
     processing_time: Optional[int] = None
+    stage_timings: Optional[Dict[str, Any]] = None
+    artifacts: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
     
@@ -50,12 +53,13 @@ class DocumentResponse(DocumentBase):
 
 
 class DocumentList(BaseModel):
-    """문서 목록 스키마"""
+    """문서 목록 스키마 (커서로 조회하면 page가 없고 total은 요청 시에만 포함)"""
     items: List[DocumentResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     limit: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class DocumentStats(BaseModel):
@@ -100,6 +104,85 @@ class FileUploadResponse(BaseModel):
     estimated_time: int  # 예상 처리 시간 (초)
 
 
+class DirectUploadRequest(BaseModel):
+    """서명 URL 직접 업로드 요청 스키마"""
+    filename: str
+    content_type: str = "application/pdf"
+    file_size: int
+    sha256: Optional[str] = None  # 있으면 저장소가 업로드 본문을 검증
+    options: Optional[Dict[str, Any]] = None  # AnalysisOptions
+    
+    @validator('file_size')
+    def validate_file_size(cls, v):
+        if v <= 0:
+            raise ValueError('파일 크기는 0보다 커야 합니다')
+        return v
+    
+    @validator('sha256')
+    def validate_sha256(cls, v):
+        if v is not None and (len(v) != 64 or any(c not in "0123456789abcdefABCDEF" for c in v)):
+            raise ValueError('SHA-256 해시 형식이 올바르지 않습니다')
+        return v.lower() if v else v
+
+
+class DirectUploadResponse(BaseModel):
+    """서명 URL 직접 업로드 응답 스키마"""
+    upload_url: str
+    method: str
+    headers: Dict[str, str]
+    expires_in: int
+    upload_token: str  # 업로드 후 문서 등록 요청에 사용
+
+
+class DirectUploadComplete(BaseModel):
+    """직접 업로드 완료(문서 등록) 요청 스키마"""
+    upload_token: str
+
+
+class DownloadUrlResponse(BaseModel):
+    """다운로드 서명 URL 응답 스키마"""
+    url: str
+    expires_in: int
+
+
+class UploadSessionCreate(BaseModel):
+    """이어 올리기 업로드 세션 생성 스키마"""
+    filename: str
+    content_type: str = "application/pdf"
+    total_size: int
+    sha256: Optional[str] = None  # 전체 파일 해시 (병합 후 검증)
+    chunk_size: Optional[int] = None  # 없으면 서버 기본값
+    options: Optional[Dict[str, Any]] = None  # AnalysisOptions
+    
+    @validator('total_size')
+    def validate_total_size(cls, v):
+        if v <= 0:
+            raise ValueError('파일 크기는 0보다 커야 합니다')
+        return v
+    
+    @validator('sha256')
+    def validate_sha256(cls, v):
+        if v is not None and (len(v) != 64 or any(c not in "0123456789abcdefABCDEF" for c in v)):
+            raise ValueError('SHA-256 해시 형식이 올바르지 않습니다')
+        return v.lower() if v else v
+
+
+class UploadSessionResponse(BaseModel):
+    """이어 올리기 업로드 세션 응답 스키마"""
+    id: uuid.UUID
+    status: str
+    original_filename: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[int]
+    missing_chunks: List[int]
+    received_bytes: int
+    expires_at: datetime
+    document_id: Optional[uuid.UUID] = None
+    error_message: Optional[str] = None
+
+
 class ProcessingStatus(BaseModel):
     """처리 상태 스키마"""
     task_id: uuid.UUID
@@ -124,3 +207,27 @@ class DocumentMetadata(BaseModel):
     character_count: Optional[int] = None
     language: Optional[str] = None
 
+
+
+class ArchivedDocumentResponse(BaseModel):
+    """보관된 문서 스키마"""
+    document_id: uuid.UUID
+    original_filename: str
+    file_size: int
+    page_count: Optional[int] = None
+    document_created_at: datetime
+    archived_at: datetime
+    rehydrate_requested_at: Optional[datetime] = None
+    rehydrated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ArchivedDocumentList(BaseModel):
+    """보관된 문서 목록 스키마"""
+    items: List[ArchivedDocumentResponse]
+    total: int
+    page: int
+    limit: int
+    pages: int
@@ -0,0 +1,304 @@
+"""
+업로드 승인 제어 및 처리 시간(ETA) 추정 서비스
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.document import Document, DocumentStatus
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.job_scheduler import job_scheduler
+
+logger = logging.getLogger(__name__)
+
+# 학습 데이터가 부족할 때 쓰는 기본 계수 (기본 30초 + 페이지당 4초 + MB당 2초)
+DEFAULT_COEFFICIENTS = (30.0, 4.0, 2.0)
+
+# 정규 방정식의 특이 행렬 방지용 ridge 계수
+RIDGE_LAMBDA = 1e-3
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """가우스 소거법으로 선형 방정식 풀이 (부분 피벗팅)"""
+    size = len(vector)
+    augmented = [row[:] + [value] for row, value in zip(matrix, vector)]
+    
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda r: abs(augmented[r][column]))
+        if abs(augmented[pivot][column]) < 1e-12:
+            raise ValueError("특이 행렬입니다")
+        augmented[column], augmented[pivot] = augmented[pivot], augmented[column]
+        
+        for row in range(column + 1, size):
+            factor = augmented[row][column] / augmented[column][column]
+            for k in range(column, size + 1):
+                augmented[row][k] -= factor * augmented[column][k]
+    
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        remainder = augmented[row][size] - sum(
+            augmented[row][k] * solution[k] for k in range(row + 1, size)
+        )
+        solution[row] = remainder / augmented[row][row]
+    return solution
+
+
+class EtaModel:
+    """
+    처리 시간 선형 회귀 모델
+    
+    processing_time ≈ b0 + b1 * 페이지 수 + b2 * 파일 크기(MB)
+    완료된 문서의 Document.processing_time으로 주기적으로 다시 학습한다.
+    """
+    
+    def __init__(self):
+        self.refresh_interval = settings.ETA_REFRESH_INTERVAL
+        self.training_samples = settings.ETA_TRAINING_SAMPLES
+        self.min_samples = settings.ETA_MIN_SAMPLES
+        
+        self.coefficients: Tuple[float, float, float] = DEFAULT_COEFFICIENTS
+        self.sample_count = 0
+        self.mean_time: Optional[float] = None
+        self.mean_absolute_error: Optional[float] = None
+        self.fitted_at: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _features(page_count: Optional[int], file_size: Optional[int]) -> List[float]:
+        return [1.0, float(page_count or 0), (file_size or 0) / (1024 * 1024)]
+    
+    def fit(self, samples: List[Tuple[Optional[int], Optional[int], float]]) -> bool:
+        """
+        (페이지 수, 파일 크기, 처리 시간) 표본으로 학습
+        
+        Returns:
+            학습 여부 (표본이 부족하면 기본 계수 유지)
+        """
+        if len(samples) < self.min_samples:
+            return False
+        
+        rows = [self._features(pages, size) for pages, size, _ in samples]
+        targets = [float(seconds) for _, _, seconds in samples]
+        
+        size = len(rows[0])
+        xtx = [[sum(row[i] * row[j] for row in rows) for j in range(size)] for i in range(size)]
+        for i in range(1, size):
+            xtx[i][i] += RIDGE_LAMBDA * len(rows)
+        xty = [sum(row[i] * target for row, target in zip(rows, targets)) for i in range(size)]
+        
+        try:
+            coefficients = _solve(xtx, xty)
+        except ValueError:
+            return False
+        
+        # 음수 계수는 물리적으로 의미가 없으므로 0으로 제한
+        coefficients = [coefficients[0]] + [max(0.0, value) for value in coefficients[1:]]
+        errors = [
+            abs(sum(c * x for c, x in zip(coefficients, row)) - target)
+            for row, target in zip(rows, targets)
+        ]
+        
+        with self._lock:
+            self.coefficients = tuple(coefficients)
+            self.sample_count = len(samples)
+            self.mean_time = sum(targets) / len(targets)
+            self.mean_absolute_error = sum(errors) / len(errors)
+            self.fitted_at = datetime.utcnow()
+        return True
+    
+    def refresh(self, db: Session, force: bool = False) -> bool:
+        """갱신 주기가 지났으면 최근 완료 문서로 다시 학습"""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+        
+        samples = db.query(Document.page_count, Document.file_size, Document.processing_time).filter(
+            Document.status == DocumentStatus.COMPLETED,
+            Document.processing_time.isnot(None),
+            Document.processing_time > 0
+        ).order_by(Document.processing_completed_at.desc()).limit(self.training_samples).all()
+        
+        fitted = self.fit(samples)
+        if fitted:
+            logger.info(f"ETA 모델 갱신: 표본 {self.sample_count}개, 계수 {self.coefficients}")
+        return fitted
+    
+    def predict(self, page_count: Optional[int], file_size: Optional[int]) -> float:
+        """예상 처리 시간 (초)"""
+        with self._lock:
+            coefficients = self.coefficients
+        features = self._features(page_count, file_size)
+        return max(1.0, sum(c * x for c, x in zip(coefficients, features)))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """모델 상태"""
+        return {
+            "coefficients": {
+                "intercept": self.coefficients[0],
+                "per_page": self.coefficients[1],
+                "per_mb": self.coefficients[2]
+            },
+            "sample_count": self.sample_count,
+            "mean_time": self.mean_time,
+            "mean_absolute_error": self.mean_absolute_error,
+            "fitted_at": self.fitted_at.isoformat() if self.fitted_at else None
+        }
+
+
+class AdmissionDecision:
+    """업로드 승인 판단 결과"""
+    
+    def __init__(
+        self,
+        admitted: bool,
+        priority_class: str,
+        queue_wait: float,
+        status_code: Optional[int] = None,
+        reason: Optional[str] = None,
+        retry_after: Optional[int] = None
+    ):
+        self.admitted = admitted
+        self.priority_class = priority_class
+        self.queue_wait = queue_wait  # 예상 대기 시간 (초)
+        self.status_code = status_code  # 거절 시 429 또는 503
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    큐 상태 기반 업로드 승인 제어
+    
+    - 사용자 대기 작업이 클래스 한도를 넘으면 429
+    - 클래스의 예상 대기 시간이 한도를 넘으면 503
+    두 경우 모두 Retry-After(초)를 함께 돌려준다.
+    """
+    
+    def __init__(self, eta_model: EtaModel):
+        self.eta_model = eta_model
+        self.enabled = settings.ADMISSION_ENABLED
+        self.max_wait = settings.ADMISSION_MAX_WAIT_SECONDS
+        self.max_user_queued = settings.ADMISSION_MAX_USER_QUEUED
+        self.throughput_window = settings.ETA_THROUGHPUT_WINDOW
+    
+    def check(self, db: Session, user: User) -> AdmissionDecision:
+        """새 업로드 승인 여부 판단"""
+        priority_class = job_scheduler.priority_class(user)
+        queue_wait = self.estimate_queue_wait(db, user)
+        
+        if not self.enabled:
+            return AdmissionDecision(True, priority_class, queue_wait)
+        
+        user_queued = db.query(func.count(ProcessingJob.id)).filter(
+            ProcessingJob.user_id == user.id,
+            ProcessingJob.status == JobStatus.QUEUED
+        ).scalar() or 0
+        if user_queued >= self.max_user_queued.get(priority_class, 10):
+            user_wait = self.estimate_queue_wait(db, user, include_own=True)
+            return AdmissionDecision(
+                False, priority_class, queue_wait,
+                status_code=429,
+                reason="처리 대기 중인 문서가 너무 많습니다. 잠시 후 다시 시도해주세요",
+                retry_after=max(1, int(user_wait / max(1, user_queued)))
+            )
+        
+        max_wait = self.max_wait.get(priority_class)
+        if max_wait is not None and queue_wait > max_wait:
+            return AdmissionDecision(
+                False, priority_class, queue_wait,
+                status_code=503,
+                reason="현재 처리 요청이 많아 업로드를 받을 수 없습니다. 잠시 후 다시 시도해주세요",
+                retry_after=max(1, int(queue_wait - max_wait))
+            )
+        
+        return AdmissionDecision(True, priority_class, queue_wait)
+    
+    def estimate_queue_wait(
+        self,
+        db: Session,
+        user: User,
+        virtual_finish: Optional[float] = None,
+        include_own: bool = False
+    ) -> float:
+        """
+        사용자의 작업이 워커에 전달되기까지 예상 대기 시간 (초)
+        
+        Args:
+            virtual_finish: 이미 등록된 작업의 가상 종료 시각 (없으면 새 작업 기준)
+            include_own: 사용자의 대기 작업이 모두 빠질 때까지의 시간 계산
+        """
+        self.eta_model.refresh(db)
+        priority_class = job_scheduler.priority_class(user)
+        
+        if virtual_finish is None:
+            class_virtual_time = db.query(func.max(ProcessingJob.virtual_finish)).filter(
+                ProcessingJob.priority_class == priority_class,
+                ProcessingJob.status != JobStatus.QUEUED
+            ).scalar() or 0.0
+            user_last_finish = db.query(func.max(ProcessingJob.virtual_finish)).filter(
+                ProcessingJob.user_id == user.id,
+                ProcessingJob.priority_class == priority_class,
+                ProcessingJob.status.in_([JobStatus.QUEUED, JobStatus.DISPATCHED])
+            ).scalar() or 0.0
+            virtual_finish = max(class_virtual_time, user_last_finish) + 1.0
+        
+        ahead_query = db.query(func.count(ProcessingJob.id)).filter(
+            ProcessingJob.priority_class == priority_class,
+            ProcessingJob.status == JobStatus.QUEUED
+        )
+        if not include_own:
+            ahead_query = ahead_query.filter(ProcessingJob.virtual_finish < virtual_finish)
+        ahead = ahead_query.scalar() or 0
+        
+        running = db.query(func.count(ProcessingJob.id)).filter(
+            ProcessingJob.status == JobStatus.DISPATCHED
+        ).scalar() or 0
+        if ahead == 0 and running < job_scheduler.max_dispatched:
+            return 0.0
+        
+        return ahead / self._class_throughput(db, priority_class)
+    
+    def estimate_processing_time(self, page_count: Optional[int], file_size: Optional[int]) -> float:
+        """문서 처리 시간 예측 (초)"""
+        return self.eta_model.predict(page_count, file_size)
+    
+    def _class_throughput(self, db: Session, priority_class: str) -> float:
+        """
+        클래스의 처리량 (건/초)
+        
+        최근 완료 기록이 있으면 관측값을, 없으면 워커 슬롯 중 클래스 몫과
+        평균 처리 시간으로 계산한 값을 사용한다.
+        """
+        since = datetime.utcnow() - timedelta(seconds=self.throughput_window)
+        finished = db.query(func.count(ProcessingJob.id)).filter(
+            ProcessingJob.priority_class == priority_class,
+            ProcessingJob.finished_at >= since
+        ).scalar() or 0
+        if finished:
+            return finished / self.throughput_window
+        
+        waiting_classes = {
+            row[0] for row in db.query(ProcessingJob.priority_class).filter(
+                ProcessingJob.status.in_([JobStatus.QUEUED, JobStatus.DISPATCHED])
+            ).distinct().all()
+        } | {priority_class}
+        total_weight = sum(job_scheduler.class_weight(c) for c in waiting_classes)
+        slots = job_scheduler.max_dispatched * job_scheduler.class_weight(priority_class) / total_weight
+        
+        service_time = self.eta_model.mean_time or self.eta_model.predict(None, None)
+        return max(slots, 1.0) / service_time
+
+
+# 프로세스 전역 인스턴스
+eta_model = EtaModel()
+admission_controller = AdmissionController(eta_model)
@@ -4,19 +4,38 @@ AI 분석 서비스 (OpenAI GPT 기반)
 
 import openai
 import tiktoken
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Callable, Awaitable
+import re
+import hashlib
 import json
+import time
 import logging
 import asyncio
 from datetime import datetime
 
 from app.core.config import settings
+from app.core.metrics import observe_ai_component
+from app.services.model_router import (
+    model_router,
+    ROUTE_MAP,
+    ROUTE_REDUCE,
+    ROUTE_QA,
+    ROUTE_KEYWORDS,
+    ROUTE_SENTENCES
+)
 
 logger = logging.getLogger(__name__)
 
 # OpenAI 클라이언트 초기화
 openai.api_key = settings.OPENAI_API_KEY
 
+# 분석 구성 요소 (Analysis 컬럼명과 동일)
+COMPONENT_SUMMARY = "summary"
+COMPONENT_QA = "qa_pairs"
+COMPONENT_KEYWORDS = "keywords"
+COMPONENT_SENTENCES = "important_sentences"
+ALL_COMPONENTS = (COMPONENT_SUMMARY, COMPONENT_QA, COMPONENT_KEYWORDS, COMPONENT_SENTENCES)
+
 
 class AIAnalyzer:
     """AI 기반 문서 분석 클래스"""
@@ -26,6 +45,7 @@ class AIAnalyzer:
         self.premium_model = settings.OPENAI_MODEL_PREMIUM
         self.max_tokens = settings.OPENAI_MAX_TOKENS
         self.temperature = settings.OPENAI_TEMPERATURE
+        self.router = model_router
         
         # 토큰 계산용 인코더
         self.encoding = tiktoken.encoding_for_model(self.default_model)
@@ -44,30 +64,125 @@ class AIAnalyzer:
     
     def split_text_by_tokens(self, text: str, max_tokens: int = 3000) -> List[str]:
         """텍스트를 토큰 수 기준으로 분할"""
-        sentences = text.split('. ')
-        chunks = []
-        current_chunk = ""
+        return [
+            text[start:end].strip()
+            for start, end in self.split_text_with_offsets(text, max_tokens)
+        ]
+    
+    def split_text_with_offsets(self, text: str, max_tokens: int = 3000) -> List[Tuple[int, int]]:
+        """
+        텍스트를 토큰 수 기준으로 분할하고 원문 오프셋 반환
+        
+        Args:
+            text: 분할할 텍스트
+            max_tokens: 청크당 최대 토큰 수
+        
+        Returns:
+            (시작 오프셋, 끝 오프셋) 목록
+        """
+        boundaries = [match.end() for match in re.finditer(r'\. ', text)]
+        if not boundaries or boundaries[-1] != len(text):
+            boundaries.append(len(text))
+        
+        spans = []
+        chunk_start = 0
+        chunk_tokens = 0
+        sentence_start = 0
+        
+        for sentence_end in boundaries:
+            # 문장 단위로 토큰을 누적 (청크 전체를 매번 다시 세지 않음)
+            sentence_tokens = self.count_tokens(text[sentence_start:sentence_end])
+            if chunk_tokens and chunk_tokens + sentence_tokens > max_tokens:
+                spans.append((chunk_start, sentence_start))
+                chunk_start = sentence_start
+                chunk_tokens = 0
+            chunk_tokens += sentence_tokens
+            sentence_start = sentence_end
+        
+        if chunk_start < len(text):
+            spans.append((chunk_start, len(text)))
+        
+        return spans
+    
+    async def _chat_completion(
+        self,
+        route: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        document_tokens: Optional[int] = None
+    ) -> str:
+        """
+        라우팅 정책을 적용한 ChatCompletion 호출
+        
+        Args:
+            route: 호출 경로 (map, reduce, qa, keywords, sentences)
+            model: 상한 모델 (사용자 등급에 따라 결정된 모델)
+            messages: 프롬프트 메시지
+            max_tokens: 최대 응답 토큰 수
+            temperature: 샘플링 온도
+            document_tokens: 문서 전체 토큰 수 (짧은 문서 판단용)
+        
+        Returns:
+            응답 텍스트
+        """
+        content, _ = await self._routed_completion(
+            route, model, messages, max_tokens, temperature, document_tokens
+        )
+        return content
+    
+    async def _routed_completion(
+        self,
+        route: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        document_tokens: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """_chat_completion과 같되 실제로 호출한 모델도 반환 (응답 텍스트, 모델)"""
+        selected_model = self.router.select_model(route, model, document_tokens)
+        start_time = time.perf_counter()
         
-        for sentence in sentences:
-            test_chunk = current_chunk + sentence + ". "
-            if self.count_tokens(test_chunk) > max_tokens:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-            else:
-                current_chunk = test_chunk
+        try:
+            response = await openai.ChatCompletion.acreate(
+                model=selected_model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        except Exception:
+            self.router.record(route, selected_model, time.perf_counter() - start_time, error=True)
+            raise
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        usage = getattr(response, "usage", None)
+        self.router.record(
+            route,
+            selected_model,
+            time.perf_counter() - start_time,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0
+        )
         
-        return chunks
+        return response.choices[0].message.content.strip(), selected_model
     
     async def analyze_document(
         self, 
         text: str, 
         language: str = "ko",
         model: str = None,
-        is_premium: bool = False
+        is_premium: bool = False,
+        chunk_summaries: Optional[List[str]] = None,
+        components: Optional[Iterable[str]] = None,
+        max_keywords: int = 15,
+        max_qa_pairs: int = 5,
+        max_sentences: int = 8,
+        summary_leaves: Optional[List[Dict[str, Any]]] = None,
+        partial_keywords: Optional[List[List[Dict[str, Any]]]] = None,
+        partial_qa_pairs: Optional[List[List[Dict[str, Any]]]] = None,
+        partial_sentences: Optional[List[List[Dict[str, Any]]]] = None,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         문서 전체 분석
@@ -77,113 +192,453 @@ class AIAnalyzer:
             language: 언어 코드
             model: 사용할 AI 모델
             is_premium: 프리미엄 사용자 여부
+            chunk_summaries: 저장된 청크 요약 (있으면 최종 reduce만 수행)
+            components: 계산할 구성 요소 (None이면 전체)
+            max_keywords: 최대 키워드 수
+            max_qa_pairs: 최대 Q&A 쌍 수
+            max_sentences: 최대 중요 문장 수
+            summary_leaves: 미리 만든 요약 트리 레벨 0 노드 (있으면 reduce만 수행)
+            partial_keywords: 페이지 범위별 키워드 목록 (있으면 병합만 수행)
+            partial_qa_pairs: 페이지 범위별 Q&A 목록 (있으면 병합만 수행)
+            partial_sentences: 페이지 범위별 중요 문장 목록 (있으면 병합만 수행)
+            progress_callback: 진행 알림 콜백 (chunk_summarized, component_done 이벤트)
             
         Returns:
-            분석 결과
+            분석 결과 (계산한 구성 요소만 포함, 목록은 components에 기록,
+            새로 만든 요약 트리는 summary_nodes에 포함)
         """
         if not model:
             model = self.premium_model if is_premium else self.default_model
         
+        selected = [c for c in ALL_COMPONENTS if components is None or c in set(components)]
+        
         start_time = datetime.now()
+        document_tokens = self.count_tokens(text)
         
         try:
-            # 병렬 분석 실행
-            tasks = [
-                self.generate_summary(text, language, model),
-                self.generate_qa_pairs(text, language, model),
-                self.extract_keywords_ai(text, language, model),
-                self.extract_important_sentences_ai(text, language, model)
-            ]
+            # 선택된 구성 요소만 병렬 실행 (모델은 라우트별로 선택됨)
+            tasks = {}
+            if COMPONENT_SUMMARY in selected:
+                if summary_leaves is not None:
+                    tasks[COMPONENT_SUMMARY] = self.reduce_summary_nodes(
+                        summary_leaves, language, model, document_tokens=document_tokens
+                    )
+                elif chunk_summaries:
+                    tasks[COMPONENT_SUMMARY] = self.summarize_chunk_summaries(
+                        chunk_summaries, language, model, document_tokens=document_tokens
+                    )
+                else:
+                    tasks[COMPONENT_SUMMARY] = self.build_summary_tree(
+                        text, language, model, document_tokens=document_tokens,
+                        progress_callback=progress_callback
+                    )
+            if COMPONENT_QA in selected:
+                if partial_qa_pairs is not None:
+                    tasks[COMPONENT_QA] = self.merge_qa_pairs(partial_qa_pairs, max_qa_pairs)
+                else:
+                    tasks[COMPONENT_QA] = self.generate_qa_pairs(
+                        text, language, model, num_questions=max_qa_pairs, document_tokens=document_tokens
+                    )
+            if COMPONENT_KEYWORDS in selected:
+                if partial_keywords is not None:
+                    tasks[COMPONENT_KEYWORDS] = self.merge_keywords(partial_keywords, max_keywords)
+                else:
+                    tasks[COMPONENT_KEYWORDS] = self.extract_keywords_ai(
+                        text, language, model, max_keywords=max_keywords, document_tokens=document_tokens
+                    )
+            if COMPONENT_SENTENCES in selected:
+                if partial_sentences is not None:
+                    tasks[COMPONENT_SENTENCES] = self.merge_important_sentences(partial_sentences, max_sentences)
+                else:
+                    tasks[COMPONENT_SENTENCES] = self.extract_important_sentences_ai(
+                        text, language, model, max_sentences=max_sentences, document_tokens=document_tokens
+                    )
+            
+            completed = []
             
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            async def track(component: str, coroutine):
+                started = time.perf_counter()
+                status = "failed"
+                try:
+                    result = await coroutine
+                    status = "completed"
+                    return result
+                finally:
+                    observe_ai_component(component, status, time.perf_counter() - started)
+                    completed.append(component)
+                    await self._notify(progress_callback, "component_done", {
+                        "component": component,
+                        "done": len(completed),
+                        "total": len(tasks)
+                    })
+            
+            results = dict(zip(
+                tasks.keys(),
+                await asyncio.gather(
+                    *(track(component, coroutine) for component, coroutine in tasks.items()),
+                    return_exceptions=True
+                )
+            ))
             
             # 결과 처리
-            summary = results[0] if not isinstance(results[0], Exception) else ""
-            qa_pairs = results[1] if not isinstance(results[1], Exception) else []
-            keywords = results[2] if not isinstance(results[2], Exception) else []
-            important_sentences = results[3] if not isinstance(results[3], Exception) else []
+            analysis = {}
+            summary_nodes = []
+            if COMPONENT_SUMMARY in results:
+                summary_result = results[COMPONENT_SUMMARY]
+                if isinstance(summary_result, Exception):
+                    analysis[COMPONENT_SUMMARY] = ""
+                elif isinstance(summary_result, dict):
+                    analysis[COMPONENT_SUMMARY] = summary_result["summary"]
+                    summary_nodes = summary_result["nodes"]
+                else:
+                    analysis[COMPONENT_SUMMARY] = summary_result
+            for component in (COMPONENT_QA, COMPONENT_KEYWORDS, COMPONENT_SENTENCES):
+                if component in results:
+                    value = results[component]
+                    analysis[component] = value if not isinstance(value, Exception) else []
             
             end_time = datetime.now()
             processing_time = int((end_time - start_time).total_seconds())
             
-            return {
-                "summary": summary,
-                "qa_pairs": qa_pairs,
-                "keywords": keywords,
-                "important_sentences": important_sentences,
+            analysis.update({
+                "components": selected,
+                "summary_nodes": summary_nodes,
                 "processing_time": processing_time,
                 "ai_model": model,
                 "language": language,
-                "confidence_score": self._calculate_confidence_score(summary, qa_pairs, keywords)
-            }
+                "confidence_score": self._calculate_confidence_score(
+                    analysis.get(COMPONENT_SUMMARY),
+                    analysis.get(COMPONENT_QA),
+                    analysis.get(COMPONENT_KEYWORDS)
+                )
+            })
+            return analysis
             
         except Exception as e:
             logger.error(f"AI 분석 실패: {str(e)}")
             raise Exception(f"AI 분석 중 오류가 발생했습니다: {str(e)}")
     
+    def fill_missing_components(self, analysis_result: Dict[str, Any], previous=None) -> Dict[str, Any]:
+        """
+        계산하지 않은 구성 요소를 이전 분석 결과에서 복사
+        
+        Args:
+            analysis_result: analyze_document 결과
+            previous: 이전 Analysis (없으면 빈 값으로 채움)
+        
+        Returns:
+            네 구성 요소가 모두 채워진 결과 (신뢰도 점수 재계산)
+        """
+        for component in ALL_COMPONENTS:
+            if component not in analysis_result:
+                default = "" if component == COMPONENT_SUMMARY else []
+                value = getattr(previous, component, None) if previous is not None else None
+                analysis_result[component] = value if value is not None else default
+        
+        analysis_result["confidence_score"] = self._calculate_confidence_score(
+            analysis_result[COMPONENT_SUMMARY],
+            analysis_result[COMPONENT_QA],
+            analysis_result[COMPONENT_KEYWORDS]
+        )
+        return analysis_result
+    
     async def generate_summary(
         self, 
         text: str, 
         language: str = "ko", 
-        model: str = None
+        model: str = None,
+        document_tokens: int = None
     ) -> str:
         """문서 요약 생성"""
+        tree = await self.build_summary_tree(text, language, model, document_tokens=document_tokens)
+        return tree["summary"]
+    
+    async def _notify(
+        self,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]],
+        event: str,
+        data: Dict[str, Any]
+    ):
+        """진행 알림 (콜백 오류는 분석에 영향을 주지 않음)"""
+        if progress_callback is None:
+            return
+        try:
+            await progress_callback(event, data)
+        except Exception as e:
+            logger.warning(f"진행 알림 실패: {event} - {str(e)}")
+    
+    async def build_summary_tree(
+        self,
+        text: str,
+        language: str = "ko",
+        model: str = None,
+        document_tokens: int = None,
+        max_tokens: int = 3000,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        계층적 요약 트리 생성 (map → reduce)
+        
+        Args:
+            text: 요약할 텍스트
+            language: 언어 코드
+            model: 상한 모델
+            document_tokens: 문서 전체 토큰 수
+            max_tokens: 청크/그룹당 최대 토큰 수
+            progress_callback: 청크 요약마다 호출되는 진행 알림 콜백
+        
+        Returns:
+            {"summary": 최종 요약, "nodes": 트리 노드 목록}
+            노드의 parent는 nodes 목록 내 상위 노드 인덱스 (최상위는 None)
+        """
+        if not model:
+            model = self.default_model
+        
+        if document_tokens is None:
+            document_tokens = self.count_tokens(text)
+        
+        # 단일 청크 요약은 그 자체가 최종 요약
+        if document_tokens <= max_tokens:
+            summary = await self._generate_chunk_summary(
+                text, language, model, route=ROUTE_REDUCE, document_tokens=document_tokens
+            )
+            node = self._make_summary_node(0, 0, 0, len(text), text, document_tokens, summary)
+            return {"summary": summary, "nodes": [node]}
+        
+        nodes = await self.map_summary_nodes(
+            text, language, model, document_tokens=document_tokens,
+            max_tokens=max_tokens, progress_callback=progress_callback
+        )
+        return await self.reduce_summary_nodes(
+            nodes, language, model, document_tokens=document_tokens, max_tokens=max_tokens
+        )
+    
+    async def map_summary_nodes(
+        self,
+        text: str,
+        language: str = "ko",
+        model: str = None,
+        document_tokens: int = None,
+        max_tokens: int = 3000,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        요약 트리의 map 단계 (원본 청크별 요약, 빠른 모델)
+        
+        대용량 문서는 페이지 범위별로 여러 워커에서 실행한 뒤
+        reduce_summary_nodes로 합친다.
+        
+        Returns:
+            레벨 0 노드 목록 (오프셋은 text 기준)
+        """
+        if not model:
+            model = self.default_model
+        
+        if document_tokens is None:
+            document_tokens = self.count_tokens(text)
+        
+        nodes = []
+        spans = self.split_text_with_offsets(text, max_tokens)
+        for position, (start, end) in enumerate(spans):
+            chunk = text[start:end].strip()
+            chunk_summary = await self._generate_chunk_summary(
+                chunk, language, model, route=ROUTE_MAP, document_tokens=document_tokens
+            )
+            nodes.append(self._make_summary_node(
+                0, position, start, end, chunk, self.count_tokens(chunk), chunk_summary
+            ))
+            await self._notify(progress_callback, "chunk_summarized", {
+                "done": position + 1,
+                "total": len(spans)
+            })
+        return nodes
+    
+    async def reduce_summary_nodes(
+        self,
+        nodes: List[Dict[str, Any]],
+        language: str = "ko",
+        model: str = None,
+        document_tokens: int = None,
+        max_tokens: int = 3000
+    ) -> Dict[str, Any]:
+        """
+        요약 트리의 reduce 단계
+        
+        요약을 토큰 한도 내 그룹으로 묶어 최상위 하나가 남을 때까지 반복한다.
+        
+        Args:
+            nodes: 레벨 0 노드 목록 (위치 순서)
+        
+        Returns:
+            {"summary": 최종 요약, "nodes": 트리 노드 목록}
+        """
         if not model:
             model = self.default_model
         
-        # 텍스트가 너무 긴 경우 분할
-        if self.count_tokens(text) > 3000:
-            chunks = self.split_text_by_tokens(text, 3000)
-            chunk_summaries = []
+        nodes = list(nodes)
+        if not nodes:
+            return {"summary": "", "nodes": []}
+        
+        current_level = list(range(len(nodes)))
+        level = 0
+        while True:
+            level += 1
+            groups = self._group_by_tokens(nodes, current_level, max_tokens)
+            is_root = len(groups) == 1
+            next_level = []
             
-            for chunk in chunks:
-                chunk_summary = await self._generate_chunk_summary(chunk, language, model)
-                chunk_summaries.append(chunk_summary)
+            for position, group in enumerate(groups):
+                combined = "\n".join(nodes[index]["summary"] for index in group)
+                group_summary = await self._generate_final_summary(
+                    combined,
+                    language,
+                    model,
+                    route=ROUTE_REDUCE if is_root else ROUTE_MAP,
+                    document_tokens=document_tokens
+                )
+                parent = self._make_summary_node(
+                    level,
+                    position,
+                    nodes[group[0]]["start_offset"],
+                    nodes[group[-1]]["end_offset"],
+                    combined,
+                    sum(nodes[index]["token_count"] for index in group),
+                    group_summary
+                )
+                nodes.append(parent)
+                for index in group:
+                    nodes[index]["parent"] = len(nodes) - 1
+                next_level.append(len(nodes) - 1)
             
-            # 청크 요약들을 다시 요약
-            combined_summary = "\n".join(chunk_summaries)
-            return await self._generate_final_summary(combined_summary, language, model)
-        else:
-            return await self._generate_chunk_summary(text, language, model)
+            if is_root:
+                return {"summary": nodes[-1]["summary"], "nodes": nodes}
+            current_level = next_level
+    
+    async def summarize_chunk_summaries(
+        self,
+        chunk_summaries: List[str],
+        language: str = "ko",
+        model: str = None,
+        document_tokens: int = None
+    ) -> str:
+        """저장된 청크 요약으로 최종 요약만 생성 (단일 LLM 호출)"""
+        if not model:
+            model = self.default_model
+        
+        combined = "\n".join(summary for summary in chunk_summaries if summary)
+        return await self._generate_final_summary(
+            combined, language, model, document_tokens=document_tokens
+        )
+    
+    async def summarize_chunk(self, text: str, language: str = "ko", model: str = None) -> str:
+        """단일 청크 요약 (map 단계)"""
+        if not model:
+            model = self.default_model
+        
+        return await self._generate_chunk_summary(text, language, model, route=ROUTE_MAP)
+    
+    def _make_summary_node(
+        self,
+        level: int,
+        position: int,
+        start_offset: int,
+        end_offset: int,
+        content: str,
+        token_count: int,
+        summary: str
+    ) -> Dict[str, Any]:
+        """요약 트리 노드 생성"""
+        return {
+            "level": level,
+            "position": position,
+            "start_offset": start_offset,
+            "end_offset": end_offset,
+            "token_count": token_count,
+            "content_hash": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "summary": summary,
+            "parent": None
+        }
+    
+    def _group_by_tokens(
+        self,
+        nodes: List[Dict[str, Any]],
+        indices: List[int],
+        max_tokens: int
+    ) -> List[List[int]]:
+        """요약 노드를 합친 토큰 수가 한도를 넘지 않도록 그룹화"""
+        groups = []
+        current = []
+        current_tokens = 0
+        
+        for index in indices:
+            summary_tokens = self.count_tokens(nodes[index]["summary"] or "")
+            if current and current_tokens + summary_tokens > max_tokens:
+                groups.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += summary_tokens
+        
+        if current:
+            groups.append(current)
+        
+        # 한 단계에서 줄어들지 않으면 무한 반복을 막기 위해 전부 합침
+        if len(groups) == len(indices) and len(groups) > 1:
+            return [list(indices)]
+        return groups
     
-    async def _generate_chunk_summary(self, text: str, language: str, model: str) -> str:
+    async def _generate_chunk_summary(
+        self,
+        text: str,
+        language: str,
+        model: str,
+        route: str = ROUTE_MAP,
+        document_tokens: int = None
+    ) -> str:
         """텍스트 청크 요약"""
         prompt = self._get_summary_prompt(language)
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=model,
+            return await self._chat_completion(
+                route,
+                model,
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": text}
                 ],
                 max_tokens=500,
-                temperature=self.temperature
+                temperature=self.temperature,
+                document_tokens=document_tokens
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f"요약 생성 실패: {str(e)}")
             return ""
     
-    async def _generate_final_summary(self, combined_text: str, language: str, model: str) -> str:
+    async def _generate_final_summary(
+        self,
+        combined_text: str,
+        language: str,
+        model: str,
+        route: str = ROUTE_REDUCE,
+        document_tokens: int = None
+    ) -> str:
         """최종 요약 생성"""
         prompt = self._get_final_summary_prompt(language)
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=model,
+            return await self._chat_completion(
+                route,
+                model,
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": combined_text}
                 ],
                 max_tokens=800,
-                temperature=self.temperature
+                temperature=self.temperature,
+                document_tokens=document_tokens
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f"최종 요약 생성 실패: {str(e)}")
             return combined_text[:1000] + "..."
@@ -193,7 +648,8 @@ class AIAnalyzer:
         text: str, 
         language: str = "ko", 
         model: str = None,
-        num_questions: int = 5
+        num_questions: int = 5,
+        document_tokens: int = None
     ) -> List[Dict[str, Any]]:
         """Q&A 쌍 생성"""
         if not model:
@@ -202,17 +658,17 @@ class AIAnalyzer:
         prompt = self._get_qa_prompt(language, num_questions)
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=model,
+            qa_text = await self._chat_completion(
+                ROUTE_QA,
+                model,
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": text}
                 ],
                 max_tokens=1000,
-                temperature=self.temperature
+                temperature=self.temperature,
+                document_tokens=document_tokens
             )
-            
-            qa_text = response.choices[0].message.content.strip()
             return self._parse_qa_response(qa_text)
             
         except Exception as e:
@@ -224,7 +680,8 @@ class AIAnalyzer:
         text: str, 
         language: str = "ko", 
         model: str = None,
-        max_keywords: int = 15
+        max_keywords: int = 15,
+        document_tokens: int = None
     ) -> List[Dict[str, Any]]:
         """AI 기반 키워드 추출"""
         if not model:
@@ -233,29 +690,117 @@ class AIAnalyzer:
         prompt = self._get_keyword_prompt(language, max_keywords)
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=model,
+            keywords_text = await self._chat_completion(
+                ROUTE_KEYWORDS,
+                model,
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": text}
                 ],
                 max_tokens=500,
-                temperature=0.3  # 키워드 추출은 낮은 temperature 사용
+                temperature=0.3,  # 키워드 추출은 낮은 temperature 사용
+                document_tokens=document_tokens
             )
-            
-            keywords_text = response.choices[0].message.content.strip()
             return self._parse_keywords_response(keywords_text)
             
         except Exception as e:
             logger.error(f"키워드 추출 실패: {str(e)}")
             return []
     
+    async def merge_keywords(
+        self,
+        partial_keywords: List[List[Dict[str, Any]]],
+        max_keywords: int = 15
+    ) -> List[Dict[str, Any]]:
+        """
+        페이지 범위별 키워드 병합
+        
+        같은 키워드(대소문자 무시)는 하나로 합쳐 등장한 범위 수를 frequency로,
+        가장 높은 중요도를 importance로 사용한다. 여러 범위에 걸쳐 나온
+        키워드를 우선한다.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for keywords in partial_keywords:
+            for item in keywords or []:
+                keyword = (item.get("keyword") or "").strip()
+                if not keyword:
+                    continue
+                entry = merged.setdefault(keyword.lower(), {
+                    "keyword": keyword,
+                    "frequency": 0,
+                    "importance": 0.0
+                })
+                entry["frequency"] += item.get("frequency") or 1
+                entry["importance"] = max(entry["importance"], item.get("importance") or 0.0)
+        
+        ranked = sorted(
+            merged.values(),
+            key=lambda entry: (entry["frequency"] * entry["importance"], entry["importance"]),
+            reverse=True
+        )
+        return ranked[:max_keywords]
+    
+    async def merge_qa_pairs(
+        self,
+        partial_qa_pairs: List[List[Dict[str, Any]]],
+        max_qa_pairs: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        페이지 범위별 Q&A 병합
+        
+        같은 질문(공백/대소문자 무시)은 처음 나온 것만 남긴다. 한 범위의
+        Q&A가 결과를 독차지하지 않도록 범위를 번갈아 가며 고르고, 그 안에서
+        신뢰도가 높은 것을 우선한다.
+        """
+        seen = set()
+        interleaved: List[Dict[str, Any]] = []
+        depth = max((len(pairs or []) for pairs in partial_qa_pairs), default=0)
+        for index in range(depth):
+            for pairs in partial_qa_pairs:
+                if index >= len(pairs or []):
+                    continue
+                pair = pairs[index]
+                question = " ".join((pair.get("question") or "").split()).lower()
+                if not question or question in seen:
+                    continue
+                seen.add(question)
+                interleaved.append(pair)
+        
+        # 정렬은 안정적이므로 같은 신뢰도에서는 범위를 번갈아 고른 순서가 유지됨
+        ranked = sorted(interleaved, key=lambda pair: pair.get("confidence") or 0.0, reverse=True)
+        return ranked[:max_qa_pairs]
+    
+    async def merge_important_sentences(
+        self,
+        partial_sentences: List[List[Dict[str, Any]]],
+        max_sentences: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        페이지 범위별 중요 문장 병합
+        
+        같은 문장은 중요도가 가장 높은 것만 남기고, 중요도 순으로 고른 뒤
+        페이지 순서로 돌려준다.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for sentences in partial_sentences:
+            for item in sentences or []:
+                sentence = " ".join((item.get("sentence") or "").split())
+                if not sentence:
+                    continue
+                current = merged.get(sentence)
+                if current is None or (item.get("importance") or 0.0) > (current.get("importance") or 0.0):
+                    merged[sentence] = item
+        
+        ranked = sorted(merged.values(), key=lambda item: item.get("importance") or 0.0, reverse=True)
+        return sorted(ranked[:max_sentences], key=lambda item: item.get("page") or 0)
+    
     async def extract_important_sentences_ai(
         self, 
         text: str, 
         language: str = "ko", 
         model: str = None,
-        max_sentences: int = 8
+        max_sentences: int = 8,
+        document_tokens: int = None
     ) -> List[Dict[str, Any]]:
         """AI 기반 중요 문장 추출"""
         if not model:
@@ -264,23 +809,60 @@ class AIAnalyzer:
         prompt = self._get_important_sentences_prompt(language, max_sentences)
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=model,
+            sentences_text = await self._chat_completion(
+                ROUTE_SENTENCES,
+                model,
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": text}
                 ],
                 max_tokens=800,
-                temperature=0.3
+                temperature=0.3,
+                document_tokens=document_tokens
             )
-            
-            sentences_text = response.choices[0].message.content.strip()
             return self._parse_sentences_response(sentences_text)
             
         except Exception as e:
             logger.error(f"중요 문장 추출 실패: {str(e)}")
             return []
     
+    async def answer_question(
+        self,
+        question: str,
+        passages: List[str],
+        language: str = "ko",
+        model: str = None
+    ) -> Tuple[str, str]:
+        """
+        검색된 발췌를 근거로 자유 질문에 답변
+        
+        Args:
+            question: 사용자 질문
+            passages: 관련도 순 문서 발췌 (번호는 1부터)
+            language: 언어 코드
+            model: 상한 모델
+        
+        Returns:
+            (발췌 번호 인용이 포함된 답변, 실제로 호출한 모델)
+        """
+        if not model:
+            model = self.default_model
+        
+        context = "\n\n".join(
+            f"[{number}] {passage}" for number, passage in enumerate(passages, 1)
+        )
+        
+        return await self._routed_completion(
+            ROUTE_QA,
+            model,
+            messages=[
+                {"role": "system", "content": self._get_answer_prompt(language)},
+                {"role": "user", "content": f"{context}\n\n질문: {question}" if language == "ko" else f"{context}\n\nQuestion: {question}"}
+            ],
+            max_tokens=800,
+            temperature=0.3
+        )
+    
     def _get_summary_prompt(self, language: str) -> str:
         """요약 프롬프트 생성"""
         if language == "ko":
@@ -354,6 +936,23 @@ A2: [Answer]
 
 ...continue"""
     
+    def _get_answer_prompt(self, language: str) -> str:
+        """질의응답 프롬프트 생성"""
+        if language == "ko":
+            return """당신은 문서 질의응답 도우미입니다. 번호가 매겨진 문서 발췌만 근거로 질문에 답해주세요.
+
+규칙:
+1. 발췌에 없는 내용은 추측하지 말고 "문서에서 찾을 수 없습니다"라고 답변
+2. 근거로 사용한 발췌 번호를 [1], [2]처럼 문장 끝에 표시
+3. 간결하고 정확하게 작성"""
+        else:
+            return """You are a document Q&A assistant. Answer the question using only the numbered document excerpts.
+
+Rules:
+1. If the excerpts do not contain the answer, say "Not found in the document" instead of guessing
+2. Cite the excerpt numbers you used like [1], [2] at the end of sentences
+3. Be concise and accurate"""
+    
     def _get_keyword_prompt(self, language: str, max_keywords: int) -> str:
         """키워드 프롬프트 생성"""
         if language == "ko":
@@ -0,0 +1,89 @@
+"""
+파이프라인 단계 체크포인트 저장소
+"""
+
+import os
+import gzip
+import json
+import shutil
+import logging
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    문서 처리 단계별 결과를 파일로 저장
+    
+    체크포인트는 {기본 디렉토리}/{문서 ID}/{단계}.json.gz 에 gzip JSON으로
+    저장되며, 입력이 바뀌었는지 확인하기 위한 key를 함께 기록한다.
+    """
+    
+    def __init__(self, base_dir: str = None):
+        self.base_dir = base_dir or settings.PIPELINE_CHECKPOINT_DIR
+    
+    def _document_dir(self, document_id: uuid.UUID) -> str:
+        return os.path.join(self.base_dir, str(document_id))
+    
+    def _path(self, document_id: uuid.UUID, stage: str) -> str:
+        return os.path.join(self._document_dir(document_id), f"{stage}.json.gz")
+    
+    def load(self, document_id: uuid.UUID, stage: str, key: str) -> Optional[Any]:
+        """
+        체크포인트 조회
+        
+        Returns:
+            저장된 단계 결과 (없거나 key가 다르면 None)
+        """
+        path = self._path(document_id, stage)
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except Exception as e:
+            logger.warning(f"체크포인트 읽기 실패 - 무시: {path} ({str(e)})")
+            return None
+        
+        if payload.get("key") != key:
+            return None
+        return payload.get("data")
+    
+    def save(self, document_id: uuid.UUID, stage: str, key: str, data: Any):
+        """체크포인트 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = self._document_dir(document_id)
+        os.makedirs(directory, exist_ok=True)
+        
+        payload = {
+            "key": key,
+            "stage": stage,
+            "saved_at": datetime.utcnow().isoformat(),
+            "data": data
+        }
+        
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+            os.replace(temp_path, self._path(document_id, stage))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def discard(self, document_id: uuid.UUID, stage: str):
+        """특정 단계의 체크포인트 삭제"""
+        path = self._path(document_id, stage)
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def clear(self, document_id: uuid.UUID):
+        """문서의 모든 체크포인트 삭제"""
+        shutil.rmtree(self._document_dir(document_id), ignore_errors=True)
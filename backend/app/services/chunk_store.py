@@ -0,0 +1,177 @@
+"""
+문서 청크 저장소 서비스 (요약 트리 영속화 및 재사용)
+"""
+
+import bisect
+import logging
+import uuid
+from typing import List, Dict, Optional, Any
+
+from sqlalchemy.orm import Session
+
+from app.models.document_chunk import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkStore:
+    """문서 청크/요약 트리 저장소"""
+    
+    def build_page_offsets(self, pages: List[Dict[str, Any]], text_length: int) -> List[int]:
+        """
+        페이지별 시작 오프셋 계산
+        
+        정제 과정에서 문자 수가 달라지므로 원문 페이지 길이의 비율로
+        cleaned_text 상의 페이지 시작 위치를 근사한다.
+        
+        Args:
+            pages: PDF 추출 결과의 페이지 목록 ({"page": int, "text": str})
+            text_length: cleaned_text 길이
+        
+        Returns:
+            페이지 순서대로의 시작 오프셋 목록
+        """
+        if not pages:
+            return []
+        
+        lengths = [len(page.get("text") or "") + 2 for page in pages]  # "\n\n" 구분자 포함
+        total = sum(lengths) or 1
+        
+        offsets = []
+        cumulative = 0
+        for length in lengths:
+            offsets.append(int(cumulative / total * text_length))
+            cumulative += length
+        return offsets
+    
+    def page_for_offset(self, page_offsets: List[int], offset: int) -> Optional[int]:
+        """오프셋이 속한 페이지 번호 (1부터 시작)"""
+        if not page_offsets:
+            return None
+        return max(1, bisect.bisect_right(page_offsets, offset))
+    
+    def save_tree(
+        self,
+        db: Session,
+        document_id: uuid.UUID,
+        nodes: List[Dict[str, Any]],
+        page_offsets: Optional[List[int]] = None,
+        language: Optional[str] = None,
+        summary_model: Optional[str] = None
+    ) -> List[DocumentChunk]:
+        """
+        요약 트리 저장 (기존 트리는 교체)
+        
+        Args:
+            db: 데이터베이스 세션
+            document_id: 문서 ID
+            nodes: AIAnalyzer.build_summary_tree가 반환한 노드 목록
+            page_offsets: 페이지별 시작 오프셋
+            language: 언어 코드
+            summary_model: 요약에 사용한 모델
+        
+        Returns:
+            저장된 청크 목록 (nodes와 같은 순서)
+        """
+        if not nodes:
+            return []
+        
+        self.delete_tree(db, document_id)
+        
+        chunks = []
+        for node in nodes:
+            end_offset = max(node["start_offset"], node["end_offset"] - 1)
+            chunks.append(DocumentChunk(
+                id=uuid.uuid4(),
+                document_id=document_id,
+                level=node["level"],
+                position=node["position"],
+                start_offset=node["start_offset"],
+                end_offset=node["end_offset"],
+                page_start=self.page_for_offset(page_offsets, node["start_offset"]),
+                page_end=self.page_for_offset(page_offsets, end_offset),
+                token_count=node.get("token_count"),
+                content_hash=node["content_hash"],
+                summary=node.get("summary"),
+                summary_model=summary_model,
+                language=language
+            ))
+        
+        # 부모 링크 연결 (부모 노드는 항상 자식보다 뒤에 위치)
+        for node, chunk in zip(nodes, chunks):
+            if node.get("parent") is not None:
+                chunk.parent_id = chunks[node["parent"]].id
+        
+        db.add_all(chunks)
+        return chunks
+    
+    def delete_tree(self, db: Session, document_id: uuid.UUID):
+        """문서의 요약 트리 삭제"""
+        db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == document_id
+        ).delete(synchronize_session=False)
+    
+    def get_leaves(
+        self,
+        db: Session,
+        document_id: uuid.UUID,
+        page_start: Optional[int] = None,
+        page_end: Optional[int] = None
+    ) -> List[DocumentChunk]:
+        """원본 청크(leaf) 조회 (페이지 범위 필터 선택)"""
+        query = db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == document_id,
+            DocumentChunk.level == 0
+        )
+        
+        if page_start is not None:
+            query = query.filter(DocumentChunk.page_end >= page_start)
+        if page_end is not None:
+            query = query.filter(DocumentChunk.page_start <= page_end)
+        
+        return query.order_by(DocumentChunk.position).all()
+    
+    def get_root(self, db: Session, document_id: uuid.UUID) -> Optional[DocumentChunk]:
+        """최상위 요약 노드 조회"""
+        return db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == document_id,
+            DocumentChunk.parent_id.is_(None)
+        ).order_by(DocumentChunk.level.desc()).first()
+    
+    def get_chunks(self, db: Session, document_id: uuid.UUID) -> List[DocumentChunk]:
+        """요약 트리 전체 조회 (레벨, 순서 기준 정렬)"""
+        return db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == document_id
+        ).order_by(DocumentChunk.level, DocumentChunk.position).all()
+    
+    async def ensure_leaf_summaries(
+        self,
+        leaves: List[DocumentChunk],
+        text: str,
+        ai_analyzer,
+        language: str,
+        model: Optional[str] = None
+    ) -> List[str]:
+        """
+        leaf 요약 반환 (요약이 비어 있는 청크만 다시 생성, 저장은 호출자가 커밋)
+        
+        Args:
+            leaves: 원본 청크 목록
+            text: cleaned_text
+            ai_analyzer: AIAnalyzer 인스턴스
+            language: 언어 코드
+            model: 상한 모델
+        
+        Returns:
+            청크 순서대로의 요약 목록
+        """
+        summaries = []
+        for leaf in leaves:
+            if not leaf.has_summary and text:
+                logger.info(f"청크 요약 누락 - 재생성: {leaf.id}")
+                leaf.summary = await ai_analyzer.summarize_chunk(
+                    text[leaf.start_offset:leaf.end_offset], language, model
+                )
+            summaries.append(leaf.summary or "")
+        
+        return summaries
@@ -0,0 +1,189 @@
+"""
+이어 올리기(resumable) 업로드 서비스
+"""
+
+import os
+import re
+import math
+import uuid
+import shutil
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
+
+import aiofiles.os
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.upload_session import UploadSession, UploadSessionStatus
+from app.schemas.document import UploadSessionCreate
+from app.services.upload_writer import upload_writer, StoredFile, FileTooLargeError
+
+logger = logging.getLogger(__name__)
+
+PART_PATTERN = re.compile(r"^(\d+)\.part$")
+
+
+class ChunkError(Exception):
+    """조각 업로드/병합 오류 (사용자에게 보여줄 메시지)"""
+    pass
+
+
+class ChunkedUploadService:
+    """
+    조각 단위 업로드 관리
+    
+    조각은 {세션 디렉토리}/{세션 ID}/{번호}.part 로 저장된다. 임시 파일에
+    끝까지 받은 뒤 이름을 바꾸므로, 같은 조각을 동시에 올리거나 중간에
+    끊겨도 완전한 조각만 받은 것으로 집계된다. 받은 조각 목록은 파일
+    시스템에서 바로 계산하므로 조각마다 DB를 갱신하지 않는다.
+    """
+    
+    def __init__(self, base_dir: str = None):
+        self.base_dir = base_dir or settings.UPLOAD_SESSION_DIR
+        self.default_chunk_size = settings.UPLOAD_SESSION_CHUNK_SIZE
+        self.min_chunk_size = settings.UPLOAD_SESSION_MIN_CHUNK_SIZE
+        self.max_chunk_size = settings.UPLOAD_SESSION_MAX_CHUNK_SIZE
+        self.session_ttl = settings.UPLOAD_SESSION_TTL
+    
+    def _session_dir(self, session_id: uuid.UUID) -> str:
+        return os.path.join(self.base_dir, str(session_id))
+    
+    def _part_path(self, session_id: uuid.UUID, index: int) -> str:
+        return os.path.join(self._session_dir(session_id), f"{index}.part")
+    
+    def create_session(self, db: Session, user: User, request: UploadSessionCreate) -> UploadSession:
+        """
+        업로드 세션 생성 (커밋은 호출자가 수행)
+        
+        Raises:
+            ChunkError: 조각 크기가 허용 범위를 벗어난 경우
+        """
+        chunk_size = request.chunk_size or self.default_chunk_size
+        if not self.min_chunk_size <= chunk_size <= self.max_chunk_size:
+            raise ChunkError(
+                f"조각 크기는 {self.min_chunk_size}~{self.max_chunk_size} 바이트여야 합니다"
+            )
+        
+        session = UploadSession(
+            user_id=user.id,
+            original_filename=request.filename,
+            mime_type=request.content_type,
+            total_size=request.total_size,
+            chunk_size=chunk_size,
+            total_chunks=max(1, math.ceil(request.total_size / chunk_size)),
+            file_hash=request.sha256,
+            options=request.options,
+            expires_at=datetime.utcnow() + timedelta(seconds=self.session_ttl)
+        )
+        db.add(session)
+        db.flush()
+        os.makedirs(self._session_dir(session.id), exist_ok=True)
+        return session
+    
+    def received_chunks(self, session: UploadSession) -> List[int]:
+        """완전히 받은 조각 번호 목록"""
+        directory = self._session_dir(session.id)
+        if not os.path.isdir(directory):
+            return []
+        
+        received = []
+        for name in os.listdir(directory):
+            match = PART_PATTERN.match(name)
+            if match is None:
+                continue
+            index = int(match.group(1))
+            if index < session.total_chunks:
+                received.append(index)
+        return sorted(received)
+    
+    def missing_chunks(self, session: UploadSession, received: Optional[List[int]] = None) -> List[int]:
+        """아직 받지 못한 조각 번호 목록"""
+        received = set(self.received_chunks(session) if received is None else received)
+        return [index for index in range(session.total_chunks) if index not in received]
+    
+    async def save_chunk(
+        self,
+        session: UploadSession,
+        index: int,
+        body: AsyncIterator[bytes],
+        checksum: Optional[str] = None
+    ) -> StoredFile:
+        """
+        조각 저장 (같은 조각을 다시 올리면 덮어씀)
+        
+        Args:
+            session: 업로드 세션
+            index: 조각 번호 (0부터)
+            body: 조각 본문 스트림
+            checksum: 조각 SHA-256 (있으면 검증)
+        
+        Raises:
+            ChunkError: 번호/크기/해시가 맞지 않는 경우
+        """
+        if not 0 <= index < session.total_chunks:
+            raise ChunkError(f"조각 번호는 0~{session.total_chunks - 1} 사이여야 합니다")
+        
+        expected = session.chunk_length(index)
+        temp_path = os.path.join(self._session_dir(session.id), f"{index}.{uuid.uuid4().hex}.tmp")
+        try:
+            stored = await upload_writer.save_stream(body, temp_path, max_size=expected)
+        except FileTooLargeError:
+            raise ChunkError(f"조각 {index}의 크기는 {expected} 바이트여야 합니다")
+        
+        try:
+            if stored.size != expected:
+                raise ChunkError(f"조각 {index}의 크기는 {expected} 바이트여야 합니다 (받은 크기: {stored.size})")
+            if checksum and stored.file_hash != checksum.lower():
+                raise ChunkError(f"조각 {index}의 해시가 일치하지 않습니다")
+            await aiofiles.os.replace(temp_path, self._part_path(session.id, index))
+        except BaseException:
+            await upload_writer.remove(temp_path)
+            raise
+        
+        stored.path = self._part_path(session.id, index)
+        return stored
+    
+    async def assemble(self, session: UploadSession, path: str) -> StoredFile:
+        """
+        조각 병합 및 검증
+        
+        Raises:
+            ChunkError: 조각이 모자라거나 전체 해시가 맞지 않는 경우
+        """
+        missing = self.missing_chunks(session)
+        if missing:
+            raise ChunkError(f"받지 못한 조각이 있습니다: {missing[:20]}")
+        
+        parts = [self._part_path(session.id, index) for index in range(session.total_chunks)]
+        stored = await upload_writer.concatenate(parts, path)
+        
+        if stored.size != session.total_size or (session.file_hash and stored.file_hash != session.file_hash):
+            await upload_writer.remove(path)
+            raise ChunkError("병합한 파일의 크기 또는 해시가 일치하지 않습니다")
+        return stored
+    
+    def discard(self, session_id: uuid.UUID):
+        """세션의 조각 파일 삭제"""
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+    
+    def cleanup_expired(self, db: Session) -> int:
+        """만료된 세션 정리 (조각 파일 삭제 후 만료 처리)"""
+        expired = db.query(UploadSession).filter(
+            UploadSession.status.in_([UploadSessionStatus.ACTIVE, UploadSessionStatus.ASSEMBLING]),
+            UploadSession.expires_at < datetime.utcnow()
+        ).all()
+        
+        for session in expired:
+            self.discard(session.id)
+            session.status = UploadSessionStatus.EXPIRED
+        db.commit()
+        
+        if expired:
+            logger.info(f"만료된 업로드 세션 {len(expired)}개 정리")
+        return len(expired)
+
+
+# 프로세스 전역 인스턴스
+chunked_upload_service = ChunkedUploadService()
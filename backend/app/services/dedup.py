@@ -0,0 +1,243 @@
+"""
+내용 해시 기반 업로드 중복 제거 서비스
+"""
+
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.document import Document, DocumentStatus
+from app.models.analysis import Analysis
+from app.models.document_chunk import DocumentChunk
+from app.models.search_index import DocumentSearchIndex
+from app.models.stored_blob import StoredBlob
+from app.schemas.analysis import AnalysisOptions
+
+logger = logging.getLogger(__name__)
+
+# 복제하지 않는 Analysis 컬럼
+ANALYSIS_SKIP_COLUMNS = {"id", "document_id", "created_at", "updated_at"}
+
+
+class DedupService:
+    """
+    같은 파일의 저장과 분석을 한 번만 수행
+    
+    - 저장: 같은 SHA-256의 파일은 하나의 저장소 객체를 참조 카운트로 공유
+    - 분석: 완료된 문서 중 같은 해시이고 요청한 모델/구성 요소를 만족하는
+      분석이 있으면 새 문서로 복제해 추출과 LLM 호출을 건너뜀
+    
+    다른 사용자의 결과 재사용은 DEDUP_CROSS_USER로 끌 수 있다. 복제는 분석
+    결과만 새 문서 소유로 복사하며 원본 문서나 소유자 정보, 피드백/내보내기
+    기록은 노출하지 않는다.
+    """
+    
+    def __init__(self):
+        self.enabled = settings.DEDUP_ENABLED
+        self.cross_user = settings.DEDUP_CROSS_USER
+    
+    # ------------------------------------------------------------------
+    # 저장소 참조 카운트
+    # ------------------------------------------------------------------
+    
+    def acquire_existing(self, db: Session, file_hash: Optional[str]) -> Optional[str]:
+        """
+        같은 내용의 파일이 이미 저장되어 있으면 참조를 늘리고 그 키를 반환
+        
+        Returns:
+            기존 저장소 키 (없으면 None)
+        """
+        if not self.enabled or not file_hash:
+            return None
+        
+        blob = db.query(StoredBlob).filter(
+            StoredBlob.file_hash == file_hash
+        ).with_for_update().first()
+        if blob is None:
+            return None
+        
+        blob.ref_count += 1
+        db.flush()
+        return blob.storage_key
+    
+    def register(self, db: Session, file_hash: Optional[str], file_size: int, storage_key: str) -> str:
+        """
+        새로 저장한 파일 등록
+        
+        동시에 같은 파일이 등록되었으면 먼저 등록된 쪽을 참조하고 그 키를
+        반환한다 (호출자는 반환된 키가 다르면 자신이 저장한 파일을 지워야 함).
+        """
+        if not self.enabled or not file_hash:
+            return storage_key
+        
+        try:
+            with db.begin_nested():
+                db.add(StoredBlob(
+                    file_hash=file_hash,
+                    storage_key=storage_key,
+                    file_size=file_size,
+                    ref_count=1
+                ))
+            return storage_key
+        except IntegrityError:
+            return self.acquire_existing(db, file_hash) or storage_key
+    
+    def release(self, db: Session, document: Document) -> bool:
+        """
+        문서가 참조하던 파일의 참조 해제 (커밋은 호출자가 수행)
+        
+        Returns:
+            저장소 파일을 삭제해야 하는지 여부
+        """
+        if not document.storage_key:
+            return False
+        
+        blob = db.query(StoredBlob).filter(
+            StoredBlob.storage_key == document.storage_key
+        ).with_for_update().first()
+        if blob is None:
+            # 해시 없이 저장된 파일 (직접 업로드 등)
+            return True
+        
+        blob.ref_count -= 1
+        if blob.ref_count > 0:
+            return False
+        db.delete(blob)
+        return True
+    
+    # ------------------------------------------------------------------
+    # 분석 결과 재사용
+    # ------------------------------------------------------------------
+    
+    def find_reusable(
+        self,
+        db: Session,
+        file_hash: Optional[str],
+        user: User,
+        options: Optional[AnalysisOptions] = None
+    ) -> Optional[Tuple[Document, Analysis]]:
+        """
+        재사용할 수 있는 완료 문서와 분석
+        
+        정책:
+        - 같은 사용자의 문서를 우선하고, DEDUP_CROSS_USER이면 다른 사용자 문서도 사용
+        - 프리미엄 모델을 요청했으면 프리미엄 모델로 만든 분석만 사용
+        - 요청한 구성 요소가 모두 채워진 분석만 사용
+        """
+        if not self.enabled or not file_hash:
+            return None
+        
+        options = options or AnalysisOptions()
+        required_model = None
+        if options.use_premium_model and user.is_premium:
+            required_model = settings.OPENAI_MODEL_PREMIUM
+        
+        query = db.query(Document, Analysis).join(
+            Analysis, Analysis.document_id == Document.id
+        ).filter(
+            Document.file_hash == file_hash,
+            Document.status == DocumentStatus.COMPLETED
+        )
+        if not self.cross_user:
+            query = query.filter(Document.user_id == user.id)
+        if required_model:
+            query = query.filter(Analysis.ai_model == required_model)
+        
+        candidates = query.order_by(
+            (Document.user_id == user.id).desc(),
+            desc(Analysis.created_at)
+        ).limit(settings.DEDUP_CANDIDATE_LIMIT).all()
+        
+        components = options.selected_components()
+        for document, analysis in candidates:
+            if all(getattr(analysis, component) for component in components):
+                return document, analysis
+        return None
+    
+    def clone(self, db: Session, source: Document, analysis: Analysis, target: Document) -> Analysis:
+        """
+        분석 결과, 요약 트리, 검색 인덱스를 대상 문서로 복제하고 완료 처리
+        
+        커밋은 호출자가 수행한다.
+        """
+        cloned = Analysis(
+            id=uuid.uuid4(),
+            document_id=target.id,
+            **{
+                column.key: getattr(analysis, column.key)
+                for column in Analysis.__mapper__.column_attrs
+                if column.key not in ANALYSIS_SKIP_COLUMNS
+            }
+        )
+        db.add(cloned)
+        
+        self._clone_chunks(db, source.id, target.id)
+        
+        index = db.query(DocumentSearchIndex).filter(
+            DocumentSearchIndex.document_id == source.id
+        ).first()
+        if index is not None:
+            db.add(DocumentSearchIndex(
+                document_id=target.id,
+                text_hash=index.text_hash,
+                passage_count=index.passage_count,
+                term_count=index.term_count,
+                avg_passage_length=index.avg_passage_length,
+                data=index.data
+            ))
+        
+        target.page_count = source.page_count or target.page_count
+        target.word_count = source.word_count
+        target.language = source.language
+        target.stage_timings = {
+            "dedup": {
+                "status": "cached",
+                "seconds": 0.0,
+                "finished_at": datetime.utcnow().isoformat()
+            }
+        }
+        target.processing_started_at = datetime.utcnow()
+        target.complete_processing(processing_time=0)
+        
+        logger.info(f"동일 파일 분석 재사용: {target.id} (LLM 호출 생략)")
+        return cloned
+    
+    def _clone_chunks(self, db: Session, source_id: uuid.UUID, target_id: uuid.UUID):
+        """요약 트리 복제 (부모가 먼저 저장되도록 상위 레벨부터)"""
+        chunks: List[DocumentChunk] = db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == source_id
+        ).order_by(desc(DocumentChunk.level), DocumentChunk.position).all()
+        if not chunks:
+            return
+        
+        id_map: Dict[uuid.UUID, uuid.UUID] = {chunk.id: uuid.uuid4() for chunk in chunks}
+        copied_columns = [
+            column.key for column in DocumentChunk.__mapper__.column_attrs
+            if column.key not in ("id", "document_id", "parent_id", "created_at", "updated_at")
+        ]
+        
+        current_level = None
+        for chunk in chunks:
+            if current_level is not None and chunk.level != current_level:
+                db.flush()
+            current_level = chunk.level
+            
+            values: Dict[str, Any] = {key: getattr(chunk, key) for key in copied_columns}
+            db.add(DocumentChunk(
+                id=id_map[chunk.id],
+                document_id=target_id,
+                parent_id=id_map.get(chunk.parent_id) if chunk.parent_id else None,
+                **values
+            ))
+        db.flush()
+
+
+# 프로세스 전역 인스턴스
+dedup_service = DedupService()
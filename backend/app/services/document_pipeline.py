@@ -0,0 +1,1062 @@
+"""
+문서 처리 파이프라인 서비스 (워커에서 실행)
+"""
+
+import os
+import time
+import socket
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, desc, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import observe_stage
+from app.models.user import User
+from app.models.document import Document, DocumentStatus
+from app.models.analysis import Analysis
+from app.schemas.analysis import AnalysisOptions
+from app.services.pdf_processor import PDFProcessor
+from app.services.text_cleaner import TextCleaner
+from app.services.ai_analyzer import (
+    AIAnalyzer, COMPONENT_SUMMARY, COMPONENT_KEYWORDS, COMPONENT_QA, COMPONENT_SENTENCES
+)
+from app.services.checkpoint_store import CheckpointStore
+from app.services.chunk_store import ChunkStore
+from app.services.retrieval import BM25Index, RetrievalService
+from app.services.single_flight import single_flight
+from app.services.progress_bus import progress_bus
+from app.services.storage import storage
+from app.services.text_store import text_store
+from app.services.user_stats import user_stats_service
+from app.services.read_cache import read_cache
+
+logger = logging.getLogger(__name__)
+
+# 단계 출력 형식이 바뀌면 올려서 기존 체크포인트를 무효화
+STAGE_VERSION = 2
+
+# 단계별 진행률 가중치 (합계 100)
+STAGE_WEIGHTS = {
+    "text": 15,
+    "images": 3,
+    "tables": 3,
+    "thumbnail": 4,
+    "clean": 10,
+    "analyze": 60,
+    "persist": 5
+}
+
+# 대용량 문서 모드 진행률 가중치 (텍스트 추출/정제/요약 map은 범위 작업에서 수행)
+LARGE_STAGE_WEIGHTS = {
+    "ranges": 65,
+    "images": 3,
+    "tables": 3,
+    "thumbnail": 4,
+    "text": 0,
+    "clean": 0,
+    "analyze": 20,
+    "persist": 5
+}
+
+# 페이지 범위 결과를 이어 붙일 때 사이에 넣는 구분자 (오프셋 계산에 사용)
+RANGE_SEPARATOR = "\n\n"
+
+# 단계 완료 시 사용자에게 보여줄 메시지
+STAGE_MESSAGES = {
+    "text": "텍스트 추출 완료",
+    "images": "이미지 추출 완료",
+    "tables": "표 추출 완료",
+    "thumbnail": "썸네일 생성 완료",
+    "clean": "텍스트 정제 완료",
+    "ranges": "페이지 범위 처리 완료",
+    "analyze": "AI 분석 완료",
+    "persist": "결과 저장 완료"
+}
+
+# CPU 작업용 서비스 (프로세스 풀의 각 프로세스에서 한 번만 생성)
+_cpu_services: Optional[Tuple[PDFProcessor, TextCleaner]] = None
+_cpu_retrieval: Optional[RetrievalService] = None
+
+
+def _get_cpu_services() -> Tuple[PDFProcessor, TextCleaner]:
+    global _cpu_services
+    if _cpu_services is None:
+        _cpu_services = (PDFProcessor(), TextCleaner())
+    return _cpu_services
+
+
+def _get_cpu_retrieval() -> RetrievalService:
+    global _cpu_retrieval
+    if _cpu_retrieval is None:
+        _cpu_retrieval = RetrievalService(AIAnalyzer())
+    return _cpu_retrieval
+
+
+# 프로세스 풀에서 실행되는 CPU 작업 (피클 가능하도록 모듈 함수로 정의)
+def cpu_extract_text(file_path: str) -> Dict[str, Any]:
+    return _get_cpu_services()[0].extract_text(file_path)
+
+
+def cpu_extract_images(file_path: str, output_dir: str) -> List[Dict[str, Any]]:
+    return _get_cpu_services()[0].extract_images(file_path, output_dir)
+
+
+def cpu_extract_tables(file_path: str) -> List[Dict[str, Any]]:
+    return _get_cpu_services()[0].extract_tables(file_path)
+
+
+def cpu_render_thumbnail(file_path: str, output_path: str) -> Dict[str, Any]:
+    return _get_cpu_services()[0].render_thumbnail(file_path, output_path)
+
+
+def cpu_extract_text_range(file_path: str, start_page: int, end_page: int) -> Dict[str, Any]:
+    return _get_cpu_services()[0].extract_text_range(file_path, start_page, end_page)
+
+
+def cpu_clean_text(text: str) -> Dict[str, Any]:
+    return _get_cpu_services()[1].clean_text(text)
+
+
+def cpu_build_search_index(text: str, page_offsets: List[int]) -> BM25Index:
+    return _get_cpu_retrieval().build_index(text, page_offsets)
+
+
+def cpu_page_count(file_path: str) -> int:
+    return _get_cpu_services()[0].get_page_count(file_path)
+
+
+class Stage:
+    """파이프라인 단계 정의"""
+    
+    def __init__(
+        self,
+        name: str,
+        depends_on: Tuple[str, ...] = (),
+        checkpoint: bool = True,
+        optional: bool = False
+    ):
+        self.name = name
+        self.depends_on = depends_on
+        self.checkpoint = checkpoint  # 결과를 체크포인트로 저장할지 여부
+        self.optional = optional  # 실패해도 문서 처리를 계속할지 여부
+
+
+class StageError(Exception):
+    """파이프라인 단계 실패"""
+    
+    def __init__(self, stage: str, error: Exception):
+        self.stage = stage
+        self.error = error
+        super().__init__(f"{stage} 단계 실패: {str(error)}")
+
+
+class PipelineRetry(Exception):
+    """재시도 가능한 실패 (다음 시도는 마지막 성공 단계 이후부터 실행)"""
+    pass
+
+
+def get_worker_id() -> str:
+    """현재 워커 프로세스 ID ("호스트:PID")"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class DocumentPipeline:
+    """
+    문서 처리 파이프라인
+    
+    워커가 lease를 잡은 문서만 처리하며, 처리 중에는 heartbeat로 lease를
+    갱신한다. 워커가 비정상 종료되면 lease가 만료되어 recover_orphans로
+    다시 큐에 들어간다. 각 단계의 결과는 체크포인트로 저장되어 재시도 시
+    마지막으로 성공한 단계 다음부터 실행된다.
+    
+    페이지 수가 LARGE_DOCUMENT_PAGE_THRESHOLD 이상인 문서는 대용량 모드로
+    처리한다. 텍스트 추출, 정제, 요약 map 단계를 페이지 범위 작업으로 나누어
+    여러 워커에 보내고, lease를 잡은 워커는 범위 결과를 모아 통계, 키워드,
+    요약 트리를 하나의 Analysis로 합친다.
+    """
+    
+    # 처리 단계와 의존성 (선언 순서는 의존 단계가 먼저 오도록 유지)
+    STAGES = [
+        Stage("text"),
+        Stage("images", optional=True),
+        Stage("tables", optional=True),
+        Stage("thumbnail", optional=True),
+        Stage("clean", depends_on=("text",)),
+        Stage("analyze", depends_on=("clean",)),
+        Stage(
+            "persist",
+            depends_on=("text", "images", "tables", "thumbnail", "clean", "analyze"),
+            checkpoint=False
+        ),
+    ]
+    
+    # 대용량 문서 모드 단계 (text/clean은 범위 결과를 합치기만 하므로 체크포인트 불필요)
+    LARGE_STAGES = [
+        Stage("ranges", checkpoint=False),  # 범위별 체크포인트는 _stage_ranges에서 관리
+        Stage("images", optional=True),
+        Stage("tables", optional=True),
+        Stage("thumbnail", optional=True),
+        Stage("text", depends_on=("ranges",), checkpoint=False),
+        Stage("clean", depends_on=("ranges",), checkpoint=False),
+        Stage("analyze", depends_on=("ranges", "clean")),
+        Stage(
+            "persist",
+            depends_on=("text", "images", "tables", "thumbnail", "clean", "analyze"),
+            checkpoint=False
+        ),
+    ]
+    
+    def __init__(self):
+        self.pdf_processor = PDFProcessor()
+        self.checkpoints = CheckpointStore()
+        self.ai_analyzer = AIAnalyzer()
+        self.chunk_store = ChunkStore()
+        self.retrieval_service = RetrievalService(self.ai_analyzer)
+        self.lease_ttl = settings.WORKER_LEASE_TTL
+        self.heartbeat_interval = settings.WORKER_HEARTBEAT_INTERVAL
+        self.max_attempts = settings.WORKER_MAX_ATTEMPTS
+        # 저장소 키별 로컬 사본 사용 수 (같은 이벤트 루프의 작업끼리 캐시 파일 공유)
+        self._source_refs: Dict[str, int] = {}
+    
+    def claim(self, db: Session, document_id: uuid.UUID, worker_id: str) -> bool:
+        """
+        문서 처리 lease 획득
+        
+        대기 중이거나 lease가 만료된 처리 중 문서만 원자적으로 가져온다.
+        
+        Returns:
+            lease 획득 여부
+        """
+        now = datetime.utcnow()
+        values = {
+            Document.status: DocumentStatus.PROCESSING,
+            Document.lease_owner: worker_id,
+            Document.lease_expires_at: now + timedelta(seconds=self.lease_ttl),
+            Document.processing_attempts: Document.processing_attempts + 1,
+            Document.processing_started_at: now,
+            Document.error_message: None
+        }
+        
+        # 대기 중 문서 (일괄 UPDATE라 사용자 통계의 상태별 개수를 직접 옮김)
+        user_id = db.execute(
+            update(Document).where(
+                Document.id == document_id,
+                Document.status == DocumentStatus.UPLOADED
+            ).values(values).returning(Document.user_id).execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if user_id is not None:
+            user_stats_service.record_status_change(db, user_id, DocumentStatus.UPLOADED, DocumentStatus.PROCESSING)
+            db.commit()
+            read_cache.invalidate_sync(read_cache.document_key(document_id))
+            return True
+        
+        # lease가 만료된 처리 중 문서 (상태는 그대로)
+        claimed = db.query(Document).filter(
+            Document.id == document_id,
+            Document.status == DocumentStatus.PROCESSING,
+            or_(Document.lease_expires_at.is_(None), Document.lease_expires_at < now)
+        ).update(values, synchronize_session=False)
+        db.commit()
+        if claimed:
+            read_cache.invalidate_sync(read_cache.document_key(document_id))
+        return claimed == 1
+    
+    def renew_lease(self, document_id: uuid.UUID, worker_id: str) -> bool:
+        """lease 연장 (heartbeat, 별도 세션 사용)"""
+        db = SessionLocal()
+        try:
+            renewed = db.query(Document).filter(
+                Document.id == document_id,
+                Document.lease_owner == worker_id
+            ).update({
+                Document.lease_expires_at: datetime.utcnow() + timedelta(seconds=self.lease_ttl)
+            }, synchronize_session=False)
+            db.commit()
+            return renewed == 1
+        finally:
+            db.close()
+    
+    def recover_orphans(self, db: Session) -> List[uuid.UUID]:
+        """
+        lease가 만료된 처리 중 문서 복구
+        
+        재시도 횟수가 남은 문서는 대기 상태로 되돌려 저장된 분석 옵션으로
+        스케줄러에 다시 등록하고, 초과한 문서는 실패 처리한다. 등록한 작업은
+        호출자가 job_scheduler.dispatch로 전달한다.
+        
+        Returns:
+            다시 등록한 문서 ID 목록
+        """
+        from app.services.job_scheduler import job_scheduler
+        
+        now = datetime.utcnow()
+        orphans = db.query(Document).filter(
+            Document.status == DocumentStatus.PROCESSING,
+            or_(
+                Document.lease_expires_at < now,
+                and_(
+                    Document.lease_expires_at.is_(None),
+                    Document.processing_started_at < now - timedelta(seconds=self.lease_ttl)
+                )
+            )
+        ).with_for_update(skip_locked=True).all()
+        
+        requeue = []
+        for document in orphans:
+            document.release_lease()
+            if (document.processing_attempts or 0) >= self.max_attempts:
+                logger.warning(f"처리 시도 횟수 초과 - 실패 처리: {document.id}")
+                document.fail_processing("워커 중단으로 처리 시도 횟수를 초과했습니다")
+            else:
+                logger.info(f"고아 문서 복구: {document.id} (시도 {document.processing_attempts}회)")
+                document.status = DocumentStatus.UPLOADED
+                job_scheduler.resubmit(db, document)
+                requeue.append(document.id)
+        
+        db.commit()
+        return requeue
+    
+    async def process(
+        self,
+        document_id: uuid.UUID,
+        options: Optional[AnalysisOptions] = None,
+        executor: Optional[Executor] = None,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        문서 처리 (단계 DAG 실행)
+        
+        Args:
+            document_id: 문서 ID
+            options: 분석 옵션 (선택하지 않은 구성 요소는 이전 결과를 복사)
+            executor: CPU 작업용 실행기 (None이면 기본 스레드 풀)
+            worker_id: lease 소유자 ID
+        
+        Returns:
+            이 워커가 처리했는지 여부 (다른 워커가 lease를 가진 경우 False)
+        """
+        worker_id = worker_id or get_worker_id()
+        loop = asyncio.get_running_loop()
+        db = SessionLocal()
+        try:
+            if not await loop.run_in_executor(None, self.claim, db, document_id, worker_id):
+                logger.info(f"다른 워커가 처리 중이거나 처리 대상이 아님: {document_id}")
+                return False
+            
+            heartbeat = asyncio.create_task(self._heartbeat(document_id, worker_id))
+            try:
+                await self._run(db, document_id, options or AnalysisOptions(), executor, worker_id)
+            finally:
+                heartbeat.cancel()
+            return True
+        finally:
+            db.close()
+    
+    async def _heartbeat(self, document_id: uuid.UUID, worker_id: str):
+        """처리가 끝날 때까지 주기적으로 lease 갱신"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                renewed = await loop.run_in_executor(None, self.renew_lease, document_id, worker_id)
+                if not renewed:
+                    logger.warning(f"문서 lease를 잃었습니다: {document_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"lease 갱신 실패: {document_id} - {str(e)}")
+    
+    async def process_range(
+        self,
+        document_id: uuid.UUID,
+        start_page: int,
+        end_page: int,
+        params: Dict[str, Any],
+        executor: Optional[Executor] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        대용량 문서의 페이지 범위 처리 (범위 작업을 받은 아무 워커에서 실행)
+        
+        원본 PDF에서 해당 페이지만 읽어 텍스트 추출, 정제, 요약 map, 키워드
+        추출까지 수행한다. 문서 lease와 결과 저장은 문서를 처리 중인 워커가
+        맡으며, 여기서는 결과만 돌려준다.
+        
+        Args:
+            document_id: 문서 ID
+            start_page: 시작 페이지 (1부터 시작)
+            end_page: 끝 페이지 (포함)
+            params: 분석 파라미터 (model, components, max_keywords)
+            executor: CPU 작업용 실행기
+        
+        Returns:
+            범위 결과 (문서가 처리 중이 아니면 None)
+        """
+        loop = asyncio.get_running_loop()
+        document = await loop.run_in_executor(None, self._processing_document, document_id)
+        if document is None:
+            logger.info(f"처리 중인 문서가 아님 - 범위 작업 생략: {document_id} ({start_page}-{end_page})")
+            return None
+        storage_key = document.storage_key
+        
+        try:
+            file_path = await self._source_path(document)
+            text_result = await loop.run_in_executor(
+                executor, cpu_extract_text_range, file_path, start_page, end_page
+            )
+        finally:
+            self._release_source(storage_key)
+        
+        clean_result = await loop.run_in_executor(executor, cpu_clean_text, text_result["text"])
+        clean_result.pop("original_text", None)
+        cleaned_text = clean_result["cleaned_text"]
+        language = clean_result["language"]
+        components = params["components"]
+        
+        summary_nodes: List[Dict[str, Any]] = []
+        keywords: List[Dict[str, Any]] = []
+        qa_pairs: List[Dict[str, Any]] = []
+        important_sentences: List[Dict[str, Any]] = []
+        if cleaned_text.strip():
+            tasks = []
+            if COMPONENT_SUMMARY in components:
+                tasks.append(self.ai_analyzer.map_summary_nodes(cleaned_text, language, params["model"]))
+            if COMPONENT_KEYWORDS in components:
+                tasks.append(self.ai_analyzer.extract_keywords_ai(
+                    cleaned_text, language, params["model"], max_keywords=params["max_keywords"]
+                ))
+            if COMPONENT_QA in components:
+                tasks.append(self.ai_analyzer.generate_qa_pairs(
+                    cleaned_text, language, params["model"], num_questions=params["max_qa_pairs"]
+                ))
+            if COMPONENT_SENTENCES in components:
+                tasks.append(self.ai_analyzer.extract_important_sentences_ai(
+                    cleaned_text, language, params["model"], max_sentences=params["max_sentences"]
+                ))
+            outputs = await asyncio.gather(*tasks)
+            if COMPONENT_SUMMARY in components:
+                summary_nodes = outputs.pop(0)
+            if COMPONENT_KEYWORDS in components:
+                keywords = outputs.pop(0)
+            if COMPONENT_QA in components:
+                qa_pairs = outputs.pop(0)
+            if COMPONENT_SENTENCES in components:
+                # 범위 안에서는 페이지를 알 수 없으므로 범위 시작 페이지로 기록
+                important_sentences = [
+                    {**sentence, "page": start_page} for sentence in outputs.pop(0)
+                ]
+        
+        return {
+            "start_page": start_page,
+            "end_page": end_page,
+            "text": text_result,
+            "clean": clean_result,
+            "summary_nodes": summary_nodes,
+            "keywords": keywords,
+            "qa_pairs": qa_pairs,
+            "important_sentences": important_sentences
+        }
+    
+    def _processing_document(self, document_id: uuid.UUID) -> Optional[Document]:
+        """처리 중인 문서 조회 (별도 세션, 세션을 닫은 뒤의 분리된 객체 반환)"""
+        db = SessionLocal()
+        try:
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if document is None or document.status != DocumentStatus.PROCESSING:
+                return None
+            return document
+        finally:
+            db.close()
+    
+    async def _run(
+        self,
+        db: Session,
+        document_id: uuid.UUID,
+        options: AnalysisOptions,
+        executor: Optional[Executor],
+        worker_id: str
+    ):
+        """
+        lease를 잡은 상태에서 단계 DAG 실행
+        
+        워커의 모든 작업이 이벤트 루프 하나를 공유하므로 DB 접근과 파일 I/O는
+        기본 실행기(I/O 스레드 풀)에서, CPU 작업은 executor에서 실행한다.
+        """
+        loop = asyncio.get_running_loop()
+        document = await loop.run_in_executor(
+            None, lambda: db.query(Document).filter(Document.id == document_id).first()
+        )
+        storage_key = document.storage_key if document else None
+        context = {"progress": 0, "timings": {}}
+        
+        try:
+            file_path = await self._source_path(document)
+            context = await self._build_context(db, document, file_path, options, executor, worker_id)
+            await self._run_stages(context)
+            
+            if context.get("lease_lost"):
+                logger.warning(f"lease를 잃어 결과를 버립니다: {document_id}")
+                await loop.run_in_executor(None, db.rollback)
+                self._release_source(storage_key, keep=True)
+                return
+            
+            document.stage_timings = dict(context["timings"])
+            await loop.run_in_executor(None, db.commit)
+            self._release_source(storage_key)
+            
+            # 완료된 문서의 체크포인트(추출 원문, 분석 결과)는 더 필요 없으므로 삭제
+            await loop.run_in_executor(None, self.checkpoints.clear, document_id)
+            await progress_bus.publish(
+                document_id, "completed", progress=100, message="처리 완료",
+                processing_time=document.processing_time
+            )
+        
+        except Exception as e:
+            # 처리 실패 - 재시도 횟수가 남았으면 체크포인트에서 이어서 재시도
+            logger.error(f"문서 처리 실패: {document_id} - {str(e)}")
+            await loop.run_in_executor(None, db.rollback)
+            document = await loop.run_in_executor(
+                None, lambda: db.query(Document).filter(Document.id == document_id).first()
+            )
+            if document is None or document.lease_owner != worker_id:
+                self._release_source(storage_key, keep=True)
+                return
+            
+            document.stage_timings = dict(context["timings"])
+            document.release_lease()
+            if (document.processing_attempts or 0) < self.max_attempts:
+                document.status = DocumentStatus.UPLOADED
+                document.error_message = str(e)
+                await loop.run_in_executor(None, db.commit)
+                self._release_source(storage_key, keep=True)
+                await progress_bus.publish(
+                    document_id, "retrying", progress=context["progress"], message="처리 재시도 대기 중",
+                    error=str(e), attempt=document.processing_attempts
+                )
+                raise PipelineRetry(str(e)) from e
+            
+            document.fail_processing(str(e))
+            await loop.run_in_executor(None, db.commit)
+            self._release_source(storage_key)
+            await progress_bus.publish(document_id, "failed", progress=context["progress"], message="처리 실패", error=str(e))
+    
+    async def _source_path(self, document: Document) -> str:
+        """
+        처리할 원본 파일의 로컬 경로
+        
+        객체 저장소에 있는 문서는 워커 캐시로 내려받는다 (재시도 동안 캐시 재사용).
+        내려받기 전에 사용 수를 늘리므로 실패해도 _release_source를 호출해야 한다.
+        """
+        if not document.storage_key:
+            return document.file_path
+        key = document.storage_key
+        self._source_refs[key] = self._source_refs.get(key, 0) + 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, storage.local_copy, key)
+    
+    def _release_source(self, storage_key: Optional[str], keep: bool = False):
+        """
+        원본 사본 사용 종료
+        
+        같은 워커에서 문서 처리와 범위 작업이 캐시 파일을 함께 쓰므로 마지막
+        사용자가 끝났을 때만 지운다. keep이면 재시도를 위해 캐시를 남긴다.
+        """
+        if not storage_key:
+            return
+        refs = self._source_refs.get(storage_key, 0) - 1
+        if refs > 0:
+            self._source_refs[storage_key] = refs
+            return
+        self._source_refs.pop(storage_key, None)
+        if keep:
+            return
+        try:
+            storage.release_local_copy(storage_key)
+        except OSError as e:
+            logger.warning(f"저장소 캐시 정리 실패: {storage_key} - {str(e)}")
+    
+    async def _build_context(
+        self,
+        db: Session,
+        document: Document,
+        file_path: str,
+        options: AnalysisOptions,
+        executor: Optional[Executor],
+        worker_id: str
+    ) -> Dict[str, Any]:
+        """단계 실행에 필요한 공용 상태"""
+        loop = asyncio.get_running_loop()
+        user = await loop.run_in_executor(
+            None, lambda: db.query(User).filter(User.id == document.user_id).first()
+        )
+        is_premium = user.is_premium if user else False
+        model = self.ai_analyzer.premium_model if options.use_premium_model and is_premium else None
+        
+        if not document.file_hash:
+            # 해시 없이 직접 업로드된 문서는 처음 처리할 때 계산해 기록
+            document.file_hash = await loop.run_in_executor(
+                None, self.pdf_processor._calculate_file_hash, file_path
+            )
+        file_hash = document.file_hash
+        
+        ranges = None
+        if settings.LARGE_DOCUMENT_ENABLED:
+            page_count = document.page_count or await loop.run_in_executor(executor, cpu_page_count, file_path)
+            if page_count >= settings.LARGE_DOCUMENT_PAGE_THRESHOLD:
+                ranges = self.pdf_processor.split_page_ranges(page_count, settings.LARGE_DOCUMENT_PAGES_PER_RANGE)
+                logger.info(f"대용량 문서 모드: {document.id} ({page_count}페이지, 범위 {len(ranges)}개)")
+        
+        analysis_params = {
+            "model": model or (self.ai_analyzer.premium_model if is_premium else self.ai_analyzer.default_model),
+            "components": options.selected_components(),
+            "max_keywords": options.max_keywords,
+            "max_qa_pairs": options.max_qa_pairs,
+            "max_sentences": options.max_sentences
+        }
+        
+        return {
+            "db": db,
+            "document": document,
+            "document_id": document.id,
+            "file_path": file_path,
+            "artifact_dir": os.path.join(settings.PIPELINE_ARTIFACT_DIR, str(document.id)),
+            "options": options,
+            "executor": executor,
+            "worker_id": worker_id,
+            "model": model,
+            "is_premium": is_premium,
+            "base_key": f"v{STAGE_VERSION}:{file_hash}",
+            "analysis_key": f"v{STAGE_VERSION}:" + single_flight.make_key(file_hash, **analysis_params),
+            "analysis_params": analysis_params,
+            "ranges": ranges,
+            "stages": self.LARGE_STAGES if ranges else self.STAGES,
+            "weights": LARGE_STAGE_WEIGHTS if ranges else STAGE_WEIGHTS,
+            "results": {},
+            "timings": {},
+            "progress": 0,  # 완료된 단계 가중치 합
+            "analyze_fraction": 0.0
+        }
+    
+    async def _run_stages(self, context: Dict[str, Any]):
+        """
+        선언된 의존성에 따라 단계 실행
+        
+        의존 단계가 끝난 단계는 바로 시작하므로 서로 독립인 단계(텍스트,
+        이미지, 표, 썸네일)는 병렬로 실행된다.
+        """
+        tasks: Dict[str, asyncio.Future] = {}
+        for stage in context["stages"]:
+            dependencies = [tasks[name] for name in stage.depends_on]
+            tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, context, dependencies))
+        
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+    
+    async def _run_stage(self, stage: Stage, context: Dict[str, Any], dependencies: List[asyncio.Future]):
+        """단일 단계 실행 (체크포인트가 있으면 재사용)"""
+        if dependencies:
+            await asyncio.gather(*dependencies)
+        
+        loop = asyncio.get_running_loop()
+        document_id = context["document_id"]
+        started = time.monotonic()
+        
+        key = None
+        if stage.checkpoint:
+            key = context["analysis_key"] if stage.name == "analyze" else context["base_key"]
+            cached = await loop.run_in_executor(None, self.checkpoints.load, document_id, stage.name, key)
+            if cached is not None:
+                context["results"][stage.name] = cached
+                self._record_timing(context, stage.name, "cached", started)
+                await self._publish_stage(context, stage.name, "cached")
+                return
+        
+        try:
+            output = await getattr(self, f"_stage_{stage.name}")(context)
+        except Exception as e:
+            self._record_timing(context, stage.name, "failed", started, error=str(e))
+            if stage.optional:
+                logger.warning(f"선택 단계 실패 - 계속 진행: {stage.name} ({document_id}) - {str(e)}")
+                context["results"][stage.name] = None
+                await self._publish_stage(context, stage.name, "failed")
+                return
+            raise StageError(stage.name, e) from e
+        
+        context["results"][stage.name] = output
+        if key is not None:
+            await loop.run_in_executor(None, self.checkpoints.save, document_id, stage.name, key, output)
+        self._record_timing(context, stage.name, "completed", started)
+        await self._publish_stage(context, stage.name, "completed")
+    
+    async def _publish_stage(self, context: Dict[str, Any], stage: str, status: str):
+        """단계 완료 이벤트 발행 (진행률은 완료된 단계 가중치의 누적값)"""
+        context["progress"] += context["weights"].get(stage, 0)
+        data = {"stage": stage, "status": status}
+        if stage == "text" and context["results"].get("text"):
+            data["page_count"] = context["results"]["text"].get("page_count")
+        
+        await progress_bus.publish(
+            context["document_id"],
+            "stage_completed",
+            progress=min(99, context["progress"]),
+            message=STAGE_MESSAGES.get(stage, stage),
+            **data
+        )
+    
+    def _analysis_progress_callback(self, context: Dict[str, Any], component_count: int):
+        """AI 분석 중간 진행 알림 (청크 요약, 구성 요소 완료)"""
+        async def callback(event: str, data: Dict[str, Any]):
+            total = max(1, data.get("total") or 1)
+            if event == "component_done":
+                fraction = data["done"] / total
+            else:
+                # 요약 map 단계는 구성 요소 하나의 진행으로 간주
+                fraction = data["done"] / total / max(1, component_count)
+            context["analyze_fraction"] = max(context["analyze_fraction"], min(1.0, fraction))
+            
+            progress = context["progress"] + int(context["weights"]["analyze"] * context["analyze_fraction"])
+            if event == "component_done":
+                message = f"AI 분석 중 ({data['done']}/{total})"
+            else:
+                message = f"요약 생성 중 ({data['done']}/{total})"
+            await progress_bus.publish(
+                context["document_id"], event, progress=min(99, progress), message=message, **data
+            )
+        return callback
+    
+    def _record_timing(
+        self,
+        context: Dict[str, Any],
+        stage: str,
+        status: str,
+        started: float,
+        error: Optional[str] = None
+    ):
+        """단계별 소요 시간 기록"""
+        timing = {
+            "status": status,
+            "seconds": round(time.monotonic() - started, 3),
+            "finished_at": datetime.utcnow().isoformat()
+        }
+        if error:
+            timing["error"] = error
+        context["timings"][stage] = timing
+        observe_stage(stage, status, timing["seconds"])
+    
+    async def _in_executor(self, context: Dict[str, Any], func, *args) -> Any:
+        """CPU 작업을 프로세스 풀(없으면 스레드 풀)에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(context["executor"], func, *args)
+    
+    async def _stage_ranges(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        페이지 범위 작업을 워커들에 나누어 보내고 결과 수집
+        
+        범위마다 체크포인트를 남기므로 재시도하면 끝나지 않은 범위만 다시 보낸다.
+        실패하거나 취소되면 남은 범위 작업을 취소한다.
+        
+        Returns:
+            페이지 순서대로의 범위 결과 목록
+        """
+        from app.worker import enqueue_page_ranges
+        
+        loop = asyncio.get_running_loop()
+        document_id = context["document_id"]
+        ranges = context["ranges"]
+        key = context["analysis_key"]
+        
+        results: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for page_range in ranges:
+            cached = await loop.run_in_executor(
+                None, self.checkpoints.load, document_id, self._range_stage(page_range), key
+            )
+            if cached is not None:
+                results[page_range] = cached
+        
+        missing = [page_range for page_range in ranges if page_range not in results]
+        pending = dict(zip(
+            missing,
+            await loop.run_in_executor(
+                None, enqueue_page_ranges, document_id, missing, context["analysis_params"]
+            )
+        ))
+        
+        deadline = time.monotonic() + settings.LARGE_DOCUMENT_RANGE_TIMEOUT
+        try:
+            while pending:
+                for page_range, output in await loop.run_in_executor(None, self._collect_ranges, pending):
+                    del pending[page_range]
+                    if output is None:
+                        raise RuntimeError(f"페이지 범위 작업이 결과 없이 끝났습니다: {page_range[0]}-{page_range[1]}")
+                    results[page_range] = output
+                    await loop.run_in_executor(
+                        None, self.checkpoints.save, document_id, self._range_stage(page_range), key, output
+                    )
+                    await self._publish_range(context, len(results), len(ranges))
+                
+                if pending:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError("페이지 범위 처리 시간이 초과되었습니다")
+                    await asyncio.sleep(settings.LARGE_DOCUMENT_POLL_INTERVAL)
+        except BaseException:
+            for async_result in pending.values():
+                async_result.revoke()
+            raise
+        
+        return [results[page_range] for page_range in ranges]
+    
+    def _range_stage(self, page_range: Tuple[int, int]) -> str:
+        """범위 결과 체크포인트 이름"""
+        return f"range_{page_range[0]}_{page_range[1]}"
+    
+    def _collect_ranges(self, pending: Dict[Tuple[int, int], Any]) -> List[Tuple[Tuple[int, int], Any]]:
+        """
+        끝난 범위 작업의 결과 (블로킹 호출이므로 실행기에서 실행)
+        
+        범위 작업이 재시도 끝에 실패했으면 그 예외가 그대로 전파된다.
+        """
+        finished = []
+        for page_range, async_result in pending.items():
+            if async_result.ready():
+                finished.append((page_range, async_result.get(disable_sync_subtasks=False)))
+        return finished
+    
+    async def _publish_range(self, context: Dict[str, Any], done: int, total: int):
+        """범위 작업 진행 알림"""
+        progress = context["progress"] + int(context["weights"]["ranges"] * done / max(1, total))
+        await progress_bus.publish(
+            context["document_id"],
+            "range_completed",
+            progress=min(99, progress),
+            message=f"페이지 범위 처리 중 ({done}/{total})",
+            done=done,
+            total=total
+        )
+    
+    def _merge_range_text(self, range_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """범위별 추출 결과를 문서 전체 추출 결과 형식으로 병합"""
+        full_text = RANGE_SEPARATOR.join(result["text"]["text"] for result in range_results)
+        return {
+            "text": full_text,
+            "pages": [page for result in range_results for page in result["text"]["pages"]],
+            "page_count": range_results[-1]["text"]["page_count"] if range_results else 0,
+            "word_count": sum(result["text"]["word_count"] for result in range_results),
+            "character_count": len(full_text)
+        }
+    
+    def _merge_range_clean(self, range_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        범위별 정제 결과 병합
+        
+        통계는 범위별 값을 더하고, 언어는 정제된 텍스트가 가장 많은 언어로 정한다.
+        """
+        cleaned_text = RANGE_SEPARATOR.join(result["clean"]["cleaned_text"] for result in range_results)
+        
+        statistics: Dict[str, int] = {}
+        languages: Dict[str, int] = {}
+        for result in range_results:
+            clean_result = result["clean"]
+            for name, value in clean_result["statistics"].items():
+                statistics[name] = statistics.get(name, 0) + value
+            if clean_result["language"] != "unknown":
+                languages[clean_result["language"]] = (
+                    languages.get(clean_result["language"], 0) + len(clean_result["cleaned_text"])
+                )
+        statistics["character_count"] = len(cleaned_text)
+        
+        return {
+            "cleaned_text": cleaned_text,
+            "statistics": statistics,
+            "language": max(languages, key=languages.get) if languages else "unknown"
+        }
+    
+    def _merge_range_leaves(self, range_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """범위별 요약 map 노드를 문서 전체 기준 오프셋과 위치로 병합"""
+        leaves = []
+        offset = 0
+        for result in range_results:
+            for node in result.get("summary_nodes") or []:
+                leaves.append(dict(
+                    node,
+                    position=len(leaves),
+                    start_offset=node["start_offset"] + offset,
+                    end_offset=node["end_offset"] + offset,
+                    parent=None
+                ))
+            offset += len(result["clean"]["cleaned_text"]) + len(RANGE_SEPARATOR)
+        return leaves
+    
+    async def _stage_text(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """PDF 텍스트 추출 (대용량 모드는 범위 결과 병합)"""
+        if context["ranges"]:
+            return self._merge_range_text(context["results"]["ranges"])
+        return await self._in_executor(context, cpu_extract_text, context["file_path"])
+    
+    async def _stage_images(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """이미지 추출"""
+        return await self._in_executor(
+            context, cpu_extract_images, context["file_path"], os.path.join(context["artifact_dir"], "images")
+        )
+    
+    async def _stage_tables(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """표 추출"""
+        return await self._in_executor(context, cpu_extract_tables, context["file_path"])
+    
+    async def _stage_thumbnail(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """첫 페이지 썸네일 생성"""
+        return await self._in_executor(
+            context, cpu_render_thumbnail, context["file_path"], os.path.join(context["artifact_dir"], "thumbnail.png")
+        )
+    
+    async def _stage_clean(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """텍스트 정제 (대용량 모드는 범위 결과 병합)"""
+        if context["ranges"]:
+            return self._merge_range_clean(context["results"]["ranges"])
+        return await self._in_executor(context, cpu_clean_text, context["results"]["text"]["text"])
+    
+    async def _stage_analyze(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """AI 분석 (선택한 구성 요소만, 같은 내용의 동시 분석은 한 번만 수행)"""
+        clean_result = context["results"]["clean"]
+        options = context["options"]
+        components = options.selected_components()
+        
+        summary_leaves = None
+        partial_keywords = None
+        partial_qa_pairs = None
+        partial_sentences = None
+        if context["ranges"]:
+            # 범위 작업에서 끝낸 요약 map/키워드/Q&A/중요 문장 결과를 합치기만 함
+            # (병합된 전체 텍스트를 한 번에 모델에 보내지 않음)
+            range_results = context["results"]["ranges"]
+            summary_leaves = self._merge_range_leaves(range_results)
+            partial_keywords = [result.get("keywords") or [] for result in range_results]
+            partial_qa_pairs = [result.get("qa_pairs") or [] for result in range_results]
+            partial_sentences = [result.get("important_sentences") or [] for result in range_results]
+        
+        flight_key = single_flight.make_key(
+            clean_result["cleaned_text"],
+            language=clean_result["language"],
+            model=context["model"] or (self.ai_analyzer.premium_model if context["is_premium"] else self.ai_analyzer.default_model),
+            components=components,
+            max_keywords=options.max_keywords,
+            max_qa_pairs=options.max_qa_pairs,
+            max_sentences=options.max_sentences
+        )
+        return await single_flight.run(
+            flight_key,
+            lambda: self.ai_analyzer.analyze_document(
+                clean_result["cleaned_text"],
+                language=clean_result["language"],
+                model=context["model"],
+                is_premium=context["is_premium"],
+                components=components,
+                max_keywords=options.max_keywords,
+                max_qa_pairs=options.max_qa_pairs,
+                max_sentences=options.max_sentences,
+                summary_leaves=summary_leaves,
+                partial_keywords=partial_keywords,
+                partial_qa_pairs=partial_qa_pairs,
+                partial_sentences=partial_sentences,
+                progress_callback=self._analysis_progress_callback(context, len(components))
+            )
+        )
+    
+    async def _stage_persist(self, context: Dict[str, Any]) -> None:
+        """
+        분석 결과와 부가 산출물 저장 (커밋은 _run에서 수행)
+        
+        검색 인덱스는 executor에서 만들고, DB 쓰기는 I/O 스레드 풀에서 한다.
+        """
+        pdf_result = context["results"]["text"]
+        cleaned_text = context["results"]["clean"]["cleaned_text"]
+        page_offsets = self.chunk_store.build_page_offsets(pdf_result.get("pages", []), len(cleaned_text))
+        search_index = await self._in_executor(context, cpu_build_search_index, cleaned_text, page_offsets)
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._persist, context, page_offsets, search_index
+        )
+    
+    def _persist(self, context: Dict[str, Any], page_offsets: List[int], search_index: BM25Index):
+        """_stage_persist의 DB 쓰기 (동기)"""
+        db = context["db"]
+        document = context["document"]
+        results = context["results"]
+        pdf_result = results["text"]
+        clean_result = results["clean"]
+        analysis_result = results["analyze"]
+        
+        # 처리 도중 lease를 잃었으면 결과를 저장하지 않음
+        db.refresh(document)
+        if document.lease_owner != context["worker_id"]:
+            context["lease_lost"] = True
+            return
+        
+        previous_analysis = db.query(Analysis).filter(
+            Analysis.of_document(document)
+        ).order_by(desc(Analysis.created_at)).first()
+        self.ai_analyzer.fill_missing_components(analysis_result, previous=previous_analysis)
+        
+        # 분석 결과 저장
+        analysis = Analysis(
+            document_id=document.id,
+            raw_text_hash=text_store.put(db, pdf_result["text"]),
+            cleaned_text_hash=text_store.put(db, clean_result["cleaned_text"]),
+            summary=analysis_result["summary"],
+            keywords=analysis_result["keywords"],
+            qa_pairs=analysis_result["qa_pairs"],
+            important_sentences=analysis_result["important_sentences"],
+            ai_model=analysis_result["ai_model"],
+            language=analysis_result["language"],
+            processing_time=analysis_result["processing_time"],
+            confidence_score=analysis_result["confidence_score"],
+            total_pages=pdf_result.get("page_count"),
+            total_words=clean_result["statistics"]["word_count"],
+            total_sentences=clean_result["statistics"]["sentence_count"],
+            total_paragraphs=clean_result["statistics"]["paragraph_count"]
+        )
+        
+        db.add(analysis)
+        
+        # 청크/요약 트리 저장 (재분석, 페이지 범위 요약, Q&A에서 재사용)
+        self.chunk_store.save_tree(
+            db,
+            document.id,
+            analysis_result.get("summary_nodes"),
+            page_offsets=page_offsets,
+            language=analysis_result["language"],
+            summary_model=analysis_result["ai_model"]
+        )
+        
+        # 질의응답용 검색 인덱스 생성
+        self.retrieval_service.save_index(
+            db, document.id, clean_result["cleaned_text"], page_offsets=page_offsets, index=search_index
+        )
+        
+        # 부가 산출물 (표는 위치와 크기만 기록)
+        document.artifacts = {
+            "images": results.get("images") or [],
+            "tables": [
+                {key: table[key] for key in ("page", "table_index", "row_count", "column_count")}
+                for table in results.get("tables") or []
+            ],
+            "thumbnail": results.get("thumbnail")
+        }
+        
+        # 문서 정보 업데이트
+        document.page_count = pdf_result.get("page_count")
+        document.word_count = clean_result["statistics"]["word_count"]
+        document.language = clean_result["language"]
+        document.complete_processing()
+        document.release_lease()
+
+
+# 워커 프로세스 전역 파이프라인
+document_pipeline = DocumentPipeline()
@@ -0,0 +1,344 @@
+"""
+문서 처리 작업 스케줄러 (우선순위 클래스 + 사용자별 가중 공정 큐)
+"""
+
+import uuid
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.document import Document, DocumentStatus
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.schemas.analysis import AnalysisOptions
+from app.worker import enqueue_document_processing
+
+logger = logging.getLogger(__name__)
+
+# 여러 API/워커 프로세스의 동시 dispatch를 직렬화하는 advisory lock 키
+DISPATCH_LOCK_KEY = 733001
+
+# 한 번에 살펴볼 대기 작업 수 (동시 실행 제한에 걸린 사용자 건너뛰기용)
+DISPATCH_SCAN_LIMIT = 200
+
+# 우선순위 클래스
+CLASS_ENTERPRISE = "enterprise"
+CLASS_PREMIUM = "premium"
+CLASS_FREE = "free"
+
+
+def _percentile(values: List[float], ratio: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class JobScheduler:
+    """
+    처리 작업 스케줄러
+    
+    - 클래스 간: 실행 중인 작업 수 / 클래스 가중치가 가장 작은 클래스를 먼저
+      선택해, 부하가 몰려도 상위 클래스가 가중치만큼의 워커 슬롯을 확보
+    - 클래스 내: 사용자별 가상 종료 시각(SCFQ) 순서로 선택해, 한 사용자가
+      대량 업로드해도 다른 사용자의 작업이 사이사이 처리됨
+    - 사용자별 동시 실행 수 제한
+    """
+    
+    def __init__(self):
+        self.max_dispatched = settings.SCHEDULER_MAX_DISPATCHED
+        self.class_weights = settings.SCHEDULER_CLASS_WEIGHTS
+        self.user_concurrency = settings.SCHEDULER_USER_CONCURRENCY
+    
+    def priority_class(self, user: Optional[User]) -> str:
+        """사용자의 우선순위 클래스"""
+        if user is None or not user.is_premium_active:
+            return CLASS_FREE
+        if user.subscription_type == CLASS_ENTERPRISE:
+            return CLASS_ENTERPRISE
+        return CLASS_PREMIUM
+    
+    def class_weight(self, priority_class: str) -> float:
+        return float(self.class_weights.get(priority_class, 1.0))
+    
+    def submit(
+        self,
+        db: Session,
+        document: Document,
+        user: Optional[User],
+        options: Optional[AnalysisOptions] = None
+    ) -> ProcessingJob:
+        """
+        처리 작업 등록 (커밋은 호출자가 수행)
+        
+        같은 클래스 안에서 사용자의 가상 종료 시각은 직전 작업의 종료 시각과
+        클래스 가상 시각 중 큰 값에 1을 더한 값이다.
+        """
+        priority_class = self.priority_class(user)
+        
+        class_virtual_time = db.query(func.max(ProcessingJob.virtual_finish)).filter(
+            ProcessingJob.priority_class == priority_class,
+            ProcessingJob.status != JobStatus.QUEUED
+        ).scalar() or 0.0
+        user_last_finish = db.query(func.max(ProcessingJob.virtual_finish)).filter(
+            ProcessingJob.priority_class == priority_class,
+            ProcessingJob.user_id == document.user_id,
+            ProcessingJob.status.in_([JobStatus.QUEUED, JobStatus.DISPATCHED])
+        ).scalar() or 0.0
+        
+        job = ProcessingJob(
+            document_id=document.id,
+            user_id=document.user_id,
+            priority_class=priority_class,
+            weight=self.class_weight(priority_class),
+            virtual_finish=max(class_virtual_time, user_last_finish) + 1.0,
+            options=options.dict() if options else None
+        )
+        db.add(job)
+        db.flush()
+        return job
+    
+    def resubmit(self, db: Session, document: Document) -> ProcessingJob:
+        """
+        중단된 문서의 처리 작업을 같은 옵션으로 다시 등록 (커밋은 호출자가 수행)
+        
+        워커에 전달된 채 남은 이전 작업은 실패로 종료해 슬롯을 반납한다.
+        아직 대기 중인 작업이 있으면 그 작업을 그대로 사용한다.
+        """
+        previous = db.query(ProcessingJob).filter(
+            ProcessingJob.document_id == document.id
+        ).order_by(ProcessingJob.enqueued_at.desc()).first()
+        if previous is not None and previous.status == JobStatus.QUEUED:
+            return previous
+        if previous is not None and previous.status == JobStatus.DISPATCHED:
+            previous.mark_finished(False)
+        
+        options = AnalysisOptions(**previous.options) if previous is not None and previous.options else None
+        user = db.query(User).filter(User.id == document.user_id).first()
+        return self.submit(db, document, user, options)
+    
+    def dispatch(self, db: Session) -> List[ProcessingJob]:
+        """
+        워커 슬롯이 남은 만큼 대기 작업을 워커 큐로 전달
+        
+        작업 ID를 미리 정해 전달 상태를 먼저 커밋한 뒤 메시지를 발행한다.
+        커밋이 실패하면 메시지가 나가지 않고, 발행이 실패하면 작업을 다시
+        대기 상태로 돌린다. 커밋과 발행 사이에 중단되면 reconcile이
+        SCHEDULER_DISPATCH_TIMEOUT 후 다시 대기시킨다.
+        
+        Returns:
+            이번에 전달한 작업 목록
+        """
+        self._lock(db)
+        self.reconcile(db)
+        
+        active = db.query(ProcessingJob.priority_class, ProcessingJob.user_id).filter(
+            ProcessingJob.status == JobStatus.DISPATCHED
+        ).all()
+        class_running = Counter(priority_class for priority_class, _ in active)
+        user_running = Counter(user_id for _, user_id in active)
+        
+        dispatched = []
+        while len(active) + len(dispatched) < self.max_dispatched:
+            job = self._next_job(db, class_running, user_running)
+            if job is None:
+                break
+            
+            job.mark_dispatched(str(uuid.uuid4()))
+            db.flush()
+            
+            class_running[job.priority_class] += 1
+            user_running[job.user_id] += 1
+            dispatched.append(job)
+        
+        messages = [(job, job.document_id, job.options, job.task_id) for job in dispatched]
+        db.commit()
+        
+        published = []
+        for job, document_id, options, task_id in messages:
+            try:
+                enqueue_document_processing(
+                    document_id, AnalysisOptions(**options) if options else None, task_id=task_id
+                )
+                published.append(job)
+            except Exception as e:
+                logger.warning(f"처리 작업 발행 실패 - 다시 대기: {document_id} - {str(e)}")
+                job.mark_requeued()
+        if len(published) < len(dispatched):
+            db.commit()
+        
+        if published:
+            logger.info(f"처리 작업 {len(published)}건 전달 (실행 중 {len(active) + len(published)}건)")
+        return published
+    
+    def dispatch_pending(self) -> int:
+        """
+        전용 세션으로 dispatch 실행 (API의 스레드 풀에서 호출)
+        
+        실패하면 로그만 남긴다. 작업은 커밋되어 있으므로 주기적인 전달
+        작업이 다시 전달한다.
+        
+        Returns:
+            이번에 전달한 작업 수
+        """
+        db = SessionLocal()
+        try:
+            return len(self.dispatch(db))
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"처리 작업 전달 실패 (주기 작업에서 재시도): {str(e)}")
+            return 0
+        finally:
+            db.close()
+    
+    def is_current(self, db: Session, document_id, task_id: str) -> bool:
+        """
+        워커가 받은 메시지가 문서의 현재 전달된 작업인지 여부
+        
+        같은 메시지가 중복 전달되었거나, 작업이 다시 대기/전달되어 ID가
+        바뀐 경우 False. 스케줄러를 거치지 않은 문서는 True.
+        """
+        job = db.query(ProcessingJob).filter(
+            ProcessingJob.document_id == document_id
+        ).order_by(ProcessingJob.enqueued_at.desc()).first()
+        if job is None:
+            return True
+        return job.status == JobStatus.DISPATCHED and job.task_id == task_id
+    
+    def finish(self, db: Session, document_id) -> Optional[ProcessingJob]:
+        """문서 처리가 끝났으면 작업을 종료 상태로 변경 (커밋은 호출자가 수행)"""
+        job = db.query(ProcessingJob).filter(
+            ProcessingJob.document_id == document_id,
+            ProcessingJob.status == JobStatus.DISPATCHED
+        ).order_by(ProcessingJob.dispatched_at.desc()).first()
+        if job is None:
+            return None
+        
+        document = db.query(Document).filter(Document.id == document_id).first()
+        if document is None or document.status in (DocumentStatus.COMPLETED, DocumentStatus.FAILED, DocumentStatus.DELETED):
+            job.mark_finished(document is not None and document.status == DocumentStatus.COMPLETED)
+        return job
+    
+    def reconcile(self, db: Session) -> int:
+        """
+        실행 중으로 남아 슬롯을 차지하는 작업 정리
+        
+        - 이미 끝난 문서의 작업은 종료 처리
+        - 전달 후 SCHEDULER_DISPATCH_TIMEOUT이 지나도록 처리가 시작되지 않은
+          작업(메시지 유실)은 다시 대기시킴. 늦게 도착한 이전 메시지는 작업
+          ID가 달라 처리되지 않는다.
+        """
+        stale = db.query(ProcessingJob, Document.status).join(
+            Document, Document.id == ProcessingJob.document_id
+        ).filter(
+            ProcessingJob.status == JobStatus.DISPATCHED,
+            Document.status.in_([DocumentStatus.COMPLETED, DocumentStatus.FAILED, DocumentStatus.DELETED])
+        ).all()
+        
+        for job, document_status in stale:
+            job.mark_finished(document_status == DocumentStatus.COMPLETED)
+        
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.SCHEDULER_DISPATCH_TIMEOUT)
+        lost = db.query(ProcessingJob).join(
+            Document, Document.id == ProcessingJob.document_id
+        ).filter(
+            ProcessingJob.status == JobStatus.DISPATCHED,
+            ProcessingJob.dispatched_at < cutoff,
+            Document.status == DocumentStatus.UPLOADED
+        ).all()
+        
+        for job in lost:
+            logger.warning(f"전달 후 시작되지 않은 작업 - 다시 대기: {job.document_id} ({job.task_id})")
+            job.mark_requeued()
+        
+        if stale or lost:
+            db.flush()
+        return len(stale) + len(lost)
+    
+    def queue_stats(self, db: Session, hours: int = None) -> Dict[str, Any]:
+        """
+        클래스별 대기 시간 통계
+        
+        Args:
+            hours: 집계 기간 (기본값: SCHEDULER_STATS_WINDOW_HOURS)
+        """
+        hours = hours or settings.SCHEDULER_STATS_WINDOW_HOURS
+        since = datetime.utcnow() - timedelta(hours=hours)
+        
+        waits: Dict[str, List[float]] = {}
+        for priority_class, queue_wait in db.query(ProcessingJob.priority_class, ProcessingJob.queue_wait).filter(
+            ProcessingJob.dispatched_at >= since,
+            ProcessingJob.queue_wait.isnot(None)
+        ):
+            waits.setdefault(priority_class, []).append(queue_wait)
+        
+        counts = db.query(ProcessingJob.priority_class, ProcessingJob.status, func.count(ProcessingJob.id)).filter(
+            ProcessingJob.status.in_([JobStatus.QUEUED, JobStatus.DISPATCHED])
+        ).group_by(ProcessingJob.priority_class, ProcessingJob.status).all()
+        oldest = dict(db.query(ProcessingJob.priority_class, func.min(ProcessingJob.enqueued_at)).filter(
+            ProcessingJob.status == JobStatus.QUEUED
+        ).group_by(ProcessingJob.priority_class).all())
+        
+        now = datetime.utcnow()
+        classes = {}
+        for priority_class in sorted(set(self.class_weights) | set(waits)):
+            class_waits = waits.get(priority_class, [])
+            class_counts = {status: count for cls, status, count in counts if cls == priority_class}
+            classes[priority_class] = {
+                "weight": self.class_weight(priority_class),
+                "queued": class_counts.get(JobStatus.QUEUED, 0),
+                "running": class_counts.get(JobStatus.DISPATCHED, 0),
+                "dispatched_in_window": len(class_waits),
+                "wait_p50": _percentile(class_waits, 0.5),
+                "wait_p95": _percentile(class_waits, 0.95),
+                "wait_max": max(class_waits) if class_waits else None,
+                "oldest_queued_age": (
+                    (now - oldest[priority_class]).total_seconds() if oldest.get(priority_class) else None
+                )
+            }
+        
+        return {
+            "window_hours": hours,
+            "max_dispatched": self.max_dispatched,
+            "classes": classes
+        }
+    
+    def _next_job(self, db: Session, class_running: Counter, user_running: Counter) -> Optional[ProcessingJob]:
+        """다음에 전달할 작업 선택"""
+        waiting_classes = [
+            row[0] for row in db.query(ProcessingJob.priority_class).filter(
+                ProcessingJob.status == JobStatus.QUEUED
+            ).distinct().all()
+        ]
+        # 가중치 대비 실행 중인 작업이 적은 클래스부터 (동률이면 가중치가 큰 클래스)
+        waiting_classes.sort(key=lambda c: (class_running[c] / self.class_weight(c), -self.class_weight(c)))
+        
+        for priority_class in waiting_classes:
+            user_limit = self.user_concurrency.get(priority_class, 1)
+            candidates = db.query(ProcessingJob).filter(
+                ProcessingJob.status == JobStatus.QUEUED,
+                ProcessingJob.priority_class == priority_class
+            ).order_by(
+                ProcessingJob.virtual_finish, ProcessingJob.enqueued_at
+            ).limit(DISPATCH_SCAN_LIMIT).all()
+            
+            for job in candidates:
+                if user_running[job.user_id] < user_limit:
+                    return job
+        return None
+    
+    def _lock(self, db: Session):
+        """dispatch 직렬화 (PostgreSQL advisory lock, 트랜잭션 종료 시 해제)"""
+        if db.bind is not None and db.bind.dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": DISPATCH_LOCK_KEY})
+
+
+# 프로세스 전역 스케줄러
+job_scheduler = JobScheduler()
@@ -0,0 +1,230 @@
+"""
+AI 모델 라우팅 서비스 (비용/지연 기반 모델 선택)
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import observe_llm_call
+
+logger = logging.getLogger(__name__)
+
+# 라우트 종류
+ROUTE_MAP = "map"            # 청크 단위 요약 (map 단계)
+ROUTE_REDUCE = "reduce"      # 최종 요약 (reduce 단계)
+ROUTE_QA = "qa"              # Q&A 생성 / 질의응답
+ROUTE_KEYWORDS = "keywords"  # 키워드 추출
+ROUTE_SENTENCES = "sentences"  # 중요 문장 추출
+
+
+class RouteStats:
+    """라우트(또는 모델)별 호출 통계"""
+    
+    def __init__(self, window_size: int):
+        self.latencies: Deque[float] = deque(maxlen=window_size)
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)  # True = 오류
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+    
+    def record(self, latency: float, error: bool, prompt_tokens: int, completion_tokens: int, cost: float):
+        """호출 결과 기록"""
+        self.calls += 1
+        self.latencies.append(latency)
+        self.outcomes.append(error)
+        if error:
+            self.errors += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost += cost
+    
+    def reset_window(self):
+        """관측 윈도우 비우기 (누적 호출/비용 통계는 유지)"""
+        self.latencies.clear()
+        self.outcomes.clear()
+    
+    @property
+    def p95_latency(self) -> Optional[float]:
+        """관측 윈도우의 p95 지연 시간"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    @property
+    def error_rate(self) -> Optional[float]:
+        """관측 윈도우의 오류율"""
+        if not self.outcomes:
+            return None
+        return sum(1 for failed in self.outcomes if failed) / len(self.outcomes)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """통계를 딕셔너리로 변환"""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p95_latency": self.p95_latency,
+            "error_rate": self.error_rate,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": round(self.cost, 6)
+        }
+
+
+class ModelRouter:
+    """
+    라우팅 정책 엔진
+    
+    - 짧은 문서와 map 단계 청크 요약은 빠른 모델 사용
+    - 최종 reduce 요약과 Q&A만 프리미엄 모델 사용
+    - 프리미엄 모델의 p95 지연 또는 오류율이 임계값을 넘으면 빠른 모델로 폴백
+    - 폴백 중에도 MODEL_ROUTING_PROBE_INTERVAL마다 한 번은 프리미엄 모델을
+      호출해 본다 (half-open). 이 호출이 임계값 안에서 성공하면 관측 윈도우를
+      비워 폴백을 끝내고, 실패하면 다음 주기까지 폴백을 유지한다.
+    """
+    
+    def __init__(
+        self,
+        fast_model: str = None,
+        premium_model: str = None
+    ):
+        self.fast_model = fast_model or settings.OPENAI_MODEL_DEFAULT
+        self.premium_model = premium_model or settings.OPENAI_MODEL_PREMIUM
+        self.enabled = settings.MODEL_ROUTING_ENABLED
+        self.short_doc_tokens = settings.MODEL_ROUTING_SHORT_DOC_TOKENS
+        self.premium_routes = set(settings.MODEL_ROUTING_PREMIUM_ROUTES)
+        self.window_size = settings.MODEL_ROUTING_WINDOW_SIZE
+        self.min_samples = settings.MODEL_ROUTING_MIN_SAMPLES
+        self.p95_threshold = settings.MODEL_ROUTING_P95_LATENCY_THRESHOLD
+        self.error_rate_threshold = settings.MODEL_ROUTING_ERROR_RATE_THRESHOLD
+        self.costs = settings.MODEL_COST_PER_1K_TOKENS
+        self.probe_interval = settings.MODEL_ROUTING_PROBE_INTERVAL
+        
+        self._lock = threading.Lock()
+        self._model_stats: Dict[str, RouteStats] = {}
+        self._route_stats: Dict[Tuple[str, str], RouteStats] = {}
+        self._last_probe: Dict[str, float] = {}  # 모델별 마지막 복구 확인 호출 시각 (monotonic)
+        self._probing: Set[str] = set()  # 복구 확인 호출 결과를 기다리는 모델
+    
+    def select_model(
+        self,
+        route: str,
+        requested_model: Optional[str] = None,
+        document_tokens: Optional[int] = None
+    ) -> str:
+        """
+        라우트에 사용할 모델 선택
+        
+        Args:
+            route: 호출 경로 (map, reduce, qa, keywords, sentences)
+            requested_model: 요청된 상한 모델 (프리미엄 사용자면 프리미엄 모델)
+            document_tokens: 문서 전체 토큰 수
+        
+        Returns:
+            실제 호출할 모델 이름
+        """
+        model = requested_model or self.fast_model
+        if not self.enabled or model == self.fast_model:
+            return model
+        
+        # 짧은 문서는 빠른 모델로 충분
+        if document_tokens is not None and document_tokens <= self.short_doc_tokens:
+            return self.fast_model
+        
+        # reduce / Q&A 외의 경로는 빠른 모델 사용
+        if route not in self.premium_routes:
+            return self.fast_model
+        
+        # 상한 모델이 불안정하면 빠른 모델로 폴백 (주기적으로 복구 확인 호출은 허용)
+        if self.is_degraded(model):
+            if self._start_probe(model):
+                logger.info(f"모델 {model} 복구 확인 호출 ({route})")
+                return model
+            logger.warning(f"모델 {model} 성능 저하 감지 - {self.fast_model}(으)로 폴백 ({route})")
+            return self.fast_model
+        
+        return model
+    
+    def is_degraded(self, model: str) -> bool:
+        """모델의 관측 지연/오류율이 임계값을 넘었는지 확인"""
+        with self._lock:
+            stats = self._model_stats.get(model)
+            if stats is None or len(stats.outcomes) < self.min_samples:
+                return False
+            p95 = stats.p95_latency
+            error_rate = stats.error_rate
+        
+        if p95 is not None and p95 > self.p95_threshold:
+            return True
+        if error_rate is not None and error_rate > self.error_rate_threshold:
+            return True
+        return False
+    
+    def _start_probe(self, model: str) -> bool:
+        """복구 확인 호출을 보낼 차례인지 확인 (주기마다 하나만 허용)"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_probe.get(model, float("-inf")) < self.probe_interval:
+                return False
+            self._last_probe[model] = now
+            self._probing.add(model)
+            return True
+    
+    def estimate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """토큰 사용량 기반 비용 추정 (USD)"""
+        prices = self.costs.get(model)
+        if not prices:
+            return 0.0
+        return (
+            prompt_tokens / 1000 * prices.get("input", 0.0)
+            + completion_tokens / 1000 * prices.get("output", 0.0)
+        )
+    
+    def record(
+        self,
+        route: str,
+        model: str,
+        latency: float,
+        error: bool = False,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0
+    ):
+        """호출 결과를 모델별/라우트별 통계에 기록"""
+        cost = self.estimate_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            model_stats = self._model_stats.setdefault(model, RouteStats(self.window_size))
+            if model in self._probing:
+                self._probing.discard(model)
+                # 복구 확인 호출이 성공하면 폴백을 일으킨 과거 표본을 버림
+                if not error and latency <= self.p95_threshold:
+                    model_stats.reset_window()
+                    logger.info(f"모델 {model} 복구 확인 - 폴백 해제")
+            route_stats = self._route_stats.setdefault((route, model), RouteStats(self.window_size))
+            model_stats.record(latency, error, prompt_tokens, completion_tokens, cost)
+            route_stats.record(latency, error, prompt_tokens, completion_tokens, cost)
+        observe_llm_call(model, route, latency, error, prompt_tokens, completion_tokens)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """라우트별/모델별 지연 및 비용 지표 반환"""
+        with self._lock:
+            models = {model: stats.to_dict() for model, stats in self._model_stats.items()}
+            routes = {
+                f"{route}:{model}": stats.to_dict()
+                for (route, model), stats in self._route_stats.items()
+            }
+        
+        for model, stats in models.items():
+            stats["degraded"] = self.is_degraded(model)
+        
+        return {"models": models, "routes": routes}
+
+
+# 프로세스 전역 라우터 (통계 공유)
+model_router = ModelRouter()
@@ -0,0 +1,466 @@
+"""
+시간 파티션 관리 및 보관(아카이브) 서비스
+"""
+
+import os
+import json
+import uuid
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Table, select, delete, text, Boolean, DateTime, Float, Integer, LargeBinary, JSON, Enum
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.exc import IntegrityError, ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document import Document
+from app.models.analysis import Analysis
+from app.models.document_chunk import DocumentChunk
+from app.models.text_blob import TextBlob
+from app.models.archive import DocumentArchive, ArchivedDocument
+from app.services.storage import storage
+from app.services.dedup import dedup_service
+from app.services.user_stats import user_stats_service
+from app.services.read_cache import read_cache
+
+logger = logging.getLogger(__name__)
+
+# created_at 월 단위로 분할된 테이블 (alembic 0002_partition_documents_analyses)
+PARTITIONED_TABLES = ("documents", "analyses")
+DEFAULT_PARTITION = "default"
+
+# 보관본에 함께 저장하는 테이블 (검색 인덱스는 복원 후 질의 시 다시 생성됨)
+ARCHIVE_TABLES = (Document.__table__, Analysis.__table__, DocumentChunk.__table__, TextBlob.__table__)
+
+
+def month_start(value: datetime) -> datetime:
+    """해당 월의 첫날 0시"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """월 단위 더하기 (월 첫날 기준)"""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: Optional[datetime]) -> str:
+    """월 파티션 이름 ({테이블}_pYYYYMM, 월이 없으면 기본 파티션)"""
+    if month is None:
+        return f"{table}_{DEFAULT_PARTITION}"
+    return f"{table}_p{month:%Y%m}"
+
+
+def _arrow_type(column) -> pa.DataType:
+    """컬럼 타입에 대응하는 Parquet 타입 (UUID/JSON/Enum은 문자열)"""
+    column_type = column.type
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, LargeBinary):
+        return pa.binary()
+    return pa.string()
+
+
+def _to_record(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    record = {}
+    for column in table.columns:
+        value = row[column.name]
+        if value is not None:
+            if isinstance(column.type, UUID):
+                value = str(value)
+            elif isinstance(column.type, JSON):
+                value = json.dumps(value, ensure_ascii=False)
+            elif isinstance(column.type, Enum) and hasattr(value, "value"):
+                value = value.value
+        record[column.name] = value
+    return record
+
+
+def _from_record(table: Table, record: Dict[str, Any]) -> Dict[str, Any]:
+    row = {}
+    for column in table.columns:
+        value = record.get(column.name)
+        if value is not None:
+            if isinstance(column.type, UUID):
+                value = uuid.UUID(value)
+            elif isinstance(column.type, JSON):
+                value = json.loads(value)
+            elif isinstance(column.type, Enum) and column.type.enum_class is not None:
+                value = column.type.enum_class(value)
+        row[column.name] = value
+    return row
+
+
+class PartitionArchiveService:
+    """
+    documents/analyses 월 파티션 유지와 보존 기간이 지난 파티션 보관
+    
+    - 다음 몇 달의 파티션을 미리 만들어 새 행이 기본 파티션에 쌓이지 않게 한다.
+    - 보존 기간이 지난 월의 문서를 분석, 청크, 텍스트와 함께 테이블별
+      Parquet(zstd) 파일로 저장소에 옮기고 빈 파티션은 분리 후 삭제한다.
+      분석은 문서보다 먼저 만들어지지 않으므로 오래된 월부터 보관하면
+      분석 파티션도 함께 비게 된다.
+    - 보관된 문서는 archived_documents 색인만 남고, 요청 시 보관본에서 해당
+      문서만 읽어 복원한다. 복원된 문서는 ARCHIVE_REHYDRATE_TTL 뒤 다시 보관된다.
+    
+    사용자 통계는 DB에 있는 문서만 집계하므로 보관/복원 후 해당 사용자
+    통계를 다시 계산한다.
+    """
+    
+    def __init__(self):
+        self.premake_months = settings.PARTITION_PREMAKE_MONTHS
+        self.retention_months = settings.PARTITION_RETENTION_MONTHS
+        self.storage_prefix = settings.ARCHIVE_STORAGE_PREFIX
+        self.rehydrate_ttl = settings.ARCHIVE_REHYDRATE_TTL
+        self.batch_size = settings.ARCHIVE_BATCH_SIZE
+    
+    # ------------------------------------------------------------------
+    # 파티션 관리
+    # ------------------------------------------------------------------
+    
+    def is_partitioned(self, db: Session) -> bool:
+        """documents가 파티션 테이블인지 (PostgreSQL에서 마이그레이션을 적용한 경우)"""
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        return db.execute(text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('documents')"
+        )).first() is not None
+    
+    def list_partitions(self, db: Session, table: str) -> List[Tuple[str, Optional[datetime]]]:
+        """
+        테이블의 파티션 목록
+        
+        Returns:
+            [(파티션 이름, 월 (기본 파티션은 None))] 오래된 월 순서
+        """
+        names = db.scalars(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ), {"table": table}).all()
+        
+        partitions = []
+        for name in names:
+            suffix = name[len(table) + 1:]
+            if suffix == DEFAULT_PARTITION:
+                partitions.append((name, None))
+            elif suffix.startswith("p"):
+                partitions.append((name, datetime.strptime(suffix[1:], "%Y%m")))
+        return sorted(partitions, key=lambda item: item[1] or datetime.max)
+    
+    def ensure_partitions(self, db: Session) -> List[str]:
+        """
+        이번 달부터 PARTITION_PREMAKE_MONTHS 뒤까지의 월 파티션 생성
+        
+        Returns:
+            새로 만든 파티션 이름 목록
+        """
+        created = []
+        current = month_start(datetime.utcnow())
+        for table in PARTITIONED_TABLES:
+            existing = {name for name, _ in self.list_partitions(db, table)}
+            for offset in range(self.premake_months + 1):
+                month = add_months(current, offset)
+                name = partition_name(table, month)
+                if name in existing:
+                    continue
+                try:
+                    with db.begin_nested():
+                        db.execute(text(
+                            f"CREATE TABLE {name} PARTITION OF {table} "
+                            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                        ))
+                    created.append(name)
+                except (IntegrityError, ProgrammingError) as e:
+                    # 기본 파티션에 이미 같은 범위의 행이 있으면 만들 수 없음 (보관 작업이 정리)
+                    logger.warning(f"파티션 생성 실패: {name} ({e.orig})")
+        db.commit()
+        
+        if created:
+            logger.info(f"파티션 생성: {', '.join(created)}")
+        return created
+    
+    def _drop_partition(self, db: Session, table: str, name: str) -> bool:
+        """비어 있는 월 파티션 분리 후 삭제"""
+        if db.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first() is not None:
+            logger.warning(f"보관 후에도 행이 남아 있어 파티션을 유지합니다: {name}")
+            return False
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        return True
+    
+    # ------------------------------------------------------------------
+    # 보관
+    # ------------------------------------------------------------------
+    
+    def archive_expired(self, db: Session) -> int:
+        """
+        보존 기간이 지난 월 파티션과 기본 파티션의 오래된 문서 보관
+        
+        Returns:
+            보관한 문서 수
+        """
+        now = datetime.utcnow()
+        cutoff = add_months(month_start(now), -self.retention_months)
+        archived = 0
+        
+        for name, month in self.list_partitions(db, "documents"):
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            document_ids = list(db.scalars(text(f"SELECT id FROM {name}")).all())
+            archived += self._archive_in_batches(db, document_ids, f"{month:%Y%m}")
+            logger.info(f"월 파티션 보관 완료: {month:%Y-%m} (문서 {len(document_ids)}개)")
+        
+        # 문서를 오래된 월부터 보관했으므로 같은 기간의 분석 파티션도 비어 있음
+        for table in PARTITIONED_TABLES:
+            for name, month in self.list_partitions(db, table):
+                if month is not None and add_months(month, 1) <= cutoff:
+                    self._drop_partition(db, table, name)
+        
+        # 기본 파티션의 오래된 문서 (복원 후 유지 기간이 지난 문서 포함)
+        rehydrated_before = now - timedelta(seconds=self.rehydrate_ttl)
+        document_ids = list(db.scalars(
+            select(Document.id)
+            .outerjoin(ArchivedDocument, ArchivedDocument.document_id == Document.id)
+            .where(
+                Document.created_at < cutoff,
+                (ArchivedDocument.rehydrated_at.is_(None)) | (ArchivedDocument.rehydrated_at < rehydrated_before)
+            )
+        ).all())
+        archived += self._archive_in_batches(db, document_ids, DEFAULT_PARTITION)
+        
+        return archived
+    
+    def _archive_in_batches(self, db: Session, document_ids: List[uuid.UUID], label: str) -> int:
+        """ARCHIVE_BATCH_SIZE개씩 나누어 보관 (보관본 하나 = 배치 하나)"""
+        archived = 0
+        for start in range(0, len(document_ids), self.batch_size):
+            archived += self.archive_documents(db, document_ids[start:start + self.batch_size], label)
+        return archived
+    
+    def archive_documents(self, db: Session, document_ids: List[uuid.UUID], label: str) -> int:
+        """
+        문서와 관련 행을 Parquet 보관본으로 옮기고 DB에서 삭제 (커밋까지 수행)
+        
+        원본 파일은 보관본으로 복사한 뒤, 커밋 후 문서 삭제와 같은 방식으로
+        참조를 해제해 다른 문서가 참조하지 않으면 저장소에서 지운다.
+        저장소 업로드가 끝난 뒤에만 DB에서 삭제하므로 실패하면 DB는 그대로다.
+        
+        Returns:
+            보관한 문서 수
+        """
+        # 보관하는 동안 문서가 바뀌지 않도록 잠금
+        documents = db.execute(
+            select(Document.id, Document.user_id, Document.original_filename,
+                   Document.file_size, Document.page_count, Document.created_at, Document.storage_key)
+            .where(Document.id.in_(document_ids))
+            .with_for_update()
+        ).all()
+        
+        archive = DocumentArchive(id=uuid.uuid4(), label=label)
+        archive.storage_prefix = f"{self.storage_prefix}/{archive.id}"
+        
+        document_table, analysis_table, chunk_table, blob_table = ARCHIVE_TABLES
+        blob_hashes = select(Analysis.raw_text_hash).where(Analysis.document_id.in_(document_ids)).union(
+            select(Analysis.cleaned_text_hash).where(Analysis.document_id.in_(document_ids))
+        )
+        queries = {
+            document_table: select(document_table).where(document_table.c.id.in_(document_ids)),
+            analysis_table: select(analysis_table).where(analysis_table.c.document_id.in_(document_ids)),
+            chunk_table: select(chunk_table).where(chunk_table.c.document_id.in_(document_ids)),
+            blob_table: select(blob_table).where(blob_table.c.content_hash.in_(blob_hashes)),
+        }
+        
+        row_counts = {}
+        total_bytes = 0
+        uploaded = []
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                for table, query in queries.items():
+                    records = [_to_record(table, row) for row in db.execute(query).mappings()]
+                    schema = pa.schema([(column.name, _arrow_type(column)) for column in table.columns])
+                    path = os.path.join(temp_dir, f"{table.name}.parquet")
+                    pq.write_table(pa.Table.from_pylist(records, schema=schema), path, compression="zstd")
+                    
+                    row_counts[table.name] = len(records)
+                    total_bytes += os.path.getsize(path)
+                    storage.put_file(path, archive.object_key(table.name), "application/vnd.apache.parquet")
+                    uploaded.append(archive.object_key(table.name))
+            
+            for document in documents:
+                if not document.storage_key:
+                    continue
+                path = storage.local_copy(document.storage_key)
+                try:
+                    storage.put_file(path, archive.file_key(document.id), "application/pdf")
+                finally:
+                    storage.release_local_copy(document.storage_key)
+                uploaded.append(archive.file_key(document.id))
+        except Exception:
+            for key in uploaded:
+                storage.delete(key)
+            raise
+        
+        archive.row_counts = row_counts
+        archive.total_bytes = total_bytes
+        db.add(archive)
+        db.flush()
+        
+        # 보관 색인 (다시 보관되는 복원 문서는 새 보관본을 가리키도록 갱신)
+        now = datetime.utcnow()
+        if documents:
+            statement = insert(ArchivedDocument.__table__).values([
+                {
+                    "document_id": document.id,
+                    "user_id": document.user_id,
+                    "archive_id": archive.id,
+                    "original_filename": document.original_filename,
+                    "file_size": document.file_size,
+                    "page_count": document.page_count,
+                    "document_created_at": document.created_at,
+                    "archived_at": now
+                }
+                for document in documents
+            ])
+            db.execute(statement.on_conflict_do_update(
+                index_elements=["document_id"],
+                set_={"archive_id": archive.id, "archived_at": now,
+                      "rehydrate_requested_at": None, "rehydrated_at": None}
+            ))
+        
+        # 원본 파일 참조 해제 (다른 문서가 같은 파일을 참조하면 유지)
+        released = [
+            document.storage_key for document in documents
+            if document.storage_key and dedup_service.release(db, document)
+        ]
+        
+        # 삭제 트리거가 분석/청크/검색 인덱스/처리 작업을 함께 정리
+        analysis_ids = db.scalars(select(Analysis.id).where(Analysis.document_id.in_(document_ids))).all()
+        db.execute(delete(Document).where(Document.id.in_(document_ids)).execution_options(synchronize_session=False))
+        db.commit()
+        
+        for storage_key in released:
+            try:
+                storage.delete(storage_key)
+            except Exception as e:
+                logger.warning(f"보관한 문서의 원본 파일 삭제 실패: {storage_key} - {str(e)}")
+        
+        # 일괄 삭제라 조회 캐시를 직접 무효화
+        read_cache.invalidate_sync(
+            *[key for document_id in document_ids for key in read_cache.document_keys(document_id)],
+            *[key for analysis_id in analysis_ids for key in read_cache.analysis_keys(analysis_id)]
+        )
+        
+        self._rebuild_stats(db, {document.user_id for document in documents})
+        logger.info(f"문서 보관: {archive.storage_prefix} ({row_counts}, {total_bytes} bytes)")
+        return len(documents)
+    
+    # ------------------------------------------------------------------
+    # 복원
+    # ------------------------------------------------------------------
+    
+    def _read(self, archive: DocumentArchive, table: Table, column: str, values: List[Any]) -> List[Dict[str, Any]]:
+        """보관본에서 column 값이 values에 속하는 행만 읽기"""
+        if not values:
+            return []
+        key = archive.object_key(table.name)
+        path = storage.local_copy(key)
+        try:
+            data = pq.read_table(path, filters=[(column, "in", [str(value) for value in values])])
+        finally:
+            storage.release_local_copy(key)
+        return [_from_record(table, record) for record in data.to_pylist()]
+    
+    def rehydrate(self, db: Session, document_id: uuid.UUID) -> bool:
+        """
+        보관된 문서를 DB로 복원 (복원된 행은 월 파티션이 없으면 기본 파티션에 들어감)
+        
+        보관본에 원본 파일이 있으면 저장소로 되돌리고 참조를 다시 등록한다.
+        
+        Returns:
+            복원했는지 여부 (보관되지 않았거나 이미 복원된 경우 False)
+        """
+        record = db.get(ArchivedDocument, document_id, with_for_update=True)
+        if record is None or record.is_rehydrated:
+            db.rollback()
+            return False
+        archive = db.get(DocumentArchive, record.archive_id)
+        
+        document_table, analysis_table, chunk_table, blob_table = ARCHIVE_TABLES
+        documents = self._read(archive, document_table, "id", [document_id])
+        analyses = self._read(archive, analysis_table, "document_id", [document_id])
+        chunks = self._read(archive, chunk_table, "document_id", [document_id])
+        blob_hashes = {
+            value for analysis in analyses
+            for value in (analysis["raw_text_hash"], analysis["cleaned_text_hash"]) if value
+        }
+        blobs = self._read(archive, blob_table, "content_hash", sorted(blob_hashes))
+        
+        for document in documents:
+            if document.get("storage_key"):
+                document["storage_key"] = self._restore_file(db, archive, document)
+        
+        if blobs:
+            db.execute(insert(blob_table).values(blobs).on_conflict_do_nothing(index_elements=["content_hash"]))
+        if documents:
+            db.execute(document_table.insert(), documents)
+        if analyses:
+            db.execute(analysis_table.insert(), analyses)
+        # 상위 요약 노드를 먼저 넣어 parent_id 참조가 유효하도록 함
+        for chunk in sorted(chunks, key=lambda row: row["level"], reverse=True):
+            db.execute(chunk_table.insert().values(chunk))
+        
+        now = datetime.utcnow()
+        record.rehydrated_at = now
+        db.commit()
+        
+        self._rebuild_stats(db, {record.user_id})
+        logger.info(f"문서 복원: {document_id} (분석 {len(analyses)}개, 청크 {len(chunks)}개)")
+        return True
+    
+    def _restore_file(self, db: Session, archive: DocumentArchive, document: Dict[str, Any]) -> str:
+        """
+        보관본의 원본 파일을 저장소로 되돌리고 사용할 저장소 키 반환
+        
+        같은 내용의 파일이 이미 있으면 그 파일을 참조한다. 원본 파일을 옮기기
+        전의 보관본은 파일이 저장소에 그대로 있으므로 원래 키를 사용한다.
+        """
+        storage_key = document["storage_key"]
+        archived_key = archive.file_key(document["id"])
+        if storage.size(archived_key) is None:
+            return storage_key
+        
+        existing_key = dedup_service.acquire_existing(db, document.get("file_hash"))
+        if existing_key:
+            return existing_key
+        
+        path = storage.local_copy(archived_key)
+        try:
+            storage.put_file(path, storage_key, document.get("mime_type") or "application/pdf")
+        finally:
+            storage.release_local_copy(archived_key)
+        
+        blob_key = dedup_service.register(db, document.get("file_hash"), document["file_size"], storage_key)
+        if blob_key != storage_key:
+            storage.delete(storage_key)
+        return blob_key
+    
+    def _rebuild_stats(self, db: Session, user_ids):
+        for user_id in sorted(user_ids, key=str):
+            user_stats_service.rebuild(db, user_id)
+
+
+# 전역 인스턴스
+partition_archive_service = PartitionArchiveService()
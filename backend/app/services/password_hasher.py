@@ -0,0 +1,127 @@
+"""
+비밀번호 해싱 전용 실행기
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.security import pwd_context
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusyError(Exception):
+    """해싱 대기열이 가득 참"""
+    
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__("비밀번호 처리 요청이 많습니다. 잠시 후 다시 시도해주세요")
+
+
+class PasswordHasher:
+    """
+    bcrypt 해싱/검증을 이벤트 루프 밖의 전용 스레드 풀에서 실행
+    
+    bcrypt는 한 번에 수백 ms의 CPU를 쓰므로 async 핸들러에서 직접 호출하면
+    그동안 같은 워커의 다른 요청이 모두 멈춘다. bcrypt 구현은 GIL을 놓고
+    계산하므로 스레드 풀로 충분하다.
+    
+    - 스레드 수(PASSWORD_HASH_WORKERS)로 해싱에 쓰는 CPU를 제한한다.
+    - 실행 중 + 대기 중 작업이 PASSWORD_HASH_MAX_PENDING을 넘으면 대기열에
+      넣지 않고 PasswordHasherBusyError로 거절한다 (로그인 폭주 시 응답
+      지연이 끝없이 늘어나지 않도록).
+    """
+    
+    def __init__(self):
+        self.workers = settings.PASSWORD_HASH_WORKERS
+        self.max_pending = settings.PASSWORD_HASH_MAX_PENDING
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        
+        # 지표
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._max_queued = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hasher"
+                    )
+        return self._executor
+    
+    def _retry_after(self) -> int:
+        """대기열이 빠질 때까지 예상 시간 (초)"""
+        average = self._run_time / self._completed if self._completed else 0.3
+        return max(1, int((self._queued + self._running) * average / self.workers))
+    
+    async def _submit(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self._queued + self._running >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusyError(self._retry_after())
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        
+        submitted = time.monotonic()
+        
+        def run():
+            started = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_time += started - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._run_time += time.monotonic() - started
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), run)
+    
+    async def hash(self, password: str) -> str:
+        """비밀번호 해싱 (현재 설정한 bcrypt cost 사용)"""
+        return await self._submit(pwd_context.hash, password)
+    
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        비밀번호 검증
+        
+        Returns:
+            (일치 여부, 새 해시). 해시의 cost가 BCRYPT_ROUNDS와 다르면 일치할
+            때 새 cost로 다시 해싱한 값을, 아니면 None을 돌려준다.
+        """
+        return await self._submit(pwd_context.verify_and_update, password, hashed_password)
+    
+    def stats(self) -> Dict[str, Any]:
+        """대기열 길이와 처리 시간 (프로세스 시작 이후 누적)"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "queued": self._queued,
+                "running": self._running,
+                "max_queued": self._max_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_time / self._completed * 1000, 2) if self._completed else None,
+                "avg_run_ms": round(self._run_time / self._completed * 1000, 2) if self._completed else None
+            }
+
+
+# 전역 인스턴스
+password_hasher = PasswordHasher()
@@ -152,7 +152,7 @@ class PDFProcessor:
         """파일의 SHA-256 해시 계산"""
         hash_sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
                 hash_sha256.update(chunk)
         return hash_sha256.hexdigest()
     
@@ -240,6 +240,64 @@ class PDFProcessor:
         doc.close()
         return images
     
+    def extract_tables(self, file_path: str) -> List[Dict[str, any]]:
+        """
+        PDF에서 표 추출 (pdfplumber)
+        
+        Args:
+            file_path: PDF 파일 경로
+        
+        Returns:
+            추출된 표 목록 (페이지, 순번, 행 데이터)
+        """
+        tables = []
+        
+        with pdfplumber.open(file_path) as pdf:
+            for page_num, page in enumerate(pdf.pages):
+                for table_index, rows in enumerate(page.extract_tables()):
+                    if not rows:
+                        continue
+                    
+                    tables.append({
+                        "page": page_num + 1,
+                        "table_index": table_index + 1,
+                        "row_count": len(rows),
+                        "column_count": max(len(row) for row in rows),
+                        "rows": rows
+                    })
+        
+        return tables
+    
+    def render_thumbnail(self, file_path: str, output_path: str, width: int = 300) -> Dict[str, any]:
+        """
+        첫 페이지 썸네일 생성
+        
+        Args:
+            file_path: PDF 파일 경로
+            output_path: 썸네일 PNG 저장 경로
+            width: 썸네일 너비 (픽셀)
+        
+        Returns:
+            썸네일 정보
+        """
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        doc = fitz.open(file_path)
+        page = doc.load_page(0)
+        zoom = width / page.rect.width if page.rect.width else 1.0
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        pix.save(output_path)
+        
+        thumbnail = {
+            "path": output_path,
+            "width": pix.width,
+            "height": pix.height
+        }
+        
+        pix = None
+        doc.close()
+        return thumbnail
+    
     def get_page_count(self, file_path: str) -> int:
         """PDF 페이지 수 반환"""
         try:
@@ -265,6 +323,66 @@ class PDFProcessor:
         except Exception as e:
             raise Exception(f"페이지 텍스트 추출 실패: {str(e)}")
     
+    def split_page_ranges(self, page_count: int, pages_per_range: int = 50) -> List[Tuple[int, int]]:
+        """
+        페이지 범위 분할 (split_pdf와 달리 파일을 새로 만들지 않음)
+        
+        Args:
+            page_count: 전체 페이지 수
+            pages_per_range: 범위당 페이지 수
+        
+        Returns:
+            (시작 페이지, 끝 페이지) 목록 (1부터 시작, 끝 페이지 포함)
+        """
+        return [
+            (start_page, min(start_page + pages_per_range - 1, page_count))
+            for start_page in range(1, page_count + 1, pages_per_range)
+        ]
+    
+    def extract_text_range(self, file_path: str, start_page: int, end_page: int) -> Dict[str, any]:
+        """
+        페이지 범위의 텍스트 추출
+        
+        원본 PDF에서 해당 페이지만 읽으며, 결과 형식은 extract_text와 같다
+        (페이지 번호는 원본 기준).
+        
+        Args:
+            file_path: PDF 파일 경로
+            start_page: 시작 페이지 (1부터 시작)
+            end_page: 끝 페이지 (포함)
+        """
+        doc = fitz.open(file_path)
+        try:
+            if start_page < 1 or end_page > len(doc) or start_page > end_page:
+                raise ValueError(f"잘못된 페이지 범위입니다: {start_page}-{end_page}")
+            
+            text_content = []
+            page_texts = []
+            for page_num in range(start_page - 1, end_page):
+                page_text = doc.load_page(page_num).get_text()
+                page_texts.append({
+                    "page": page_num + 1,
+                    "text": page_text,
+                    "word_count": len(page_text.split())
+                })
+                text_content.append(page_text)
+            
+            total_pages = len(doc)
+        finally:
+            doc.close()
+        
+        full_text = "\n\n".join(text_content)
+        
+        return {
+            "text": full_text,
+            "pages": page_texts,
+            "page_count": total_pages,
+            "start_page": start_page,
+            "end_page": end_page,
+            "word_count": len(full_text.split()),
+            "character_count": len(full_text)
+        }
+    
     def split_pdf(self, file_path: str, output_dir: str, pages_per_chunk: int = 10) -> List[str]:
         """
         PDF를 여러 파일로 분할
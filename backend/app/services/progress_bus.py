@@ -0,0 +1,183 @@
+"""
+문서 처리 진행 이벤트 버스 (Redis pub/sub 또는 프로세스 내 브로커)
+"""
+
+import json
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from cachetools import LRUCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "progress"
+
+# 이 이벤트가 오면 구독을 종료
+TERMINAL_EVENTS = {"completed", "failed"}
+
+BACKEND_REDIS = "redis"
+BACKEND_MEMORY = "memory"
+
+
+class ProgressBus:
+    """
+    진행 이벤트 발행/구독
+    
+    - redis: 워커와 API 서버가 다른 프로세스/노드일 때 사용. 마지막 이벤트를
+      키로도 저장해 새로 연결한 클라이언트가 현재 상태를 바로 받을 수 있다.
+    - memory: 단일 노드(워커가 API와 같은 프로세스)에서 사용. 구독자 큐는
+      각자의 이벤트 루프로 전달되므로 다른 스레드의 루프에서 발행해도 된다.
+    """
+    
+    def __init__(self, backend: str = None, redis_url: str = None):
+        self.backend = backend or settings.PROGRESS_BUS_BACKEND
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.snapshot_ttl = settings.PROGRESS_SNAPSHOT_TTL
+        
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._last: LRUCache = LRUCache(maxsize=4096)
+        self._lock = threading.Lock()
+        self._redis = None
+    
+    @staticmethod
+    def _channel(document_id) -> str:
+        return f"{KEY_PREFIX}:channel:{document_id}"
+    
+    @staticmethod
+    def _snapshot_key(document_id) -> str:
+        return f"{KEY_PREFIX}:last:{document_id}"
+    
+    async def _get_redis(self):
+        """Redis 클라이언트 (지연 생성)"""
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+    
+    async def publish(
+        self,
+        document_id,
+        event: str,
+        progress: Optional[int] = None,
+        message: Optional[str] = None,
+        **data
+    ) -> Dict[str, Any]:
+        """
+        진행 이벤트 발행 (실패해도 처리 흐름에는 영향 없음)
+        
+        Args:
+            document_id: 문서 ID
+            event: 이벤트 종류 (stage_completed, chunk_summarized, component_done, completed, failed 등)
+            progress: 전체 진행률 (0-100)
+            message: 사용자에게 보여줄 현재 단계 설명
+            data: 이벤트별 추가 정보
+        """
+        payload = {
+            "document_id": str(document_id),
+            "event": event,
+            "progress": progress,
+            "message": message,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+        try:
+            if self.backend == BACKEND_REDIS:
+                redis = await self._get_redis()
+                raw = json.dumps(payload, ensure_ascii=False, default=str)
+                await redis.set(self._snapshot_key(document_id), raw, ex=self.snapshot_ttl)
+                await redis.publish(self._channel(document_id), raw)
+            else:
+                self._publish_local(str(document_id), payload)
+        except Exception as e:
+            logger.warning(f"진행 이벤트 발행 실패: {document_id} {event} - {str(e)}")
+        return payload
+    
+    def _publish_local(self, key: str, payload: Dict[str, Any]):
+        with self._lock:
+            self._last[key] = payload
+            subscribers = list(self._subscribers.get(key, ()))
+        
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, payload)
+            except RuntimeError:
+                # 구독자 루프가 이미 닫힘
+                pass
+    
+    async def last_event(self, document_id) -> Optional[Dict[str, Any]]:
+        """문서의 마지막 진행 이벤트"""
+        try:
+            if self.backend == BACKEND_REDIS:
+                redis = await self._get_redis()
+                raw = await redis.get(self._snapshot_key(document_id))
+                return json.loads(raw) if raw else None
+            with self._lock:
+                return self._last.get(str(document_id))
+        except Exception as e:
+            logger.warning(f"진행 이벤트 조회 실패: {document_id} - {str(e)}")
+            return None
+    
+    async def subscribe(self, document_id, heartbeat: float = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        진행 이벤트 구독
+        
+        heartbeat초 동안 이벤트가 없으면 None을 내보내므로 호출자는 이를
+        연결 유지 신호로 사용할 수 있다.
+        """
+        heartbeat = heartbeat or settings.PROGRESS_HEARTBEAT_INTERVAL
+        if self.backend == BACKEND_REDIS:
+            async for event in self._subscribe_redis(document_id, heartbeat):
+                yield event
+        else:
+            async for event in self._subscribe_local(str(document_id), heartbeat):
+                yield event
+    
+    async def _subscribe_local(self, key: str, heartbeat: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(subscriber)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[key]
+    
+    async def _subscribe_redis(self, document_id, heartbeat: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        redis = await self._get_redis()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(self._channel(document_id))
+        try:
+            loop = asyncio.get_running_loop()
+            idle_since = loop.time()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    idle_since = loop.time()
+                    yield json.loads(message["data"])
+                elif loop.time() - idle_since >= heartbeat:
+                    idle_since = loop.time()
+                    yield None
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.close()
+            except Exception:
+                pass
+
+
+# 프로세스 전역 이벤트 버스
+progress_bus = ProgressBus()
@@ -0,0 +1,518 @@
+"""
+문서/분석 조회 캐시 (프로세스 내 L1 + Redis L2)
+"""
+
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import logging
+import threading
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import count_cache_request
+from app.models.user import User
+from app.models.document import Document
+from app.models.analysis import Analysis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "readcache"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+BACKEND_REDIS = "redis"
+BACKEND_MEMORY = "memory"
+BACKEND_OFF = "off"
+
+# 무효화 기록(프로세스 내) 최대 항목 수
+INVALIDATION_LOG_SIZE = 100_000
+
+# 커밋 후 무효화할 키를 모아 두는 Session.info 키
+SESSION_INFO_KEY = "read_cache_keys"
+
+# 통계 항목 -> Prometheus result 레이블
+METRIC_RESULTS = {
+    "l1_hits": "l1_hit",
+    "l2_hits": "l2_hit",
+    "coalesced": "coalesced",
+    "misses": "miss",
+    "early_refreshes": "early_refresh",
+    "errors": "error"
+}
+
+
+class MemoryRedis:
+    """
+    프로세스 내 Redis 대체 (테스트/단일 프로세스용)
+    
+    조회 캐시가 사용하는 get/set/delete/publish만 흉내 내며, 발행한
+    메시지는 다른 프로세스로 전달되지 않는다.
+    """
+    
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+    
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value, expires_at = self._data.get(key, (None, None))
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+    
+    async def mget(self, *keys: str) -> list:
+        return [await self.get(key) for key in keys]
+    
+    async def set(self, key: str, value: str, ex: Optional[int] = None):
+        with self._lock:
+            self._data[key] = (value, time.time() + ex if ex else None)
+    
+    async def delete(self, *keys: str) -> int:
+        return self.discard(*keys)
+    
+    async def publish(self, channel: str, message: str) -> int:
+        return 0
+    
+    def discard(self, *keys: str) -> int:
+        """동기 삭제 (워커 스레드의 커밋 후 무효화용)"""
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+
+class CacheEntry:
+    """L1 항목 (크기는 직렬화한 길이 기준)"""
+    
+    __slots__ = ("value", "size")
+    
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+
+
+class ReadCache:
+    """
+    조회 결과 2단 캐시
+    
+    - L1: 프로세스 내 TTL/LRU 캐시 (직렬화 크기 합계로 제한). 짧은 TTL로
+      유지하며 다른 프로세스의 무효화는 Redis pub/sub으로 받는다.
+    - L2: Redis (READ_CACHE_BACKEND=memory면 프로세스 내 가짜 Redis).
+    - 같은 키의 동시 미스는 한 번만 로드하고 나머지는 결과를 기다린다.
+      L2 항목은 만료가 가까울수록 높은 확률로 미리 다시 로드해 만료 순간
+      요청이 한꺼번에 몰리지 않게 한다 (확률적 조기 갱신).
+    - 문서/분석/사용자가 바뀐 트랜잭션이 커밋되면 Session 이벤트에서 관련 키를
+      무효화한다. ORM을 거치지 않는 일괄 변경은 호출자가 invalidate한다.
+    - 로드 중에 무효화된 키는 로드한 값을 저장하지 않는다. 프로세스 안에서는
+      무효화 세대로, 프로세스 사이에서는 무효화할 때 L2에 남기는 버전 키로
+      로드 시작 후 무효화됐는지 확인한다.
+    
+    캐시 값은 JSON으로 직렬화 가능한 응답 데이터여야 하며, 없는 항목(None)은
+    캐시하지 않는다.
+    """
+    
+    def __init__(self, backend: str = None, redis_url: str = None):
+        self.backend = backend or settings.READ_CACHE_BACKEND
+        self.enabled = self.backend != BACKEND_OFF
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.early_refresh_beta = settings.READ_CACHE_EARLY_REFRESH_BETA
+        
+        self._l1: TTLCache = TTLCache(
+            maxsize=settings.READ_CACHE_L1_MAX_BYTES,
+            ttl=settings.READ_CACHE_L1_TTL,
+            getsizeof=lambda entry: entry.size
+        )
+        self._l1_lock = threading.Lock()
+        # 키 -> 마지막 무효화 세대 (_l1_lock으로 보호)
+        self._generation = 0
+        self._invalidated: TTLCache = TTLCache(
+            maxsize=INVALIDATION_LOG_SIZE, ttl=settings.READ_CACHE_TOMBSTONE_TTL
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._memory = MemoryRedis() if self.backend == BACKEND_MEMORY else None
+        self._redis = None
+        self._redis_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self._origin = uuid.uuid4().hex  # 자신이 발행한 무효화 메시지 구분용
+        self._stats: Dict[str, Counter] = defaultdict(Counter)
+    
+    # ------------------------------------------------------------------
+    # 키
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def version_key(key: str) -> str:
+        """무효화할 때마다 바뀌는 키 버전 (L2, READ_CACHE_TOMBSTONE_TTL 동안 유지)"""
+        return f"{KEY_PREFIX}:version:{key}"
+    
+    @staticmethod
+    def document_key(document_id) -> str:
+        return f"{KEY_PREFIX}:document:{document_id}"
+    
+    @staticmethod
+    def analysis_key(analysis_id) -> str:
+        return f"{KEY_PREFIX}:analysis:{analysis_id}"
+    
+    @staticmethod
+    def analysis_markdown_key(analysis_id) -> str:
+        return f"{KEY_PREFIX}:analysis_markdown:{analysis_id}"
+    
+    @staticmethod
+    def document_analysis_key(document_id) -> str:
+        """문서의 최신 분석"""
+        return f"{KEY_PREFIX}:document_analysis:{document_id}"
+    
+    @staticmethod
+    def principal_key(user_id) -> str:
+        """인증 사용자 (app.core.security.resolve_principal)"""
+        return f"{KEY_PREFIX}:principal:{user_id}"
+    
+    def document_keys(self, document_id) -> list:
+        """문서가 바뀌거나 삭제될 때 무효화할 키"""
+        return [self.document_key(document_id), self.document_analysis_key(document_id)]
+    
+    def analysis_keys(self, analysis_id, document_id=None) -> list:
+        """분석이 추가/변경/삭제될 때 무효화할 키"""
+        keys = [self.analysis_key(analysis_id), self.analysis_markdown_key(analysis_id)]
+        if document_id is not None:
+            keys.append(self.document_analysis_key(document_id))
+        return keys
+    
+    @staticmethod
+    def owned(user_id, data: Any) -> Dict[str, Any]:
+        """소유자와 함께 저장할 캐시 값 (조회 시 is_owner로 확인)"""
+        return {"user_id": str(user_id), "data": data}
+    
+    @staticmethod
+    def is_owner(entry: Optional[Dict[str, Any]], user_id) -> bool:
+        """owned로 저장한 값이 해당 사용자 것인지 여부"""
+        return entry is not None and entry["user_id"] == str(user_id)
+    
+    @staticmethod
+    def _namespace(key: str) -> str:
+        return key.split(":")[1]
+    
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        """
+        캐시 조회, 없으면 loader로 로드해 저장
+        
+        Args:
+            key: 캐시 키
+            loader: 값을 로드하는 코루틴 함수 (없으면 None 반환)
+            ttl: L2 유지 시간 (초)
+        """
+        if not self.enabled:
+            return await loader()
+        
+        namespace = self._namespace(key)
+        self._ensure_listener()
+        
+        with self._l1_lock:
+            entry = self._l1.get(key)
+        if entry is not None:
+            self._count(namespace, "l1_hits")
+            return entry.value
+        
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count(namespace, "coalesced")
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, namespace, loader, ttl)
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 호출자가 없을 때 "exception never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            self._inflight.pop(key, None)
+        return value
+    
+    async def _load(self, key: str, namespace: str, loader: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        generation = self._current_generation()
+        raw, version = await self._l2_get(key)
+        if raw is not None:
+            payload = json.loads(raw)
+            if not self._should_refresh(payload):
+                self._count(namespace, "l2_hits")
+                self._l1_set(key, payload["value"], len(raw), generation)
+                return payload["value"]
+            self._count(namespace, "early_refreshes")
+        
+        self._count(namespace, "misses")
+        started = time.monotonic()
+        value = await loader()
+        if value is None:
+            return None
+        
+        raw = json.dumps(
+            {"value": value, "load_time": time.monotonic() - started, "expires_at": time.time() + ttl},
+            ensure_ascii=False,
+            default=str
+        )
+        # 로드 중에 무효화됐으면 옛 값일 수 있으므로 이번 호출자에게만 돌려줌
+        if self._invalidated_since(key, generation):
+            return value
+        if await self._l2_set(key, raw, ttl, version):
+            self._l1_set(key, value, len(raw), generation)
+        return value
+    
+    def _should_refresh(self, payload: Dict[str, Any]) -> bool:
+        """
+        만료 전 조기 갱신 여부
+        
+        로드에 오래 걸린 항목일수록, 만료가 가까울수록 갱신 확률이 높다
+        (남은 시간 < 로드 시간 × beta × -ln(난수)).
+        """
+        if self.early_refresh_beta <= 0:
+            return False
+        gap = payload["load_time"] * self.early_refresh_beta * -math.log(1.0 - random.random())
+        return time.time() + gap >= payload["expires_at"]
+    
+    def _current_generation(self) -> int:
+        with self._l1_lock:
+            return self._generation
+    
+    def _invalidated_since(self, key: str, generation: int) -> bool:
+        """generation 이후 이 프로세스에서 key가 무효화됐는지 여부"""
+        with self._l1_lock:
+            return self._invalidated.get(key, 0) > generation
+    
+    def _l1_set(self, key: str, value: Any, size: int, generation: int):
+        with self._l1_lock:
+            if self._invalidated.get(key, 0) > generation:
+                return
+            try:
+                self._l1[key] = CacheEntry(value, size)
+            except ValueError:
+                # L1 전체 크기보다 큰 값은 L2에만 둠
+                pass
+    
+    def _l1_evict(self, keys):
+        """L1에서 삭제하고 진행 중인 로드가 저장하지 않도록 무효화 세대 기록"""
+        with self._l1_lock:
+            self._generation += 1
+            for key in keys:
+                self._l1.pop(key, None)
+                self._invalidated[key] = self._generation
+    
+    # ------------------------------------------------------------------
+    # L2 (Redis)
+    # ------------------------------------------------------------------
+    
+    async def _get_redis(self):
+        """L2 클라이언트 (지연 생성)"""
+        if self._memory is not None:
+            return self._memory
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            self._redis_loop = asyncio.get_running_loop()
+        return self._redis
+    
+    async def _l2_get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """L2 값과 현재 키 버전"""
+        try:
+            redis = await self._get_redis()
+            raw, version = await redis.mget(key, self.version_key(key))
+            return raw, version
+        except Exception as e:
+            self._count(self._namespace(key), "errors")
+            logger.warning(f"조회 캐시 L2 조회 실패: {key} - {str(e)}")
+            return None, None
+    
+    async def _l2_set(self, key: str, raw: str, ttl: int, version: Optional[str]) -> bool:
+        """
+        L2 저장 (로드 시작 후 다른 프로세스가 무효화해 버전이 바뀌었으면 저장 안 함)
+        
+        Returns:
+            저장했는지 여부
+        """
+        try:
+            redis = await self._get_redis()
+            if await redis.get(self.version_key(key)) != version:
+                logger.debug(f"조회 캐시 로드 중 무효화됨 - 저장 생략: {key}")
+                return False
+            await redis.set(key, raw, ex=ttl)
+            return True
+        except Exception as e:
+            self._count(self._namespace(key), "errors")
+            logger.warning(f"조회 캐시 L2 저장 실패: {key} - {str(e)}")
+            return False
+    
+    # ------------------------------------------------------------------
+    # 무효화
+    # ------------------------------------------------------------------
+    
+    def _message(self, keys) -> str:
+        return json.dumps({"origin": self._origin, "keys": list(keys)})
+    
+    async def invalidate(self, *keys: str):
+        """L1/L2에서 삭제하고 다른 프로세스의 L1에도 알림"""
+        if not self.enabled or not keys:
+            return
+        self._l1_evict(keys)
+        try:
+            redis = await self._get_redis()
+            # 버전을 먼저 바꿔 진행 중인 다른 프로세스의 로드가 옛 값을 저장하지 않게 함
+            version = uuid.uuid4().hex
+            for key in keys:
+                await redis.set(self.version_key(key), version, ex=settings.READ_CACHE_TOMBSTONE_TTL)
+            await redis.delete(*keys)
+            await redis.publish(INVALIDATION_CHANNEL, self._message(keys))
+        except Exception as e:
+            logger.warning(f"조회 캐시 무효화 실패: {keys} - {str(e)}")
+    
+    def invalidate_sync(self, *keys: str):
+        """동기 코드(워커, 동기 Session)에서 무효화"""
+        if not self.enabled or not keys:
+            return
+        self._l1_evict(keys)
+        try:
+            if self._memory is not None:
+                self._memory.discard(*keys)
+                return
+            if self._sync_redis is None:
+                import redis
+                self._sync_redis = redis.Redis.from_url(self.redis_url, decode_responses=True)
+            version = uuid.uuid4().hex
+            pipe = self._sync_redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(self.version_key(key), version, ex=settings.READ_CACHE_TOMBSTONE_TTL)
+            pipe.delete(*keys)
+            pipe.publish(INVALIDATION_CHANNEL, self._message(keys))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"조회 캐시 무효화 실패: {keys} - {str(e)}")
+    
+    def invalidate_nowait(self, *keys: str):
+        """
+        현재 스레드에 맞는 방식으로 무효화
+        
+        L1은 바로 지우고, L2 클라이언트를 만든 이벤트 루프 안이면 L2 삭제를
+        작업으로 예약하며 그 밖에서는 동기 클라이언트를 사용한다.
+        """
+        if not self.enabled or not keys:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None and loop is self._redis_loop:
+            self._l1_evict(keys)
+            loop.create_task(self.invalidate(*keys))
+        else:
+            self.invalidate_sync(*keys)
+    
+    def _ensure_listener(self):
+        """다른 프로세스의 무효화 알림 구독 (Redis 사용 시, 이벤트 루프마다 한 번)"""
+        if self.backend != BACKEND_REDIS:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+    
+    async def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                redis = await self._get_redis()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != self._origin:
+                        self._l1_evict(payload.get("keys", []))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"조회 캐시 무효화 구독 실패 - 재연결: {str(e)}")
+                # 알림을 놓친 동안의 L1은 믿을 수 없으므로 비움
+                with self._l1_lock:
+                    self._l1.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+    
+    # ------------------------------------------------------------------
+    # Session 이벤트 (커밋 후 자동 무효화)
+    # ------------------------------------------------------------------
+    
+    def register(self, session_class=Session):
+        """flush/commit 이벤트 등록 (AsyncSession도 내부적으로 Session을 사용)"""
+        if not event.contains(session_class, "after_flush", self._after_flush):
+            event.listen(session_class, "after_flush", self._after_flush)
+            event.listen(session_class, "after_commit", self._after_commit)
+            event.listen(session_class, "after_rollback", self._after_rollback)
+    
+    def _after_flush(self, session: Session, flush_context):
+        keys = session.info.setdefault(SESSION_INFO_KEY, set())
+        for instance in chain(session.new, session.dirty, session.deleted):
+            if isinstance(instance, Document) and instance.id is not None:
+                keys.update(self.document_keys(instance.id))
+            elif isinstance(instance, Analysis) and instance.id is not None:
+                keys.update(self.analysis_keys(instance.id, instance.document_id))
+            elif isinstance(instance, User) and instance.id is not None:
+                keys.add(self.principal_key(instance.id))
+    
+    def _after_commit(self, session: Session):
+        keys = session.info.pop(SESSION_INFO_KEY, None)
+        if keys:
+            self.invalidate_nowait(*keys)
+    
+    def _after_rollback(self, session: Session):
+        session.info.pop(SESSION_INFO_KEY, None)
+    
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+    
+    def _count(self, namespace: str, name: str):
+        self._stats[namespace][name] += 1
+        count_cache_request("read", namespace, METRIC_RESULTS[name])
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        키 종류별 적중 통계 (프로세스 시작 이후 누적)
+        
+        Returns:
+            {종류: {"l1_hits", "l2_hits", "misses", "coalesced", "early_refreshes", "errors", "hit_ratio"}}
+        """
+        result = {}
+        for namespace, counter in self._stats.items():
+            hits = counter["l1_hits"] + counter["l2_hits"] + counter["coalesced"]
+            lookups = hits + counter["misses"]
+            result[namespace] = {
+                **{name: counter[name] for name in ("l1_hits", "l2_hits", "misses", "coalesced", "early_refreshes", "errors")},
+                "hit_ratio": round(hits / lookups, 4) if lookups else None
+            }
+        return result
+
+
+# 프로세스 전역 인스턴스 (임포트 시 Session 이벤트 등록)
+read_cache = ReadCache()
+read_cache.register()
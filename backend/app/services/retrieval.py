@@ -0,0 +1,285 @@
+"""
+문서 검색 서비스 (BM25 역색인 기반 질의응답 컨텍스트 검색)
+"""
+
+import re
+import json
+import math
+import zlib
+import bisect
+import hashlib
+import logging
+import threading
+import uuid
+from collections import Counter
+from typing import List, Dict, Optional, Any, Tuple
+
+from cachetools import LRUCache
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document_chunk import DocumentChunk
+from app.models.search_index import DocumentSearchIndex
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절 / 영문·숫자 토큰 패턴
+HANGUL_PATTERN = re.compile(r'[가-힣]+')
+WORD_PATTERN = re.compile(r'[A-Za-z0-9]+')
+
+INDEX_FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색용 토큰화
+    
+    한글은 조사/어미 변화에 강하도록 음절 bigram으로, 영문과 숫자는
+    소문자 단어 단위로 분리한다.
+    """
+    tokens = []
+    for word in HANGUL_PATTERN.findall(text):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    tokens.extend(word.lower() for word in WORD_PATTERN.findall(text))
+    return tokens
+
+
+class BM25Index:
+    """단일 문서의 BM25 역색인"""
+    
+    def __init__(
+        self,
+        passages: List[Dict[str, Any]],
+        postings: Dict[str, List[int]],
+        lengths: List[int],
+        k1: float = None,
+        b: float = None
+    ):
+        self.passages = passages  # [{"start", "end", "page_start", "page_end"}]
+        self.postings = postings  # term -> [passage, tf, passage, tf, ...]
+        self.lengths = lengths
+        self.k1 = k1 if k1 is not None else settings.RETRIEVAL_BM25_K1
+        self.b = b if b is not None else settings.RETRIEVAL_BM25_B
+        self.avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+    
+    @classmethod
+    def build(cls, text: str, spans: List[Tuple[int, int]], page_spans: List[Tuple[Optional[int], Optional[int]]]) -> "BM25Index":
+        """
+        텍스트 구간 목록으로 인덱스 생성
+        
+        Args:
+            text: cleaned_text
+            spans: 검색 단위 구간 (시작, 끝 오프셋)
+            page_spans: 구간별 (시작 페이지, 끝 페이지)
+        """
+        passages = []
+        lengths = []
+        postings: Dict[str, List[int]] = {}
+        
+        for index, ((start, end), (page_start, page_end)) in enumerate(zip(spans, page_spans)):
+            terms = Counter(tokenize(text[start:end]))
+            passages.append({
+                "start": start,
+                "end": end,
+                "page_start": page_start,
+                "page_end": page_end
+            })
+            lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                postings.setdefault(term, []).extend((index, frequency))
+        
+        return cls(passages, postings, lengths)
+    
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """
+        질의와 관련된 상위 구간 검색
+        
+        Returns:
+            (구간 인덱스, 점수) 목록 (점수 내림차순)
+        """
+        passage_total = len(self.passages)
+        if not passage_total:
+            return []
+        
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            
+            document_frequency = len(posting) // 2
+            idf = math.log(1 + (passage_total - document_frequency + 0.5) / (document_frequency + 0.5))
+            
+            for i in range(0, len(posting), 2):
+                passage, frequency = posting[i], posting[i + 1]
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[passage] / (self.avg_length or 1))
+                scores[passage] = scores.get(passage, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+    
+    def to_bytes(self) -> bytes:
+        """압축 직렬화"""
+        payload = {
+            "version": INDEX_FORMAT_VERSION,
+            "passages": [
+                [p["start"], p["end"], p["page_start"], p["page_end"]] for p in self.passages
+            ],
+            "lengths": self.lengths,
+            "postings": self.postings
+        }
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(raw, 6)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BM25Index":
+        """압축 데이터에서 인덱스 복원"""
+        payload = json.loads(zlib.decompress(data).decode("utf-8"))
+        passages = [
+            {"start": start, "end": end, "page_start": page_start, "page_end": page_end}
+            for start, end, page_start, page_end in payload["passages"]
+        ]
+        return cls(passages, payload["postings"], payload["lengths"])
+
+
+class RetrievalService:
+    """문서 검색 인덱스 생성/조회 서비스"""
+    
+    def __init__(self, ai_analyzer):
+        self.ai_analyzer = ai_analyzer
+        self.passage_tokens = settings.RETRIEVAL_PASSAGE_TOKENS
+        self._cache: LRUCache = LRUCache(maxsize=settings.RETRIEVAL_INDEX_CACHE_SIZE)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """cleaned_text 해시"""
+        return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+    
+    def build_index(
+        self,
+        text: str,
+        page_offsets: Optional[List[int]] = None,
+        leaves: Optional[List[DocumentChunk]] = None
+    ) -> BM25Index:
+        """
+        cleaned_text로 BM25 인덱스 생성
+        
+        Args:
+            text: cleaned_text
+            page_offsets: 페이지별 시작 오프셋 (처리 파이프라인에서 전달)
+            leaves: 저장된 원본 청크 (페이지 오프셋이 없을 때 페이지 추정용)
+        """
+        spans = [
+            (start, end)
+            for start, end in self.ai_analyzer.split_text_with_offsets(text, self.passage_tokens)
+            if text[start:end].strip()
+        ]
+        page_spans = [self._page_span(start, end, page_offsets, leaves) for start, end in spans]
+        return BM25Index.build(text, spans, page_spans)
+    
+    def save_index(
+        self,
+        db: Session,
+        document_id: uuid.UUID,
+        text: str,
+        page_offsets: Optional[List[int]] = None,
+        leaves: Optional[List[DocumentChunk]] = None,
+        index: Optional[BM25Index] = None
+    ) -> BM25Index:
+        """인덱스 생성 후 저장 (기존 인덱스 교체, index를 주면 생성하지 않고 저장만 함)"""
+        if index is None:
+            index = self.build_index(text, page_offsets, leaves)
+        
+        record = db.query(DocumentSearchIndex).filter(
+            DocumentSearchIndex.document_id == document_id
+        ).first()
+        if record is None:
+            record = DocumentSearchIndex(document_id=document_id)
+            db.add(record)
+        
+        record.text_hash = self.text_hash(text)
+        record.passage_count = len(index.passages)
+        record.term_count = len(index.postings)
+        record.avg_passage_length = index.avg_length
+        record.data = index.to_bytes()
+        
+        with self._lock:
+            self._cache[document_id] = (record.text_hash, index)
+        return index
+    
+    def get_index(self, db: Session, document_id: uuid.UUID, text: str) -> BM25Index:
+        """
+        인덱스 조회 (메모리 캐시 → DB → 없으면 한 번 생성해 저장)
+        
+        Args:
+            db: 데이터베이스 세션
+            document_id: 문서 ID
+            text: 현재 분석의 cleaned_text (인덱스 유효성 확인용)
+        """
+        current_hash = self.text_hash(text)
+        
+        with self._lock:
+            cached = self._cache.get(document_id)
+        if cached and cached[0] == current_hash:
+            return cached[1]
+        
+        record = db.query(DocumentSearchIndex).filter(
+            DocumentSearchIndex.document_id == document_id
+        ).first()
+        if record is not None and record.text_hash == current_hash:
+            index = BM25Index.from_bytes(record.data)
+            with self._lock:
+                self._cache[document_id] = (current_hash, index)
+            return index
+        
+        logger.info(f"검색 인덱스 생성: {document_id}")
+        leaves = db.query(DocumentChunk).filter(
+            DocumentChunk.document_id == document_id,
+            DocumentChunk.level == 0
+        ).order_by(DocumentChunk.position).all()
+        index = self.save_index(db, document_id, text, leaves=leaves)
+        db.commit()
+        return index
+    
+    def invalidate(self, document_id: uuid.UUID):
+        """메모리 캐시에서 인덱스 제거"""
+        with self._lock:
+            self._cache.pop(document_id, None)
+    
+    def _page_span(
+        self,
+        start: int,
+        end: int,
+        page_offsets: Optional[List[int]],
+        leaves: Optional[List[DocumentChunk]]
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """구간의 (시작 페이지, 끝 페이지) 추정"""
+        last = max(start, end - 1)
+        
+        if page_offsets:
+            return (
+                max(1, bisect.bisect_right(page_offsets, start)),
+                max(1, bisect.bisect_right(page_offsets, last))
+            )
+        
+        if leaves:
+            page_start = self._interpolate_page(leaves, start)
+            page_end = self._interpolate_page(leaves, last)
+            return page_start, page_end
+        
+        return None, None
+    
+    def _interpolate_page(self, leaves: List[DocumentChunk], offset: int) -> Optional[int]:
+        """원본 청크의 페이지 범위로 오프셋의 페이지를 선형 보간"""
+        for leaf in leaves:
+            if leaf.start_offset <= offset < leaf.end_offset:
+                if leaf.page_start is None or leaf.page_end is None:
+                    return None
+                span = max(1, leaf.end_offset - leaf.start_offset)
+                ratio = (offset - leaf.start_offset) / span
+                return leaf.page_start + int(ratio * (leaf.page_end - leaf.page_start + 1))
+        return None
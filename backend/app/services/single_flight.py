@@ -0,0 +1,221 @@
+"""
+동일 분석 요청 병합 서비스 (single-flight)
+"""
+
+import json
+import copy
+import uuid
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "singleflight"
+
+# 리더가 잠금을 해제하는 Lua 스크립트 (자신이 잡은 잠금만 삭제)
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlightError(Exception):
+    """다른 워커에서 수행한 공유 계산이 실패한 경우"""
+    pass
+
+
+class SingleFlight:
+    """
+    진행 중인 동일 계산을 하나로 병합
+    
+    같은 키의 요청이 동시에 들어오면 첫 요청만 실제로 계산하고 나머지는
+    그 결과를 기다린다. 워커 내부는 asyncio Future로, 워커 간에는 선택적으로
+    Redis 잠금과 pub/sub으로 병합한다.
+    """
+    
+    def __init__(self, redis_url: str = None):
+        self.enabled = settings.SINGLE_FLIGHT_ENABLED
+        self.redis_enabled = settings.SINGLE_FLIGHT_REDIS_ENABLED
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.lock_ttl = settings.SINGLE_FLIGHT_LOCK_TTL
+        self.wait_timeout = settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+        self.result_ttl = settings.SINGLE_FLIGHT_RESULT_TTL
+        
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._redis = None
+    
+    @staticmethod
+    def make_key(text: str, **params) -> str:
+        """
+        병합 키 생성
+        
+        Args:
+            text: 분석 대상 텍스트
+            params: 결과에 영향을 주는 모델/옵션 값
+        
+        Returns:
+            텍스트 해시와 옵션 해시를 결합한 키
+        """
+        text_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        options = json.dumps(params, sort_keys=True, default=str)
+        options_hash = hashlib.sha256(options.encode("utf-8")).hexdigest()[:16]
+        return f"{text_hash}:{options_hash}"
+    
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키 단위로 병합해 func 실행
+        
+        결과는 호출자마다 복사본을 돌려주므로 호출자가 수정해도 서로
+        영향을 주지 않는다. 워커 간 병합을 쓰려면 결과가 JSON 직렬화
+        가능해야 한다.
+        """
+        if not self.enabled:
+            return await func()
+        
+        future = self._inflight.get(key)
+        if future is not None:
+            logger.info(f"진행 중인 동일 분석에 합류: {key}")
+            return copy.deepcopy(await asyncio.shield(future))
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self.redis_enabled:
+                result = await self._run_distributed(key, func)
+            else:
+                result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 호출자가 없을 때 "exception never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._inflight.pop(key, None)
+        
+        return copy.deepcopy(result)
+    
+    def inflight_count(self) -> int:
+        """현재 워커에서 진행 중인 병합 키 수"""
+        return len(self._inflight)
+    
+    async def _get_redis(self):
+        """Redis 클라이언트 (지연 생성)"""
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+    
+    async def _run_distributed(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Redis 잠금을 잡은 워커만 계산하고 나머지는 결과 발행을 기다림"""
+        try:
+            redis = await self._get_redis()
+            token = uuid.uuid4().hex
+            acquired = await redis.set(f"{KEY_PREFIX}:lock:{key}", token, nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            logger.warning(f"single-flight Redis 사용 불가 - 워커 내 병합만 적용: {e}")
+            return await func()
+        
+        if acquired:
+            return await self._lead(redis, key, token, func)
+        
+        payload = await self._wait_for_leader(redis, key)
+        if payload is None:
+            # 리더가 사라졌거나 시간 초과 - 직접 계산
+            logger.warning(f"공유 분석 결과 대기 시간 초과 - 직접 계산: {key}")
+            return await func()
+        if "error" in payload:
+            raise SingleFlightError(payload["error"])
+        return payload["result"]
+    
+    async def _lead(self, redis, key: str, token: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        리더로서 계산 후 결과 발행
+        
+        결과에는 잠금 토큰을 붙여 기다리는 쪽이 이전 리더의 결과(특히 오류)를
+        이번 결과로 받지 않게 한다.
+        """
+        try:
+            # 이전 리더가 남긴 결과는 이번 계산과 무관하므로 삭제
+            await redis.delete(f"{KEY_PREFIX}:result:{key}")
+        except Exception as e:
+            logger.warning(f"single-flight 이전 결과 삭제 실패: {e}")
+        
+        payload: Dict[str, Any] = {"error": "공유 분석이 중단되었습니다"}
+        try:
+            result = await func()
+            payload = {"result": result}
+        except Exception as e:
+            payload = {"error": str(e)}
+            raise
+        finally:
+            payload["token"] = token
+            message = json.dumps(payload, ensure_ascii=False, default=str)
+            try:
+                # 구독 전에 발행된 경우를 위해 결과를 잠시 보관
+                await redis.set(f"{KEY_PREFIX}:result:{key}", message, ex=self.result_ttl)
+                await redis.publish(f"{KEY_PREFIX}:channel:{key}", message)
+                await redis.eval(RELEASE_LOCK_SCRIPT, 1, f"{KEY_PREFIX}:lock:{key}", token)
+            except Exception as e:
+                logger.warning(f"single-flight 결과 발행 실패: {e}")
+        return result
+    
+    async def _wait_for_leader(self, redis, key: str) -> Optional[Dict[str, Any]]:
+        """
+        리더의 결과 발행 대기 (잠금이 사라지면 None)
+        
+        기다리기 시작할 때의 잠금 토큰과 다른 토큰의 결과는 무시한다
+        (잠금이 이미 사라졌으면 방금 끝난 리더의 결과를 받음).
+        """
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(f"{KEY_PREFIX}:channel:{key}")
+            token = await redis.get(f"{KEY_PREFIX}:lock:{key}")
+            
+            def current(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+                if not raw:
+                    return None
+                payload = json.loads(raw)
+                if token is not None and payload.get("token") != token:
+                    return None
+                return payload
+            
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.wait_timeout
+            while loop.time() < deadline:
+                payload = current(await redis.get(f"{KEY_PREFIX}:result:{key}"))
+                if payload is not None:
+                    return payload
+                
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    payload = current(message["data"])
+                    if payload is not None:
+                        return payload
+                
+                if not await redis.exists(f"{KEY_PREFIX}:lock:{key}"):
+                    return current(await redis.get(f"{KEY_PREFIX}:result:{key}"))
+            return None
+        except Exception as e:
+            logger.warning(f"single-flight 결과 대기 실패: {e}")
+            return None
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.close()
+            except Exception:
+                pass
+
+
+# 프로세스 전역 인스턴스 (같은 워커의 요청끼리 공유)
+single_flight = SingleFlight()
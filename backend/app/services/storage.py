@@ -0,0 +1,330 @@
+"""
+파일 저장소 서비스 (로컬 디스크 / S3 호환 객체 저장소)
+"""
+
+import os
+import shutil
+import base64
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+from jose import jwt, JWTError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_LOCAL = "local"
+BACKEND_S3 = "s3"
+
+# 서명 토큰 용도
+ACTION_UPLOAD = "upload"      # 로컬 저장소 직접 업로드
+ACTION_DOWNLOAD = "download"  # 로컬 저장소 직접 다운로드
+ACTION_REGISTER = "register"  # 직접 업로드한 파일을 문서로 등록
+
+
+class StorageError(Exception):
+    """저장소 작업 실패"""
+    pass
+
+
+class Storage:
+    """
+    파일 저장소 공통 인터페이스
+    
+    문서는 저장소 키(documents/{사용자 ID}/{파일 이름})로 식별한다.
+    클라이언트는 서명된 URL로 직접 올리고 내려받으며, 워커는 처리에
+    필요할 때 local_copy로 로컬 파일을 얻는다.
+    """
+    
+    backend = None
+    
+    def __init__(self):
+        self.presign_expires = settings.STORAGE_PRESIGN_EXPIRES
+    
+    @staticmethod
+    def document_key(user_id, filename: str) -> str:
+        """문서 저장소 키"""
+        return f"documents/{user_id}/{filename}"
+    
+    def create_token(self, key: str, action: str, expires: int = None, **claims) -> str:
+        """저장소 키에 대한 서명 토큰 (로컬 서명 URL, 직접 업로드 등록 확인용)"""
+        payload = {
+            "exp": datetime.utcnow() + timedelta(seconds=expires or self.presign_expires),
+            "key": key,
+            "action": action,
+            **claims
+        }
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    
+    def verify_token(self, token: str, action: str) -> Optional[Dict[str, Any]]:
+        """저장소 접근 토큰 검증 (용도가 다르거나 만료되면 None)"""
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return None
+        if payload.get("action") != action:
+            return None
+        return payload
+    
+    def location(self, key: str) -> str:
+        """Document.file_path에 기록할 위치"""
+        raise NotImplementedError
+    
+    def put_file(self, local_path: str, key: str, content_type: str = None):
+        """로컬 파일을 저장소로 옮김 (원본 로컬 파일은 제거됨)"""
+        raise NotImplementedError
+    
+    def size(self, key: str) -> Optional[int]:
+        """객체 크기 (없으면 None)"""
+        raise NotImplementedError
+    
+    def delete(self, key: str):
+        """객체 삭제 (없으면 무시)"""
+        raise NotImplementedError
+    
+    def local_copy(self, key: str) -> str:
+        """처리용 로컬 파일 경로 (원격 저장소면 캐시로 내려받음)"""
+        raise NotImplementedError
+    
+    def release_local_copy(self, key: str):
+        """local_copy로 내려받은 캐시 파일 정리"""
+        pass
+    
+    def presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        file_hash: Optional[str] = None,
+        expires: int = None
+    ) -> Dict[str, Any]:
+        """
+        직접 업로드용 서명 URL
+        
+        Returns:
+            {"url", "method", "headers", "expires_in"}
+        """
+        raise NotImplementedError
+    
+    def presigned_download(self, key: str, filename: str = None, expires: int = None) -> str:
+        """직접 다운로드용 서명 URL"""
+        raise NotImplementedError
+
+
+class LocalStorage(Storage):
+    """
+    로컬 디스크 저장소 (단일 노드/개발용)
+    
+    서명 URL은 /storage 엔드포인트를 가리키는 만료 시간이 있는 토큰으로
+    대신한다.
+    """
+    
+    backend = BACKEND_LOCAL
+    
+    def __init__(self, base_dir: str = None):
+        super().__init__()
+        self.base_dir = base_dir or settings.UPLOAD_DIR
+    
+    def path(self, key: str) -> str:
+        """키에 해당하는 로컬 경로 (저장소 밖을 가리키는 키는 거부)"""
+        base = os.path.abspath(self.base_dir)
+        path = os.path.abspath(os.path.join(base, key))
+        if not path.startswith(base + os.sep):
+            raise StorageError(f"잘못된 저장소 키입니다: {key}")
+        return path
+    
+    def location(self, key: str) -> str:
+        return os.path.join(self.base_dir, key)
+    
+    def put_file(self, local_path: str, key: str, content_type: str = None):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.move(local_path, path)
+    
+    def size(self, key: str) -> Optional[int]:
+        path = self.path(key)
+        return os.path.getsize(path) if os.path.exists(path) else None
+    
+    def delete(self, key: str):
+        path = self.path(key)
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def local_copy(self, key: str) -> str:
+        path = self.path(key)
+        if not os.path.exists(path):
+            raise StorageError(f"파일을 찾을 수 없습니다: {key}")
+        return path
+    
+    def presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        file_hash: Optional[str] = None,
+        expires: int = None
+    ) -> Dict[str, Any]:
+        expires = expires or self.presign_expires
+        token = self.create_token(key, ACTION_UPLOAD, expires, content_type=content_type, file_hash=file_hash)
+        return {
+            "url": f"{settings.API_V1_STR}/storage/objects?token={token}",
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "expires_in": expires
+        }
+    
+    def presigned_download(self, key: str, filename: str = None, expires: int = None) -> str:
+        token = self.create_token(key, ACTION_DOWNLOAD, expires, filename=filename)
+        return f"{settings.API_V1_STR}/storage/objects?token={token}"
+
+
+class S3Storage(Storage):
+    """
+    S3 호환 객체 저장소 (AWS S3, MinIO)
+    
+    API 서버는 서명 URL만 발급하고 파일 본문은 클라이언트와 저장소가 직접
+    주고받는다. 워커는 처리할 때만 캐시 디렉토리로 내려받는다.
+    """
+    
+    backend = BACKEND_S3
+    
+    def __init__(self, bucket: str = None):
+        super().__init__()
+        self.bucket = bucket or settings.S3_BUCKET_NAME
+        self.cache_dir = settings.STORAGE_CACHE_DIR
+        self._client = None
+        self._presign_client = None
+        self._lock = threading.Lock()
+    
+    def _make_client(self, endpoint: Optional[str]):
+        import boto3
+        from botocore.config import Config
+        
+        return boto3.client(
+            "s3",
+            endpoint_url=endpoint,
+            aws_access_key_id=settings.S3_ACCESS_KEY,
+            aws_secret_access_key=settings.S3_SECRET_KEY,
+            region_name=settings.S3_REGION,
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"})
+        )
+    
+    @property
+    def client(self):
+        """내부 통신용 클라이언트 (지연 생성)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._make_client(settings.S3_ENDPOINT)
+        return self._client
+    
+    @property
+    def presign_client(self):
+        """서명 URL용 클라이언트 (클라이언트가 접근하는 공개 주소 기준)"""
+        if self._presign_client is None:
+            with self._lock:
+                if self._presign_client is None:
+                    self._presign_client = self._make_client(settings.S3_PUBLIC_ENDPOINT or settings.S3_ENDPOINT)
+        return self._presign_client
+    
+    def ensure_bucket(self):
+        """버킷이 없으면 생성"""
+        from botocore.exceptions import ClientError
+        
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except ClientError:
+            self.client.create_bucket(Bucket=self.bucket)
+            logger.info(f"저장소 버킷 생성: {self.bucket}")
+    
+    def location(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+    
+    def put_file(self, local_path: str, key: str, content_type: str = None):
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.client.upload_file(local_path, self.bucket, key, ExtraArgs=extra_args)
+        os.remove(local_path)
+    
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+        
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+    
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        self.release_local_copy(key)
+    
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+    
+    def local_copy(self, key: str) -> str:
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            return path
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # download_file은 큰 객체를 범위 요청으로 나누어 스트리밍
+            self.client.download_file(self.bucket, key, temp_path)
+            os.replace(temp_path, path)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise StorageError(f"저장소에서 파일을 내려받지 못했습니다: {key} ({str(e)})") from e
+        return path
+    
+    def release_local_copy(self, key: str):
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        file_hash: Optional[str] = None,
+        expires: int = None
+    ) -> Dict[str, Any]:
+        expires = expires or self.presign_expires
+        params = {"Bucket": self.bucket, "Key": key, "ContentType": content_type}
+        headers = {"Content-Type": content_type}
+        if file_hash:
+            # 저장소가 업로드 본문의 SHA-256을 검증하도록 체크섬을 서명에 포함
+            checksum = base64.b64encode(bytes.fromhex(file_hash)).decode("ascii")
+            params["ChecksumSHA256"] = checksum
+            headers["x-amz-checksum-sha256"] = checksum
+        
+        url = self.presign_client.generate_presigned_url(
+            "put_object", Params=params, ExpiresIn=expires
+        )
+        return {"url": url, "method": "PUT", "headers": headers, "expires_in": expires}
+    
+    def presigned_download(self, key: str, filename: str = None, expires: int = None) -> str:
+        params = {"Bucket": self.bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        return self.presign_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires or self.presign_expires
+        )
+
+
+def create_storage(backend: str = None) -> Storage:
+    """설정에 맞는 저장소 생성"""
+    backend = backend or settings.STORAGE_BACKEND
+    if backend == BACKEND_S3:
+        return S3Storage()
+    if backend == BACKEND_LOCAL:
+        return LocalStorage()
+    raise ValueError(f"지원하지 않는 저장소입니다: {backend}")
+
+
+# 프로세스 전역 저장소
+storage = create_storage()
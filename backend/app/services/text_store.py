@@ -0,0 +1,117 @@
+"""
+분석 텍스트 저장소 서비스 (내용 해시 기준, zstd 압축)
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, delete, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.analysis import Analysis
+from app.models.text_blob import TextBlob, CODEC_ZSTD
+
+logger = logging.getLogger(__name__)
+
+
+class TextStore:
+    """
+    분석 원문/정제 텍스트 저장
+    
+    같은 텍스트는 해시 하나로 한 번만 저장되고, 재분석으로 만든 새 분석
+    버전이나 중복 파일에서 복제한 분석은 해시만 복사해 같은 행을 참조한다.
+    분석 목록/통계 조회는 analyses 테이블만 읽으므로 큰 텍스트를 건드리지
+    않으며, 텍스트가 필요한 엔드포인트만 관계를 명시적으로 불러온다.
+    """
+    
+    def __init__(self):
+        self.level = settings.TEXT_BLOB_ZSTD_LEVEL
+        self.sweep_grace = settings.TEXT_BLOB_SWEEP_GRACE
+        self.sweep_batch = settings.TEXT_BLOB_SWEEP_BATCH
+    
+    def put(self, db: Session, text: Optional[str]) -> Optional[str]:
+        """
+        텍스트 저장 (커밋은 호출자가 수행)
+        
+        이미 있는 텍스트는 다시 압축/저장하지 않고 마지막 참조 시각만
+        갱신한다. 이 갱신이 행을 잠그므로 같은 트랜잭션에서 분석 행이
+        커밋되기 전에 정리 작업이 텍스트를 지우지 못한다.
+        
+        Returns:
+            텍스트 해시 (텍스트가 없으면 None)
+        """
+        if text is None:
+            return None
+        
+        content_hash = TextBlob.hash_text(text)
+        now = datetime.utcnow()
+        exists_already = db.execute(
+            insert(TextBlob.__table__)
+            .values(content_hash=content_hash, codec=CODEC_ZSTD, data=b"",
+                    original_size=0, compressed_size=0, created_at=now, last_referenced_at=now)
+            .on_conflict_do_update(index_elements=["content_hash"], set_={"last_referenced_at": now})
+            .returning(TextBlob.compressed_size)
+        ).scalar_one() > 0
+        
+        if not exists_already:
+            data = TextBlob.compress(text, self.level)
+            db.execute(
+                TextBlob.__table__.update()
+                .where(TextBlob.content_hash == content_hash)
+                .values(data=data, original_size=len(text.encode("utf-8")), compressed_size=len(data))
+            )
+        return content_hash
+    
+    def get(self, db: Session, content_hash: Optional[str]) -> Optional[str]:
+        """해시로 텍스트 조회 (없으면 None)"""
+        if not content_hash:
+            return None
+        blob = db.get(TextBlob, content_hash)
+        return blob.text if blob is not None else None
+    
+    def sweep(self, db: Session) -> int:
+        """
+        어떤 분석도 참조하지 않는 텍스트 삭제
+        
+        저장 직후 분석 행이 아직 커밋되지 않았을 수 있으므로 마지막 참조
+        후 유예 시간이 지난 텍스트만 대상으로 한다.
+        
+        Returns:
+            삭제한 텍스트 수
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.sweep_grace)
+        orphans = (
+            select(TextBlob.content_hash)
+            .where(
+                TextBlob.last_referenced_at < cutoff,
+                ~exists().where(Analysis.raw_text_hash == TextBlob.content_hash),
+                ~exists().where(Analysis.cleaned_text_hash == TextBlob.content_hash)
+            )
+            .limit(self.sweep_batch)
+            .with_for_update(skip_locked=True)
+        )
+        
+        try:
+            result = db.execute(
+                delete(TextBlob)
+                .where(TextBlob.content_hash.in_(orphans), TextBlob.last_referenced_at < cutoff)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except IntegrityError:
+            # 정리 중 새 분석이 같은 텍스트를 참조한 경우 (다음 주기에 다시 시도)
+            db.rollback()
+            logger.info("텍스트 정리 중 참조가 추가되어 이번 주기를 건너뜁니다")
+            return 0
+        
+        if result.rowcount:
+            logger.info(f"참조되지 않는 분석 텍스트 {result.rowcount}개 삭제")
+        return result.rowcount
+
+
+# 전역 인스턴스
+text_store = TextStore()
@@ -0,0 +1,127 @@
+"""
+업로드 파일 스트리밍 저장 서비스
+"""
+
+import os
+import hashlib
+import logging
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FileTooLargeError(Exception):
+    """업로드 크기 제한 초과"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"파일 크기는 {max_size // (1024 * 1024)}MB를 초과할 수 없습니다")
+
+
+class StoredFile:
+    """디스크에 저장된 업로드 파일 정보"""
+    
+    def __init__(self, path: str, size: int, file_hash: str):
+        self.path = path
+        self.size = size
+        self.file_hash = file_hash  # SHA-256
+
+
+class UploadWriter:
+    """
+    업로드 본문을 청크 단위로 디스크에 저장
+    
+    전체 본문을 메모리에 올리지 않고 읽는 즉시 비동기로 기록하며, 저장하면서
+    SHA-256을 계산하고 크기 제한을 넘는 순간 중단한다. 중단되거나 실패한
+    파일은 삭제된다.
+    """
+    
+    def __init__(self, chunk_size: int = None, max_size: int = None):
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+        self.max_size = max_size or settings.MAX_FILE_SIZE
+    
+    async def save(self, file: UploadFile, path: str, max_size: Optional[int] = None) -> StoredFile:
+        """
+        업로드 파일 저장
+        
+        Args:
+            file: 업로드 파일
+            path: 저장 경로
+            max_size: 크기 제한 (기본값: MAX_FILE_SIZE)
+        
+        Raises:
+            FileTooLargeError: 크기 제한 초과
+        """
+        return await self.save_stream(self._iter_upload(file), path, max_size)
+    
+    async def save_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        path: str,
+        max_size: Optional[int] = None
+    ) -> StoredFile:
+        """
+        바이트 스트림 저장 (요청 본문 스트림, 업로드 파일 등)
+        
+        Raises:
+            FileTooLargeError: 크기 제한 초과
+        """
+        max_size = max_size or self.max_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(path, "wb") as out:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > max_size:
+                        raise FileTooLargeError(max_size)
+                    digest.update(chunk)
+                    await out.write(chunk)
+        except BaseException:
+            await self.remove(path)
+            raise
+        
+        return StoredFile(path, size, digest.hexdigest())
+    
+    async def concatenate(self, parts: List[str], path: str) -> StoredFile:
+        """조각 파일을 순서대로 이어 붙여 저장"""
+        return await self.save_stream(self._iter_files(parts), path, max_size=float("inf"))
+    
+    async def _iter_upload(self, file: UploadFile) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await file.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    
+    async def _iter_files(self, paths: List[str]) -> AsyncIterator[bytes]:
+        for part in paths:
+            async with aiofiles.open(part, "rb") as f:
+                while True:
+                    chunk = await f.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+    
+    async def remove(self, path: str):
+        """저장 중이던 파일 삭제 (없으면 무시)"""
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"업로드 파일 삭제 실패: {path} - {str(e)}")
+
+
+# 프로세스 전역 인스턴스
+upload_writer = UploadWriter()
@@ -0,0 +1,329 @@
+"""
+사용자별 통계 증분 갱신 서비스
+"""
+
+import uuid
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.document import Document, DocumentStatus
+from app.models.analysis import Analysis
+from app.models.user_stats import UserStats
+
+logger = logging.getLogger(__name__)
+
+# 값이 바뀌면 통계를 다시 반영해야 하는 컬럼
+DOCUMENT_TRACKED_COLUMNS = ("user_id", "status", "file_size", "processing_time")
+ANALYSIS_TRACKED_COLUMNS = ("document_id", "language", "ai_model", "processing_time", "confidence_score")
+
+# 문서 상태 -> 개수 컬럼
+STATUS_COLUMNS = {
+    DocumentStatus.UPLOADED: "uploaded_documents",
+    DocumentStatus.PROCESSING: "processing_documents",
+    DocumentStatus.COMPLETED: "completed_documents",
+    DocumentStatus.FAILED: "failed_documents",
+}
+
+# 더하고 빼는 숫자 컬럼
+COUNTER_COLUMNS = (
+    "total_documents",
+    *STATUS_COLUMNS.values(),
+    "total_file_size",
+    "document_processing_time_sum",
+    "document_processing_time_count",
+    "total_analyses",
+    "analysis_processing_time_sum",
+    "analysis_processing_time_count",
+    "confidence_score_sum",
+    "confidence_score_count",
+)
+
+stats_table = UserStats.__table__
+
+
+class StatsDelta:
+    """사용자 한 명의 통계 변화량"""
+    
+    def __init__(self):
+        self.values: Counter = Counter()
+        self.languages: Counter = Counter()
+        self.models: Counter = Counter()
+    
+    def __bool__(self) -> bool:
+        return any(self.values.values()) or any(self.languages.values()) or any(self.models.values())
+
+
+def _merge_counts(current: Optional[Dict[str, int]], changes: Counter) -> Dict[str, int]:
+    merged = Counter(current or {})
+    merged.update(changes)
+    return {key: count for key, count in merged.items() if count > 0}
+
+
+class UserStatsService:
+    """
+    사용자 통계(user_stats) 관리
+    
+    Session flush 이벤트에서 변경된 문서/분석을 찾아 같은 트랜잭션 안에서
+    통계 행에 변화량을 더한다. 변경 전 값은 flush 전(before_flush)에, 변경
+    후 값은 flush 후(after_flush)에 DB에서 집계하므로 상태 전환
+    (start/complete/fail_processing), 업로드, 삭제, 재처리 모두 같은 경로로
+    반영된다. 트랜잭션이 롤백되면 통계 변경도 함께 롤백된다.
+    
+    ORM을 거치지 않는 일괄 UPDATE/DELETE는 이벤트가 발생하지 않으므로
+    호출하는 쪽에서 record_status_change/discard_analyses로 반영한다.
+    어긋난 값은 rebuild(배치 작업)로 원본 테이블에서 다시 계산한다.
+    """
+    
+    def register(self, session_class=Session):
+        """flush 이벤트 등록 (AsyncSession도 내부적으로 Session을 사용)"""
+        if not event.contains(session_class, "before_flush", self._before_flush):
+            event.listen(session_class, "before_flush", self._before_flush)
+            event.listen(session_class, "after_flush", self._after_flush)
+    
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    
+    def get(self, db: Session, user_id: uuid.UUID) -> UserStats:
+        """사용자 통계 (기본 키 조회, 행이 없으면 0으로 채운 저장하지 않는 객체)"""
+        stats = db.get(UserStats, user_id)
+        if stats is None:
+            stats = UserStats(
+                user_id=user_id,
+                **{column: 0 for column in COUNTER_COLUMNS},
+                language_counts={},
+                model_counts={}
+            )
+        return stats
+    
+    # ------------------------------------------------------------------
+    # flush 이벤트
+    # ------------------------------------------------------------------
+    
+    def _changed_ids(self, session: Session, after: bool) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+        """
+        통계에 영향을 주는 문서/분석 ID
+        
+        flush 전에는 변경/삭제될 행 (이전 값을 빼기 위해), flush 후에는
+        추가/변경된 행 (새 값을 더하기 위해)
+        """
+        document_ids: Set[uuid.UUID] = set()
+        analysis_ids: Set[uuid.UUID] = set()
+        
+        for instance in session.dirty:
+            if isinstance(instance, Document):
+                columns, ids = DOCUMENT_TRACKED_COLUMNS, document_ids
+            elif isinstance(instance, Analysis):
+                columns, ids = ANALYSIS_TRACKED_COLUMNS, analysis_ids
+            else:
+                continue
+            state = inspect(instance)
+            if any(state.attrs[column].history.has_changes() for column in columns):
+                ids.add(instance.id)
+        
+        for instance in (session.new if after else session.deleted):
+            if isinstance(instance, Document):
+                document_ids.add(instance.id)
+            elif isinstance(instance, Analysis):
+                analysis_ids.add(instance.id)
+        
+        document_ids.discard(None)
+        analysis_ids.discard(None)
+        return document_ids, analysis_ids
+    
+    def _before_flush(self, session: Session, flush_context, instances):
+        self._apply_changes(session, after=False)
+    
+    def _after_flush(self, session: Session, flush_context):
+        self._apply_changes(session, after=True)
+    
+    def _apply_changes(self, session: Session, after: bool):
+        document_ids, analysis_ids = self._changed_ids(session, after)
+        if not document_ids and not analysis_ids:
+            return
+        
+        connection = session.connection()
+        sign = 1 if after else -1
+        deltas: Dict[uuid.UUID, StatsDelta] = defaultdict(StatsDelta)
+        if document_ids:
+            self._collect_documents(connection, Document.id.in_(document_ids), sign, deltas)
+        if analysis_ids:
+            self._collect_analyses(connection, Analysis.id.in_(analysis_ids), sign, deltas)
+        self._apply(connection, deltas)
+    
+    # ------------------------------------------------------------------
+    # 일괄 변경 반영
+    # ------------------------------------------------------------------
+    
+    def record_status_change(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        old_status: DocumentStatus,
+        new_status: DocumentStatus
+    ):
+        """ORM을 거치지 않은 문서 상태 변경 반영 (커밋은 호출자가 수행)"""
+        delta = StatsDelta()
+        if old_status in STATUS_COLUMNS:
+            delta.values[STATUS_COLUMNS[old_status]] -= 1
+        if new_status in STATUS_COLUMNS:
+            delta.values[STATUS_COLUMNS[new_status]] += 1
+        self._apply(db.connection(), {user_id: delta})
+    
+    def discard_analyses(self, db: Session, condition):
+        """
+        일괄 삭제할 분석 결과를 통계에서 제외 (삭제 전에 호출)
+        
+        Args:
+            condition: 삭제 대상 조건 (예: Analysis.document_id == document_id)
+        """
+        deltas: Dict[uuid.UUID, StatsDelta] = defaultdict(StatsDelta)
+        connection = db.connection()
+        self._collect_analyses(connection, condition, -1, deltas)
+        self._apply(connection, deltas)
+    
+    # ------------------------------------------------------------------
+    # 집계
+    # ------------------------------------------------------------------
+    
+    def _collect_documents(self, connection: Connection, condition, sign: int, deltas: Dict[uuid.UUID, StatsDelta]):
+        rows = connection.execute(
+            select(
+                Document.user_id,
+                func.count(Document.id).label("total_documents"),
+                *[
+                    func.count(Document.id).filter(Document.status == document_status).label(column)
+                    for document_status, column in STATUS_COLUMNS.items()
+                ],
+                func.coalesce(func.sum(Document.file_size), 0).label("total_file_size"),
+                func.coalesce(func.sum(Document.processing_time), 0).label("document_processing_time_sum"),
+                func.count(Document.processing_time).label("document_processing_time_count")
+            ).where(condition).group_by(Document.user_id)
+        ).mappings()
+        
+        for row in rows:
+            delta = deltas[row["user_id"]]
+            for column, value in row.items():
+                if column != "user_id":
+                    delta.values[column] += sign * value
+    
+    def _collect_analyses(self, connection: Connection, condition, sign: int, deltas: Dict[uuid.UUID, StatsDelta]):
+        rows = connection.execute(
+            select(
+                Document.user_id,
+                Analysis.language,
+                Analysis.ai_model,
+                func.count(Analysis.id).label("total_analyses"),
+                func.coalesce(func.sum(Analysis.processing_time), 0).label("analysis_processing_time_sum"),
+                func.count(Analysis.processing_time).label("analysis_processing_time_count"),
+                func.coalesce(func.sum(Analysis.confidence_score), 0.0).label("confidence_score_sum"),
+                func.count(Analysis.confidence_score).label("confidence_score_count")
+            ).join(
+                Document, Document.id == Analysis.document_id
+            ).where(condition).group_by(Document.user_id, Analysis.language, Analysis.ai_model)
+        ).mappings()
+        
+        for row in rows:
+            delta = deltas[row["user_id"]]
+            for column, value in row.items():
+                if column not in ("user_id", "language", "ai_model"):
+                    delta.values[column] += sign * value
+            if row["language"]:
+                delta.languages[row["language"]] += sign * row["total_analyses"]
+            if row["ai_model"]:
+                delta.models[row["ai_model"]] += sign * row["total_analyses"]
+    
+    # ------------------------------------------------------------------
+    # 통계 행 갱신
+    # ------------------------------------------------------------------
+    
+    def _lock(self, connection: Connection, user_id: uuid.UUID) -> Dict[str, Any]:
+        """통계 행을 만들고 (없으면) 행 잠금"""
+        connection.execute(
+            insert(stats_table).values(user_id=user_id).on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        return dict(connection.execute(
+            select(stats_table).where(stats_table.c.user_id == user_id).with_for_update()
+        ).mappings().one())
+    
+    def _apply(self, connection: Connection, deltas: Dict[uuid.UUID, StatsDelta]):
+        """변화량 반영 (여러 사용자를 갱신할 때 교착을 피하도록 ID 순서로 잠금)"""
+        for user_id in sorted(deltas, key=str):
+            delta = deltas[user_id]
+            if not delta:
+                continue
+            
+            row = self._lock(connection, user_id)
+            values = {
+                column: row[column] + change
+                for column, change in delta.values.items() if change
+            }
+            values["language_counts"] = _merge_counts(row["language_counts"], delta.languages)
+            values["model_counts"] = _merge_counts(row["model_counts"], delta.models)
+            values["updated_at"] = datetime.utcnow()
+            connection.execute(
+                update(stats_table).where(stats_table.c.user_id == user_id).values(**values)
+            )
+    
+    # ------------------------------------------------------------------
+    # 재구성 (배치)
+    # ------------------------------------------------------------------
+    
+    def rebuild(self, db: Session, user_id: Optional[uuid.UUID] = None) -> int:
+        """
+        원본 테이블에서 통계 재계산 (사용자마다 별도 트랜잭션으로 커밋)
+        
+        통계 행을 먼저 잠그므로 재계산 중 같은 사용자의 변경은 재계산이
+        끝난 뒤에 반영된다.
+        
+        Returns:
+            증분 값과 달라 보정한 사용자 수
+        """
+        user_ids = [user_id] if user_id else list(db.scalars(select(User.id)).all())
+        corrected = 0
+        
+        for current_user_id in user_ids:
+            connection = db.connection()
+            row = self._lock(connection, current_user_id)
+            
+            deltas: Dict[uuid.UUID, StatsDelta] = defaultdict(StatsDelta)
+            self._collect_documents(connection, Document.user_id == current_user_id, 1, deltas)
+            self._collect_analyses(connection, Document.user_id == current_user_id, 1, deltas)
+            delta = deltas[current_user_id]
+            
+            values = {column: delta.values.get(column, 0) for column in COUNTER_COLUMNS}
+            values["language_counts"] = _merge_counts({}, delta.languages)
+            values["model_counts"] = _merge_counts({}, delta.models)
+            
+            drift = [
+                column for column, value in values.items()
+                if column != "confidence_score_sum" and row[column] != value
+            ]
+            if abs(row["confidence_score_sum"] - values["confidence_score_sum"]) > 1e-6:
+                drift.append("confidence_score_sum")
+            if drift:
+                corrected += 1
+                logger.warning(f"사용자 통계 보정: {current_user_id} ({', '.join(drift)})")
+            
+            now = datetime.utcnow()
+            connection.execute(
+                update(stats_table).where(stats_table.c.user_id == current_user_id).values(
+                    **values, rebuilt_at=now, updated_at=now
+                )
+            )
+            db.commit()
+        
+        return corrected
+
+
+# 프로세스 전역 인스턴스 (임포트 시 flush 이벤트 등록)
+user_stats_service = UserStatsService()
+user_stats_service.register()
@@ -0,0 +1,118 @@
+"""
+키셋(커서) 페이지네이션 유틸리티
+
+OFFSET은 앞 페이지의 행을 모두 읽고 버리므로 깊은 페이지일수록 느려진다.
+마지막 행의 (정렬 컬럼, id)를 커서로 넘겨 그 다음 행부터 읽으면 (정렬 컬럼,
+id) 인덱스로 바로 찾아가므로 페이지 깊이와 관계없이 일정한 시간이 걸린다.
+"""
+
+import json
+import uuid
+import base64
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, or_, asc, desc, tuple_
+from sqlalchemy.sql import Select
+
+
+class InvalidCursorError(ValueError):
+    """잘못되었거나 정렬 조건이 다른 커서"""
+    pass
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, row_id: uuid.UUID) -> str:
+    """마지막 행의 정렬 값과 id를 커서 문자열로 변환"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps(
+        {"s": sort_by, "o": sort_order, "v": value, "id": str(row_id)},
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, column) -> Tuple[Any, uuid.UUID]:
+    """
+    커서 문자열 해석
+    
+    Returns:
+        (정렬 값, id)
+    
+    Raises:
+        InvalidCursorError: 형식이 잘못되었거나 정렬 조건이 다른 경우
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != sort_by or payload["o"] != sort_order:
+            raise InvalidCursorError("커서와 정렬 조건이 다릅니다")
+        
+        value = payload["v"]
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        return value, uuid.UUID(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("잘못된 커서입니다") from e
+
+
+def _after(column, id_column, descending: bool, value: Any, last_id: uuid.UUID):
+    """
+    커서 다음 행 조건
+    
+    NULL 정렬은 PostgreSQL 기본값을 따른다 (오름차순은 마지막, 내림차순은 처음).
+    NULL이 없는 컬럼은 행 비교 한 번으로 인덱스 범위 탐색이 되도록 한다.
+    """
+    compare = tuple_(column, id_column) < tuple_(value, last_id) if descending \
+        else tuple_(column, id_column) > tuple_(value, last_id)
+    after_id = id_column < last_id if descending else id_column > last_id
+    
+    if not column.property.columns[0].nullable:
+        return compare
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), after_id), column.isnot(None))
+        return compare
+    if value is None:
+        return and_(column.is_(None), after_id)
+    return or_(compare, column.is_(None))
+
+
+def apply_keyset(
+    query: Select,
+    column,
+    id_column,
+    sort_by: str,
+    sort_order: str,
+    cursor: Optional[str] = None
+) -> Select:
+    """
+    정렬 (id로 동순위 구분)과 커서 조건 적용
+    
+    Raises:
+        InvalidCursorError: 커서가 잘못된 경우
+    """
+    descending = sort_order == "desc"
+    order_func = desc if descending else asc
+    query = query.order_by(order_func(column), order_func(id_column))
+    
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order, column)
+        query = query.where(_after(column, id_column, descending, value, last_id))
+    return query
+
+
+def next_cursor(rows: list, limit: int, column, sort_by: str, sort_order: str) -> Optional[str]:
+    """
+    다음 페이지 커서 (limit + 1개를 조회해 넘치는 행이 있을 때만 반환)
+    
+    rows는 limit개로 잘라낸다.
+    """
+    if len(rows) <= limit:
+        return None
+    
+    del rows[limit:]
+    last = rows[-1]
+    return encode_cursor(sort_by, sort_order, getattr(last, column.key), last.id)
@@ -0,0 +1,377 @@
+"""
+Celery 워커 (문서 처리 작업 큐)
+
+실행:
+    celery -A app.worker worker --pool=threads --concurrency=8 -Q celery --loglevel=info
+    celery -A app.worker worker --pool=threads --concurrency=4 -Q document_ranges --loglevel=info
+    celery -A app.worker beat --loglevel=info
+
+작업은 스레드 풀에서 받아 워커 프로세스당 하나의 이벤트 루프에서 실행하고,
+PDF 추출/텍스트 정제 같은 CPU 작업은 별도 프로세스 풀에서 실행한다.
+(prefork 풀의 자식 프로세스는 프로세스 풀을 만들 수 없으므로 threads 풀 사용)
+
+대용량 문서의 페이지 범위 작업은 LARGE_DOCUMENT_RANGE_QUEUE 큐로 보낸다.
+문서 작업은 범위 결과를 기다리며 슬롯을 차지하므로 범위 작업은 반드시 범위
+큐만 받는 워커에서 실행해야 한다. 같은 워커가 두 큐를 함께 받으면 모든 슬롯이
+범위 결과를 기다리는 문서 작업으로 차서 범위 작업이 실행되지 못한다.
+SCHEDULER_MAX_DISPATCHED는 문서 큐 워커의 전체 슬롯보다 작게 두어 주기 작업
+(전달, 복구, 정리)이 실행될 슬롯을 남긴다.
+"""
+
+import uuid
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from celery import Celery
+from celery.result import AsyncResult
+from celery.signals import worker_ready, worker_shutdown
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import start_worker_server
+from app.schemas.analysis import AnalysisOptions
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "handoc",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="UTC",
+    enable_utc=True,
+    # 워커가 죽으면 메시지가 다시 전달되도록 처리 완료 후 ack
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    result_expires=max(3600, settings.LARGE_DOCUMENT_RANGE_TIMEOUT),
+    beat_schedule={
+        "recover-orphaned-documents": {
+            "task": "documents.recover_orphans",
+            "schedule": float(settings.WORKER_RECOVERY_INTERVAL),
+        },
+        "dispatch-processing-jobs": {
+            "task": "documents.dispatch",
+            "schedule": float(settings.SCHEDULER_DISPATCH_INTERVAL),
+        },
+        "cleanup-upload-sessions": {
+            "task": "uploads.cleanup_expired",
+            "schedule": float(settings.UPLOAD_SESSION_CLEANUP_INTERVAL),
+        },
+        "rebuild-user-stats": {
+            "task": "stats.rebuild_user_stats",
+            "schedule": float(settings.USER_STATS_REBUILD_INTERVAL),
+        },
+        "sweep-text-blobs": {
+            "task": "text_blobs.sweep",
+            "schedule": float(settings.TEXT_BLOB_SWEEP_INTERVAL),
+        },
+        "maintain-partitions": {
+            "task": "partitions.maintain",
+            "schedule": float(settings.PARTITION_MAINTENANCE_INTERVAL),
+        },
+    },
+)
+
+
+class WorkerRuntime:
+    """
+    워커 프로세스 공용 실행 환경 (이벤트 루프 스레드 + CPU 프로세스 풀)
+    
+    Celery 스레드의 모든 작업이 이벤트 루프 하나를 공유하므로, 동기 DB 접근과
+    파일 I/O는 루프의 기본 실행기(I/O 스레드 풀)에서, CPU 작업은 executor에서
+    실행해야 한다.
+    """
+    
+    def __init__(self, cpu_processes: int, io_threads: int):
+        self.loop = asyncio.new_event_loop()
+        self.executor = ProcessPoolExecutor(max_workers=cpu_processes)
+        self.io_executor = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix="worker-io")
+        self.loop.set_default_executor(self.io_executor)
+        self._thread = threading.Thread(target=self._run_loop, name="worker-event-loop", daemon=True)
+        self._thread.start()
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def run(self, coro) -> Any:
+        """코루틴을 공용 이벤트 루프에서 실행하고 결과를 기다림"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+    
+    def shutdown(self):
+        """이벤트 루프와 프로세스 풀 종료"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.io_executor.shutdown(wait=False, cancel_futures=True)
+
+
+_runtime: Optional[WorkerRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> WorkerRuntime:
+    """워커 실행 환경 (최초 작업 시 생성)"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = WorkerRuntime(settings.WORKER_CPU_PROCESSES, settings.WORKER_IO_THREADS)
+        return _runtime
+
+
+def enqueue_document_processing(
+    document_id: uuid.UUID,
+    options: Optional[AnalysisOptions] = None,
+    task_id: Optional[str] = None
+) -> str:
+    """
+    문서 처리 작업을 큐에 추가
+    
+    Args:
+        task_id: 사용할 Celery 작업 ID (스케줄러가 미리 기록해 둔 ID)
+    
+    Returns:
+        Celery 작업 ID
+    """
+    result = process_document_task.apply_async(
+        args=[str(document_id), options.dict() if options else None],
+        task_id=task_id
+    )
+    return result.id
+
+
+def enqueue_page_ranges(
+    document_id: uuid.UUID,
+    ranges: List[Tuple[int, int]],
+    params: Dict[str, Any]
+) -> List[AsyncResult]:
+    """
+    대용량 문서의 페이지 범위 작업을 큐에 추가
+    
+    Returns:
+        범위 순서대로의 Celery 작업 결과 핸들
+    """
+    return [
+        process_range_task.apply_async(
+            args=[str(document_id), start_page, end_page, params],
+            queue=settings.LARGE_DOCUMENT_RANGE_QUEUE
+        )
+        for start_page, end_page in ranges
+    ]
+
+
+@celery_app.task(name="documents.process", bind=True, max_retries=None)
+def process_document_task(self, document_id: str, options: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    문서 처리 작업
+    
+    단계가 실패하면 체크포인트를 남긴 채 지수 백오프로 재시도한다.
+    (최대 시도 횟수는 문서의 processing_attempts로 관리)
+    스케줄러 작업의 현재 작업 ID와 다른 메시지(중복 전달, 다시 전달되기 전의
+    메시지)는 처리하지 않는다.
+    """
+    from app.services.document_pipeline import document_pipeline, get_worker_id, PipelineRetry
+    
+    if not _is_current_dispatch(uuid.UUID(document_id), self.request.id):
+        logger.info(f"현재 전달된 작업이 아님 - 건너뜀: {document_id} ({self.request.id})")
+        return False
+    
+    runtime = get_runtime()
+    retrying = False
+    try:
+        return runtime.run(document_pipeline.process(
+            uuid.UUID(document_id),
+            options=AnalysisOptions(**options) if options else None,
+            executor=runtime.executor,
+            worker_id=f"{get_worker_id()}:{threading.get_ident()}"
+        ))
+    except PipelineRetry as e:
+        retrying = True
+        countdown = settings.WORKER_RETRY_BACKOFF * (2 ** self.request.retries)
+        logger.info(f"문서 처리 재시도 예약: {document_id} ({countdown}초 후)")
+        raise self.retry(exc=e, countdown=countdown)
+    finally:
+        # 재시도 예약이 아니면 (성공, 실패, 예외 모두) 작업 슬롯 반납 후 다음 대기 작업 전달
+        if not retrying:
+            _finish_job(uuid.UUID(document_id))
+
+
+@celery_app.task(name="documents.process_range", bind=True, max_retries=settings.LARGE_DOCUMENT_RANGE_RETRIES)
+def process_range_task(
+    self,
+    document_id: str,
+    start_page: int,
+    end_page: int,
+    params: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    대용량 문서의 페이지 범위 처리 작업
+    
+    결과는 결과 백엔드를 통해 문서를 처리 중인 워커가 수집한다.
+    """
+    from app.services.document_pipeline import document_pipeline
+    
+    runtime = get_runtime()
+    try:
+        return runtime.run(document_pipeline.process_range(
+            uuid.UUID(document_id),
+            start_page,
+            end_page,
+            params,
+            executor=runtime.executor
+        ))
+    except Exception as e:
+        countdown = settings.WORKER_RETRY_BACKOFF * (2 ** self.request.retries)
+        logger.info(f"페이지 범위 작업 재시도 예약: {document_id} ({start_page}-{end_page}, {countdown}초 후)")
+        raise self.retry(exc=e, countdown=countdown)
+
+
+def _is_current_dispatch(document_id: uuid.UUID, task_id: str) -> bool:
+    from app.services.job_scheduler import job_scheduler
+    
+    db = SessionLocal()
+    try:
+        return job_scheduler.is_current(db, document_id, task_id)
+    finally:
+        db.close()
+
+
+def _finish_job(document_id: uuid.UUID):
+    from app.services.job_scheduler import job_scheduler
+    
+    db = SessionLocal()
+    try:
+        job_scheduler.finish(db, document_id)
+        db.commit()
+        job_scheduler.dispatch(db)
+    except Exception as e:
+        logger.warning(f"처리 작업 종료 기록 실패: {document_id} - {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@celery_app.task(name="documents.dispatch")
+def dispatch_processing_jobs_task() -> int:
+    """대기 중인 처리 작업을 스케줄러 순서대로 워커 큐에 전달"""
+    from app.services.job_scheduler import job_scheduler
+    
+    db = SessionLocal()
+    try:
+        return len(job_scheduler.dispatch(db))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="documents.recover_orphans")
+def recover_orphaned_documents_task() -> int:
+    """lease가 만료된 처리 중 문서를 스케줄러에 다시 등록하고 전달"""
+    from app.services.document_pipeline import document_pipeline
+    from app.services.job_scheduler import job_scheduler
+    
+    db = SessionLocal()
+    try:
+        document_ids = document_pipeline.recover_orphans(db)
+    finally:
+        db.close()
+    
+    if document_ids:
+        job_scheduler.dispatch_pending()
+    return len(document_ids)
+
+
+@celery_app.task(name="uploads.cleanup_expired")
+def cleanup_upload_sessions_task() -> int:
+    """만료된 이어 올리기 업로드 세션의 조각 파일 정리"""
+    from app.services.chunked_upload import chunked_upload_service
+    
+    db = SessionLocal()
+    try:
+        return chunked_upload_service.cleanup_expired(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="stats.rebuild_user_stats")
+def rebuild_user_stats_task(user_id: Optional[str] = None) -> int:
+    """사용자 통계를 원본 테이블에서 다시 계산 (증분 갱신과 어긋난 값 보정)"""
+    from app.services.user_stats import user_stats_service
+    
+    db = SessionLocal()
+    try:
+        return user_stats_service.rebuild(db, uuid.UUID(user_id) if user_id else None)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="text_blobs.sweep")
+def sweep_text_blobs_task() -> int:
+    """어떤 분석도 참조하지 않는 텍스트 삭제"""
+    from app.services.text_store import text_store
+    
+    db = SessionLocal()
+    try:
+        return text_store.sweep(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="partitions.maintain")
+def maintain_partitions_task() -> int:
+    """다음 달 파티션 생성 및 보존 기간이 지난 문서 보관"""
+    from app.services.partition_archive import partition_archive_service
+    
+    db = SessionLocal()
+    try:
+        if not partition_archive_service.is_partitioned(db):
+            return 0
+        partition_archive_service.ensure_partitions(db)
+        return partition_archive_service.archive_expired(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="documents.rehydrate")
+def rehydrate_document_task(document_id: str) -> bool:
+    """보관된 문서를 DB로 복원"""
+    from app.services.partition_archive import partition_archive_service
+    
+    db = SessionLocal()
+    try:
+        return partition_archive_service.rehydrate(db, uuid.UUID(document_id))
+    finally:
+        db.close()
+
+
+@worker_ready.connect
+def _recover_on_startup(**kwargs):
+    """워커 시작 시 이전 중단으로 남은 문서 복구"""
+    recover_orphaned_documents_task.delay()
+
+
+@worker_ready.connect
+def _start_metrics_server(**kwargs):
+    """파이프라인 단계/LLM 지표 노출 (Prometheus가 WORKER_METRICS_PORT를 수집)"""
+    try:
+        start_worker_server(settings.WORKER_METRICS_PORT)
+    except OSError as e:
+        # 같은 호스트에서 워커를 여러 개 띄우면 포트가 겹칠 수 있음
+        logger.warning(f"워커 지표 서버 시작 실패: {str(e)}")
+
+
+@worker_shutdown.connect
+def _shutdown_runtime(**kwargs):
+    global _runtime
+    with _runtime_lock:
+        if _runtime is not None:
+            _runtime.shutdown()
+            _runtime = None
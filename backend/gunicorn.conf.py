@@ -0,0 +1,40 @@
+"""
+gunicorn 설정 (프로덕션 API 서버)
+
+실행:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+워커 프로세스마다 Prometheus 지표를 PROMETHEUS_MULTIPROC_DIR의 파일에 쓰고,
+/metrics는 모든 워커의 값을 합쳐 돌려준다 (app/core/metrics.py). 이 값은
+워커가 prometheus_client를 임포트하기 전에 정해져야 하므로 여기서 설정한다.
+"""
+
+import os
+import shutil
+import multiprocessing
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+# 멀티프로세스 지표 디렉토리
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/handoc_prometheus")
+
+
+def on_starting(server):
+    """이전 실행의 지표 파일 삭제 (남아 있으면 카운터가 이어서 합산됨)"""
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """종료된 워커의 게이지(livesum) 값 제거"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,64 @@
+"""
+백엔드 단위 테스트 공용 설정
+
+TestSettings(ENVIRONMENT=test)와 메모리 SQLite로 실행한다. 설정은 app을
+가져올 때 정해지므로 환경 변수를 먼저 지정한다.
+
+    cd backend && python -m pytest tests
+"""
+
+import os
+import uuid
+
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+
+import app.models  # noqa: F401 (모든 모델을 메타데이터에 등록)
+from app.core.database import Base, SessionLocal, engine
+from app.models.user import User
+from app.models.document import Document
+
+
+@pytest.fixture
+def db():
+    """빈 테이블로 시작하는 동기 세션 (테스트마다 새로 생성)"""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def make_user(db):
+    """사용자 생성 (flush까지 수행)"""
+    def factory(**fields) -> User:
+        name = uuid.uuid4().hex[:12]
+        user = User(email=f"{name}@example.com", username=name, hashed_password="not-a-hash", **fields)
+        db.add(user)
+        db.flush()
+        return user
+    return factory
+
+
+@pytest.fixture
+def make_document(db):
+    """문서 생성 (flush까지 수행)"""
+    def factory(user: User, **fields) -> Document:
+        values = {
+            "filename": "document.pdf",
+            "original_filename": "document.pdf",
+            "file_size": 1024,
+            "file_path": "/tmp/document.pdf",
+            "mime_type": "application/pdf"
+        }
+        values.update(fields)
+        document = Document(user_id=user.id, **values)
+        db.add(document)
+        db.flush()
+        return document
+    return factory
@@ -0,0 +1,102 @@
+"""
+분석 구성 요소 선택 테스트 (선택한 구성 요소만 계산, 나머지는 이전 분석에서 복사)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.analysis import AnalysisOptions
+from app.services.ai_analyzer import AIAnalyzer, ALL_COMPONENTS
+
+
+class Calls:
+    """호출된 생성 함수 기록"""
+    
+    def __init__(self):
+        self.names = []
+    
+    def returning(self, name, value):
+        async def call(*args, **kwargs):
+            self.names.append(name)
+            return value
+        return call
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    analyzer = AIAnalyzer()
+    calls = Calls()
+    monkeypatch.setattr(analyzer, "build_summary_tree", calls.returning("build_summary_tree", {"summary": "새 요약", "nodes": []}))
+    monkeypatch.setattr(analyzer, "summarize_chunk_summaries", calls.returning("summarize_chunk_summaries", "재사용 요약"))
+    monkeypatch.setattr(analyzer, "generate_qa_pairs", calls.returning("generate_qa_pairs", [{"question": "질문", "answer": "답변"}]))
+    monkeypatch.setattr(analyzer, "extract_keywords_ai", calls.returning("extract_keywords_ai", [{"keyword": "키워드"}]))
+    monkeypatch.setattr(analyzer, "extract_important_sentences_ai", calls.returning("extract_important_sentences_ai", [{"sentence": "문장"}]))
+    analyzer.calls = calls
+    return analyzer
+
+
+def test_selected_components_follow_flags():
+    assert AnalysisOptions().selected_components() == list(ALL_COMPONENTS)
+    
+    options = AnalysisOptions(generate_qa=False, extract_sentences=False)
+    assert options.selected_components() == ["summary", "keywords"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_runs_only_selected_components(analyzer):
+    result = await analyzer.analyze_document("본문", components=["summary", "keywords"])
+    
+    assert sorted(analyzer.calls.names) == ["build_summary_tree", "extract_keywords_ai"]
+    assert result["components"] == ["summary", "keywords"]
+    assert result["summary"] == "새 요약"
+    assert "qa_pairs" not in result
+    assert "important_sentences" not in result
+
+
+@pytest.mark.asyncio
+async def test_summary_only_reanalysis_reduces_stored_chunk_summaries(analyzer):
+    result = await analyzer.analyze_document(
+        "본문", components=["summary"], chunk_summaries=["첫 조각 요약", "둘째 조각 요약"]
+    )
+    
+    assert analyzer.calls.names == ["summarize_chunk_summaries"]
+    assert result["summary"] == "재사용 요약"
+
+
+@pytest.mark.asyncio
+async def test_failed_component_is_left_empty(analyzer, monkeypatch):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("LLM 오류")
+    monkeypatch.setattr(analyzer, "generate_qa_pairs", failing)
+    
+    result = await analyzer.analyze_document("본문", components=["qa_pairs"])
+    
+    assert result["qa_pairs"] == []
+
+
+def test_fill_missing_components_copies_previous_analysis():
+    analyzer = AIAnalyzer()
+    previous = SimpleNamespace(
+        summary="이전 요약",
+        qa_pairs=[{"question": "이전 질문"}],
+        keywords=None,
+        important_sentences=[{"sentence": "이전 문장"}]
+    )
+    
+    result = analyzer.fill_missing_components({"summary": "새 요약"}, previous=previous)
+    
+    assert result["summary"] == "새 요약"
+    assert result["qa_pairs"] == [{"question": "이전 질문"}]
+    assert result["keywords"] == []
+    assert result["important_sentences"] == [{"sentence": "이전 문장"}]
+    assert "confidence_score" in result
+
+
+def test_fill_missing_components_without_previous_uses_empty_values():
+    result = AIAnalyzer().fill_missing_components({"keywords": [{"keyword": "키워드"}]})
+    
+    assert result["summary"] == ""
+    assert result["qa_pairs"] == []
+    assert result["important_sentences"] == []
+    assert result["keywords"] == [{"keyword": "키워드"}]
@@ -0,0 +1,65 @@
+"""
+파이프라인 체크포인트 테스트 (저장/조회, 입력 key 확인, 손상 파일 무시, 삭제)
+"""
+
+import os
+import uuid
+
+import pytest
+
+from app.services.checkpoint_store import CheckpointStore
+
+DATA = {"text": "본문", "pages": [{"page": 1, "text": "본문"}]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(base_dir=str(tmp_path))
+
+
+@pytest.fixture
+def document_id():
+    return uuid.uuid4()
+
+
+def test_save_and_load_round_trip(store, document_id):
+    store.save(document_id, "text", "v2:hash", DATA)
+    
+    assert store.load(document_id, "text", "v2:hash") == DATA
+
+
+def test_load_ignores_checkpoint_for_other_input(store, document_id):
+    store.save(document_id, "text", "v2:hash", DATA)
+    
+    assert store.load(document_id, "text", "v2:other-hash") is None
+    assert store.load(document_id, "clean", "v2:hash") is None
+    assert store.load(uuid.uuid4(), "text", "v2:hash") is None
+
+
+def test_load_ignores_corrupt_checkpoint(store, document_id):
+    store.save(document_id, "text", "v2:hash", DATA)
+    with open(store._path(document_id, "text"), "wb") as f:
+        f.write(b"not gzip")
+    
+    assert store.load(document_id, "text", "v2:hash") is None
+
+
+def test_save_overwrites_without_leaving_temp_files(store, document_id):
+    store.save(document_id, "analyze", "v2:hash", {"summary": "이전"})
+    store.save(document_id, "analyze", "v2:hash", {"summary": "새 요약"})
+    
+    assert store.load(document_id, "analyze", "v2:hash") == {"summary": "새 요약"}
+    assert os.listdir(store._document_dir(document_id)) == ["analyze.json.gz"]
+
+
+def test_discard_and_clear(store, document_id):
+    store.save(document_id, "text", "v2:hash", DATA)
+    store.save(document_id, "clean", "v2:hash", DATA)
+    
+    store.discard(document_id, "clean")
+    assert store.load(document_id, "clean", "v2:hash") is None
+    assert store.load(document_id, "text", "v2:hash") == DATA
+    
+    store.clear(document_id)
+    assert not os.path.isdir(store._document_dir(document_id))
+    store.discard(document_id, "text")
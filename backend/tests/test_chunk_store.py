@@ -0,0 +1,110 @@
+"""
+요약 트리 저장소 테스트 (페이지 오프셋, 트리 저장/교체, 페이지 범위 조회, 누락 요약 재생성)
+"""
+
+import pytest
+
+from app.services.chunk_store import ChunkStore
+
+PAGES = [{"page": 1, "text": "a" * 98}, {"page": 2, "text": "b" * 98}, {"page": 3, "text": "c" * 98}]
+PAGE_OFFSETS = [0, 100, 200]
+
+
+def node(level, position, start, end, parent=None, summary="요약"):
+    return {
+        "level": level,
+        "position": position,
+        "start_offset": start,
+        "end_offset": end,
+        "content_hash": f"{level}-{position}".ljust(64, "0"),
+        "token_count": end - start,
+        "summary": summary,
+        "parent": parent
+    }
+
+
+def tree():
+    """leaf 3개(페이지 1, 2, 3)와 루트 1개"""
+    return [
+        node(0, 0, 0, 100, parent=3),
+        node(0, 1, 100, 200, parent=3),
+        node(0, 2, 200, 300, parent=3, summary=None),
+        node(1, 0, 0, 300, summary="최종 요약"),
+    ]
+
+
+@pytest.fixture
+def store():
+    return ChunkStore()
+
+
+@pytest.fixture
+def document(make_user, make_document):
+    return make_document(make_user())
+
+
+def test_build_page_offsets_scales_to_cleaned_text(store):
+    assert store.build_page_offsets(PAGES, 300) == PAGE_OFFSETS
+    assert store.build_page_offsets(PAGES, 150) == [0, 50, 100]
+    assert store.build_page_offsets([], 300) == []
+
+
+def test_page_for_offset(store):
+    assert store.page_for_offset(PAGE_OFFSETS, 0) == 1
+    assert store.page_for_offset(PAGE_OFFSETS, 99) == 1
+    assert store.page_for_offset(PAGE_OFFSETS, 100) == 2
+    assert store.page_for_offset(PAGE_OFFSETS, 299) == 3
+    assert store.page_for_offset([], 10) is None
+
+
+def test_save_tree_links_parents_and_pages(db, store, document):
+    chunks = store.save_tree(db, document.id, tree(), PAGE_OFFSETS, language="ko", summary_model="model")
+    db.flush()
+    
+    root = store.get_root(db, document.id)
+    assert root.id == chunks[3].id
+    assert root.summary == "최종 요약"
+    assert [chunk.parent_id for chunk in chunks[:3]] == [root.id] * 3
+    assert [(chunk.page_start, chunk.page_end) for chunk in chunks[:3]] == [(1, 1), (2, 2), (3, 3)]
+
+
+def test_save_tree_replaces_previous_tree(db, store, document):
+    store.save_tree(db, document.id, tree(), PAGE_OFFSETS)
+    db.flush()
+    store.save_tree(db, document.id, [node(0, 0, 0, 300)], PAGE_OFFSETS)
+    db.flush()
+    
+    chunks = store.get_chunks(db, document.id)
+    assert len(chunks) == 1
+    assert (chunks[0].page_start, chunks[0].page_end) == (1, 3)
+
+
+def test_get_leaves_filters_by_page_range(db, store, document):
+    store.save_tree(db, document.id, tree(), PAGE_OFFSETS)
+    db.flush()
+    
+    assert [leaf.position for leaf in store.get_leaves(db, document.id)] == [0, 1, 2]
+    assert [leaf.position for leaf in store.get_leaves(db, document.id, page_start=2, page_end=2)] == [1]
+    assert [leaf.position for leaf in store.get_leaves(db, document.id, page_start=2)] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_ensure_leaf_summaries_regenerates_only_missing(db, store, document):
+    store.save_tree(db, document.id, tree(), PAGE_OFFSETS)
+    db.flush()
+    leaves = store.get_leaves(db, document.id)
+    text = "a" * 100 + "b" * 100 + "c" * 100
+    
+    class Analyzer:
+        requested = []
+        
+        async def summarize_chunk(self, chunk_text, language, model=None):
+            self.requested.append(chunk_text)
+            return "새 요약"
+    
+    analyzer = Analyzer()
+    summaries = await store.ensure_leaf_summaries(leaves, text, analyzer, "ko")
+    
+    assert summaries == ["요약", "요약", "새 요약"]
+    assert analyzer.requested == ["c" * 100]
+    assert leaves[2].summary == "새 요약"
@@ -0,0 +1,153 @@
+"""
+이어 올리기 업로드 테스트 (조각 저장/재개, 병합 검증, 만료 정리)
+"""
+
+import os
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.upload_session import UploadSessionStatus
+from app.schemas.document import UploadSessionCreate
+from app.services.chunked_upload import ChunkedUploadService, ChunkError
+
+CHUNK_SIZE = 16
+CONTENT = bytes(range(40))  # 16 + 16 + 8 바이트, 조각 3개
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunk(index: int) -> bytes:
+    return CONTENT[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+
+
+async def stream(data: bytes, step: int = 5):
+    """요청 본문처럼 잘게 나눠 보내는 스트림"""
+    for start in range(0, len(data), step):
+        yield data[start:start + step]
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ChunkedUploadService(base_dir=str(tmp_path / "sessions"))
+    service.min_chunk_size = 8
+    service.max_chunk_size = 1024
+    return service
+
+
+@pytest.fixture
+def session(db, make_user, service):
+    request = UploadSessionCreate(
+        filename="document.pdf", total_size=len(CONTENT), chunk_size=CHUNK_SIZE, sha256=sha256(CONTENT)
+    )
+    return service.create_session(db, make_user(), request)
+
+
+def test_create_session_splits_into_chunks(service, session):
+    assert session.total_chunks == 3
+    assert session.chunk_length(0) == CHUNK_SIZE
+    assert session.chunk_length(2) == 8
+    assert os.path.isdir(service._session_dir(session.id))
+    assert service.received_chunks(session) == []
+    assert service.missing_chunks(session) == [0, 1, 2]
+
+
+def test_create_session_rejects_chunk_size_out_of_range(db, make_user, service):
+    request = UploadSessionCreate(filename="document.pdf", total_size=100, chunk_size=4)
+    with pytest.raises(ChunkError):
+        service.create_session(db, make_user(), request)
+
+
+@pytest.mark.asyncio
+async def test_resume_reports_received_and_missing_chunks(service, session):
+    await service.save_chunk(session, 2, stream(chunk(2)))
+    await service.save_chunk(session, 0, stream(chunk(0)), checksum=sha256(chunk(0)))
+    
+    assert service.received_chunks(session) == [0, 2]
+    assert service.missing_chunks(session) == [1]
+
+
+@pytest.mark.asyncio
+async def test_save_chunk_overwrites_previous_upload(service, session):
+    await service.save_chunk(session, 0, stream(b"\xff" * CHUNK_SIZE))
+    stored = await service.save_chunk(session, 0, stream(chunk(0)))
+    
+    with open(stored.path, "rb") as f:
+        assert f.read() == chunk(0)
+    assert service.received_chunks(session) == [0]
+
+
+@pytest.mark.asyncio
+async def test_save_chunk_rejects_bad_index(service, session):
+    with pytest.raises(ChunkError):
+        await service.save_chunk(session, 3, stream(chunk(0)))
+    with pytest.raises(ChunkError):
+        await service.save_chunk(session, -1, stream(chunk(0)))
+
+
+@pytest.mark.asyncio
+async def test_save_chunk_rejects_wrong_size_without_keeping_files(service, session):
+    with pytest.raises(ChunkError):
+        await service.save_chunk(session, 0, stream(chunk(0)[:-1]))
+    with pytest.raises(ChunkError):
+        await service.save_chunk(session, 0, stream(chunk(0) + b"\x00"))
+    
+    assert service.received_chunks(session) == []
+    assert os.listdir(service._session_dir(session.id)) == []
+
+
+@pytest.mark.asyncio
+async def test_save_chunk_rejects_checksum_mismatch(service, session):
+    with pytest.raises(ChunkError):
+        await service.save_chunk(session, 1, stream(chunk(1)), checksum=sha256(chunk(0)))
+    
+    assert service.received_chunks(session) == []
+
+
+@pytest.mark.asyncio
+async def test_assemble_requires_every_chunk(service, session, tmp_path):
+    await service.save_chunk(session, 0, stream(chunk(0)))
+    await service.save_chunk(session, 2, stream(chunk(2)))
+    
+    with pytest.raises(ChunkError):
+        await service.assemble(session, str(tmp_path / "assembled.pdf"))
+    assert not (tmp_path / "assembled.pdf").exists()
+
+
+@pytest.mark.asyncio
+async def test_assemble_after_resume_produces_original_file(service, session, tmp_path):
+    for index in (1, 2, 0):
+        await service.save_chunk(session, index, stream(chunk(index)))
+    
+    path = str(tmp_path / "assembled.pdf")
+    stored = await service.assemble(session, path)
+    
+    assert stored.size == len(CONTENT)
+    assert stored.file_hash == sha256(CONTENT)
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_assemble_rejects_file_hash_mismatch(service, session, tmp_path):
+    session.file_hash = sha256(b"other file")
+    for index in range(session.total_chunks):
+        await service.save_chunk(session, index, stream(chunk(index)))
+    
+    path = tmp_path / "assembled.pdf"
+    with pytest.raises(ChunkError):
+        await service.assemble(session, str(path))
+    assert not path.exists()
+
+
+def test_cleanup_expired_discards_chunks(db, service, session):
+    session.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.flush()
+    
+    assert service.cleanup_expired(db) == 1
+    assert session.status == UploadSessionStatus.EXPIRED
+    assert not os.path.isdir(service._session_dir(session.id))
+    assert service.cleanup_expired(db) == 0
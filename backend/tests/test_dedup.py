@@ -0,0 +1,133 @@
+"""
+중복 업로드 재사용 테스트 (find_reusable 정책, 저장소 참조 카운트)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.analysis import Analysis
+from app.models.document import DocumentStatus
+from app.schemas.analysis import AnalysisOptions
+from app.services.dedup import DedupService
+
+FILE_HASH = "a" * 64
+
+
+@pytest.fixture
+def dedup():
+    service = DedupService()
+    service.enabled = True
+    service.cross_user = False
+    return service
+
+
+@pytest.fixture
+def completed(db, make_document):
+    """분석까지 끝난 문서 생성"""
+    def factory(user, file_hash=FILE_HASH, created_at=None, **analysis_fields):
+        document = make_document(user, file_hash=file_hash, status=DocumentStatus.COMPLETED)
+        values = {
+            "summary": "요약",
+            "keywords": [{"keyword": "키워드", "frequency": 1, "importance": 0.9}],
+            "qa_pairs": [{"question": "질문", "answer": "답변", "confidence": 0.8}],
+            "important_sentences": [{"sentence": "문장", "importance": 0.7, "page": 1}],
+            "ai_model": settings.OPENAI_MODEL_DEFAULT,
+            "created_at": created_at or datetime.utcnow()
+        }
+        values.update(analysis_fields)
+        analysis = Analysis(document_id=document.id, **values)
+        db.add(analysis)
+        db.flush()
+        return document, analysis
+    return factory
+
+
+def test_reuses_same_users_completed_analysis(db, dedup, make_user, completed):
+    user = make_user()
+    document, analysis = completed(user)
+    
+    assert dedup.find_reusable(db, FILE_HASH, user) == (document, analysis)
+
+
+def test_ignores_other_files_and_unfinished_documents(db, dedup, make_user, make_document, completed):
+    user = make_user()
+    completed(user, file_hash="b" * 64)
+    make_document(user, file_hash=FILE_HASH, status=DocumentStatus.PROCESSING)
+    
+    assert dedup.find_reusable(db, FILE_HASH, user) is None
+    assert dedup.find_reusable(db, None, user) is None
+
+
+def test_disabled_service_never_reuses(db, dedup, make_user, completed):
+    user = make_user()
+    completed(user)
+    dedup.enabled = False
+    
+    assert dedup.find_reusable(db, FILE_HASH, user) is None
+
+
+def test_other_users_analysis_not_reused_by_default(db, dedup, make_user, completed):
+    owner, uploader = make_user(), make_user()
+    completed(owner)
+    
+    assert dedup.find_reusable(db, FILE_HASH, uploader) is None
+
+
+def test_cross_user_reuse_when_enabled(db, dedup, make_user, completed):
+    owner, uploader = make_user(), make_user()
+    document, analysis = completed(owner)
+    dedup.cross_user = True
+    
+    assert dedup.find_reusable(db, FILE_HASH, uploader) == (document, analysis)
+
+
+def test_same_user_preferred_over_newer_cross_user_result(db, dedup, make_user, completed):
+    owner, uploader = make_user(), make_user()
+    own = completed(uploader, created_at=datetime.utcnow() - timedelta(days=1))
+    completed(owner, created_at=datetime.utcnow())
+    dedup.cross_user = True
+    
+    assert dedup.find_reusable(db, FILE_HASH, uploader) == own
+
+
+def test_requires_requested_components(db, dedup, make_user, completed):
+    user = make_user()
+    completed(user, qa_pairs=None)
+    
+    assert dedup.find_reusable(db, FILE_HASH, user) is None
+    
+    without_qa = AnalysisOptions(generate_qa=False)
+    assert dedup.find_reusable(db, FILE_HASH, user, without_qa) is not None
+
+
+def test_premium_request_requires_premium_analysis(db, dedup, make_user, completed):
+    user = make_user(is_premium=True, subscription_type="premium")
+    completed(user, ai_model=settings.OPENAI_MODEL_DEFAULT)
+    premium_options = AnalysisOptions(use_premium_model=True)
+    
+    assert dedup.find_reusable(db, FILE_HASH, user, premium_options) is None
+    
+    document, analysis = completed(user, ai_model=settings.OPENAI_MODEL_PREMIUM)
+    assert dedup.find_reusable(db, FILE_HASH, user, premium_options) == (document, analysis)
+
+
+def test_storage_reference_counting(db, dedup, make_user, make_document):
+    assert dedup.acquire_existing(db, FILE_HASH) is None
+    assert dedup.register(db, FILE_HASH, 1024, "documents/first.pdf") == "documents/first.pdf"
+    
+    db.commit()
+    
+    # 같은 내용의 두 번째 업로드는 기존 파일을 참조
+    assert dedup.acquire_existing(db, FILE_HASH) == "documents/first.pdf"
+    db.commit()
+    
+    # 동시에 같은 파일을 등록한 경우 (다른 세션이 먼저 등록한 것처럼 세션을 비움)
+    db.expunge_all()
+    assert dedup.register(db, FILE_HASH, 1024, "documents/second.pdf") == "documents/first.pdf"
+    
+    first = make_document(make_user(), storage_key="documents/first.pdf")
+    assert dedup.release(db, first) is False
+    assert dedup.release(db, first) is False
+    assert dedup.release(db, first) is True
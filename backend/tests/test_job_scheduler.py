@@ -0,0 +1,205 @@
+"""
+처리 작업 스케줄러 테스트 (클래스 가중치, 사용자별 SCFQ 순서, 동시 실행 제한, 전달)
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.processing_job import JobStatus
+from app.services import job_scheduler as job_scheduler_module
+from app.services.job_scheduler import JobScheduler, CLASS_ENTERPRISE, CLASS_PREMIUM, CLASS_FREE
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler()
+    scheduler.max_dispatched = 10
+    scheduler.class_weights = {CLASS_ENTERPRISE: 8.0, CLASS_PREMIUM: 4.0, CLASS_FREE: 1.0}
+    scheduler.user_concurrency = {CLASS_ENTERPRISE: 10, CLASS_PREMIUM: 10, CLASS_FREE: 10}
+    return scheduler
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """워커 큐 발행 대신 (문서 ID, 작업 ID) 기록"""
+    messages = []
+    
+    def enqueue(document_id, options=None, task_id=None):
+        messages.append((document_id, task_id))
+        return task_id
+    
+    monkeypatch.setattr(job_scheduler_module, "enqueue_document_processing", enqueue)
+    return messages
+
+
+@pytest.fixture
+def submit(db, scheduler, make_document):
+    """문서를 만들어 작업 등록 (등록 순서대로 enqueued_at 증가)"""
+    started = datetime.utcnow() - timedelta(hours=1)
+    count = [0]
+    
+    def factory(user):
+        job = scheduler.submit(db, make_document(user), user)
+        job.enqueued_at = started + timedelta(seconds=count[0])
+        count[0] += 1
+        db.flush()
+        return job
+    return factory
+
+
+def drain(db, scheduler, class_running=None, user_running=None):
+    """_next_job을 반복해 전달 순서 반환"""
+    class_running = class_running or Counter()
+    user_running = user_running or Counter()
+    order = []
+    while True:
+        job = scheduler._next_job(db, class_running, user_running)
+        if job is None:
+            return order
+        job.mark_dispatched(f"task-{len(order)}")
+        db.flush()
+        class_running[job.priority_class] += 1
+        user_running[job.user_id] += 1
+        order.append(job)
+
+
+def test_priority_class(scheduler, make_user):
+    assert scheduler.priority_class(None) == CLASS_FREE
+    assert scheduler.priority_class(make_user()) == CLASS_FREE
+    assert scheduler.priority_class(make_user(is_premium=True, subscription_type="premium")) == CLASS_PREMIUM
+    assert scheduler.priority_class(make_user(is_premium=True, subscription_type=CLASS_ENTERPRISE)) == CLASS_ENTERPRISE
+    expired = make_user(is_premium=True, subscription_expires_at=datetime.utcnow() - timedelta(days=1))
+    assert scheduler.priority_class(expired) == CLASS_FREE
+
+
+def test_higher_weight_class_first_when_idle(db, scheduler, make_user, submit):
+    free = submit(make_user())
+    premium = submit(make_user(is_premium=True, subscription_type="premium"))
+    
+    assert scheduler._next_job(db, Counter(), Counter()) is premium
+    assert free.status == JobStatus.QUEUED
+
+
+def test_class_with_least_running_per_weight_first(db, scheduler, make_user, submit):
+    free = submit(make_user())
+    premium = submit(make_user(is_premium=True, subscription_type="premium"))
+    
+    # premium 8/4 = 2 > free 1/1 = 1
+    job = scheduler._next_job(db, Counter({CLASS_PREMIUM: 8, CLASS_FREE: 1}), Counter())
+    assert job is free
+    
+    # premium 3/4 < free 1/1
+    job = scheduler._next_job(db, Counter({CLASS_PREMIUM: 3, CLASS_FREE: 1}), Counter())
+    assert job is premium
+
+
+def test_users_interleave_within_class(db, scheduler, make_user, submit):
+    heavy, light = make_user(), make_user()
+    heavy_jobs = [submit(heavy) for _ in range(3)]
+    light_job = submit(light)
+    
+    assert [job.virtual_finish for job in heavy_jobs] == [1.0, 2.0, 3.0]
+    assert light_job.virtual_finish == 1.0
+    assert drain(db, scheduler) == [heavy_jobs[0], light_job, heavy_jobs[1], heavy_jobs[2]]
+
+
+def test_new_user_starts_at_class_virtual_time(db, scheduler, make_user, submit):
+    first = make_user()
+    for _ in range(3):
+        submit(first)
+    drain(db, scheduler)
+    
+    # 이미 전달된 작업의 가상 시각보다 앞서 새치기하지 않음
+    late = submit(make_user())
+    assert late.virtual_finish == 4.0
+
+
+def test_user_concurrency_limit(db, scheduler, make_user, submit):
+    scheduler.user_concurrency[CLASS_FREE] = 1
+    busy, other = make_user(), make_user()
+    busy_jobs = [submit(busy) for _ in range(2)]
+    other_job = submit(other)
+    
+    order = drain(db, scheduler)
+    assert order == [busy_jobs[0], other_job]
+    assert busy_jobs[1].status == JobStatus.QUEUED
+    
+    user_running = Counter({busy.id: 1})
+    assert scheduler._next_job(db, Counter({CLASS_FREE: 1}), user_running) is None
+
+
+def test_dispatch_commits_before_publishing(db, scheduler, make_user, submit, published, monkeypatch):
+    user = make_user()
+    jobs = [submit(user) for _ in range(2)]
+    db.commit()
+    
+    in_transaction = []
+    
+    def enqueue(document_id, options=None, task_id=None):
+        in_transaction.append(db.in_transaction())
+        published.append((document_id, task_id))
+        return task_id
+    
+    monkeypatch.setattr(job_scheduler_module, "enqueue_document_processing", enqueue)
+    dispatched = scheduler.dispatch(db)
+    
+    assert dispatched == jobs
+    assert in_transaction == [False, False]
+    assert published == [(job.document_id, job.task_id) for job in jobs]
+    assert all(job.status == JobStatus.DISPATCHED for job in jobs)
+
+
+def test_dispatch_respects_max_dispatched(db, scheduler, make_user, submit, published):
+    scheduler.max_dispatched = 2
+    for _ in range(3):
+        submit(make_user())
+    db.commit()
+    
+    assert len(scheduler.dispatch(db)) == 2
+    assert scheduler.dispatch(db) == []
+    assert len(published) == 2
+
+
+def test_failed_publish_requeues_job(db, scheduler, make_user, submit, monkeypatch):
+    job = submit(make_user())
+    db.commit()
+    
+    def enqueue(document_id, options=None, task_id=None):
+        raise ConnectionError("broker down")
+    
+    monkeypatch.setattr(job_scheduler_module, "enqueue_document_processing", enqueue)
+    assert scheduler.dispatch(db) == []
+    
+    db.refresh(job)
+    assert job.status == JobStatus.QUEUED
+    assert job.task_id is None
+
+
+def test_is_current_rejects_stale_messages(db, scheduler, make_user, make_document, published):
+    user = make_user()
+    document = make_document(user)
+    assert scheduler.is_current(db, document.id, "anything")  # 스케줄러를 거치지 않은 문서
+    
+    scheduler.submit(db, document, user)
+    db.commit()
+    job, = scheduler.dispatch(db)
+    
+    assert scheduler.is_current(db, document.id, job.task_id)
+    assert not scheduler.is_current(db, document.id, "duplicate-or-old-task")
+    
+    job.mark_finished(True)
+    db.commit()
+    assert not scheduler.is_current(db, document.id, job.task_id)
+
+
+def test_reconcile_requeues_lost_dispatch(db, scheduler, make_user, submit, published):
+    job = submit(make_user())
+    db.commit()
+    scheduler.dispatch(db)
+    
+    job.dispatched_at = datetime.utcnow() - timedelta(seconds=job_scheduler_module.settings.SCHEDULER_DISPATCH_TIMEOUT + 1)
+    db.flush()
+    assert scheduler.reconcile(db) == 1
+    assert job.status == JobStatus.QUEUED
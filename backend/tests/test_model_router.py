@@ -0,0 +1,124 @@
+"""
+모델 라우팅 정책 테스트 (경로별 모델 선택, 성능 저하 폴백, 복구 확인 호출)
+"""
+
+import pytest
+
+from app.services import model_router as model_router_module
+from app.services.model_router import ModelRouter, ROUTE_MAP, ROUTE_QA, ROUTE_REDUCE
+
+FAST = "fast-model"
+PREMIUM = "premium-model"
+
+
+class FakeClock:
+    """time.monotonic 대체 (복구 확인 주기 검증용)"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(model_router_module.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def router(clock):
+    router = ModelRouter(fast_model=FAST, premium_model=PREMIUM)
+    router.enabled = True
+    router.premium_routes = {ROUTE_REDUCE, ROUTE_QA}
+    router.short_doc_tokens = 100
+    router.min_samples = 3
+    router.p95_threshold = 1.0
+    router.error_rate_threshold = 0.5
+    router.probe_interval = 60.0
+    return router
+
+
+def degrade(router: ModelRouter):
+    for _ in range(router.min_samples):
+        router.record(ROUTE_QA, PREMIUM, 0.1, error=True)
+
+
+def test_premium_only_on_premium_routes(router):
+    assert router.select_model(ROUTE_REDUCE, PREMIUM, document_tokens=1000) == PREMIUM
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM
+    assert router.select_model(ROUTE_MAP, PREMIUM, document_tokens=1000) == FAST
+
+
+def test_short_document_uses_fast_model(router):
+    assert router.select_model(ROUTE_REDUCE, PREMIUM, document_tokens=50) == FAST
+
+
+def test_free_user_never_gets_premium(router):
+    assert router.select_model(ROUTE_REDUCE, FAST, document_tokens=1000) == FAST
+    assert router.select_model(ROUTE_QA, None) == FAST
+
+
+def test_no_fallback_below_min_samples(router):
+    router.record(ROUTE_QA, PREMIUM, 0.1, error=True)
+    assert not router.is_degraded(PREMIUM)
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM
+
+
+def test_falls_back_on_error_rate(router):
+    degrade(router)
+    assert router.is_degraded(PREMIUM)
+    
+    # 첫 호출은 복구 확인, 같은 주기의 나머지는 폴백
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM
+    assert router.select_model(ROUTE_QA, PREMIUM) == FAST
+    assert router.select_model(ROUTE_REDUCE, PREMIUM) == FAST
+
+
+def test_falls_back_on_p95_latency(router):
+    for _ in range(router.min_samples):
+        router.record(ROUTE_QA, PREMIUM, 5.0)
+    assert router.is_degraded(PREMIUM)
+
+
+def test_successful_probe_ends_fallback(router):
+    degrade(router)
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM  # 복구 확인 호출
+    router.record(ROUTE_QA, PREMIUM, 0.2)
+    
+    assert not router.is_degraded(PREMIUM)
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM
+
+
+def test_failed_probe_keeps_fallback_until_next_interval(router, clock):
+    degrade(router)
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM  # 복구 확인 호출
+    router.record(ROUTE_QA, PREMIUM, 0.2, error=True)
+    
+    assert router.is_degraded(PREMIUM)
+    clock.now += router.probe_interval - 1
+    assert router.select_model(ROUTE_QA, PREMIUM) == FAST
+    
+    clock.now += 1
+    assert router.select_model(ROUTE_QA, PREMIUM) == PREMIUM
+    assert router.select_model(ROUTE_QA, PREMIUM) == FAST
+
+
+def test_slow_probe_does_not_end_fallback(router):
+    degrade(router)
+    router.select_model(ROUTE_QA, PREMIUM)
+    router.record(ROUTE_QA, PREMIUM, router.p95_threshold + 1)
+    assert router.is_degraded(PREMIUM)
+
+
+def test_metrics_include_cost_and_degraded(router):
+    router.costs = {PREMIUM: {"input": 1.0, "output": 2.0}}
+    router.record(ROUTE_QA, PREMIUM, 0.5, prompt_tokens=1000, completion_tokens=500)
+    
+    metrics = router.get_metrics()
+    assert metrics["models"][PREMIUM]["cost"] == pytest.approx(2.0)
+    assert metrics["models"][PREMIUM]["degraded"] is False
+    assert metrics["routes"][f"{ROUTE_QA}:{PREMIUM}"]["calls"] == 1
@@ -0,0 +1,88 @@
+"""
+키셋 페이지네이션 테스트 (커서 인코딩, apply_keyset/next_cursor 왕복)
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.document import Document
+from app.utils.pagination import (
+    InvalidCursorError, apply_keyset, decode_cursor, encode_cursor, next_cursor
+)
+
+
+def page_through(db, column, sort_by: str, sort_order: str, limit: int):
+    """커서를 따라 끝까지 읽은 행과 페이지 수"""
+    rows_seen, pages, cursor = [], 0, None
+    while True:
+        query = apply_keyset(select(Document), column, Document.id, sort_by, sort_order, cursor)
+        rows = list(db.scalars(query.limit(limit + 1)).all())
+        cursor = next_cursor(rows, limit, column, sort_by, sort_order)
+        assert len(rows) <= limit
+        rows_seen.extend(rows)
+        pages += 1
+        if cursor is None:
+            return rows_seen, pages
+
+
+@pytest.fixture
+def documents(db, make_user, make_document):
+    """정렬 값이 겹치는 문서 7개"""
+    user = make_user()
+    base = datetime(2026, 1, 1)
+    return [
+        make_document(user, file_size=size, created_at=base + timedelta(minutes=minute))
+        for size, minute in [(100, 0), (300, 1), (100, 1), (200, 2), (300, 2), (100, 3), (200, 3)]
+    ]
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    created = datetime(2026, 3, 4, 5, 6, 7, 890)
+    cursor = encode_cursor("created_at", "desc", created, row_id)
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "created_at", "desc", Document.created_at) == (created, row_id)
+
+
+def test_cursor_for_other_sort_is_rejected():
+    cursor = encode_cursor("file_size", "asc", 100, uuid.uuid4())
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "file_size", "desc", Document.file_size)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "created_at", "asc", Document.created_at)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "bm90IGpzb24"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "file_size", "asc", Document.file_size)
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", [1, 3, 7])
+def test_pages_cover_all_rows_in_order(db, documents, sort_order, limit):
+    rows, pages = page_through(db, Document.file_size, "file_size", sort_order, limit)
+    
+    expected = sorted(documents, key=lambda d: (d.file_size, d.id), reverse=sort_order == "desc")
+    assert [row.id for row in rows] == [document.id for document in expected]
+    assert pages == -(-len(documents) // limit)
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_datetime_sort_with_ties(db, documents, sort_order):
+    rows, _ = page_through(db, Document.created_at, "created_at", sort_order, 2)
+    
+    expected = sorted(documents, key=lambda d: (d.created_at, d.id), reverse=sort_order == "desc")
+    assert [row.id for row in rows] == [document.id for document in expected]
+
+
+def test_no_cursor_when_page_is_not_full(db, documents):
+    rows = list(db.scalars(
+        apply_keyset(select(Document), Document.file_size, Document.id, "file_size", "asc").limit(len(documents) + 1)
+    ).all())
+    assert next_cursor(rows, len(documents), Document.file_size, "file_size", "asc") is None
+    assert len(rows) == len(documents)
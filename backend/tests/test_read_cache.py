@@ -0,0 +1,164 @@
+"""
+조회 캐시 테스트 (L1/L2 적중, 무효화, 로드 중 무효화된 값 저장 방지, 커밋 후 자동 무효화)
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.read_cache import ReadCache, read_cache
+
+KEY = ReadCache.document_key("00000000-0000-0000-0000-000000000001")
+TTL = 60
+
+
+class Loader:
+    """호출 횟수를 세는 loader (before는 값을 돌려주기 전에 실행할 코루틴 함수)"""
+    
+    def __init__(self, value="value", before=None):
+        self.value = value
+        self.before = before
+        self.calls = 0
+    
+    async def __call__(self):
+        self.calls += 1
+        if self.before is not None:
+            await self.before()
+        return self.value
+
+
+@pytest.fixture
+def cache():
+    cache = ReadCache(backend="memory")
+    cache.early_refresh_beta = 0
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_in_l1(cache):
+    loader = Loader()
+    
+    assert await cache.get_or_load(KEY, loader, TTL) == "value"
+    assert await cache.get_or_load(KEY, loader, TTL) == "value"
+    
+    assert loader.calls == 1
+    assert cache.stats()["document"]["misses"] == 1
+    assert cache.stats()["document"]["l1_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_l2_serves_after_l1_is_cleared(cache):
+    loader = Loader()
+    await cache.get_or_load(KEY, loader, TTL)
+    cache._l1.clear()
+    
+    assert await cache.get_or_load(KEY, loader, TTL) == "value"
+    assert loader.calls == 1
+    assert cache.stats()["document"]["l2_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_none_is_not_cached(cache):
+    loader = Loader(value=None)
+    
+    assert await cache.get_or_load(KEY, loader, TTL) is None
+    assert await cache.get_or_load(KEY, loader, TTL) is None
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once(cache):
+    loader = Loader(before=lambda: asyncio.sleep(0.01))
+    
+    results = await asyncio.gather(*(cache.get_or_load(KEY, loader, TTL) for _ in range(5)))
+    
+    assert results == ["value"] * 5
+    assert loader.calls == 1
+    assert cache.stats()["document"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_invalidate_evicts_l1_and_l2(cache):
+    await cache.get_or_load(KEY, Loader("old"), TTL)
+    
+    await cache.invalidate(KEY)
+    
+    assert KEY not in cache._l1
+    assert await cache._memory.get(KEY) is None
+    assert await cache.get_or_load(KEY, Loader("new"), TTL) == "new"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_sync_evicts_l1_and_l2(cache):
+    await cache.get_or_load(KEY, Loader("old"), TTL)
+    
+    cache.invalidate_sync(KEY)
+    
+    assert KEY not in cache._l1
+    assert await cache._memory.get(KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_load_invalidated_in_process_is_not_stored(cache):
+    """로드 중 같은 프로세스에서 무효화되면 이번 호출자에게만 값을 돌려줌"""
+    stale = Loader("stale", before=lambda: cache.invalidate(KEY))
+    
+    assert await cache.get_or_load(KEY, stale, TTL) == "stale"
+    
+    assert KEY not in cache._l1
+    assert await cache._memory.get(KEY) is None
+    assert await cache.get_or_load(KEY, Loader("fresh"), TTL) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_load_invalidated_by_other_process_is_not_stored(cache):
+    """다른 프로세스의 무효화는 L2 버전 키로만 알 수 있음"""
+    async def other_process_invalidates():
+        await cache._memory.set(cache.version_key(KEY), "other", ex=TTL)
+        await cache._memory.delete(KEY)
+    
+    stale = Loader("stale", before=other_process_invalidates)
+    
+    assert await cache.get_or_load(KEY, stale, TTL) == "stale"
+    
+    assert KEY not in cache._l1
+    assert await cache._memory.get(KEY) is None
+    assert await cache.get_or_load(KEY, Loader("fresh"), TTL) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_load_after_invalidation_is_stored(cache):
+    """무효화가 끝난 뒤 시작한 로드는 바뀐 버전 기준으로 정상 저장"""
+    await cache.invalidate(KEY)
+    loader = Loader("fresh")
+    
+    await cache.get_or_load(KEY, loader, TTL)
+    await cache.get_or_load(KEY, loader, TTL)
+    
+    assert loader.calls == 1
+    assert await cache._memory.get(KEY) is not None
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_loads():
+    cache = ReadCache(backend="off")
+    loader = Loader()
+    
+    await cache.get_or_load(KEY, loader, TTL)
+    await cache.get_or_load(KEY, loader, TTL)
+    
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_commit_invalidates_document_keys(db, make_user, make_document):
+    user = make_user()
+    document = make_document(user)
+    db.commit()
+    key = read_cache.document_key(document.id)
+    await read_cache.get_or_load(key, Loader("old"), TTL)
+    
+    document.page_count = 3
+    db.commit()
+    
+    assert await read_cache.get_or_load(key, Loader("new"), TTL) == "new"
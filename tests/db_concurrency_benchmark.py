@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+HanDoc AI 동시 요청 지연 시간 벤치마크
+
+DB를 조회하는 API 엔드포인트에 동시 요청을 보내 p50/p95/p99 지연 시간을
+측정합니다. 비동기 DB 세션 전환 전후 빌드에서 각각 실행해 비교합니다:
+    
+    python tests/db_concurrency_benchmark.py --output before.json
+    python tests/db_concurrency_benchmark.py --output after.json
+    python tests/db_concurrency_benchmark.py --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import aiohttp
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+# 벤치마크 설정
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+TEST_EMAIL = "test@handoc.ai"
+TEST_PASSWORD = "TestPassword123!"
+
+# 측정 대상 엔드포인트 (모두 인증과 DB 조회를 거침)
+ENDPOINTS = [
+    "/api/v1/auth/me",
+    "/api/v1/documents/?page=1&limit=20",
+    "/api/v1/documents/stats/overview",
+    "/api/v1/analyses/?page=1&limit=20",
+]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """백분위수 (최근접 순위)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """지연 시간 요약 (밀리초)"""
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput": round((len(latencies) + errors) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0
+    }
+
+
+class DatabaseConcurrencyBenchmark:
+    def __init__(self, concurrency: int, requests_per_client: int):
+        self.concurrency = concurrency
+        self.requests_per_client = requests_per_client
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.access_token: Optional[str] = None
+    
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self.session = aiohttp.ClientSession(connector=connector)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+    
+    async def login(self):
+        """테스트 사용자 생성 (이미 있으면 무시) 및 로그인"""
+        async with self.session.post(
+            f"{API_BASE_URL}/api/v1/auth/register",
+            json={
+                "username": "testuser",
+                "email": TEST_EMAIL,
+                "password": TEST_PASSWORD,
+                "full_name": "Test User"
+            }
+        ):
+            pass
+        
+        async with self.session.post(
+            f"{API_BASE_URL}/api/v1/auth/login",
+            data={"username": TEST_EMAIL, "password": TEST_PASSWORD}
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(f"로그인 실패: HTTP {response.status}")
+            data = await response.json()
+            self.access_token = data["access_token"]
+    
+    async def client(self, endpoint: str, latencies: List[float], errors: List[int]):
+        """한 클라이언트가 같은 엔드포인트를 순차 호출"""
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        for _ in range(self.requests_per_client):
+            start_time = time.perf_counter()
+            try:
+                async with self.session.get(f"{API_BASE_URL}{endpoint}", headers=headers) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors.append(response.status)
+                        continue
+            except aiohttp.ClientError:
+                errors.append(0)
+                continue
+            latencies.append(time.perf_counter() - start_time)
+    
+    async def run_endpoint(self, endpoint: str) -> Dict[str, float]:
+        latencies: List[float] = []
+        errors: List[int] = []
+        start_time = time.perf_counter()
+        await asyncio.gather(*[
+            self.client(endpoint, latencies, errors) for _ in range(self.concurrency)
+        ])
+        return summarize(latencies, len(errors), time.perf_counter() - start_time)
+    
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        """모든 엔드포인트 측정"""
+        print(f"🚀 동시 요청 벤치마크 (클라이언트 {self.concurrency}개, 클라이언트당 {self.requests_per_client}회)")
+        print("=" * 70)
+        
+        await self.login()
+        results = {}
+        for endpoint in ENDPOINTS:
+            # 연결 풀과 캐시를 데우기 위한 예열 요청
+            async with self.session.get(
+                f"{API_BASE_URL}{endpoint}",
+                headers={"Authorization": f"Bearer {self.access_token}"}
+            ) as response:
+                await response.read()
+            results[endpoint] = await self.run_endpoint(endpoint)
+            stats = results[endpoint]
+            print(
+                f"{endpoint:45} p50 {stats['p50_ms']:8.1f}ms  p95 {stats['p95_ms']:8.1f}ms  "
+                f"p99 {stats['p99_ms']:8.1f}ms  오류 {stats['errors']}"
+            )
+        return results
+
+
+def compare(before_path: str, after_path: str):
+    """두 결과 파일의 p99 비교"""
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)["results"]
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+    
+    print(f"{'엔드포인트':45} {'이전 p99':>12} {'이후 p99':>12} {'변화':>8}")
+    print("=" * 80)
+    for endpoint, stats in after.items():
+        if endpoint not in before:
+            continue
+        old, new = before[endpoint]["p99_ms"], stats["p99_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{endpoint:45} {old:10.1f}ms {new:10.1f}ms {change:+7.1f}%")
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="HanDoc AI 동시 요청 지연 시간 벤치마크")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=20, help="클라이언트당 요청 수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="두 결과 파일의 p99 비교")
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+        return
+    
+    async with DatabaseConcurrencyBenchmark(args.concurrency, args.requests) as benchmark:
+        results = await benchmark.run()
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "concurrency": args.concurrency,
+                "requests_per_client": args.requests,
+                "results": results
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 결과가 {args.output}에 저장되었습니다.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
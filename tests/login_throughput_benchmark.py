@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+HanDoc AI 로그인 처리량 벤치마크
+
+동시 로그인을 보내 초당 로그인 수를 측정하고, 같은 시간 동안 가벼운
+인증 엔드포인트(문서 처리 상태 조회와 같은 폴링 요청)의 지연 시간을 함께
+측정합니다. 비밀번호 해싱이 이벤트 루프를 막으면 로그인 처리량과 관계없이
+폴링 지연이 크게 늘어납니다. 전용 실행기 적용 전후 빌드에서 각각 실행해
+비교합니다:
+    
+    python tests/login_throughput_benchmark.py --output before.json
+    python tests/login_throughput_benchmark.py --output after.json
+    python tests/login_throughput_benchmark.py --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import aiohttp
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from db_concurrency_benchmark import summarize
+
+# 벤치마크 설정
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+TEST_EMAIL = "test@handoc.ai"
+TEST_PASSWORD = "TestPassword123!"
+
+# 로그인과 동시에 호출하는 폴링 엔드포인트
+POLL_ENDPOINT = "/api/v1/auth/verify-token"
+POLL_INTERVAL = 0.05
+
+
+class LoginThroughputBenchmark:
+    def __init__(self, concurrency: int, duration: float):
+        self.concurrency = concurrency
+        self.duration = duration
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.access_token: Optional[str] = None
+    
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency + 1)
+        self.session = aiohttp.ClientSession(connector=connector)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+    
+    async def login(self) -> int:
+        """로그인 1회 (HTTP 상태 코드 반환)"""
+        async with self.session.post(
+            f"{API_BASE_URL}/api/v1/auth/login",
+            json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
+        ) as response:
+            if response.status == 200 and self.access_token is None:
+                self.access_token = (await response.json())["access_token"]
+            else:
+                await response.read()
+            return response.status
+    
+    async def setup(self):
+        """테스트 사용자 생성 (이미 있으면 무시) 및 폴링용 토큰 발급"""
+        async with self.session.post(
+            f"{API_BASE_URL}/api/v1/auth/register",
+            json={
+                "username": "testuser",
+                "email": TEST_EMAIL,
+                "password": TEST_PASSWORD,
+                "full_name": "Test User"
+            }
+        ):
+            pass
+        
+        status = await self.login()
+        if status != 200:
+            raise RuntimeError(f"로그인 실패: HTTP {status}")
+    
+    async def login_client(self, deadline: float, latencies: List[float], errors: List[int]):
+        """마감 시각까지 로그인을 반복"""
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            try:
+                status = await self.login()
+            except aiohttp.ClientError:
+                errors.append(0)
+                continue
+            if status != 200:
+                errors.append(status)
+                if status == 503:
+                    await asyncio.sleep(0.1)
+                continue
+            latencies.append(time.perf_counter() - start_time)
+    
+    async def poll_client(self, deadline: float, latencies: List[float], errors: List[int]):
+        """마감 시각까지 폴링 엔드포인트를 일정 간격으로 호출"""
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            try:
+                async with self.session.get(f"{API_BASE_URL}{POLL_ENDPOINT}", headers=headers) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors.append(response.status)
+                    else:
+                        latencies.append(time.perf_counter() - start_time)
+            except aiohttp.ClientError:
+                errors.append(0)
+            await asyncio.sleep(POLL_INTERVAL)
+    
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        print(f"🚀 로그인 처리량 벤치마크 (동시 로그인 {self.concurrency}개, {self.duration:.0f}초)")
+        print("=" * 70)
+        
+        await self.setup()
+        
+        login_latencies: List[float] = []
+        login_errors: List[int] = []
+        poll_latencies: List[float] = []
+        poll_errors: List[int] = []
+        
+        start_time = time.perf_counter()
+        deadline = start_time + self.duration
+        await asyncio.gather(
+            self.poll_client(deadline, poll_latencies, poll_errors),
+            *[self.login_client(deadline, login_latencies, login_errors) for _ in range(self.concurrency)]
+        )
+        elapsed = time.perf_counter() - start_time
+        
+        results = {
+            "login": summarize(login_latencies, len(login_errors), elapsed),
+            "poll": summarize(poll_latencies, len(poll_errors), elapsed)
+        }
+        results["login"]["logins_per_second"] = round(len(login_latencies) / elapsed, 2)
+        results["login"]["rejected"] = login_errors.count(503)
+        
+        login, poll = results["login"], results["poll"]
+        print(
+            f"{'로그인':10} 성공 {login['logins_per_second']:7.1f}/s  p50 {login['p50_ms']:8.1f}ms  "
+            f"p99 {login['p99_ms']:8.1f}ms  거절(503) {login['rejected']}  오류 {login['errors']}"
+        )
+        print(
+            f"{'폴링':10} p50 {poll['p50_ms']:8.1f}ms  p95 {poll['p95_ms']:8.1f}ms  "
+            f"p99 {poll['p99_ms']:8.1f}ms  최대 {poll['max_ms']:8.1f}ms"
+        )
+        return results
+
+
+def compare(before_path: str, after_path: str):
+    """두 결과 파일의 로그인 처리량과 폴링 p99 비교"""
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)["results"]
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+    
+    rows = [
+        ("로그인/초", before["login"]["logins_per_second"], after["login"]["logins_per_second"], ""),
+        ("로그인 p99", before["login"]["p99_ms"], after["login"]["p99_ms"], "ms"),
+        ("폴링 p99", before["poll"]["p99_ms"], after["poll"]["p99_ms"], "ms"),
+        ("폴링 최대", before["poll"]["max_ms"], after["poll"]["max_ms"], "ms"),
+    ]
+    print(f"{'항목':15} {'이전':>12} {'이후':>12} {'변화':>8}")
+    print("=" * 52)
+    for name, old, new, unit in rows:
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{name:15} {old:10.1f}{unit:2} {new:10.1f}{unit:2} {change:+7.1f}%")
+
+
+async def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="HanDoc AI 로그인 처리량 벤치마크")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 로그인 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 (초)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="두 결과 파일 비교")
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+        return
+    
+    async with LoginThroughputBenchmark(args.concurrency, args.duration) as benchmark:
+        results = await benchmark.run()
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "results": results
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 결과가 {args.output}에 저장되었습니다.")
+
+if __name__ == "__main__":
+    asyncio.run(main())